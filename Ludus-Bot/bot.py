@@ -1,6 +1,7 @@
 import sys
 import os
 import json
+import signal
 import asyncio
 import traceback
 import logging
@@ -16,6 +17,8 @@ from discord import app_commands
 import constants
 import ludus_logging
 from utils import user_storage
+from utils.render_service import render_service
+from utils.scheduler import scheduler
 import aiofiles
 
 # 1. PATH CONFIGURATION (PRIORITY)
@@ -223,6 +226,18 @@ async def setup_hook():
     except Exception as e:
         print(f"[BOT] Failed to load UNO assets: {e}")
     
+    # Fork image render workers before cogs start their threads
+    try:
+        render_service.start()
+    except Exception as e:
+        print(f"[BOT] Failed to start render workers: {e}")
+    
+    # Import legacy JSON user files into SQLite before any cog reads a profile
+    try:
+        await user_storage.prepare_user_storage()
+    except Exception as e:
+        print(f"[BOT] User storage migration failed: {e}")
+    
     # Load all Cog extensions
     await load_cogs()
     
@@ -234,6 +249,12 @@ async def setup_hook():
     
     bot.loop.create_task(activity_worker())
 
+    # Close cleanly on SIGTERM (launcher/Render) so pending user writes get flushed
+    try:
+        bot.loop.add_signal_handler(signal.SIGTERM, lambda: bot.loop.create_task(bot.close()))
+    except (NotImplementedError, RuntimeError):
+        pass  # Windows / non-main thread
+
 @bot.event
 async def on_ready():
     """Triggered when the bot is online."""
@@ -519,3 +540,7 @@ if __name__ == "__main__":
         bot.run(TOKEN)
     except Exception as e:
         print(f"[FATAL] Connection error: {e}")
+    finally:
+        user_storage.flush_all()
+        scheduler.flush()
+        render_service.close()
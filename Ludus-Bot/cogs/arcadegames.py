@@ -6,6 +6,7 @@ import random
 import time
 import io
 from PIL import Image, ImageDraw, ImageFont
+from utils.render_service import render_service
 
 from discord import app_commands
 from discord.ui import View, Button
@@ -594,7 +595,7 @@ class BombDefuseView(discord.ui.View):
         await self.cog.show_arcade_menu(interaction)
 
     async def update_board(self, interaction=None):
-        file = discord.File(self.game.render(), filename="bomb.png")
+        file = await render_service.render_file(self.game.render, filename="bomb.png")
         
         if self.game.state == "win":
             reward = 300
@@ -780,7 +781,7 @@ class SnakeView(discord.ui.View):
         self.message = None
 
     async def update_board(self, interaction=None):
-        file = discord.File(self.game.render(), filename="snake.png")
+        file = await render_service.render_file(self.game.render, filename="snake.png")
         desc = f"Score: {self.game.score} | Length: {len(self.game.snake)}"
         color = discord.Color.green()
         
@@ -991,7 +992,7 @@ class TetrisView(discord.ui.View):
         self.message = None
 
     async def update_board(self, interaction=None):
-        file = discord.File(self.game.render(), filename="tetris.png")
+        file = await render_service.render_file(self.game.render, filename="tetris.png")
         desc = f"Score: {self.game.score}"
         
         if self.game.state == "game_over":
@@ -1215,7 +1216,7 @@ class SpaceInvadersView(discord.ui.View):
         self.message = None
 
     async def update_board(self, interaction=None):
-        file = discord.File(self.game.render(), filename="invaders.png")
+        file = await render_service.render_file(self.game.render, filename="invaders.png")
         desc = f"Score: {self.game.score} | Level: {self.game.level}"
         
         if self.game.state == "game_over":
@@ -1385,7 +1386,7 @@ class PongView(discord.ui.View):
         self.message = None
 
     async def update_board(self, interaction=None):
-        file = discord.File(self.game.render(), filename="pong.png")
+        file = await render_service.render_file(self.game.render, filename="pong.png")
         desc = f"Player: {self.game.score_p1} | AI: {self.game.score_ai}"
         
         if self.game.state != "playing":
@@ -1480,7 +1481,7 @@ class PacManView(discord.ui.View):
         self.message = None
     
     async def update_board(self, interaction=None):
-        file = discord.File(self.game.render(), filename="pacman.png")
+        file = await render_service.render_file(self.game.render, filename="pacman.png")
         desc = f"Score: {self.game.score} | Lives: {'❤️'*self.game.lives}"
         
         if self.game.state == "win":
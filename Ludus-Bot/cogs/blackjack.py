@@ -30,6 +30,8 @@ try:
 except Exception:
     _bj_inc = _bj_mg = None
 
+from utils.render_service import render_service
+
 # Active games
 active_blackjack_games = {}
 
@@ -238,7 +240,7 @@ class BlackjackActionView(discord.ui.View):
             deck = self.economy_cog.get_user_card_deck(interaction.user.id)
         
         # Create hand image with hidden 2nd card in PVP
-        hand_image = await asyncio.to_thread(
+        hand_image = await render_service.render_file(
             create_blackjack_hand_image,
             self.player_cards,
             self.player_value,
@@ -372,6 +374,19 @@ def create_blackjack_hand_image(cards, value, player_name, is_pvp=False, deck='c
     return discord.File(fp=buffer, filename='blackjack_hand.png')
 
 
+class _TableUser:
+    """Picklable stand-in for a discord user on the blackjack table image"""
+    def __init__(self, display_name):
+        self.display_name = display_name
+
+def _render_players(players):
+    """Plain copies of player dicts for the render workers (discord users and bot stubs can't be pickled)"""
+    return [
+        {**{k: p[k] for k in ('cards', 'value', 'bet', 'status', 'result', 'is_bot') if k in p},
+         'user': _TableUser(p['user'].display_name)}
+        for p in players
+    ]
+
 def create_blackjack_table_image(dealer_cards, dealer_value, players, show_dealer=False, pot=0, is_pvp=False, current_player_index=None, deck='classic'):
     """Create blackjack table image with all players - uses assets/fonts
     
@@ -1207,11 +1222,11 @@ class BlackjackGame:
         
         while player['value'] < 21 and player['status'] == 'playing':
             # Create visual table
-            table_image = await asyncio.to_thread(
+            table_image = await render_service.render_file(
                 create_blackjack_table_image,
                 dealer_cards,
                 dealer_value,
-                self.players,
+                _render_players(self.players),
                 show_dealer=False,
                 pot=sum(p['bet'] for p in self.players),
                 is_pvp=is_pvp,
@@ -1324,11 +1339,11 @@ class BlackjackGame:
                 card_deck = self.get_user_deck(player['user'].id)
                 break
         
-        table_image = await asyncio.to_thread(
+        table_image = await render_service.render_file(
             create_blackjack_table_image,
             dealer_cards,
             dealer_value,
-            self.players,
+            _render_players(self.players),
             show_dealer=True,
             pot=sum(p['bet'] for p in self.players),
             is_pvp=is_pvp,
@@ -1716,7 +1731,7 @@ class BlackjackCog(commands.Cog):
                 result = "lose"
                 winnings_text = f"-{bet_amount} 💠"
             
-            game_image = await asyncio.to_thread(
+            game_image = await render_service.render_file(
                 create_blackjack_image,
                 player_cards, dealer_cards, player_value, dealer_value,
                 interaction.user.display_name, bet_amount, result, True, 
@@ -1786,7 +1801,7 @@ Additionally, please remember that **the odds are always in favor of the house.
         
         # Player's turn
         while player_value < 21:
-            game_image = await asyncio.to_thread(
+            game_image = await render_service.render_file(
                 create_blackjack_image,
                 player_cards, dealer_cards, player_value, dealer_value,
                 interaction.user.display_name, bet_amount, None, False, 
@@ -1854,7 +1869,7 @@ Additionally, please remember that **the odds are always in favor of the house.
                 winnings_text = "Bet returned"
         
         # Final result
-        game_image = await asyncio.to_thread(
+        game_image = await render_service.render_file(
             create_blackjack_image,
             player_cards, dealer_cards, player_value, dealer_value,
             interaction.user.display_name, bet_amount, result, show_dealer, 
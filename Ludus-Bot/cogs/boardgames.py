@@ -8,6 +8,9 @@ import time
 
 from discord.ui import View, Button
 from cogs.minigames import PaginatedHelpView
+from utils import connect4_engine as c4_engine
+from utils import tictactoe_engine as ttt_engine
+from utils.render_service import render_service
 
 # User stats persistence
 try:
@@ -143,177 +146,7 @@ def get_host_background(game_state, guild_id):
 
 def check_winner(board, size):
     """Check if there's a winner - 3x3 needs 3, 4x4 needs 4, 5x5 needs 4"""
-    # Determine win condition based on board size
-    if size == 3:
-        win_length = 3
-    elif size == 4:
-        win_length = 4
-    else:  # 5x5 or larger
-        win_length = 4
-    
-    # Check all possible lines
-    for row in range(size):
-        for col in range(size):
-            if board[row * size + col] == 0:
-                continue
-            
-            player = board[row * size + col]
-            
-            # Check horizontal (right)
-            if col + win_length <= size:
-                if all(board[row * size + col + i] == player for i in range(win_length)):
-                    return player
-            
-            # Check vertical (down)
-            if row + win_length <= size:
-                if all(board[(row + i) * size + col] == player for i in range(win_length)):
-                    return player
-            
-            # Check diagonal (down-right)
-            if row + win_length <= size and col + win_length <= size:
-                if all(board[(row + i) * size + col + i] == player for i in range(win_length)):
-                    return player
-            
-            # Check anti-diagonal (down-left)
-            if row + win_length <= size and col - win_length >= -1:
-                if all(board[(row + i) * size + col - i] == player for i in range(win_length)):
-                    return player
-    
-    return None
-
-def evaluate_position(board, size, player, opponent):
-    """Heuristic evaluation for larger boards"""
-    score = 0
-    
-    # Check all rows, columns, and diagonals
-    for row in range(size):
-        for col in range(size):
-            if board[row * size + col] != 0:
-                continue
-            # Evaluate potential of this position
-            threats = 0
-            opportunities = 0
-            
-            # Check row
-            row_player = sum(1 for c in range(size) if board[row * size + c] == player)
-            row_opponent = sum(1 for c in range(size) if board[row * size + c] == opponent)
-            if row_opponent == 0 and row_player > 0:
-                opportunities += row_player ** 2
-            if row_player == 0 and row_opponent > 0:
-                threats += row_opponent ** 2
-                
-            # Check column
-            col_player = sum(1 for r in range(size) if board[r * size + col] == player)
-            col_opponent = sum(1 for r in range(size) if board[r * size + col] == opponent)
-            if col_opponent == 0 and col_player > 0:
-                opportunities += col_player ** 2
-            if col_player == 0 and col_opponent > 0:
-                threats += col_opponent ** 2
-    
-    return opportunities - threats
-
-def minimax(board, size, depth, is_maximizing, alpha, beta, player, opponent, max_depth):
-    """Minimax algorithm with alpha-beta pruning and depth limit"""
-    winner = check_winner(board, size)
-    
-    # Terminal states
-    if winner == player:
-        return 100 - depth  # Prefer faster wins
-    elif winner == opponent:
-        return depth - 100  # Prefer slower losses
-    elif all(cell != 0 for cell in board):
-        return 0  # Draw
-    
-    # Depth limit - use heuristic evaluation
-    if depth >= max_depth:
-        return evaluate_position(board, size, player, opponent)
-    
-    if is_maximizing:
-        max_eval = -float('inf')
-        for i in range(len(board)):
-            if board[i] == 0:
-                board[i] = player
-                eval_score = minimax(board, size, depth + 1, False, alpha, beta, player, opponent, max_depth)
-                board[i] = 0
-                max_eval = max(max_eval, eval_score)
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break  # Beta cutoff
-        return max_eval
-    else:
-        min_eval = float('inf')
-        for i in range(len(board)):
-            if board[i] == 0:
-                board[i] = opponent
-                eval_score = minimax(board, size, depth + 1, True, alpha, beta, player, opponent, max_depth)
-                board[i] = 0
-                min_eval = min(min_eval, eval_score)
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break  # Alpha cutoff
-        return min_eval
-
-def choose_move(board, size, player):
-    """AI chooses optimal move - unbeatable on 3x3, very strong on larger boards"""
-    opponent = 3 - player
-    
-    # Set depth limit based on board size
-    if size == 3:
-        max_depth = 9  # Full search for 3x3
-    elif size == 4:
-        max_depth = 5  # Medium depth for 4x4
-    else:  # 5x5 or larger
-        max_depth = 3  # Shallow search with heuristic for 5x5
-    
-    # Priority moves for larger boards (optimization)
-    if size >= 4:
-        # 1. Check for immediate win
-        for i in range(len(board)):
-            if board[i] == 0:
-                board[i] = player
-                if check_winner(board, size):
-                    board[i] = 0
-                    return i
-                board[i] = 0
-        
-        # 2. Block immediate opponent win
-        for i in range(len(board)):
-            if board[i] == 0:
-                board[i] = opponent
-                if check_winner(board, size):
-                    board[i] = 0
-                    return i
-                board[i] = 0
-    
-    best_score = -float('inf')
-    best_moves = []
-    
-    # Evaluate all possible moves
-    for i in range(len(board)):
-        if board[i] == 0:
-            board[i] = player
-            score = minimax(board, size, 0, False, -float('inf'), float('inf'), player, opponent, max_depth)
-            board[i] = 0
-            
-            if score > best_score:
-                best_score = score
-                best_moves = [i]
-            elif score == best_score:
-                best_moves.append(i)
-    
-    # If multiple moves have same score, prefer center positions
-    if len(best_moves) > 1:
-        center = size // 2
-        center_positions = []
-        for move in best_moves:
-            row = move // size
-            col = move % size
-            dist = abs(row - center) + abs(col - center)
-            center_positions.append((dist, move))
-        center_positions.sort()
-        return center_positions[0][1]
-    
-    return best_moves[0] if best_moves else 0
+    return ttt_engine.winner(board, size)
 
 async def process_move(bot, interaction, game_id, game, idx):
     player_num = game['turn']
@@ -471,7 +304,16 @@ async def process_move(bot, interaction, game_id, game, idx):
 async def handle_bot_move(bot, message, game_id, game):
     await asyncio.sleep(1)
     bot_player = game['turn']
-    move_idx = choose_move(game['board'], game['size'], bot_player)
+    # Search in the worker pool so the event loop keeps serving other games
+    try:
+        move_idx = await render_service.run(
+            ttt_engine.best_move, game['board'], game['size'], bot_player,
+            timeout=15,
+        )
+    except Exception as e:
+        # Timeout / broken pool: search in-process (in a thread) so the game never stalls on the bot
+        print(f"[TicTacToe] Bot search in worker failed ({e}); searching in a thread")
+        move_idx = await asyncio.to_thread(ttt_engine.best_move, list(game['board']), game['size'], bot_player)
 
     class FakeInteraction:
         def __init__(self, msg):
@@ -1031,12 +873,19 @@ class BoardGames(commands.Cog):
     # ==================== CONNECT 4 ====================
 
     @app_commands.command(name="connect4", description="Play Connect 4 against another player or AI")
-    @app_commands.describe(opponent="Player to challenge (leave empty to play against AI)")
-    async def connect4_slash(self, interaction: discord.Interaction, opponent: Optional[discord.Member] = None):
+    @app_commands.describe(opponent="Player to challenge (leave empty to play against AI)",
+                           difficulty="AI strength (only used against the AI)")
+    @app_commands.choices(difficulty=[
+        app_commands.Choice(name="Easy", value="easy"),
+        app_commands.Choice(name="Medium", value="medium"),
+        app_commands.Choice(name="Hard", value="hard"),
+    ])
+    async def connect4_slash(self, interaction: discord.Interaction, opponent: Optional[discord.Member] = None,
+                             difficulty: str = "medium"):
         await interaction.response.defer()
-        await self._start_connect4(interaction.user, opponent, interaction)
+        await self._start_connect4(interaction.user, opponent, interaction, difficulty)
 
-    async def _start_connect4(self, player1, opponent, interaction):
+    async def _start_connect4(self, player1, opponent, interaction, difficulty: str = "medium"):
         if player1.id in self.player_games:
             await interaction.followup.send(
                 "❌ You're already in a game! Use the 🚪 Quit button to resign first.", ephemeral=True
@@ -1067,6 +916,7 @@ class BoardGames(commands.Cog):
             "current_turn": player1.id,
             "symbols":      {player1.id: _C4_P1, p2_id: _C4_P2},
             "is_ai":        is_ai,
+            "difficulty":   difficulty,
             "channel":      interaction.channel.id,
             "game_over":    False,
         }
@@ -1193,7 +1043,19 @@ class BoardGames(commands.Cog):
         # ---- AI turn ----
         if game_state["is_ai"]:
             game_state["current_turn"] = "AI"
-            ai_col = self._get_ai_c4_move(board, _C4_P2, _C4_P1)
+            # Search in the worker pool so the event loop keeps serving other games
+            difficulty = game_state.get("difficulty", "medium")
+            try:
+                ai_col = await render_service.run(
+                    c4_engine.best_move, board, _C4_P2, _C4_P1, difficulty,
+                    timeout=15,
+                )
+            except Exception as e:
+                # Timeout / broken pool: search in-process (in a thread) so the game never stalls on the AI
+                print(f"[Connect4] AI search in worker failed ({e}); searching in a thread")
+                ai_col = await asyncio.to_thread(
+                    c4_engine.best_move, [row[:] for row in board], _C4_P2, _C4_P1, difficulty,
+                )
             ai_row = 0
             for r in range(5, -1, -1):
                 if board[r][ai_col] == " ":
@@ -1282,113 +1144,6 @@ class BoardGames(commands.Cog):
                 return True
         return False
 
-    def _c4_is_terminal(self, board) -> bool:
-        """True if someone has won or the board is full."""
-        for r in range(6):
-            for c in range(7):
-                if board[r][c] != " " and self._check_c4_winner(board, r, c):
-                    return True
-        return all(board[0][c] != " " for c in range(7))
-
-    def _c4_score_window(self, window, ai_sym, opp_sym) -> int:
-        ai  = window.count(ai_sym)
-        opp = window.count(opp_sym)
-        emp = window.count(" ")
-        if ai == 4:              return  1_000_000
-        if opp == 4:             return -1_000_000
-        if ai == 3 and emp == 1: return  50
-        if ai == 2 and emp == 2: return  10
-        if opp == 3 and emp == 1:return -80
-        if opp == 2 and emp == 2:return  -5
-        return 0
-
-    def _c4_heuristic(self, board, ai_sym, opp_sym) -> int:
-        score = 0
-        # Centre column bias
-        score += sum(1 for r in range(6) if board[r][3] == ai_sym) * 6
-        # Horizontal
-        for r in range(6):
-            for c in range(4):
-                score += self._c4_score_window(board[r][c:c+4], ai_sym, opp_sym)
-        # Vertical
-        for c in range(7):
-            col = [board[r][c] for r in range(6)]
-            for r in range(3):
-                score += self._c4_score_window(col[r:r+4], ai_sym, opp_sym)
-        # Diag /
-        for r in range(3):
-            for c in range(4):
-                score += self._c4_score_window([board[r+i][c+i] for i in range(4)], ai_sym, opp_sym)
-        # Diag \
-        for r in range(3, 6):
-            for c in range(4):
-                score += self._c4_score_window([board[r-i][c+i] for i in range(4)], ai_sym, opp_sym)
-        return score
-
-    def _c4_drop_copy(self, board, col, symbol):
-        """Return (new_board, row) after dropping, or (None, -1) if full."""
-        for r in range(5, -1, -1):
-            if board[r][col] == " ":
-                nb = [row[:] for row in board]
-                nb[r][col] = symbol
-                return nb, r
-        return None, -1
-
-    def _c4_minimax(self, board, depth, alpha, beta, maximising, ai_sym, opp_sym) -> int:
-        available = [c for c in range(7) if board[0][c] == " "]
-        if depth == 0 or not available or self._c4_is_terminal(board):
-            return self._c4_heuristic(board, ai_sym, opp_sym)
-        # Move order: centre first
-        ordered = sorted(available, key=lambda c: abs(c - 3))
-        if maximising:
-            val = -10_000_000
-            for col in ordered:
-                nb, _ = self._c4_drop_copy(board, col, ai_sym)
-                if nb is None: continue
-                val   = max(val, self._c4_minimax(nb, depth-1, alpha, beta, False, ai_sym, opp_sym))
-                alpha = max(alpha, val)
-                if alpha >= beta: break
-            return val
-        else:
-            val = 10_000_000
-            for col in ordered:
-                nb, _ = self._c4_drop_copy(board, col, opp_sym)
-                if nb is None: continue
-                val  = min(val, self._c4_minimax(nb, depth-1, alpha, beta, True, ai_sym, opp_sym))
-                beta = min(beta, val)
-                if alpha >= beta: break
-            return val
-
-    def _get_ai_c4_move(self, board, ai_symbol, player_symbol) -> int:
-        """Pick best column using minimax (depth 6) with alpha-beta pruning."""
-        available = [c for c in range(7) if board[0][c] == " "]
-        if not available:
-            return 3
-
-        # Immediate win
-        for col in available:
-            nb, row = self._c4_drop_copy(board, col, ai_symbol)
-            if nb and self._check_c4_winner(nb, row, col):
-                return col
-
-        # Immediate block
-        for col in available:
-            nb, row = self._c4_drop_copy(board, col, player_symbol)
-            if nb and self._check_c4_winner(nb, row, col):
-                return col
-
-        # Minimax search
-        best_col   = sorted(available, key=lambda c: abs(c - 3))[0]
-        best_score = -10_000_000
-        for col in sorted(available, key=lambda c: abs(c - 3)):
-            nb, _ = self._c4_drop_copy(board, col, ai_symbol)
-            if nb is None: continue
-            score = self._c4_minimax(nb, 5, -10_000_000, 10_000_000, False, ai_symbol, player_symbol)
-            if score > best_score:
-                best_score = score
-                best_col   = col
-        return best_col
-
 
     # ==================== HANGMAN ====================
     
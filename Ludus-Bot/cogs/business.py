@@ -1,13 +1,14 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord.ui import View, Button, Select, Modal, TextInput
 import json
 import os
 import asyncio
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.embed_styles import EmbedBuilder, Colors, Emojis
+from utils.scheduler import scheduler
 
 
 def _parse_ts(s):
@@ -392,10 +393,37 @@ class Business(commands.Cog):
         data_dir = os.getenv("RENDER_DISK_PATH", ".")
         self.manager = BusinessManager(data_dir)
         self.inventory_file = os.path.join(data_dir, "inventory.json")
-        # Start background tasks
-        self.process_shipments_task.start()
-        self.passive_income_task.start()
-        self.payroll_task.start()
+
+    async def cog_load(self):
+        # Timed work runs on the shared scheduler: two hourly jobs plus one job
+        # per shipment at its delivery time (instead of scanning every 5 minutes)
+        scheduler.register("business.payroll", self._run_payroll)
+        scheduler.register("business.passive_income", self._run_passive_income)
+        scheduler.register("business.shipment", self._deliver_shipments)
+        first = discord.utils.utcnow() + timedelta(hours=1)
+        # replace=False keeps the persisted phase, so a restart neither skips
+        # nor repeats an hourly payout
+        scheduler.schedule("business.payroll", first, key="business:payroll", every=3600, replace=False)
+        scheduler.schedule("business.passive_income", first, key="business:passive_income", every=3600, replace=False)
+        for owner_id in list(self.manager.get_all_businesses()):
+            self._schedule_shipments(owner_id)
+
+    def cog_unload(self):
+        for kind in ("business.payroll", "business.passive_income", "business.shipment"):
+            scheduler.unregister(kind)
+        scheduler.flush()
+
+    def _schedule_shipments(self, owner_id):
+        """Make sure every pending shipment of this business has a delivery job."""
+        owner_id = str(owner_id)
+        business = self.manager.get_user_business(owner_id) or {}
+        for shipment in business.get('incoming_shipments', []):
+            try:
+                deliver_at = _parse_ts(shipment['deliver_at'])
+            except Exception:
+                continue
+            scheduler.schedule("business.shipment", deliver_at, {"owner_id": owner_id},
+                               key=f"shipment:{owner_id}:{shipment['deliver_at']}", replace=False)
     
     # Economy is handled by the central Economy cog; file fallbacks are done inline where necessary.
     
@@ -1105,6 +1133,7 @@ class Business(commands.Cog):
         item_data = {"id": item_id, "name": item_name, "quantity": quantity, "price": 0, "emoji": emoji}
         success, msg = self.manager.add_shipment(owner_id, sender_id, item_data, eta_minutes)
         if success:
+            self._schedule_shipments(owner_id)
             embed = EmbedBuilder.create(
                 title=f"{Emojis.SUCCESS} Shipment Scheduled",
                 description=f"Scheduled delivery of **{quantity}x {emoji} {item_name}** to {owner.display_name} in {eta_minutes} minutes.",
@@ -1119,9 +1148,9 @@ class Business(commands.Cog):
             )
             await ctx.send(embed=embed)
 
-    @tasks.loop(minutes=60.0)
-    async def payroll_task(self):
+    async def _run_payroll(self, job):
         """Pay employee salaries hourly if possible."""
+        await self.bot.wait_until_ready()
         try:
             econ = self.bot.get_cog('Economy')
             for owner_id, business in list(self.manager.get_all_businesses().items()):
@@ -1204,52 +1233,55 @@ class Business(commands.Cog):
         except Exception:
             pass
 
-    @payroll_task.before_loop
-    async def before_payroll(self):
+    async def _deliver_shipments(self, job):
+        """Deliver this business's due shipments (every one that is due, so a
+        late or repeated job still leaves nothing behind)."""
         await self.bot.wait_until_ready()
-
-    @tasks.loop(minutes=5.0)
-    async def process_shipments_task(self):
-        """Background task to process due shipments."""
+        owner_id = job.data["owner_id"]
+        business = self.manager.get_user_business(owner_id)
+        if not business:
+            return
+        now = discord.utils.utcnow()
+        shipments = business.get('incoming_shipments', [])
+        delivered = []
+        for shipment in list(shipments):
+            try:
+                deliver_at = _parse_ts(shipment['deliver_at'])
+            except Exception:
+                continue
+            if deliver_at <= now:
+                item = shipment['item']
+                inv = business.get('inventory', {})
+                if item['id'] in inv:
+                    inv[item['id']]['quantity'] += item.get('quantity', 1)
+                else:
+                    inv[item['id']] = item
+                business['inventory'] = inv
+                shipments.remove(shipment)
+                delivered.append(shipment)
+        if not delivered:
+            return
+        self.manager.save_businesses()
+        # notify owner
         try:
-            now = discord.utils.utcnow()
-            changed = False
-            for owner_id, business in list(self.manager.get_all_businesses().items()):
-                shipments = business.get('incoming_shipments', [])
-                for shipment in list(shipments):
-                    try:
-                        deliver_at = _parse_ts(shipment['deliver_at'])
-                    except Exception:
-                        continue
-                    if deliver_at <= now:
-                        item = shipment['item']
-                        inv = business.get('inventory', {})
-                        if item['id'] in inv:
-                            inv[item['id']]['quantity'] += item.get('quantity', 1)
-                        else:
-                            inv[item['id']] = item
-                        business['inventory'] = inv
-                        shipments.remove(shipment)
-                        changed = True
-                        # notify owner
-                        try:
-                            user = await self.bot.fetch_user(int(owner_id))
-                            embed = EmbedBuilder.create(
-                                title=f"{Emojis.SUCCESS} Shipment Delivered!",
-                                description=f"Your business received {item.get('quantity',1)}x {item.get('emoji','📦')} {item.get('name')} from <@{shipment['from']}>.",
-                                color=Colors.SUCCESS
-                            )
-                            await user.send(embed=embed)
-                        except Exception:
-                            pass
-                if changed:
-                    self.manager.save_businesses()
+            user = self.bot.get_user(int(owner_id)) or await self.bot.fetch_user(int(owner_id))
         except Exception:
-            pass
+            return
+        for shipment in delivered:
+            item = shipment['item']
+            try:
+                embed = EmbedBuilder.create(
+                    title=f"{Emojis.SUCCESS} Shipment Delivered!",
+                    description=f"Your business received {item.get('quantity',1)}x {item.get('emoji','📦')} {item.get('name')} from <@{shipment['from']}>.",
+                    color=Colors.SUCCESS
+                )
+                await user.send(embed=embed)
+            except Exception:
+                pass
 
-    @tasks.loop(minutes=60.0)
-    async def passive_income_task(self):
+    async def _run_passive_income(self, job):
         """Periodic passive payouts based on shop stock value."""
+        await self.bot.wait_until_ready()
         try:
             econ = self.bot.get_cog('Economy')
             for owner_id, business in list(self.manager.get_all_businesses().items()):
@@ -1294,14 +1326,6 @@ class Business(commands.Cog):
         except Exception:
             pass
 
-    @process_shipments_task.before_loop
-    async def before_shipments(self):
-        await self.bot.wait_until_ready()
-
-    @passive_income_task.before_loop
-    async def before_passive(self):
-        await self.bot.wait_until_ready()
-
 async def setup(bot):
     await bot.add_cog(Business(bot))
 
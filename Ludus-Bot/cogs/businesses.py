@@ -1,5 +1,5 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 import json
 import os
@@ -62,9 +62,7 @@ class PassiveBusinesses(commands.Cog):
                 "upgrade_cost_multiplier": 1.5
             }
         }
-        
-        # Start passive income generation
-        self.generate_income.start()
+        # No timer: income accrues from timestamps and is settled when collected
     
     def load_data(self):
         """Load business data"""
@@ -101,21 +99,6 @@ class PassiveBusinesses(commands.Cog):
         multiplier = self.business_types[business_type]["upgrade_cost_multiplier"]
         return int(base_cost * (multiplier ** current_level))
     
-    def cog_unload(self):
-        """Stop task when cog unloads"""
-        self.generate_income.cancel()
-    
-    @tasks.loop(hours=1)
-    async def generate_income(self):
-        """Generate passive income every hour"""
-        # This happens automatically, income accumulates until collected
-        pass
-    
-    @generate_income.before_loop
-    async def before_generate_income(self):
-        """Wait until bot is ready"""
-        await self.bot.wait_until_ready()
-    
     @commands.group(name="mybusiness", aliases=['mybiz', 'passivebiz'], invoke_without_command=True)
     async def business(self, ctx):
         """View available passive income businesses"""
@@ -16,6 +16,7 @@ from collections import Counter
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from utils.card_visuals import create_hand_image, create_war_image
+from utils.render_service import render_service
 
 try:
     from utils.stat_hooks import us_inc as _inc, us_mg as _mg
@@ -229,7 +230,7 @@ class GoFishActionView(discord.ui.View):
             await interaction.response.send_message("🃏 Your hand is empty!", ephemeral=True)
             return
         deck = self.cog.get_user_deck(self.user_id)
-        img = await asyncio.to_thread(create_hand_image, [_fmt(c) for c in hand], "Your Hand", deck)
+        img = await render_service.render_file(create_hand_image, [_fmt(c) for c in hand], "Your Hand", deck)
         embed = discord.Embed(
             title="🃏 Your Hand",
             description=f"**{len(hand)} card(s)** — Books: **{len(state['player_books'])}** 📗",
@@ -310,7 +311,7 @@ class CardGames(commands.Cog):
         first_deck = _build_deck()
         first_p = first_deck.pop()
         first_b = first_deck.pop()
-        first_img = await asyncio.to_thread(
+        first_img = await render_service.render_file(
             create_war_image,
             _fmt(first_p), _fmt(first_b),
             challenger.display_name, opp_name,
@@ -359,7 +360,7 @@ class CardGames(commands.Cog):
             round_log.append(f"{icon} R{rnd}: **{p_card}** vs **{b_card}** — {result}")
 
             # Generate card image for this round
-            war_img = await asyncio.to_thread(
+            war_img = await render_service.render_file(
                 create_war_image,
                 _fmt(p_card), _fmt(b_card),
                 challenger.display_name, opp_name,
@@ -421,7 +422,7 @@ class CardGames(commands.Cog):
                 pass
 
         # Final summary image — last round's cards stay visible
-        final_img = await asyncio.to_thread(
+        final_img = await render_service.render_file(
             create_war_image,
             _fmt(p_card), _fmt(b_card),
             challenger.display_name, opp_name,
@@ -7,6 +7,8 @@ import chess
 import random
 from PIL import Image, ImageDraw, ImageFont
 import io
+from utils import chess_engine
+from utils.render_service import render_service
 try:
     from utils.stat_hooks import us_inc as _cc_inc, us_mg as _cc_mg
 except Exception:
@@ -60,7 +62,7 @@ class CheckersMoveModal(discord.ui.Modal, title="Make Your Move"):
         # Check game status
         is_over, status_text = get_checkers_game_status(self.game['board'], self.game['current_player'])
         
-        board_file = create_checkers_board_image(self.game['board'], last_move=(from_pos, to_pos))
+        board_file = await render_service.render_file(create_checkers_board_image, self.game['board'], last_move=(from_pos, to_pos))
         
         red_name = "🤖 BOT" if self.game['red_player'] == 'BOT_AI' else f"<@{self.game['red_player']}>"
         black_name = "🤖 BOT" if self.game['black_player'] == 'BOT_AI' else f"<@{self.game['black_player']}>"
@@ -173,7 +175,8 @@ class ChessMoveModal(discord.ui.Modal, title="Make Your Move"):
         is_over, status_text = get_game_status(self.game['board'])
         
         # Generate new board image
-        board_file = create_board_image(
+        board_file = await render_service.render_file(
+            create_board_image,
             self.game['board'],
             last_move=move,
             board_theme=self.game['board_theme'],
@@ -356,7 +359,13 @@ class ChessCog(commands.Cog):
     @app_commands.command(name="chess", description="Create a chess lobby")
     @app_commands.allowed_contexts(guilds=True, dms=False, private_channels=False)
     @app_commands.allowed_installs(guilds=True, users=True)
-    async def chess_command(self, interaction: discord.Interaction):
+    @app_commands.describe(difficulty="Bot strength (only used if the bot joins)")
+    @app_commands.choices(difficulty=[
+        app_commands.Choice(name="Easy", value="easy"),
+        app_commands.Choice(name="Medium", value="medium"),
+        app_commands.Choice(name="Hard", value="hard"),
+    ])
+    async def chess_command(self, interaction: discord.Interaction, difficulty: str = "easy"):
         """Command to start a chess game"""
         uid = str(interaction.user.id)
         
@@ -372,7 +381,8 @@ class ChessCog(commands.Cog):
             'hostId': uid,
             'players': [uid],
             'messageId': None,
-            'last_activity': time.time()
+            'last_activity': time.time(),
+            'bot_difficulty': difficulty
         }
         
         self.bot.active_lobbies[lobby_id] = lobby
@@ -538,14 +548,15 @@ class ChessCog(commands.Cog):
             'last_activity': time.time(),
             'move_history': [],
             'board_theme': self.get_player_chess_theme(interaction.guild.id if interaction.guild else None, lobby['players'][0]),
-            'piece_set': 'classic'
+            'piece_set': 'classic',
+            'bot_difficulty': lobby.get('bot_difficulty', 'easy')
         }
         
         self.bot.active_games[game_id] = game
         self.bot.active_lobbies.pop(lobby_id, None)
         
         # Generate board image
-        board_file = create_board_image(board, board_theme=game['board_theme'])
+        board_file = await render_service.render_file(create_board_image, board, board_theme=game['board_theme'])
         
         white_name = "🤖 BOT" if game['white_player'] == 'BOT_AI' else f"<@{game['white_player']}>"
         black_name = "🤖 BOT" if game['black_player'] == 'BOT_AI' else f"<@{game['black_player']}>"
@@ -730,7 +741,8 @@ class ChessCog(commands.Cog):
         
         if accept:
             # Accept draw - end game
-            board_file = create_board_image(
+            board_file = await render_service.render_file(
+                create_board_image,
                 game['board'],
                 board_theme=game['board_theme'],
                 piece_set=game['piece_set']
@@ -819,7 +831,8 @@ class ChessCog(commands.Cog):
         is_over, status_text = get_game_status(game['board'])
         
         # Generate new board image
-        board_file = create_board_image(
+        board_file = await render_service.render_file(
+            create_board_image,
             game['board'],
             last_move=move,
             board_theme=game['board_theme'],
@@ -914,7 +927,15 @@ class ChessCog(commands.Cog):
     async def play_bot_move(self, channel, game_id, game):
         """Bot makes a move"""
         
-        move = get_bot_move(game['board'], difficulty='easy')
+        difficulty = game.get('bot_difficulty', 'easy')
+        budget = chess_engine.DIFFICULTY_LEVELS.get(difficulty, chess_engine.DIFFICULTY_LEVELS['easy'])['time']
+        # Search in the worker pool so a deep search never blocks the event loop
+        try:
+            move = await render_service.run(get_bot_move, game['board'], difficulty, timeout=budget + 10)
+        except Exception as e:
+            # Timeout / broken pool: search in-process (in a thread) so the game never stalls on the bot
+            print(f"[Chess] Bot search in worker failed ({e}); searching in a thread")
+            move = await asyncio.to_thread(get_bot_move, game['board'].copy(), difficulty)
         
         if not move:
             return
@@ -931,7 +952,8 @@ class ChessCog(commands.Cog):
         is_over, status_text = get_game_status(game['board'])
         
         # Generate new board image
-        board_file = create_board_image(
+        board_file = await render_service.render_file(
+            create_board_image,
             game['board'],
             last_move=move,
             board_theme=game['board_theme'],
@@ -1216,7 +1238,7 @@ class ChessCog(commands.Cog):
             self.bot.active_games[game_id] = game
             self.bot.active_lobbies.pop(lobby_id, None)
             
-            board_file = create_checkers_board_image(board)
+            board_file = await render_service.render_file(create_checkers_board_image, board)
             
             red_name = "🤖 BOT" if game['red_player'] == 'BOT_AI' else f"<@{game['red_player']}>"
             black_name = "🤖 BOT" if game['black_player'] == 'BOT_AI' else f"<@{game['black_player']}>"
@@ -1345,7 +1367,7 @@ class ChessCog(commands.Cog):
         
         is_over, status_text = get_checkers_game_status(game['board'], game['current_player'])
         
-        board_file = create_checkers_board_image(game['board'], last_move=(from_pos, to_pos))
+        board_file = await render_service.render_file(create_checkers_board_image, game['board'], last_move=(from_pos, to_pos))
         
         red_name = "🤖 BOT" if game['red_player'] == 'BOT_AI' else f"<@{game['red_player']}>"
         black_name = "🤖 BOT" if game['black_player'] == 'BOT_AI' else f"<@{game['black_player']}>"
@@ -1423,98 +1445,95 @@ PIECE_SETS = {
 }
 
 
-def create_board_image(board: chess.Board, last_move=None, board_theme='classic', piece_set='classic'):
-    """
-    Generate chess board image with current positions
-    
-    Args:
-        board: chess.Board object
-        last_move: Last move (chess.Move) to highlight
-        board_theme: Board theme (classic, blue, green, etc.)
-        piece_set: Piece set (classic, modern, fantasy)
+# ==================== BOARD RENDER CACHE ====================
+# Fonts, outlined piece sprites, empty boards and highlight tiles are built
+# once per process, so a board render is one copy of the cached empty board
+# plus at most 2 highlight and 32 piece pastes.
+
+CHESS_SQUARE_SIZE = 80
+CHESS_BOARD_MARGIN = 30
+PIECE_FONT_NAMES = ("seguisym.ttf", "SEGUISYM.TTF", "segoeuisymbol.ttf", "DejaVuSans.ttf", "arial.ttf", "Arial.ttf")
+LABEL_FONT_NAMES = ("arial.ttf",)
+
+_font_cache = {}
+_piece_sprite_cache = {}
+_empty_board_cache = {}
+_highlight_tile_cache = {}
+
+
+def _load_font(font_names, size):
+    """First font in font_names that loads (default font otherwise), cached per process"""
+    key = (font_names, size)
+    font = _font_cache.get(key)
+    if font is None:
+        for font_name in font_names:
+            try:
+                font = ImageFont.truetype(font_name, size)
+                break
+            except Exception:
+                continue
+        if font is None:
+            font = ImageFont.load_default()
+        _font_cache[key] = font
+    return font
+
+
+def _piece_sprite(symbol, piece_set='classic', square_size=CHESS_SQUARE_SIZE):
+    """RGBA sprite of one outlined piece glyph, padded so the outline never clips.
     
-    Returns:
-        discord.File with board image
+    Returns (sprite, pad): paste at (square_x - pad, square_y - pad).
     """
-    # Use PIL with text pieces
-    square_size = 80
+    key = (symbol, piece_set, square_size)
+    cached = _piece_sprite_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    pad = square_size // 8
+    font = _load_font(PIECE_FONT_NAMES, square_size * 4 // 5)
+    piece_char = PIECE_SYMBOLS.get(symbol, symbol)
+    sprite = Image.new('RGBA', (square_size + 2 * pad, square_size + 2 * pad), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
+    
+    bbox = draw.textbbox((0, 0), piece_char, font=font)
+    text_x = pad + (square_size - (bbox[2] - bbox[0])) // 2
+    text_y = pad + (square_size - (bbox[3] - bbox[1])) // 2 - 5
+    
+    # White pieces: bright fill with dark outline; black pieces: dark fill with bright outline
+    if symbol.isupper():
+        outline_color, fill_color = (40, 40, 40), (255, 255, 255)
+    else:
+        outline_color, fill_color = (220, 220, 220), (0, 0, 0)
+    for dx in (-2, -1, 0, 1, 2):
+        for dy in (-2, -1, 0, 1, 2):
+            if dx != 0 or dy != 0:
+                draw.text((text_x + dx, text_y + dy), piece_char, fill=outline_color, font=font)
+    draw.text((text_x, text_y), piece_char, fill=fill_color, font=font)
+    
+    _piece_sprite_cache[key] = (sprite, pad)
+    return sprite, pad
+
+
+def _empty_board(board_theme, square_size=CHESS_SQUARE_SIZE, margin=CHESS_BOARD_MARGIN):
+    """Squares and coordinate labels for a theme (shared - copy before drawing on it)"""
+    key = (board_theme, square_size, margin)
+    img = _empty_board_cache.get(key)
+    if img is not None:
+        return img
+    
     board_size = 8 * square_size
-    margin = 30
     img_size = board_size + 2 * margin
-    
     img = Image.new('RGB', (img_size, img_size), color=(50, 50, 50))
     draw = ImageDraw.Draw(img)
     
     theme = BOARD_THEMES.get(board_theme, BOARD_THEMES['classic'])
-    light_color = theme['light']
-    dark_color = theme['dark']
-    
     for row in range(8):
         for col in range(8):
             x = margin + col * square_size
             y = margin + row * square_size
-            
-            is_light = (row + col) % 2 == 0
-            color = light_color if is_light else dark_color
-            
-            if last_move:
-                square = chess.square(col, 7 - row)
-                if square == last_move.from_square or square == last_move.to_square:
-                    color = tuple(int(c * 0.7 + 255 * 0.3) for c in color)
-            
+            color = theme['light'] if (row + col) % 2 == 0 else theme['dark']
             draw.rectangle([x, y, x + square_size, y + square_size], fill=color)
-            
-            piece = board.piece_at(chess.square(col, 7 - row))
-            if piece:
-                # Use Unicode chess emoji
-                symbol = piece.symbol()
-                piece_char = PIECE_SYMBOLS.get(symbol, symbol)
-                
-                # Try multiple fonts for chess symbols
-                font = None
-                font_size = 64
-                for font_name in ["seguisym.ttf", "SEGUISYM.TTF", "segoeuisymbol.ttf", "DejaVuSans.ttf", "arial.ttf", "Arial.ttf"]:
-                    try:
-                        font = ImageFont.truetype(font_name, font_size)
-                        break
-                    except:
-                        continue
-                
-                if font is None:
-                    font = ImageFont.load_default()
-                
-                bbox = draw.textbbox((0, 0), piece_char, font=font)
-                text_width = bbox[2] - bbox[0]
-                text_height = bbox[3] - bbox[1]
-                text_x = x + (square_size - text_width) // 2
-                text_y = y + (square_size - text_height) // 2 - 5
-                
-                # White pieces: bright color with dark outline for visibility
-                # Black pieces: dark color with bright outline for visibility
-                if piece.color == chess.WHITE:
-                    # Draw outline (dark stroke around white pieces)
-                    outline_color = (40, 40, 40)
-                    for dx in [-2, -1, 0, 1, 2]:
-                        for dy in [-2, -1, 0, 1, 2]:
-                            if dx != 0 or dy != 0:
-                                draw.text((text_x + dx, text_y + dy), piece_char, fill=outline_color, font=font)
-                    # Draw piece (bright white fill)
-                    draw.text((text_x, text_y), piece_char, fill=(255, 255, 255), font=font)
-                else:
-                    # Draw outline (light stroke around black pieces)
-                    outline_color = (220, 220, 220)
-                    for dx in [-2, -1, 0, 1, 2]:
-                        for dy in [-2, -1, 0, 1, 2]:
-                            if dx != 0 or dy != 0:
-                                draw.text((text_x + dx, text_y + dy), piece_char, fill=outline_color, font=font)
-                    # Draw piece (black fill)
-                    draw.text((text_x, text_y), piece_char, fill=(0, 0, 0), font=font)
-    
-    try:
-        label_font = ImageFont.truetype("arial.ttf", 20)
-    except:
-        label_font = ImageFont.load_default()
     
+    label_font = _load_font(LABEL_FONT_NAMES, 20)
     for i in range(8):
         letter = chr(ord('a') + i)
         x = margin + i * square_size + square_size // 2 - 5
@@ -1526,8 +1545,60 @@ def create_board_image(board: chess.Board, last_move=None, board_theme='classic'
         draw.text((5, y), number, fill='white', font=label_font)
         draw.text((img_size - margin + 5, y), number, fill='white', font=label_font)
     
+    _empty_board_cache[key] = img
+    return img
+
+
+def _highlight_tile(board_theme, is_light, square_size=CHESS_SQUARE_SIZE):
+    """Last-move highlight square: the theme color blended 30% towards white"""
+    key = (board_theme, is_light, square_size)
+    tile = _highlight_tile_cache.get(key)
+    if tile is None:
+        theme = BOARD_THEMES.get(board_theme, BOARD_THEMES['classic'])
+        color = theme['light'] if is_light else theme['dark']
+        color = tuple(int(c * 0.7 + 255 * 0.3) for c in color)
+        tile = Image.new('RGB', (square_size + 1, square_size + 1), color)
+        _highlight_tile_cache[key] = tile
+    return tile
+
+
+def render_board(board: chess.Board, last_move=None, board_theme='classic', piece_set='classic'):
+    """Compose the board as a PIL image from the cached empty board, highlight tiles and piece sprites"""
+    square_size = CHESS_SQUARE_SIZE
+    margin = CHESS_BOARD_MARGIN
+    img = _empty_board(board_theme).copy()
+    
+    if last_move:
+        for square in (last_move.from_square, last_move.to_square):
+            col, row = chess.square_file(square), 7 - chess.square_rank(square)
+            tile = _highlight_tile(board_theme, (row + col) % 2 == 0)
+            img.paste(tile, (margin + col * square_size, margin + row * square_size))
+    
+    for square, piece in board.piece_map().items():
+        col, row = chess.square_file(square), 7 - chess.square_rank(square)
+        sprite, pad = _piece_sprite(piece.symbol(), piece_set)
+        img.paste(sprite, (margin + col * square_size - pad, margin + row * square_size - pad), sprite)
+    
+    return img
+
+
+def create_board_image(board: chess.Board, last_move=None, board_theme='classic', piece_set='classic'):
+    """
+    Generate chess board image with current positions
+    
+    Args:
+        board: chess.Board object
+        last_move: Last move (chess.Move) to highlight
+        board_theme: Board theme (classic, blue, green, etc.)
+        piece_set: Piece set (classic, modern, fantasy)
+    
+    Returns:
+        discord.File with board image
+    """
+    img = render_board(board, last_move, board_theme, piece_set)
+    
     buffer = io.BytesIO()
-    img.save(buffer, format='PNG')
+    img.save(buffer, format='PNG', compress_level=1)  # fast zlib level: encode dominated the render
     buffer.seek(0)
     
     return discord.File(buffer, filename='chess_board.png')
@@ -1580,76 +1651,34 @@ def parse_move(board: chess.Board, move_str: str):
     return None
 
 
-def get_bot_move(board: chess.Board, difficulty='easy'):
+def get_bot_move(board: chess.Board, difficulty='medium'):
     """
-    Simple AI for bot
+    Pick the bot's move with the alpha-beta engine (utils/chess_engine.py)
     
     Args:
         board: Current board state
-        difficulty: Difficulty level (easy, medium, hard)
+        difficulty: Difficulty level (easy, medium, hard) - see chess_engine.DIFFICULTY_LEVELS
     
     Returns:
-        chess.Move
+        chess.Move, or None if there are no legal moves
     """
-    
-    legal_moves = list(board.legal_moves)
-    if not legal_moves:
-        return None
-    
-    if difficulty == 'easy':
-        # Random move
-        return random.choice(legal_moves)
-    
-    # For medium/hard: choose best move (simple heuristic)
-    best_move = None
-    best_score = -999999
-    
-    for move in legal_moves:
-        board.push(move)
-        score = evaluate_board(board)
-        board.pop()
-        
-        if score > best_score:
-            best_score = score
-            best_move = move
-    
-    return best_move or random.choice(legal_moves)
+    return chess_engine.choose_move(board, difficulty)
 
 
 def evaluate_board(board: chess.Board):
     """
-    Simple position evaluation
+    Position evaluation in centipawns (material + piece-square tables)
     
     Returns:
         int: Score (positive = white advantage, negative = black advantage)
     """
     if board.is_checkmate():
-        return -999999 if board.turn == chess.WHITE else 999999
+        return -chess_engine.MATE if board.turn == chess.WHITE else chess_engine.MATE
     
     if board.is_stalemate() or board.is_insufficient_material():
         return 0
     
-    # Piece values
-    piece_values = {
-        chess.PAWN: 1,
-        chess.KNIGHT: 3,
-        chess.BISHOP: 3,
-        chess.ROOK: 5,
-        chess.QUEEN: 9,
-        chess.KING: 0
-    }
-    
-    score = 0
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece:
-            value = piece_values[piece.piece_type]
-            if piece.color == chess.WHITE:
-                score += value
-            else:
-                score -= value
-    
-    return score
+    return chess_engine.evaluate(board)
 
 
 def get_game_status(board: chess.Board):
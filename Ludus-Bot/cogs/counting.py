@@ -1,12 +1,31 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
+import asyncio
 import json
 import os
+import threading
+from collections import OrderedDict
 from typing import Optional
 from leaderboard_manager import leaderboard_manager
 
+# Accepted numbers remembered per guild, for the "deleted their number" notice
+RECENT_NUMBERS_PER_GUILD = 100
+# Seconds between write-behind flushes of the counting files and server peaks
+FLUSH_INTERVAL = 10
+
+
 class Counting(commands.Cog):
+    """Counting channels.
+
+    State lives in memory (count_data / user_counts) and is written behind
+    every FLUSH_INTERVAL seconds in a thread, so a busy channel costs no disk
+    I/O per message.  Each number is judged by _advance(), which never awaits:
+    messages in a channel are decided strictly in the order they arrive, and
+    when two users race the same number the first one wins and the second is
+    rejected - Discord calls (delete, react, warn) happen after the decision.
+    """
+
     def __init__(self, bot):
         self.bot = bot
         _data_dir = os.getenv("RENDER_DISK_PATH", "data")
@@ -34,10 +53,29 @@ class Counting(commands.Cog):
             5000, 10000, 25000
         ]
         
+        # guild_id -> OrderedDict(message_id -> {number, user_id}), newest last, bounded
         self.message_numbers = {}
         
         # Track user counts for rewards (user_id -> {guild_id: count})
         self.user_counts = self.load_user_counts()
+
+        # Write-behind state: what changed since the last flush
+        self.data_dirty = False
+        self.counts_dirty = False
+        self.pending_peaks = {}  # guild_id -> (peak, server name)
+        self._write_lock = threading.Lock()
+        self._write_seq = 0
+        self._written_seq = {}
+        self._flush_lock = asyncio.Lock()
+        self.flush_task.start()
+
+    def cog_unload(self):
+        self.flush_task.cancel()
+        # Final synchronous flush so nothing accepted is lost
+        self.save_data()
+        if self.counts_dirty:
+            self.save_user_counts()
+        self._flush_peaks()
     
     def load_user_counts(self):
         """Load user count tracking for rewards"""
@@ -50,8 +88,8 @@ class Counting(commands.Cog):
     def save_user_counts(self):
         """Save user count tracking"""
         counts_file = os.path.join(self.data_dir, "counting_user_counts.json")
-        with open(counts_file, "w") as f:
-            json.dump(self.user_counts, f, indent=4)
+        self.counts_dirty = False
+        self._write_json(counts_file, json.dumps(self.user_counts, indent=4), self._next_seq())
 
     def load_data(self):
         if os.path.exists(self.file_path):
@@ -61,8 +99,92 @@ class Counting(commands.Cog):
             self.count_data = {}
 
     def save_data(self):
-        with open(self.file_path, "w") as f:
-            json.dump(self.count_data, f, indent=4)
+        self.data_dirty = False
+        self._write_json(self.file_path, json.dumps(self.count_data, indent=4), self._next_seq())
+
+    # ── Write-behind persistence ─────────────────────────────────────────────
+
+    def _next_seq(self):
+        self._write_seq += 1
+        return self._write_seq
+
+    def _write_json(self, path, payload, seq):
+        """Atomic write; a snapshot older than one already written is dropped."""
+        with self._write_lock:
+            if seq < self._written_seq.get(path, 0):
+                return
+            tmp = path + ".tmp"
+            with open(tmp, "w") as f:
+                f.write(payload)
+            os.replace(tmp, path)
+            self._written_seq[path] = seq
+
+    def _flush_peaks(self):
+        """One leaderboard_stats.json write for every peak reached since the last flush."""
+        if not self.pending_peaks:
+            return
+        peaks, self.pending_peaks = self.pending_peaks, {}
+        for guild_id, (number, server_name) in peaks.items():
+            leaderboard_manager.update_peak(guild_id, "counting_peak", number, server_name=server_name, save=False)
+        leaderboard_manager.save_stats()
+
+    async def flush(self):
+        """Write whatever changed; snapshots are taken here, the disk writes run in a thread."""
+        async with self._flush_lock:
+            writes = []
+            if self.data_dirty:
+                self.data_dirty = False
+                writes.append((self.file_path, json.dumps(self.count_data, indent=4), self._next_seq()))
+            if self.counts_dirty:
+                self.counts_dirty = False
+                counts_file = os.path.join(self.data_dir, "counting_user_counts.json")
+                writes.append((counts_file, json.dumps(self.user_counts, indent=4), self._next_seq()))
+            self._flush_peaks()
+            if not writes:
+                return
+            try:
+                await asyncio.to_thread(lambda: [self._write_json(*w) for w in writes])
+            except Exception as e:
+                print(f"[Counting] Failed to save counting data: {e}")
+                self.data_dirty = self.counts_dirty = True
+
+    @tasks.loop(seconds=FLUSH_INTERVAL)
+    async def flush_task(self):
+        await self.flush()
+
+    # ── Counting ─────────────────────────────────────────────────────────────
+
+    def _advance(self, guild_id, server_data, message, number):
+        """Judge one number and apply it if valid. Never awaits, so a channel is decided in order.
+
+        Returns ("double" | "wrong" | "ok", expected, user_count).
+        """
+        expected = server_data.get("current_count", 0) + 1
+        if message.author.id == server_data.get("last_user"):
+            return "double", expected, 0
+        if number != expected:
+            return "wrong", expected, 0
+
+        server_data["current_count"] = number
+        server_data["last_user"] = message.author.id
+        self.data_dirty = True
+
+        # Coalesced peak update for the server leaderboard (written on the next flush)
+        peak = self.pending_peaks.get(message.guild.id)
+        if peak is None or number > peak[0]:
+            self.pending_peaks[message.guild.id] = (number, message.guild.name)
+
+        recent = self.message_numbers.setdefault(guild_id, OrderedDict())
+        recent[message.id] = {"number": number, "user_id": message.author.id}
+        while len(recent) > RECENT_NUMBERS_PER_GUILD:
+            recent.popitem(last=False)
+
+        # Track user counts
+        user_id_str = str(message.author.id)
+        per_guild = self.user_counts.setdefault(user_id_str, {})
+        per_guild[guild_id] = per_guild.get(guild_id, 0) + 1
+        self.counts_dirty = True
+        return "ok", expected, per_guild[guild_id]
 
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -87,10 +209,9 @@ class Counting(commands.Cog):
             return await message.delete()
 
         server_data = self.count_data[guild_id]
-        expected = server_data.get("current_count", 0) + 1
-        last_user = server_data.get("last_user")
+        verdict, expected, user_count = self._advance(guild_id, server_data, message, number)
 
-        if message.author.id == last_user:
+        if verdict == "double":
             await message.delete()
             warning = await message.channel.send(
                 f"❌ {message.author.mention}, you can't count twice in a row!"
@@ -98,7 +219,7 @@ class Counting(commands.Cog):
             await warning.delete(delay=5)
             return
 
-        if number != expected:
+        if verdict == "wrong":
             await message.delete()
             warning = await message.channel.send(
                 f"❌ Wrong number! Expected {expected}, got {number}."
@@ -106,30 +227,6 @@ class Counting(commands.Cog):
             await warning.delete(delay=5)
             return
 
-        server_data["current_count"] = number
-        server_data["last_user"] = message.author.id
-        self.save_data()
-
-        # Update global server peak for leaderboard
-        leaderboard_manager.update_peak(message.guild.id, "counting_peak", number, server_name=message.guild.name)
-
-        self.message_numbers[message.id] = {
-            "number": number,
-            "user_id": message.author.id,
-            "guild_id": message.guild.id
-        }
-        
-        # Track user counts
-        user_id_str = str(message.author.id)
-        if user_id_str not in self.user_counts:
-            self.user_counts[user_id_str] = {}
-        if guild_id not in self.user_counts[user_id_str]:
-            self.user_counts[user_id_str][guild_id] = 0
-        
-        self.user_counts[user_id_str][guild_id] += 1
-        user_count = self.user_counts[user_id_str][guild_id]
-        self.save_user_counts()
-        
         # Give PsyCoins: 2 coins per 4 counts (0.5 per count)
         coins_earned = 0
         if user_count % 4 == 0:
@@ -177,18 +274,19 @@ class Counting(commands.Cog):
 
     @commands.Cog.listener()
     async def on_message_delete(self, message):
-        if message.id not in self.message_numbers:
+        guild = message.guild
+        if not guild:
+            return
+
+        guild_id = str(guild.id)
+        recent = self.message_numbers.get(guild_id)
+        if not recent or message.id not in recent:
             return
 
-        msg_data = self.message_numbers[message.id]
+        msg_data = recent.pop(message.id)
         number = msg_data["number"]
         user_id = msg_data["user_id"]
-        
-        guild = self.bot.get_guild(msg_data["guild_id"])
-        if not guild:
-            return
 
-        guild_id = str(guild.id)
         if guild_id not in self.count_data:
             return
 
@@ -209,8 +307,6 @@ class Counting(commands.Cog):
         except:
             pass
 
-        del self.message_numbers[message.id]
-
     async def give_milestone_role(self, message, number):
         guild = message.guild
         role_name = f"Counter {number}"
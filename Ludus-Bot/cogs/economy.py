@@ -12,6 +12,11 @@ from utils import user_storage
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.embed_styles import EmbedBuilder, Colors, Emojis
 from utils import user_storage
+from utils.journal import TransactionJournal
+from utils.leaderboard_index import leaderboard_index
+
+# Compact the journal into economy.json/inventory.json once it holds this many records
+COMPACT_AFTER_RECORDS = 5000
 
 
 
@@ -108,23 +113,42 @@ class Economy(commands.Cog):
         print(f"[ECONOMY] Economy file: {self.economy_file}")
         print(f"[ECONOMY] Inventory file: {self.inventory_file}")
         
+        # economy.json / inventory.json are the last compacted snapshot;
+        # the journal holds every journaled change made since then.
         self.economy_data = self.load_economy()
         self.inventory_data = self.load_inventory()
+        self.journal = TransactionJournal(f"{self.economy_file}.journal")
+        replayed = 0
+        for record in self.journal.replay():
+            self._apply_record(record)
+            replayed += 1
+        if replayed:
+            print(f"[ECONOMY] Replayed {replayed} journal records")
+        # The leaderboard snapshot can be older than the journal - bring balances up to date
+        accounts = {uid: d for uid, d in self.economy_data.items() if isinstance(d, dict)}
+        leaderboard_index.set_many(
+            "coins",
+            {uid: d.get("balance") for uid, d in accounts.items()},
+            names={uid: d.get("username") for uid, d in accounts.items()},
+        )
         
         # Concurrency safety locks
         self.economy_lock = asyncio.Lock()
         self.inventory_lock = asyncio.Lock()
         
-        # Dirty flags to batch saves
+        # Dirty flags: set by direct edits to economy_data/inventory_data that
+        # were not journaled; they force a snapshot on the next save.
         self.economy_dirty = False
         self.inventory_dirty = False
         
-        # Autosave task to ensure data is saved every 5 minutes
+        # Autosave task (compaction every 5 minutes) + journal group commit
         self.autosave_task = None
+        self.journal_task = None
     
     async def cog_load(self):
-        """Called when cog is loaded - start autosave"""
+        """Called when cog is loaded - start autosave and journal flusher"""
         self.autosave_task = asyncio.create_task(self.autosave_loop())
+        self.journal_task = asyncio.create_task(self.journal.run())
         
         # Items available in the shop
         self.shop_items = {
@@ -151,44 +175,98 @@ class Economy(commands.Cog):
                 return json.load(f)
         return {}
 
-    async def save_economy(self):
-        """Save economy data with error handling, backup, and concurrency safety"""
-        if not self.economy_dirty:
-            return  # No changes to save
-        
+    @staticmethod
+    def _new_account() -> dict:
+        return {
+            "balance": 100,  # Starting balance
+            "total_earned": 100,
+            "total_spent": 0,
+            "last_daily": None,
+            "daily_streak": 0,
+            "active_boosts": {},
+            "username": None  # Cache username for leaderboard
+        }
+
+    # ==================== JOURNAL ====================
+    # Record types (absolute values, so replay is idempotent):
+    #   {"t": "a", "u": user_key, "f": {field: value, ...}}   account fields
+    #   {"t": "i", "u": user_key, "k": item_id, "v": qty}      inventory slot (None = removed)
+
+    def _apply_record(self, record: dict):
+        """Apply one journal record to the in-memory state (used on replay)."""
+        user_key = record.get("u")
+        if record.get("t") == "a":
+            account = self.economy_data.setdefault(user_key, self._new_account())
+            account.update(record.get("f", {}))
+        elif record.get("t") == "i":
+            inventory = self.inventory_data.setdefault(user_key, {})
+            if record.get("v") is None:
+                inventory.pop(record.get("k"), None)
+            else:
+                inventory[record.get("k")] = record["v"]
+
+    def _journal_account(self, user_key: str, *fields: str):
+        """Journal the current value of the given account fields (all fields if none given)."""
+        account = self.economy_data[user_key]
+        keys = fields or tuple(account.keys())
+        self.journal.append({"t": "a", "u": user_key, "f": {k: account.get(k) for k in keys}})
+        if "balance" in keys:
+            leaderboard_index.set("coins", user_key, account.get("balance"), username=account.get("username"))
+
+    def _journal_item(self, user_key: str, item_id: str):
+        """Journal the current quantity of one inventory slot."""
+        self.journal.append({"t": "i", "u": user_key, "k": item_id,
+                             "v": self.inventory_data.get(user_key, {}).get(item_id)})
+
+    async def save_economy(self, force: bool = False):
+        """Make pending economy changes durable.
+
+        Journaled changes only need a journal flush. A full snapshot
+        (compaction) is written when there are un-journaled direct edits,
+        when the journal has grown past COMPACT_AFTER_RECORDS, or on force.
+        """
+        await asyncio.to_thread(self.journal.flush)
+        if (force and self.journal.records) or self.economy_dirty or self.inventory_dirty \
+                or self.journal.records >= COMPACT_AFTER_RECORDS:
+            await self._compact()
+
+    async def _compact(self):
+        """Fold the journal into economy.json + inventory.json and start a fresh segment."""
         async with self.economy_lock:
             try:
-                # Create backup before saving
-                if os.path.exists(self.economy_file):
-                    backup_file = f"{self.economy_file}.backup"
-                    with open(self.economy_file, 'r') as f:
-                        backup_data = f.read()
-                    with open(backup_file, 'w') as f:
-                        f.write(backup_data)
-                
-                # Save with atomic write (write to temp, then rename)
-                temp_file = f"{self.economy_file}.tmp"
-                with open(temp_file, 'w') as f:
-                    json.dump(self.economy_data, f, indent=2)
-                
-                # Atomic rename (works on all platforms)
-                if os.path.exists(self.economy_file):
-                    os.replace(temp_file, self.economy_file)
-                else:
-                    os.rename(temp_file, self.economy_file)
-                
+                # Rotate and serialise without yielding, so the snapshot
+                # covers exactly the records in the rotated segment.
+                self.journal.rotate()
+                economy_json = json.dumps(self.economy_data, separators=(",", ":"))
+                inventory_json = json.dumps(self.inventory_data, separators=(",", ":"))
+                if self.economy_dirty:
+                    # Direct balance edits (gambling bets, owner commands) bypass the journal
+                    leaderboard_index.set_many("coins", {
+                        uid: d.get("balance") for uid, d in self.economy_data.items() if isinstance(d, dict)
+                    })
                 self.economy_dirty = False
-                print(f"[ECONOMY] Saved {len(self.economy_data)} user balances")
+                self.inventory_dirty = False
+
+                def _write():
+                    for path, payload in ((self.economy_file, economy_json),
+                                          (self.inventory_file, inventory_json)):
+                        temp_file = f"{path}.tmp"
+                        with open(temp_file, 'w') as f:
+                            f.write(payload)
+                            f.flush()
+                            os.fsync(f.fileno())
+                        # Atomic rename (works on all platforms)
+                        os.replace(temp_file, path)
+                    self.journal.discard_rotated()
+
+                await asyncio.to_thread(_write)
+                print(f"[ECONOMY] Compacted {len(self.economy_data)} user balances")
             except Exception as e:
+                # The rotated segment is kept and replayed on next start
                 print(f"❌ ERROR saving economy data: {e}")
                 import traceback
                 traceback.print_exc()
-                # Try to restore from backup if save failed
-                backup_file = f"{self.economy_file}.backup"
-                if os.path.exists(backup_file):
-                    print(f"[ECONOMY] Restoring from backup...")
-                    with open(backup_file, 'r') as f:
-                        self.economy_data = json.load(f)
+                self.economy_dirty = True
 
     def load_inventory(self):
         if os.path.exists(self.inventory_file):
@@ -196,27 +274,9 @@ class Economy(commands.Cog):
                 return json.load(f)
         return {}
 
-    async def save_inventory(self):
-        """Save inventory data with error handling and concurrency safety"""
-        if not self.inventory_dirty:
-            return  # No changes to save
-        
-        async with self.inventory_lock:
-            try:
-                temp_file = f"{self.inventory_file}.tmp"
-                with open(temp_file, 'w') as f:
-                    json.dump(self.inventory_data, f, indent=2)
-                
-                if os.path.exists(self.inventory_file):
-                    os.replace(temp_file, self.inventory_file)
-                else:
-                    os.rename(temp_file, self.inventory_file)
-                
-                self.inventory_dirty = False
-            except Exception as e:
-                print(f"❌ ERROR saving inventory data: {e}")
-                import traceback
-                traceback.print_exc()
+    async def save_inventory(self, force: bool = False):
+        """Inventory shares the economy journal and snapshot cycle"""
+        await self.save_economy(force)
     
     async def autosave_loop(self):
         """Automatically save economy data every 5 minutes"""
@@ -224,39 +284,32 @@ class Economy(commands.Cog):
         while not self.bot.is_closed():
             await asyncio.sleep(300)  # 5 minutes
             print("[ECONOMY] Auto-saving economy data...")
-            await self.save_economy()
-            await self.save_inventory()
+            await self.save_economy(force=True)
     
     def cog_unload(self):
         """Ensure data is saved when cog unloads"""
         print("[ECONOMY] Saving data before cog unload...")
-        # Note: Can't await in sync method, but Discord.py handles this
-        # The bot will wait for async cleanup
-        if hasattr(self, 'autosave_task'):
-            self.autosave_task.cancel()
-        # Schedule final save
+        for task in (self.autosave_task, self.journal_task):
+            if task:
+                task.cancel()
+        # Journaled changes are durable as soon as this returns
+        try:
+            self.journal.flush()
+        except Exception as e:
+            print(f"❌ ERROR flushing economy journal: {e}")
+        # Schedule final compaction
         asyncio.create_task(self._final_save())
     
     async def _final_save(self):
         """Final save before unload"""
-        await self.save_economy()
-        await self.save_inventory()
+        await self.save_economy(force=True)
 
     def get_balance(self, user_id: int) -> int:
         """Get user's PsyCoin balance"""
         user_key = str(user_id)
         if user_key not in self.economy_data:
-            self.economy_data[user_key] = {
-                "balance": 100,  # Starting balance
-                "total_earned": 100,
-                "total_spent": 0,
-                "last_daily": None,
-                "daily_streak": 0,
-                "active_boosts": {},
-                "username": None  # Cache username for leaderboard
-            }
-            self.economy_dirty = True
-            asyncio.create_task(self.save_economy())
+            self.economy_data[user_key] = self._new_account()
+            self._journal_account(user_key)
         return self.economy_data[user_key]["balance"]
 
     def add_coins(self, user_id: int, amount: int, reason: str = "transaction"):
@@ -270,7 +323,7 @@ class Economy(commands.Cog):
         
         self.economy_data[user_key]["balance"] += amount
         self.economy_data[user_key]["total_earned"] += amount
-        self.economy_dirty = True
+        self._journal_account(user_key, "balance", "total_earned")
         return self.economy_data[user_key]["balance"]
 
     def remove_coins(self, user_id: int, amount: int) -> bool:
@@ -281,7 +334,7 @@ class Economy(commands.Cog):
         if balance >= amount:
             self.economy_data[user_key]["balance"] -= amount
             self.economy_data[user_key]["total_spent"] += amount
-            self.economy_dirty = True
+            self._journal_account(user_key, "balance", "total_spent")
             return True
         return False
 
@@ -299,7 +352,7 @@ class Economy(commands.Cog):
             else:
                 # Remove expired boost
                 del boosts[boost_type]
-                self.economy_dirty = True
+                self._journal_account(user_key, "active_boosts")
         return False
 
     def add_boost(self, user_id: int, boost_type: str, duration_hours: int, extend: bool = False):
@@ -329,15 +382,14 @@ class Economy(commands.Cog):
             # New boost or replace existing
             new_expiry = discord.utils.utcnow() + timedelta(hours=duration_hours)
         
-        self.economy_data[user_key]["active_boosts"][boost_type] = new_expiry.isoformat()
-        self.economy_dirty = True
+        self.economy_data[user_key].setdefault("active_boosts", {})[boost_type] = new_expiry.isoformat()
+        self._journal_account(user_key, "active_boosts")
 
     def get_inventory(self, user_id: int):
         """Get user's inventory"""
         user_key = str(user_id)
         if user_key not in self.inventory_data:
             self.inventory_data[user_key] = {}
-            self.inventory_dirty = True
         return self.inventory_data[user_key]
 
     def add_item(self, user_id: int, item_id: str, quantity: int = 1):
@@ -350,7 +402,7 @@ class Economy(commands.Cog):
         else:
             inventory[item_id] = quantity
         
-        self.inventory_dirty = True
+        self._journal_item(user_key, item_id)
 
 
     def remove_item(self, user_id: int, item_id: str, quantity: int = 1) -> bool:
@@ -362,7 +414,7 @@ class Economy(commands.Cog):
             inventory[item_id] -= quantity
             if inventory[item_id] == 0:
                 del inventory[item_id]
-            self.inventory_dirty = True
+            self._journal_item(user_key, item_id)
             return True
         return False
 
@@ -379,7 +431,7 @@ class Economy(commands.Cog):
         user_key = str(user_id)
         self.get_balance(user_id)  # Ensure user exists
         self.economy_data[user_key]["fish_coins"] = self.economy_data[user_key].get("fish_coins", 0) + amount
-        self.economy_dirty = True
+        self._journal_account(user_key, "fish_coins")
         return self.economy_data[user_key]["fish_coins"]
 
     def remove_fish_coins(self, user_id: int, amount: int) -> bool:
@@ -388,7 +440,7 @@ class Economy(commands.Cog):
         current = self.get_fish_coins(user_id)
         if current >= amount:
             self.economy_data[user_key]["fish_coins"] = current - amount
-            self.economy_dirty = True
+            self._journal_account(user_key, "fish_coins")
             return True
         return False
 
@@ -403,7 +455,7 @@ class Economy(commands.Cog):
         user_key = str(user_id)
         self.get_balance(user_id)  # Ensure user exists
         self.economy_data[user_key]["mine_coins"] = self.economy_data[user_key].get("mine_coins", 0) + amount
-        self.economy_dirty = True
+        self._journal_account(user_key, "mine_coins")
         return self.economy_data[user_key]["mine_coins"]
 
     def remove_mine_coins(self, user_id: int, amount: int) -> bool:
@@ -412,7 +464,7 @@ class Economy(commands.Cog):
         current = self.get_mine_coins(user_id)
         if current >= amount:
             self.economy_data[user_key]["mine_coins"] = current - amount
-            self.economy_dirty = True
+            self._journal_account(user_key, "mine_coins")
             return True
         return False
 
@@ -427,7 +479,7 @@ class Economy(commands.Cog):
         user_key = str(user_id)
         self.get_balance(user_id)  # Ensure user exists
         self.economy_data[user_key]["farm_coins"] = self.economy_data[user_key].get("farm_coins", 0) + amount
-        self.economy_dirty = True
+        self._journal_account(user_key, "farm_coins")
         return self.economy_data[user_key]["farm_coins"]
 
     def remove_farm_coins(self, user_id: int, amount: int) -> bool:
@@ -436,7 +488,7 @@ class Economy(commands.Cog):
         current = self.get_farm_coins(user_id)
         if current >= amount:
             self.economy_data[user_key]["farm_coins"] = current - amount
-            self.economy_dirty = True
+            self._journal_account(user_key, "farm_coins")
             return True
         return False
 
@@ -459,7 +511,7 @@ class Economy(commands.Cog):
         # Cache username for leaderboard
         if data.get("username") != member.display_name:
             data["username"] = member.display_name
-            self.economy_dirty = True
+            self._journal_account(user_key, "username")
         
         # Calculate wealth tier
         if balance >= 1_000_000:
@@ -574,7 +626,7 @@ class Economy(commands.Cog):
         username = user.display_name if hasattr(user, 'display_name') else str(user)
         if user_data.get("username") != username:
             user_data["username"] = username
-            self.economy_dirty = True
+            self._journal_account(user_key, "username")
         
         last_daily = user_data.get("last_daily")
         
@@ -617,6 +669,7 @@ class Economy(commands.Cog):
         total_reward = base_reward + streak_bonus
         
         user_data["last_daily"] = now.isoformat()
+        self._journal_account(user_key, "daily_streak", "last_daily")
         self.add_coins(user.id, total_reward, "daily_reward")
         
         desc = f"{msg_shield if 'msg_shield' in locals() else ''}You received **{total_reward:,} PsyCoins**!"
@@ -781,7 +834,7 @@ class Economy(commands.Cog):
         user_key = str(user_id)
         inventory = self.get_inventory(user_id)
         inventory["equipped_deck"] = deck_name
-        self.inventory_dirty = True
+        self._journal_item(user_key, "equipped_deck")
     
     def get_owned_decks(self, user_id: int) -> list:
         """Get list of card decks user owns"""
@@ -800,7 +853,7 @@ class Economy(commands.Cog):
         user_key = str(user_id)
         inventory = self.get_inventory(user_id)
         inventory[f"deck_{deck_name}"] = True
-        self.inventory_dirty = True
+        self._journal_item(user_key, f"deck_{deck_name}")
 
     async def _use_item(self, user, item_id, ctx, interaction):
         if not self.remove_item(user.id, item_id):
@@ -921,8 +974,8 @@ class Economy(commands.Cog):
         await self._show_leaderboard(interaction.guild, None, interaction)
 
     async def _show_leaderboard(self, guild, ctx, interaction):
-        # Sort users by balance
-        sorted_users = sorted(self.economy_data.items(), key=lambda x: x[1].get("balance", 0), reverse=True)[:10]
+        # Top 10 balances from the leaderboard index (kept up to date by _journal_account)
+        top_users = leaderboard_index.top("coins", 10)
         
         embed = discord.Embed(
             title="🏆 PsyCoin Leaderboard",
@@ -930,41 +983,26 @@ class Economy(commands.Cog):
             color=discord.Color.gold()
         )
         
-        for i, (user_id, data) in enumerate(sorted_users, 1):
-            balance = data.get("balance", 0)
+        for i, (user_id, balance) in enumerate(top_users, 1):
+            data = self.economy_data.get(str(user_id), {})
             streak = data.get("daily_streak", 0)
-            cached_name = data.get("username", "Unknown User")
             
-            try:
-                user = await self.bot.fetch_user(int(user_id))
+            # Names come from caches only - no fetch_user round trip per row
+            user = self.bot.get_user(user_id)
+            if user is not None:
                 username = user.display_name
-                
-                # Update cached username if changed
-                if cached_name != username:
+                if data and data.get("username") != username:
                     data["username"] = username
-                    self.economy_dirty = True
-                
-                embed.add_field(
-                    name=f"{i}. {username}",
-                    value=f"💰 {balance:,} PsyCoins | 🔥 {streak} day streak",
-                    inline=False
-                )
-            except discord.NotFound:
-                print(f"[ECONOMY] User {user_id} not found (left Discord or deleted account)")
-                # Use cached username
-                embed.add_field(
-                    name=f"{i}. {cached_name}",
-                    value=f"💰 {balance:,} PsyCoins | 🔥 {streak} day streak",
-                    inline=False
-                )
-            except Exception as e:
-                print(f"[ECONOMY] Error fetching user {user_id}: {e}")
-                # Use cached username as fallback
-                embed.add_field(
-                    name=f"{i}. {cached_name}",
-                    value=f"💰 {balance:,} PsyCoins | 🔥 {streak} day streak",
-                    inline=False
-                )
+                    self._journal_account(str(user_id), "username")
+                leaderboard_index.remember_name(user_id, username)
+            else:
+                username = data.get("username") or leaderboard_index.name(user_id, "Unknown User")
+            
+            embed.add_field(
+                name=f"{i}. {username}",
+                value=f"💰 {int(balance):,} PsyCoins | 🔥 {streak} day streak",
+                inline=False
+            )
         
         if interaction:
             await interaction.followup.send(embed=embed)
@@ -12,6 +12,8 @@ from discord import app_commands
 from discord.ui import View, Button
 from cogs.minigames import PaginatedHelpView
 from utils.embed_styles import EmbedBuilder, Colors, Emojis
+from utils.live_updates import live_updates
+from utils.leaderboard_index import leaderboard_index
 import traceback
 try:
     from utils.stat_hooks import us_inc as _f_inc
@@ -136,20 +138,26 @@ class FishingMinigameView(discord.ui.View):
         base_interval = 3.0 - (difficulty * 0.3)
         self.move_interval = base_interval * (1 + rod_bonus * 0.3)  # Up to 13.5% slower
         self.message = None
-        self.auto_move_task = None
+        self.live = None
         self.start_time = None
         
     async def start_auto_movement(self, interaction: discord.Interaction):
         """Start automatic fish movement"""
         self.message = await interaction.original_response()
         self.start_time = asyncio.get_event_loop().time()
-        self.auto_move_task = asyncio.create_task(self._auto_move_fish())
+        self.live = live_updates.register(
+            self.message.edit,
+            channel_id=self.message.channel.id,
+            render=lambda: {"embed": self._build_embed(), "view": self},
+            step=self._move_fish,
+            interval=self.move_interval,
+        )
     
     async def on_timeout(self):
         """Called when the view times out after 3 minutes"""
         self.game_over = True
-        if self.auto_move_task:
-            self.auto_move_task.cancel()
+        if self.live:
+            await self.live.close()
         
         if self.message:
             try:
@@ -165,29 +173,15 @@ class FishingMinigameView(discord.ui.View):
             except:
                 pass
         
-    async def _auto_move_fish(self):
-        """Background task to move fish automatically"""
-        try:
-            while not self.game_over:
-                await asyncio.sleep(self.move_interval)
-                if self.game_over:
-                    break
-                    
-                # Move fish randomly
-                self.position += random.randint(-1, 1)
-                self.position = max(0, min(10, self.position))
-                
-                # Update display
-                if self.message:
-                    try:
-                        await self._update_display()
-                    except:
-                        break
-        except asyncio.CancelledError:
-            pass
-            
-    async def _update_display(self):
-        """Update the message display"""
+    def _move_fish(self):
+        """Animation step: the fish drifts on its own"""
+        if self.game_over:
+            return False
+        self.position += random.randint(-1, 1)
+        self.position = max(0, min(10, self.position))
+    
+    def _build_embed(self):
+        """Current game state as an embed"""
         fish_data = self.cog.fish_types[self.fish_id]
         
         # Calculate remaining time
@@ -227,13 +221,12 @@ class FishingMinigameView(discord.ui.View):
                        f"• Difficulty: {'⭐' * self.difficulty}",
             color=discord.Color.blue()
         )
-        
-        await self.message.edit(embed=embed, view=self)
+        return embed
         
     def stop(self):
-        """Stop the view and cancel auto-movement"""
-        if self.auto_move_task:
-            self.auto_move_task.cancel()
+        """Stop the view and its animation"""
+        if self.live:
+            self.live.stop()
         super().stop()
         
     @discord.ui.button(label="⬅️ Left", style=discord.ButtonStyle.primary, custom_id="fish_left")
@@ -293,45 +286,9 @@ class FishingMinigameView(discord.ui.View):
     
     async def update_game(self, interaction: discord.Interaction):
         """Update game display"""
-        fish_data = self.cog.fish_types[self.fish_id]
-        
-        # Calculate remaining time
-        elapsed = asyncio.get_event_loop().time() - self.start_time
-        remaining = max(0, 180 - int(elapsed))  # 180 seconds = 3 minutes
-        minutes = remaining // 60
-        seconds = remaining % 60
-        time_display = f"{minutes}:{seconds:02d}"
-        
-        # Create visual representation
-        line = ["⬜"] * 11
-        line[self.player_position] = "🎣"
-        
-        # Show fish position indicator
-        if self.player_position == self.position:
-            line[self.position] = "🟢"  # Perfect alignment!
-        else:
-            line[self.position] = "🐟"
-        
-        visual = "".join(line)
-        
-        # Build progress bars
-        catches_bar = "🟢" * self.catches + "⚪" * (self.required_catches - self.catches)
-        escapes_bar = "🔴" * self.escapes + "⚪" * (self.max_escapes - self.escapes)
-        
-        embed = discord.Embed(
-            title="🎣 Fishing Minigame",
-            description=f"**Catching:** {fish_data['name']} ({fish_data['rarity']})\n"
-                       f"**Progress:** {catches_bar} ({self.required_catches} needed)\n"
-                       f"**Escapes:** {escapes_bar} ({self.max_escapes} max)\n"
-                       f"⏱️ **Time Remaining:** {time_display}\n\n"
-                       f"{visual}\n\n"
-                       f"**Tips:**\n"
-                       f"• Move ⬅️ ➡️ to align EXACTLY with the fish\n"
-                       f"• Press 🎣 when you see 🟢 to reel in!\n"
-                       f"• The fish moves automatically - be quick!\n"
-                       f"• Difficulty: {'⭐' * self.difficulty}",
-            color=discord.Color.blue()
-        )
+        embed = self._build_embed()
+        if self.live:
+            self.live.skip_pending()  # this response already shows the latest state
         
         try:
             await interaction.response.edit_message(embed=embed, view=self)
@@ -342,6 +299,8 @@ class FishingMinigameView(discord.ui.View):
         """Player caught the fish"""
         self.game_over = True
         self.stop()
+        if self.live:
+            await self.live.close()
         
         fish_data = self.cog.fish_types[self.fish_id]
         weight = round(random.uniform(fish_data["weight"][0], fish_data["weight"][1]), 2)
@@ -358,6 +317,7 @@ class FishingMinigameView(discord.ui.View):
         user_data["total_catches"] += 1
         user_data["total_value"] += fish_data["value"]
         self.cog.save_fishing_data()
+        leaderboard_index.set("fishing", self.user.id, user_data["total_catches"], username=self.user.display_name)
         # Track in data/users/{id}.json
         if _f_inc is not None:
             try:
@@ -429,6 +389,8 @@ class FishingMinigameView(discord.ui.View):
         """Fish got away"""
         self.game_over = True
         self.stop()
+        if self.live:
+            await self.live.close()
         
         fish_data = self.cog.fish_types[self.fish_id]
         
@@ -463,7 +425,8 @@ class KrakenBossFight(discord.ui.View):
         self.game_over = False
         self.message = None
         self.start_time = 0
-        self.auto_move_task = None
+        self.live = None
+        self.defeated = False  # set by the animation step, handled in _animation_finished
         
         # ROD BONUS SYSTEM - Better rods help with BOSS FIGHT!
         rod_difficulty_bonus = {
@@ -549,82 +512,91 @@ class KrakenBossFight(discord.ui.View):
         self.start_time = asyncio.get_event_loop().time()
         await self.update_display()
         
-        # Start auto-movement
-        self.auto_move_task = asyncio.create_task(self.auto_move_kraken())
+        # Start auto-movement (frames sent by the shared live update scheduler)
+        self.live = live_updates.register(
+            self.message.edit,
+            channel_id=self.message.channel.id,
+            render=lambda: {"embed": self._build_embed(), "view": self},
+            step=self._move_kraken,
+            interval=self.kraken_move_speed,
+            on_stop=self._animation_finished,
+        )
     
-    async def auto_move_kraken(self):
-        """Kraken moves automatically - FAST and ERRATIC!"""
-        try:
-            while not self.game_over:
-                await asyncio.sleep(self.kraken_move_speed)
-                
-                if self.game_over:
-                    break
+    def _move_kraken(self):
+        """Kraken moves automatically - FAST and ERRATIC! Returns False when the fight is lost."""
+        if self.game_over:
+            return False
+        if asyncio.get_event_loop().time() - self.start_time >= 300:
+            self.defeated = True  # out of time
+            return False
+        # Move Kraken erratically (1-3 spaces)
+        move = random.randint(-self.kraken_move_range, self.kraken_move_range)
+        self.kraken_position += move
+        self.kraken_position = max(0, min(10, self.kraken_position))
+        
+        # Check for attack countdown
+        self.attack_countdown += 1
+        
+        # BOSS ATTACK SYSTEM - MULTIPLE PATTERNS!
+        if self.attack_countdown >= self.next_attack_in:
+            if not self.attack_warning and not self.attack_active:
+                # Start warning phase - choose attack pattern!
+                self.attack_warning = True
+                self.attack_active = False
                 
-                # Move Kraken erratically (1-3 spaces)
-                move = random.randint(-self.kraken_move_range, self.kraken_move_range)
-                self.kraken_position += move
-                self.kraken_position = max(0, min(10, self.kraken_position))
+                # Select random pattern
+                pattern_key = random.choice(list(self.attack_patterns.keys()))
+                pattern = self.attack_patterns[pattern_key]
+                self.attack_pattern = pattern["name"]
                 
-                # Check for attack countdown
-                self.attack_countdown += 1
+                # Generate attack positions based on pattern
+                if pattern_key == "random_triple":
+                    # 3 random positions
+                    self.attack_positions = random.sample(range(11), 3)
+                elif pattern_key == "barrage":
+                    # 5 random positions (DANGEROUS!)
+                    self.attack_positions = random.sample(range(11), 5)
+                else:
+                    # Use predefined pattern
+                    self.attack_positions = pattern["positions"].copy()
                 
-                # BOSS ATTACK SYSTEM - MULTIPLE PATTERNS!
-                if self.attack_countdown >= self.next_attack_in:
-                    if not self.attack_warning and not self.attack_active:
-                        # Start warning phase - choose attack pattern!
-                        self.attack_warning = True
-                        self.attack_active = False
-                        
-                        # Select random pattern
-                        pattern_key = random.choice(list(self.attack_patterns.keys()))
-                        pattern = self.attack_patterns[pattern_key]
-                        self.attack_pattern = pattern["name"]
-                        
-                        # Generate attack positions based on pattern
-                        if pattern_key == "random_triple":
-                            # 3 random positions
-                            self.attack_positions = random.sample(range(11), 3)
-                        elif pattern_key == "barrage":
-                            # 5 random positions (DANGEROUS!)
-                            self.attack_positions = random.sample(range(11), 5)
-                        else:
-                            # Use predefined pattern
-                            self.attack_positions = pattern["positions"].copy()
-                        
-                    elif self.attack_warning and not self.attack_active:
-                        # Warning → Attack!
-                        self.attack_active = True
-                        self.attack_warning = False
-                        
-                        # Check if player is hit by any attack position
-                        if self.player_position in self.attack_positions:
-                            self.escapes += 1
-                            if self.escapes >= self.max_escapes:
-                                await self.lose_game()
-                                break
-                    elif self.attack_active:
-                        # Reset attack
-                        self.attack_active = False
-                        self.attack_positions = []
-                        self.attack_pattern = None
-                        self.attack_countdown = 0
-                        self.next_attack_in = random.randint(2, 4)  # Szybsze ataki!
+            elif self.attack_warning and not self.attack_active:
+                # Warning → Attack!
+                self.attack_active = True
+                self.attack_warning = False
                 
-                # Update display
-                if self.message:
-                    try:
-                        await self._update_display()
-                    except:
-                        break
-        except asyncio.CancelledError:
-            pass
+                # Check if player is hit by any attack position
+                if self.player_position in self.attack_positions:
+                    self.escapes += 1
+                    if self.escapes >= self.max_escapes:
+                        self.defeated = True
+                        return False
+            elif self.attack_active:
+                # Reset attack
+                self.attack_active = False
+                self.attack_positions = []
+                self.attack_pattern = None
+                self.attack_countdown = 0
+                self.next_attack_in = random.randint(2, 4)  # Szybsze ataki!
+    
+    async def _animation_finished(self):
+        if self.defeated and not self.game_over:
+            await self.lose_game()
     
     async def _update_display(self):
         """Update the message display"""
         if self.game_over:
             return
         
+        # Check timeout
+        if asyncio.get_event_loop().time() - self.start_time >= 300:
+            await self.lose_game()
+            return
+        
+        await self.message.edit(embed=self._build_embed(), view=self)
+    
+    def _build_embed(self):
+        """Current fight state as an embed"""
         # Calculate remaining time
         elapsed = asyncio.get_event_loop().time() - self.start_time
         remaining = max(0, 300 - int(elapsed))  # 300 seconds = 5 minutes
@@ -632,11 +604,6 @@ class KrakenBossFight(discord.ui.View):
         seconds = remaining % 60
         time_display = f"{minutes}:{seconds:02d}"
         
-        # Check timeout
-        if remaining <= 0:
-            await self.lose_game()
-            return
-        
         # Create visual representation
         line = ["⬜"] * 11
         line[self.player_position] = "🎣"
@@ -703,17 +670,16 @@ class KrakenBossFight(discord.ui.View):
             color=discord.Color.dark_purple() if self.attack_active else 
                   (discord.Color.dark_red() if self.attack_warning else discord.Color.dark_blue())
         )
-        
-        await self.message.edit(embed=embed, view=self)
+        return embed
     
     async def update_display(self):
         """Public update method"""
         await self._update_display()
     
     def stop(self):
-        """Stop the view and cancel auto-movement"""
-        if self.auto_move_task:
-            self.auto_move_task.cancel()
+        """Stop the view and its animation"""
+        if self.live:
+            self.live.stop()
         super().stop()
     
     @discord.ui.button(label="⬅️ Left", style=discord.ButtonStyle.primary, custom_id="kraken_left")
@@ -778,12 +744,17 @@ class KrakenBossFight(discord.ui.View):
             await interaction.response.defer()
         except:
             pass
-        await self._update_display()
+        if self.live:
+            self.live.invalidate()  # coalesced with the Kraken's own frames
+        else:
+            await self._update_display()
     
     async def win_game(self, interaction: discord.Interaction):
         """Player caught the Kraken!"""
         self.game_over = True
         self.stop()
+        if self.live:
+            await self.live.close()
         
         # Calculate time taken
         elapsed = int(asyncio.get_event_loop().time() - self.start_time)
@@ -811,6 +782,7 @@ class KrakenBossFight(discord.ui.View):
         user_data["total_value"] += 50000  # Kraken is worth a lot!
         
         self.cog.save_fishing_data()
+        leaderboard_index.set("fishing", self.user.id, user_data["total_catches"], username=self.user.display_name)
         
         kraken_defeated = """```
          ⚔️ SLAIN ⚔️
@@ -856,6 +828,8 @@ class KrakenBossFight(discord.ui.View):
         """Kraken defeated the player"""
         self.game_over = True
         self.stop()
+        if self.live:
+            await self.live.close()
         
         kraken_victorious = """```
        💀 GAME OVER 💀
@@ -11,6 +11,8 @@ import sys
 # Add utils to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from utils.card_visuals import create_comparison_image, parse_card
+from utils.live_updates import live_updates
+from utils.leaderboard_index import leaderboard_index
 try:
     from utils.stat_hooks import us_inc as _g_inc, us_mg as _g_mg
 except Exception:
@@ -86,6 +88,7 @@ class CrashView(discord.ui.View):
         self.current_multiplier = 1.00
         self.cashed_out = False
         self.crashed = False
+        self.live = None
         
         # Add disclaimer button
         add_disclaimer_button(self)
@@ -106,6 +109,9 @@ class CrashView(discord.ui.View):
         
         self.cashed_out = True
         self.stop()
+        if self.live:
+            # Make sure a running-frame edit can't land after the cash-out embed
+            await self.live.close()
         
         # Calculate payout
         payout = int(self.bet * self.current_multiplier)
@@ -135,35 +141,16 @@ class CrashView(discord.ui.View):
         """Start the crash animation"""
         await asyncio.sleep(2)
         
-        # Increment multiplier until crash
-        increment = 0.10
-        
-        while self.current_multiplier < self.crash_multiplier and not self.cashed_out:
-            self.current_multiplier += increment
-            
-            # Update button label
-            for item in self.children:
-                if isinstance(item, discord.ui.Button) and item.custom_id == "cashout":
-                    item.label = f"💰 Cash Out ({self.current_multiplier:.2f}x)"
-            
-            # Update embed
-            embed = discord.Embed(
-                title="📈 Crash Game Running...",
-                description=f"**Your Bet:** {self.bet:,} coins\n\n"
-                           f"**Current Multiplier:** {self.current_multiplier:.2f}x\n"
-                           f"**Potential Win:** {int(self.bet * self.current_multiplier):,} coins",
-                color=discord.Color.blue()
-            )
-            embed.set_footer(text="Click 'Cash Out' to claim your winnings!")
-            
-            try:
-                await interaction.edit_original_response(embed=embed, view=self)
-            except:
-                break
-            
-            # Wait before next increment (speed increases over time)
-            wait_time = max(0.3, 1.0 - (self.current_multiplier * 0.05))
-            await asyncio.sleep(wait_time)
+        # Frames go through the shared scheduler (coalesced + rate limited)
+        self.live = live_updates.register(
+            interaction.edit_original_response,
+            channel_id=interaction.channel_id,
+            render=self._frame,
+            step=self._advance,
+            interval=1.0,
+        )
+        await self.live.wait()
+        await self.live.close()
         
         if not self.cashed_out:
             # CRASHED!
@@ -189,6 +176,34 @@ class CrashView(discord.ui.View):
                 await interaction.edit_original_response(embed=embed, view=None)
             except:
                 pass
+    
+    def _advance(self):
+        """One multiplier step; returns False once the game crashed or was cashed out."""
+        if self.cashed_out:
+            return False
+        self.current_multiplier += 0.10
+        if self.current_multiplier >= self.crash_multiplier:
+            return False
+        
+        # Update button label
+        for item in self.children:
+            if isinstance(item, discord.ui.Button) and item.custom_id == "cashout":
+                item.label = f"💰 Cash Out ({self.current_multiplier:.2f}x)"
+        
+        # Speed increases over time
+        self.live.interval = max(0.3, 1.0 - (self.current_multiplier * 0.05))
+        return True
+    
+    def _frame(self):
+        embed = discord.Embed(
+            title="📈 Crash Game Running...",
+            description=f"**Your Bet:** {self.bet:,} coins\n\n"
+                       f"**Current Multiplier:** {self.current_multiplier:.2f}x\n"
+                       f"**Potential Win:** {int(self.bet * self.current_multiplier):,} coins",
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text="Click 'Cash Out' to claim your winnings!")
+        return {"embed": embed, "view": self}
 
 
 class MinesView(discord.ui.View):
@@ -569,6 +584,7 @@ class Gambling(commands.Cog):
             stats["games"][game]["lost"] += 1
 
         self.save_stats()
+        leaderboard_index.set("gambling", user_id, stats["total_games"])
         # Mirror into data/users/{id}.json
         if _g_mg is not None:
             try:
@@ -7,7 +7,9 @@ Leaderboard system for Ludus-Bot.
 • L!synclb      – Force re-sync stats from data files (owner only)
 • L!lbconsent   – Toggle global visibility for this server (admin only)
 
-Data sources (aggregated per guild on on_ready / synclb):
+Pages are served from utils/leaderboard_index.py, which the cogs keep up
+to date as scores change (snapshot in leaderboard_index.json, loaded on
+on_ready).  Data sources for a full rebuild / per-guild aggregates (synclb):
   economy.json        → balance, total_earned, total_spent
   fishing_data.json   → total_catches
   profiles.json       → xp, level, minigames_played, minigames_won,
@@ -18,13 +20,16 @@ Data sources (aggregated per guild on on_ready / synclb):
 """
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
+import asyncio
 import json
 import os
 from typing import Dict, List, Tuple
 import discord.ui
 
+from utils.leaderboard_index import leaderboard_index
+
 
 # ─── helpers ──────────────────────────────────────────────────────────────────
 
@@ -156,6 +161,32 @@ class LeaderboardView(discord.ui.LayoutView):
 
 # ─── cog ──────────────────────────────────────────────────────────────────────
 
+# category value → (index category, title, unit)
+PAGES: Dict[str, Tuple[str, str, str]] = {
+    "s_coins":      ("coins",      "💰 Coins",        "🪙"),
+    "s_fishing":    ("fishing",    "🎣 Fishing",      "fish"),
+    "s_mining":     ("mining",     "⛏️ Mining",       "blocks"),
+    "s_farming":    ("farming",    "🌾 Farming",      "crops"),
+    "s_minigames":  ("minigames",  "🎮 Minigames",    "games"),
+    "s_gambling":   ("gambling",   "🎲 Gambling",     "games"),
+    "s_duels":      ("duels",      "⚔️ Duels",        "wins"),
+    "s_quests":     ("quests",     "📜 Quests",       "quests"),
+    "s_reputation": ("reputation", "❤️ Reputation",   "rep"),
+    "s_xp":         ("xp",         "⭐ Level/XP",     "XP"),
+    "s_streak":     ("streak",     "🔥 Daily Streak", "days"),
+    "g_coins":      ("coins",      "💰 Global – Coins",     "🪙"),
+    "g_fishing":    ("fishing",    "🎣 Global – Fishing",   "fish"),
+    "g_mining":     ("mining",     "⛏️ Global – Mining",    "blocks"),
+    "g_farming":    ("farming",    "🌾 Global – Farming",   "crops"),
+    "g_minigames":  ("minigames",  "🎮 Global – Minigames", "games"),
+    "g_gambling":   ("gambling",   "🎲 Global – Gambling",  "games"),
+    "g_duels":      ("duels",      "⚔️ Global – Duels",     "wins"),
+    "g_quests":     ("quests",     "📜 Global – Quests",    "quests"),
+    "g_xp":         ("xp",         "⭐ Global – Level/XP",  "XP"),
+    "g_reputation": ("reputation", "❤️ Global – Reputation", "rep"),
+}
+
+
 class Leaderboard(commands.Cog):
     """Leaderboard cog – server + global stats, Components V2 UI."""
 
@@ -175,15 +206,62 @@ class Leaderboard(commands.Cog):
         self._lb: Dict      = _load_json(self._lb_path)
         self._consent: Dict = _load_json(self._consent_path)
 
+        # Ranked boards fed by the cogs (utils/leaderboard_index.py)
+        self.index = leaderboard_index
+        self.save_index.start()
+
+    def cog_unload(self):
+        self.save_index.cancel()
+        self.index.save(force=True)
+
     # ── lifecycle ─────────────────────────────────────────────────────
     @commands.Cog.listener()
     async def on_ready(self):
-        await self.sync_stats()
+        self.index.ensure_loaded()
+        # Whatever the member cache already knows; more is learned from activity
+        for guild, user_ids in self._cached_members().items():
+            self.index.note_members(guild, user_ids)
+        print(f"[Leaderboard] Index ready – {self.index.stats()}")
+
+    @tasks.loop(seconds=60)
+    async def save_index(self):
+        snapshot = self.index.snapshot()
+        if snapshot is not None:
+            await asyncio.to_thread(self.index.write, snapshot)
+
+    @save_index.before_loop
+    async def before_save_index(self):
+        await self.bot.wait_until_ready()
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if message.guild is None or message.author.bot:
+            return
+        self.index.note_member(message.guild.id, message.author.id)
+        if self.index.names.get(message.author.id) != message.author.display_name:
+            self.index.remember_name(message.author.id, message.author.display_name)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        if not member.bot:
+            self.index.note_member(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.index.drop_member(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.index.drop_guild(guild.id)
 
     # ── internal helpers ──────────────────────────────────────────────
     def _save(self):
         _save_json(self._lb_path, self._lb)
 
+    def _cached_members(self) -> Dict[int, List[int]]:
+        """Member ids per guild from the gateway cache (no chunking)."""
+        return {guild.id: [m.id for m in guild.members if not m.bot] for guild in self.bot.guilds}
+
     def _guild_data(self, guild_id: int, name: str = "") -> dict:
         gid = str(guild_id)
         if gid not in self._lb:
@@ -207,43 +285,25 @@ class Leaderboard(commands.Cog):
 
     # ── sync ──────────────────────────────────────────────────────────
     async def sync_stats(self):
-        """Read all data files and aggregate per-guild stats."""
+        """Rebuild the index from all data files and aggregate per-guild stats."""
         print("[Leaderboard] Syncing stats from data files…")
 
-        eco     = _load_json(os.path.join(self.data_dir, "economy.json"))
-        fish    = _load_json(os.path.join(self.data_dir, "fishing_data.json"))
+        self.index.rebuild(self.data_dir, self._cached_members())
+        await asyncio.to_thread(self.index.write, self.index.snapshot(force=True))
+
         prof    = _load_json(os.path.join(self.data_dir, "profiles.json"))
         gamble  = _load_json(os.path.join(self.data_dir, "gambling_stats.json"))
         gstats  = _load_json(os.path.join(self.data_dir, "game_stats.json"))
 
         for guild in self.bot.guilds:
-            gid = str(guild.id)
-            # Ensure member cache is populated
-            if not guild.chunked:
-                try:
-                    await guild.chunk(cache=True)
-                except Exception:
-                    pass
-            members = {str(m.id) for m in guild.members}
-
-            # coins
-            coins = 0
-            for uid, d in eco.items():
-                if uid.isdigit() and uid in members and isinstance(d, dict):
-                    coins += d.get("balance", 0)
+            board = self.index.board("coins", guild.id)
+            members = {str(uid) for uid in board.scores} if board is not None else set()
+            members.update(str(m.id) for m in guild.members)
 
-            # fishing – total_catches is the int; fish_caught is a dict
-            fish_total = 0
-            for uid, d in fish.items():
-                if uid.isdigit() and uid in members and isinstance(d, dict):
-                    val = d.get("total_catches", 0)
-                    fish_total += val if isinstance(val, int) else 0
-
-            # profiles – xp, minigames, commands
-            xp = mg_played = mg_won = cmds = 0
+            # profiles – minigames, commands (xp comes from the index)
+            mg_played = mg_won = cmds = 0
             for uid, d in prof.items():
                 if uid.isdigit() and uid in members and isinstance(d, dict):
-                    xp        += d.get("xp", d.get("total_xp", 0))
                     mg_played += d.get("minigames_played", 0)
                     mg_won    += d.get("minigames_won", 0)
                     cmds      += d.get("commands_used", 0)
@@ -254,24 +314,23 @@ class Leaderboard(commands.Cog):
                     mg_played += d.get("total_games", 0)
                     mg_won    += d.get("games_won", 0)
 
-            # gambling
-            g_games = g_wins = 0
+            # gambling wins (games come from the index)
+            g_wins = 0
             for uid, d in gamble.items():
                 if uid.isdigit() and uid in members and isinstance(d, dict):
-                    g_games += d.get("total_games", 0)
                     g_wins  += d.get("total_won", 0)
 
             gdata = self._guild_data(guild.id, guild.name)
             gdata.update({
                 "server_name":      guild.name,
-                "total_coins":      coins,
-                "fish_caught":      fish_total,
+                "total_coins":      self.index.guild_total("coins", guild.id),
+                "fish_caught":      self.index.guild_total("fishing", guild.id),
                 "minigames_played": mg_played,
                 "minigames_won":    mg_won,
-                "gambling_games":   g_games,
+                "gambling_games":   self.index.guild_total("gambling", guild.id),
                 "gambling_wins":    g_wins,
                 "commands_used":    cmds,
-                "total_xp":         xp,
+                "total_xp":         self.index.guild_total("xp", guild.id),
                 "last_synced":      discord.utils.utcnow().isoformat(),
             })
 
@@ -282,213 +341,41 @@ class Leaderboard(commands.Cog):
 
     async def build_page(self, category: str, guild: discord.Guild) -> str:
         """Return markdown text for a given category + guild."""
+        page = PAGES.get(category)
+        if page is None:
+            return "❓ Unknown category."
+        index_category, title, unit = page
+
+        if category.startswith("s_"):
+            header = f"# {title} – {guild.name}\n"
+            # Guild whose members the index hasn't seen yet: show everyone, like before
+            guild_id = guild.id if self.index.has_members(guild.id) else None
+            entries = self.index.top(index_category, 10, guild_id=guild_id)
+            names = [self._member_name(guild, uid) for uid, _ in entries]
+        else:
+            header = f"# {title}\n"
+            entries = self.index.top(index_category, 10)
+            names = [self._user_name(uid) for uid, _ in entries]
 
-        # ── Server (local) pages ──────────────────────────────────────
-        if category == "s_coins":
-            return await self._local_from_eco(guild)
-
-        if category == "s_fishing":
-            return await self._local_from_file(
-                guild, "fishing_data.json", "total_catches",
-                "🎣 Fishing – " + guild.name, "fish")
-
-        if category == "s_minigames":
-            return await self._local_from_profile(
-                guild, "minigames_played", "🎮 Minigames – " + guild.name, "games")
-
-        if category == "s_xp":
-            return await self._local_from_profile(
-                guild, "xp", "⭐ Level/XP – " + guild.name, "XP")
-
-        if category == "s_mining":
-            return await self._local_from_profile(
-                guild, "mining_total_mined", "⛏️ Mining – " + guild.name, "blocks")
-
-        if category == "s_farming":
-            return await self._local_from_profile(
-                guild, "farming_total_harvested", "🌾 Farming – " + guild.name, "crops")
-
-        if category == "s_gambling":
-            return await self._local_from_file(
-                guild, "gambling_stats.json", "total_games",
-                "🎲 Gambling – " + guild.name, "games")
-
-        if category == "s_duels":
-            return await self._local_from_profile(
-                guild, "duels_won", "⚔️ Duels – " + guild.name, "wins")
-
-        if category == "s_quests":
-            return await self._local_from_profile(
-                guild, "quests_completed", "📜 Quests – " + guild.name, "quests")
-
-        if category == "s_reputation":
-            return await self._local_from_file(
-                guild, "reputation.json", "total_rep",
-                "❤️ Reputation – " + guild.name, "rep")
-
-        if category == "s_streak":
-            return await self._local_from_profile(
-                guild, "daily_longest_streak", "🔥 Daily Streak – " + guild.name, "days")
-
-        # ── Global pages (per-user, all servers) ──────────────────────
-        if category == "g_coins":
-            return await self._global_users(
-                "economy.json", "balance", "💰 Global – Coins", "🪙")
-        if category == "g_fishing":
-            return await self._global_users(
-                "fishing_data.json", "total_catches", "🎣 Global – Fishing", "fish")
-        if category == "g_mining":
-            return await self._global_users(
-                "profiles.json", "mining_total_mined", "⛏️ Global – Mining", "blocks")
-        if category == "g_farming":
-            return await self._global_users(
-                "profiles.json", "farming_total_harvested", "🌾 Global – Farming", "crops")
-        if category == "g_minigames":
-            return await self._global_users(
-                "profiles.json", "minigames_played", "🎮 Global – Minigames", "games")
-        if category == "g_gambling":
-            return await self._global_users(
-                "gambling_stats.json", "total_games", "🎲 Global – Gambling", "games")
-        if category == "g_duels":
-            return await self._global_users(
-                "profiles.json", "duels_won", "⚔️ Global – Duels", "wins")
-        if category == "g_quests":
-            return await self._global_users(
-                "profiles.json", "quests_completed", "📜 Global – Quests", "quests")
-        if category == "g_xp":
-            return await self._global_users(
-                "profiles.json", "xp", "⭐ Global – Level/XP", "XP")
-        if category == "g_reputation":
-            return await self._global_users(
-                "reputation.json", "total_rep", "❤️ Global – Reputation", "rep")
-
-        return "❓ Unknown category."
-
-    # ── local helpers ─────────────────────────────────────────────────
-
-    async def _local_from_eco(self, guild: discord.Guild) -> str:
-        title = f"# 💰 Coins – {guild.name}\n"
-        eco = _load_json(os.path.join(self.data_dir, "economy.json"))
-        if not guild.chunked:
-            try:
-                await guild.chunk(cache=True)
-            except Exception:
-                pass
-        members = {str(m.id): m for m in guild.members}
-        entries = []
-        for uid, d in eco.items():
-            if not uid.isdigit() or not isinstance(d, dict):
-                continue
-            if members and uid not in members:
-                continue
-            bal = d.get("balance", 0)
-            name = members[uid].display_name if uid in members else d.get("username", f"User {uid}")
-            entries.append((name, bal))
-        entries.sort(key=lambda x: x[1], reverse=True)
-        if not entries:
-            return title + "*No data yet.*"
-        lines = [title]
-        for i, (name, val) in enumerate(entries[:10], 1):
-            lines.append(f"{_medal(i)} {name} — {val:,} 🪙")
-        return "\n".join(lines)
-
-    async def _local_from_file(self, guild: discord.Guild, filename: str,
-                                stat_key: str, title: str, unit: str) -> str:
-        header = f"# {title}\n"
-        data = _load_json(os.path.join(self.data_dir, filename))
-        if not guild.chunked:
-            try:
-                await guild.chunk(cache=True)
-            except Exception:
-                pass
-        members = {str(m.id): m for m in guild.members}
-        entries = []
-        for uid, d in data.items():
-            if not uid.isdigit() or not isinstance(d, dict):
-                continue
-            if members and uid not in members:
-                continue
-            val = d.get(stat_key, 0)
-            if not isinstance(val, (int, float)):
-                val = 0
-            if val > 0:
-                name = members[uid].display_name if uid in members else f"User {uid}"
-                entries.append((name, val))
-        entries.sort(key=lambda x: x[1], reverse=True)
         if not entries:
             return header + "*No data yet.*"
         lines = [header]
-        for i, (name, val) in enumerate(entries[:10], 1):
+        for i, (name, (_, val)) in enumerate(zip(names, entries), 1):
             lines.append(f"{_medal(i)} {name} — {int(val):,} {unit}")
         return "\n".join(lines)
 
-    async def _local_from_profile(self, guild: discord.Guild, stat_key: str,
-                                   title: str, unit: str) -> str:
-        header = f"# {title}\n"
-        prof = _load_json(os.path.join(self.data_dir, "profiles.json"))
-        if not guild.chunked:
-            try:
-                await guild.chunk(cache=True)
-            except Exception:
-                pass
-        members = {str(m.id): m for m in guild.members}
-        entries = []
-        for uid, d in prof.items():
-            if not uid.isdigit() or not isinstance(d, dict):
-                continue
-            if members and uid not in members:
-                continue
-            val = d.get(stat_key, 0)
-            if not isinstance(val, (int, float)):
-                val = 0
-            if val > 0:
-                name = members[uid].display_name if uid in members else f"User {uid}"
-                entries.append((name, val))
-        entries.sort(key=lambda x: x[1], reverse=True)
-        if not entries:
-            return header + "*No data yet.*"
-        lines = [header]
-        for i, (name, val) in enumerate(entries[:10], 1):
-            lines.append(f"{_medal(i)} {name} — {int(val):,} {unit}")
-        return "\n".join(lines)
+    # ── name helpers (caches only – no HTTP) ──────────────────────────
 
-    # ── global helpers ────────────────────────────────────────────────
-
-    async def _global_users(self, filename: str, stat_key: str,
-                             title: str, unit: str) -> str:
-        """Top users across ALL servers — no guild filter.
-        Name resolution: economy.json cache → bot.get_user() → 'User {id}'."""
-        header = f"# {title}\n"
-        data   = _load_json(os.path.join(self.data_dir, filename))
-        # Build username cache from economy.json (most reliably has display names)
-        eco    = _load_json(os.path.join(self.data_dir, "economy.json"))
-        name_cache: Dict[str, str] = {
-            uid: d.get("username", f"User {uid}")
-            for uid, d in eco.items()
-            if uid.isdigit() and isinstance(d, dict)
-        }
+    def _member_name(self, guild: discord.Guild, user_id: int) -> str:
+        member = guild.get_member(user_id)
+        return member.display_name if member else self._user_name(user_id)
 
-        entries = []
-        for uid, d in data.items():
-            if not uid.isdigit() or not isinstance(d, dict):
-                continue
-            val = d.get(stat_key, 0)
-            if not isinstance(val, (int, float)) or val <= 0:
-                continue
-            if uid in name_cache:
-                name = name_cache[uid]
-            else:
-                user = self.bot.get_user(int(uid))
-                name = user.display_name if user else f"User {uid}"
-            entries.append((name, int(val)))
-
-        entries.sort(key=lambda x: x[1], reverse=True)
-        if not entries:
-            return header + "*No data yet.*"
-        lines = [header]
-        for i, (name, val) in enumerate(entries[:10], 1):
-            lines.append(f"{_medal(i)} {name} — {val:,} {unit}")
-        return "\n".join(lines)
+    def _user_name(self, user_id: int) -> str:
+        name = self.index.names.get(user_id)
+        if name:
+            return name
+        user = self.bot.get_user(user_id)
+        return user.display_name if user else f"User {user_id}"
 
     # ── slash command ─────────────────────────────────────────────────
 
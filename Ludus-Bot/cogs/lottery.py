@@ -1,5 +1,5 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 import json
 import os
@@ -7,6 +7,8 @@ import random
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 
+from utils.scheduler import scheduler
+
 
 def _parse_ts(s):
     """Parse ISO timestamp – handles both naive (old data) and tz-aware strings."""
@@ -29,9 +31,11 @@ class Lottery(commands.Cog):
         
         # Ticket price
         self.ticket_price = 100
-        
-        # Start the daily drawing loop
-        self.daily_drawing.start()
+
+    async def cog_load(self):
+        # One scheduler job at the drawing time instead of an hourly check
+        scheduler.register("lottery.drawing", self._run_drawing)
+        self._schedule_drawing()
     
     def load_data(self):
         """Load lottery data"""
@@ -60,22 +64,21 @@ class Lottery(commands.Cog):
         return next_drawing
     
     def cog_unload(self):
-        """Stop the task when cog unloads"""
-        self.daily_drawing.cancel()
-    
-    @tasks.loop(hours=1)
-    async def daily_drawing(self):
-        """Check if it's time for the daily drawing"""
-        now = discord.utils.utcnow()
-        next_drawing = _parse_ts(self.lottery_data["next_drawing"])
-        
-        if now >= next_drawing:
-            await self.conduct_drawing()
-    
-    @daily_drawing.before_loop
-    async def before_daily_drawing(self):
-        """Wait until bot is ready"""
+        """Stop drawings when cog unloads (the pending one stays scheduled)"""
+        scheduler.unregister("lottery.drawing")
+        scheduler.flush()
+
+    def _schedule_drawing(self):
+        """(Re)schedule the drawing job for lottery_data["next_drawing"]"""
+        scheduler.schedule("lottery.drawing", _parse_ts(self.lottery_data["next_drawing"]), key="lottery:drawing")
+
+    async def _run_drawing(self, job):
+        """Daily drawing, fired by the scheduler"""
         await self.bot.wait_until_ready()
+        if discord.utils.utcnow() >= _parse_ts(self.lottery_data["next_drawing"]):
+            await self.conduct_drawing()
+        else:
+            self._schedule_drawing()
     
     async def conduct_drawing(self):
         """Conduct the lottery drawing"""
@@ -84,6 +87,7 @@ class Lottery(commands.Cog):
             self.lottery_data["current_jackpot"] += 5000
             self.lottery_data["next_drawing"] = self.get_next_drawing_time().isoformat()
             self.save_data()
+            self._schedule_drawing()
             return
         
         # Select a random ticket
@@ -142,6 +146,7 @@ class Lottery(commands.Cog):
         self.lottery_data["last_drawing"] = discord.utils.utcnow().isoformat()
         self.lottery_data["next_drawing"] = self.get_next_drawing_time().isoformat()
         self.save_data()
+        self._schedule_drawing()
     
     @commands.group(name="lottery", invoke_without_command=True)
     async def lottery(self, ctx):
@@ -8,9 +8,13 @@ from discord.ext import commands
 from discord import app_commands
 import asyncio
 import random
+import time
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from utils.mafia_store import mafia_store
+from utils.scheduler import scheduler
+
 # ========================================
 # ROLE DEFINITIONS - EXPANDABLE SYSTEM
 # ========================================
@@ -1875,13 +1879,169 @@ class MafiaCog(commands.Cog):
         self.bot = bot
         self.active_lobbies = {}
         self.active_games = {}
+        self._phase_locks = {}  # lobby_id -> asyncio.Lock, one transition at a time
+
+    async def cog_load(self):
+        # Phase ends are persisted scheduler jobs ("mafia.phase", key mafia:<lobby>):
+        # no task per game, and games survive a restart via their snapshots
+        scheduler.register("mafia.phase", self._on_phase_deadline)
+        for lobby_id, game_state in mafia_store.load_all().items():
+            for pdata in game_state["players"].values():
+                pdata["role_info"] = self._lookup_role(game_state["theme"], game_state["mode"], pdata["role"])
+            self.active_games[lobby_id] = game_state
+        if self.active_games:
+            print(f"[Mafia] Restored {len(self.active_games)} running games")
+            asyncio.create_task(self._resume_games())
+
+    def cog_unload(self):
+        scheduler.unregister("mafia.phase")
+        scheduler.flush()
+        mafia_store.flush_now()
+
+    # ========================================
+    # PHASE ENGINE
+    # ========================================
+
+    @staticmethod
+    def _lookup_role(theme: str, mode: str, role_id: str):
+        db_key = f"{theme}_advanced" if mode in ["advanced", "custom"] else f"{theme}_normal"
+        for roles in ROLES_DATABASE.get(db_key, {}).values():
+            if role_id in roles:
+                return roles[role_id]
+        return None
+
+    def _save_game(self, lobby_id: str):
+        game_state = self.active_games.get(lobby_id)
+        if game_state:
+            mafia_store.save(lobby_id, game_state)
+
+    def _schedule_phase_end(self, lobby_id: str, delay: float):
+        """End the current phase `delay` seconds from now.
+
+        A deadline of an earlier phase is replaced; one already set for this
+        phase that is due sooner (everyone acted while the panels went out) is kept.
+        """
+        game_state = self.active_games[lobby_id]
+        key = f"mafia:{lobby_id}"
+        data = {"lobby_id": lobby_id, "phase": game_state["phase"], "day": game_state["day_number"]}
+        due = time.time() + delay
+        pending = scheduler.get(key)
+        if pending is None or pending.data != data or pending.due > due:
+            scheduler.schedule("mafia.phase", due, data, key=key)
+        self._save_game(lobby_id)
+
+    def _phase_complete(self, game_state: dict) -> bool:
+        """Has everyone who can act in this phase acted?"""
+        if game_state["phase"] == "vote":
+            return all(pid in game_state["votes"] for pid in game_state["alive_players"])
+        if game_state["phase"] == "night" and not game_state.get("voice_mode", False):
+            evil_faction = "MAFIA" if game_state["theme"] == "mafia" else "WEREWOLVES"
+            evil_alive = any(game_state["players"][pid]["faction"] == evil_faction for pid in game_state["alive_players"])
+            if evil_alive and evil_faction not in game_state["night_actions"]:
+                return False
+            return all(pid in game_state["power_actions"] for pid in game_state.get("awaiting", [])
+                       if game_state["players"][pid]["alive"])
+        return False
+
+    def _on_player_action(self, lobby_id: str):
+        """Persist a night action / vote; end the phase at once when nobody is left to act"""
+        game_state = self.active_games.get(lobby_id)
+        if not game_state:
+            return
+        if self._phase_complete(game_state):
+            game_state["closed"] = True
+            self._schedule_phase_end(lobby_id, 0)
+        else:
+            self._save_game(lobby_id)
+
+    async def _on_phase_deadline(self, job):
+        """Scheduler handler: move a game on from the phase recorded in the job"""
+        await self.bot.wait_until_ready()
+        lobby_id = job.data["lobby_id"]
+        async with self._phase_locks.setdefault(lobby_id, asyncio.Lock()):
+            game_state = self.active_games.get(lobby_id)
+            if (not game_state or game_state["phase"] != job.data["phase"]
+                    or game_state["day_number"] != job.data["day"]):
+                return  # stale deadline, the phase already ended
+            game_state["closed"] = True
+            phase = game_state["phase"]
+            if phase == "night":
+                await self._process_night(lobby_id)
+            elif phase == "day":
+                await self._vote_phase(lobby_id)
+            elif phase == "vote":
+                await self._process_votes(lobby_id)
+            elif phase == "ended":
+                await self._cleanup_game(lobby_id)
+
+    async def _resume_games(self):
+        """After a restart: re-post the controls of the phase each restored game is in"""
+        await self.bot.wait_until_ready()
+        for lobby_id, game_state in list(self.active_games.items()):
+            if scheduler.get(f"mafia:{lobby_id}") is None:
+                # Stopped between entering a phase and scheduling its end
+                self._schedule_phase_end(lobby_id, 0)
+                continue
+            if game_state.get("closed") or game_state["phase"] not in ("night", "vote"):
+                continue
+            lang = game_state["language"]
+            try:
+                main_channel = self.bot.get_channel(game_state["main_channel_id"])
+                await main_channel.send(
+                    f"♻️ {'Gra wznowiona po restarcie bota - panele akcji wysłane ponownie.' if lang == 'pl' else 'Game resumed after a bot restart - action panels were sent again.'}"
+                )
+                if game_state["phase"] == "vote":
+                    await self._vote_channel(game_state).send(
+                        f"## 🗳️ {'GŁOSOWANIE' if lang == 'pl' else 'VOTING'}", view=VoteView(self, lobby_id)
+                    )
+                    continue
+                evil_faction = "MAFIA" if game_state["theme"] == "mafia" else "WEREWOLVES"
+                if not game_state.get("voice_mode", False) and evil_faction not in game_state["night_actions"]:
+                    evil_channel = self.bot.get_channel(game_state["evil_channel_id"])
+                    await evil_channel.send(
+                        f"## 🔫 {'Wybierz ofiarę' if lang == 'pl' else 'Choose victim'}",
+                        view=NightActionView(self, lobby_id, evil_faction)
+                    )
+                await self._send_power_role_actions(lobby_id, only_pending=True)
+            except Exception as e:
+                print(f"[Mafia] Failed to resume {lobby_id}: {e}")
+
+    def _vote_channel(self, game_state: dict):
+        # Use game center text for voice mode, otherwise main channel
+        if game_state.get("voice_mode", False) and game_state.get("game_center_text_id"):
+            return self.bot.get_channel(game_state["game_center_text_id"])
+        return self.bot.get_channel(game_state["main_channel_id"])
+
+    async def _cleanup_game(self, lobby_id: str):
+        """Delete the game's channels and forget it"""
+        game_state = self.active_games.get(lobby_id)
+        if not game_state:
+            return
+        guild = self.bot.get_guild(game_state["guild_id"])
+        
+        # Delete category and all channels
+        try:
+            category = guild.get_channel(game_state["category_id"])
+            if category:
+                for channel in category.channels:
+                    await channel.delete()
+                await category.delete()
+        except Exception as e:
+            print(f"Failed to delete category: {e}")
+        
+        # Cleanup
+        del self.active_games[lobby_id]
+        if lobby_id in self.active_lobbies:
+            del self.active_lobbies[lobby_id]
+        self._phase_locks.pop(lobby_id, None)
+        mafia_store.delete(lobby_id)
     
     @app_commands.command(name="mafia", description="🕴️ Start a Mafia/Werewolf social deduction game")
     async def mafia_command(self, interaction: discord.Interaction):
         """Create a new Mafia/Werewolf lobby"""
         
         lobby_id = f"mafia_{interaction.channel.id}"
-        if lobby_id in self.active_lobbies:
+        if lobby_id in self.active_lobbies or lobby_id in self.active_games:
             await interaction.response.send_message("❌ A game is already active in this channel!", ephemeral=True)
             return
         
@@ -2132,8 +2292,9 @@ class MafiaCog(commands.Cog):
         
         await asyncio.sleep(5)
         
-        # Start first night
-        await self._night_phase(lobby_id)
+        # Start first night (under the phase lock, like every later phase change)
+        async with self._phase_locks.setdefault(lobby_id, asyncio.Lock()):
+            await self._night_phase(lobby_id)
     
     async def _send_roles_dm(self, game_state: dict):
         """Send role assignments via DM"""
@@ -2205,8 +2366,9 @@ class MafiaCog(commands.Cog):
             except Exception as e:
                 print(f"Failed to send DM to {player_id}: {e}")
     
-    async def _send_power_role_actions(self, lobby_id: str):
-        """Send action panels to power roles (detective, doctor, etc.)"""
+    async def _send_power_role_actions(self, lobby_id: str, only_pending: bool = False):
+        """Send action panels to power roles (detective, doctor, etc.)
+        only_pending: re-send to players who got a panel but have not acted yet"""
         game_state = self.active_games.get(lobby_id)
         if not game_state:
             return
@@ -2301,10 +2463,14 @@ class MafiaCog(commands.Cog):
         }
         
         # Find all alive power roles
+        panels = []
         for player_id, pdata in game_state["players"].items():
             if not pdata["alive"]:
                 continue
             
+            if only_pending and (player_id not in game_state.get("awaiting", []) or player_id in game_state["power_actions"]):
+                continue
+            
             power = pdata["role_info"].get("power")
             if not power or power in ["kill", "kill_leader", "lynch_win", "contract"]:
                 continue  # Skip evil killers and passive roles
@@ -2313,7 +2479,14 @@ class MafiaCog(commands.Cog):
             action_config = power_actions.get(power)
             if not action_config:
                 continue  # Skip powers without UI implementation yet
-            
+            panels.append((player_id, action_config))
+        
+        if not only_pending:
+            # Players with a panel; the night can end once they all act.  Set before the
+            # first DM goes out, so an early action never sees a partial list.
+            game_state["awaiting"] = [player_id for player_id, _ in panels]
+        
+        for player_id, action_config in panels:
             # Send action view via DM
             try:
                 user = await self.bot.fetch_user(player_id)
@@ -2326,6 +2499,8 @@ class MafiaCog(commands.Cog):
                 )
             except Exception as e:
                 print(f"Failed to send power role action to {player_id}: {e}")
+                if not only_pending:
+                    game_state["awaiting"].remove(player_id)  # no panel, nothing to wait for
     
     async def _process_power_role_actions(self, lobby_id: str):
         """Process power role actions and return investigation/tracking results"""
@@ -2726,6 +2901,7 @@ class MafiaCog(commands.Cog):
         
         game_state["day_number"] += 1
         game_state["phase"] = "night"
+        game_state["closed"] = False
         game_state["night_actions"] = {}
         game_state["power_actions"] = {}  # Reset power role actions
         
@@ -2772,6 +2948,10 @@ class MafiaCog(commands.Cog):
                     f"{'Wszyscy gracze przebywają w centrum.' if lang == 'pl' else 'All players stay at the center.'}"
                 )
         
+        # Power role panels (detective, doctor, etc.) go out first: they fill in
+        # game_state["awaiting"], which decides when the night is complete
+        await self._send_power_role_actions(lobby_id)
+        
         # Get evil players
         evil_players = [pid for pid, pdata in game_state["players"].items() 
                        if pdata["faction"] == evil_faction and pdata["alive"]]
@@ -2812,14 +2992,8 @@ class MafiaCog(commands.Cog):
                 except:
                     pass
         
-        # Send power role action panels (detective, doctor, etc.)
-        await self._send_power_role_actions(lobby_id)
-        
-        # Wait for night duration
-        await asyncio.sleep(game_state["night_duration"])
-        
-        # Process night actions
-        await self._process_night(lobby_id)
+        # Night actions are processed when the night ends (or once everyone has acted)
+        self._schedule_phase_end(lobby_id, game_state["night_duration"])
     
     async def _process_night(self, lobby_id: str):
         """Process night actions and move to day"""
@@ -2940,6 +3114,7 @@ class MafiaCog(commands.Cog):
             return
         
         game_state["phase"] = "day"
+        game_state["closed"] = False
         main_channel = self.bot.get_channel(game_state["main_channel_id"])
         lang = game_state["language"]
         guild = self.bot.get_guild(game_state["guild_id"])
@@ -2970,10 +3145,8 @@ class MafiaCog(commands.Cog):
             f"⏱️ {game_state['day_duration']}s"
         )
         
-        await asyncio.sleep(game_state["day_duration"])
-        
-        # Start voting phase
-        await self._vote_phase(lobby_id)
+        # Voting starts when the discussion time is up
+        self._schedule_phase_end(lobby_id, game_state["day_duration"])
     
     async def _vote_phase(self, lobby_id: str):
         """Execute voting phase"""
@@ -2982,13 +3155,10 @@ class MafiaCog(commands.Cog):
             return
         
         game_state["phase"] = "vote"
+        game_state["closed"] = False
         game_state["votes"] = {}
         
-        # Use game center text for voice mode, otherwise main channel
-        if game_state.get("voice_mode", False) and game_state.get("game_center_text_id"):
-            channel = self.bot.get_channel(game_state["game_center_text_id"])
-        else:
-            channel = self.bot.get_channel(game_state["main_channel_id"])
+        channel = self._vote_channel(game_state)
         
         lang = game_state["language"]
         guild = self.bot.get_guild(game_state["guild_id"])
@@ -3018,10 +3188,8 @@ class MafiaCog(commands.Cog):
             view=view
         )
         
-        await asyncio.sleep(game_state["vote_duration"])
-        
-        # Process votes
-        await self._process_votes(lobby_id)
+        # Votes are counted when time is up (or once every living player has voted)
+        self._schedule_phase_end(lobby_id, game_state["vote_duration"])
     
     async def _process_votes(self, lobby_id: str):
         """Process voting results"""
@@ -3092,7 +3260,6 @@ class MafiaCog(commands.Cog):
             return True
         
         main_channel = self.bot.get_channel(game_state["main_channel_id"])
-        guild = self.bot.get_guild(game_state["guild_id"])
         lang = game_state["language"]
         theme = game_state["theme"]
         
@@ -3141,23 +3308,9 @@ class MafiaCog(commands.Cog):
                 f"\n\n{'Kategoria zostanie usunięta za 60 sekund...' if lang == 'pl' else 'Category will be deleted in 60 seconds...'}"
             )
             
-            # Wait before cleanup
-            await asyncio.sleep(60)
-            
-            # Delete category and all channels
-            try:
-                category = guild.get_channel(game_state["category_id"])
-                if category:
-                    for channel in category.channels:
-                        await channel.delete()
-                    await category.delete()
-            except Exception as e:
-                print(f"Failed to delete category: {e}")
-            
-            # Cleanup
-            del self.active_games[lobby_id]
-            if lobby_id in self.active_lobbies:
-                del self.active_lobbies[lobby_id]
+            # Channels are deleted by the "ended" deadline
+            game_state["phase"] = "ended"
+            self._schedule_phase_end(lobby_id, 60)
             
             return True
         
@@ -3194,9 +3347,9 @@ class NightActionView(discord.ui.View):
         options = []
         for pid in targets[:25]:  # Max 25 options
             try:
-                role_info = game_state["players"][pid]["role_info"]
+                user = self.cog.bot.get_user(pid)
                 options.append(discord.SelectOption(
-                    label=f"Player {pid[:8]}...",
+                    label=f"{user.name}" if user else f"Player {str(pid)[:8]}...",
                     value=str(pid),
                     emoji="🎯"
                 ))
@@ -3225,10 +3378,15 @@ class NightActionView(discord.ui.View):
             await interaction.response.send_message("❌ You can't do that!", ephemeral=True)
             return
         
+        if game_state["phase"] != "night" or game_state.get("closed"):
+            await interaction.response.send_message("❌ The night is over!", ephemeral=True)
+            return
+        
         target = int(interaction.data['values'][0])
         game_state["night_actions"][self.faction] = target
         
         await interaction.response.send_message(f"✅ Target selected!", ephemeral=True)
+        self.cog._on_player_action(self.lobby_id)
 
 
 class PowerRoleActionView(discord.ui.View):
@@ -3306,6 +3464,10 @@ class PowerRoleActionView(discord.ui.View):
             await interaction.response.send_message("❌ Dead players can't act!", ephemeral=True)
             return
         
+        if game_state["phase"] != "night" or game_state.get("closed"):
+            await interaction.response.send_message("❌ The night is over!", ephemeral=True)
+            return
+        
         target = int(interaction.data['values'][0])
         
         # Record action
@@ -3329,6 +3491,7 @@ class PowerRoleActionView(discord.ui.View):
             f"✅ **{action_name} recorded!**\nTarget: <@{target}>",
             ephemeral=True
         )
+        self.cog._on_player_action(self.lobby_id)
 
 
 class VoteView(discord.ui.View):
@@ -3355,8 +3518,9 @@ class VoteView(discord.ui.View):
         options = []
         for pid in alive[:25]:  # Max 25 options
             try:
+                user = self.cog.bot.get_user(pid)
                 options.append(discord.SelectOption(
-                    label=f"Player {pid[:8]}...",
+                    label=f"{user.name}" if user else f"Player {str(pid)[:8]}...",
                     value=str(pid),
                     emoji="🗳️"
                 ))
@@ -3381,10 +3545,15 @@ class VoteView(discord.ui.View):
             await interaction.response.send_message("❌ You can't vote!", ephemeral=True)
             return
         
+        if game_state["phase"] != "vote" or game_state.get("closed"):
+            await interaction.response.send_message("❌ Voting is over!", ephemeral=True)
+            return
+        
         target = int(interaction.data['values'][0])
         game_state["votes"][interaction.user.id] = target
         
         await interaction.response.send_message(f"✅ Vote cast for <@{target}>!", ephemeral=True)
+        self.cog._on_player_action(self.lobby_id)
 
 
 async def setup(bot):
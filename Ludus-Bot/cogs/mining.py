@@ -4,10 +4,13 @@ from discord import app_commands
 import json
 import os
 import random
-import asyncio
 from datetime import datetime, timezone, timedelta
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import io
+from bisect import bisect_right
+from utils.mining_world import ChunkedWorld, hash_u32, hash_unit
+from utils.mining_render import BLOCK_SIZE, compose_background, get_atlas, viewport_cache
+from utils.render_service import render_service
 try:
     from utils.stat_hooks import us_inc as _m_inc
 except Exception:
@@ -24,6 +27,20 @@ def _parse_ts(s):
 class MiningGame:
     """Represents a single mining game session"""
     
+    # Generated world area: x in [WORLD_MIN_X, WORLD_MAX_X), y >= -1.
+    # Chunks are generated lazily, so depth is unbounded (the Abyss goes on);
+    # worlds from the old generator (version 1) stop at LEGACY_WORLD_DEPTH.
+    WORLD_MIN_X = -50
+    WORLD_MAX_X = 50
+    LEGACY_WORLD_DEPTH = 150
+    
+    # Terrain generator version for new worlds (1 = Random per block, 2 = integer hash)
+    WORLD_GEN = 2
+    
+    # Ores that may spawn cracked/irradiated (10% each world, derived from the seed)
+    STATEFUL_ORES = frozenset(["coal", "coal2", "iron", "gold", "redstone", "diamond", "emerald", "netherite", "ancient_debris"])
+    ORE_STATE_CHANCE = 0.10
+    
     BIOMES = {
         0: {"name": "Surface", "blocks": ["dirt", "stone", "coal"], "hardness": 1.0},
         10: {"name": "Underground", "blocks": ["stone", "coal", "iron"], "hardness": 1.2},
@@ -32,6 +49,9 @@ class MiningGame:
         75: {"name": "Ancient Depths", "blocks": ["deepslate", "diamond", "emerald", "netherite"], "hardness": 3.0},
         100: {"name": "Abyss", "blocks": ["bedrock", "netherite", "ancient_debris"], "hardness": 5.0}
     }
+    _BIOME_DEPTHS = sorted(BIOMES)
+    # Rare-ore candidates per biome for depth 10+ (biome blocks minus stone/deepslate)
+    _BIOME_ORES = {d: [b for b in biome["blocks"] if b not in ("stone", "deepslate")] for d, biome in BIOMES.items()}
     
     BLOCK_VALUES = {
         "dirt": 1, "stone": 2, "stone": 2, "coal": 5, "iron": 15, "gold": 50,
@@ -155,7 +175,7 @@ class MiningGame:
         # Map generation
         self.width = 11  # View width
         self.height = 10  # View height
-        self.map_data = {}  # {(x, y): block_type}
+        self.map_data = self._new_world()  # ChunkedWorld: {(x, y): block_type}
         self.last_map_regen = discord.utils.utcnow()
         
         # Placed structures
@@ -173,8 +193,114 @@ class MiningGame:
         
         self.generate_world()
         
+    def _new_world(self, version: int = None) -> ChunkedWorld:
+        """Empty chunked world whose baseline is generated from this game's seed"""
+        version = version or self.WORLD_GEN
+        return ChunkedWorld(self._generator(version), version=version)
+    
+    def _generator(self, version: int):
+        return self._terrain_block if version >= 2 else self._legacy_terrain_block
+    
+    def _terrain_block(self, x: int, y: int):
+        """Seed-generated baseline block at (x, y), or None outside the world.
+        
+        One integer hash per block (no Random objects): the low bits pick the
+        layer block, a second hash picks the rare ore.
+        """
+        if not (self.WORLD_MIN_X <= x < self.WORLD_MAX_X) or y < -1:
+            return None
+        if y <= 0:
+            if y == 0:
+                return "grass"
+            # Shop at y=-1 (above grass surface)
+            return "shop_left" if x == 4 else "shop_right" if x == 5 else "air"
+        
+        noise = hash_unit(self.seed, x, y)
+        if y >= 10:
+            # Probabilities: 60% stone2, 25% coal2, 10% iron, 5% rare biome ore
+            if noise < 0.60:
+                return "stone2"
+            if noise < 0.85:
+                return "coal2"
+            if noise < 0.95:
+                return "iron"
+            ores = self._BIOME_ORES[self._biome_depth(y)]
+            if not ores:
+                return "stone2"
+            block = ores[hash_u32(self.seed, x, y, 1) % len(ores)]
+            return "coal2" if block == "coal" else block
+        
+        blocks = self.BIOMES[self._biome_depth(y)]["blocks"]
+        if noise < 0.6:
+            return blocks[0]
+        if noise < 0.85:
+            return blocks[1] if len(blocks) > 1 else blocks[0]
+        if noise < 0.95:
+            return blocks[2] if len(blocks) > 2 else blocks[1]
+        return blocks[-1]
+    
+    def _legacy_terrain_block(self, x: int, y: int):
+        """Version 1 generator (random.Random per block) - kept so worlds saved
+        before the hash generator keep the baseline their chunks were diffed against"""
+        if not (self.WORLD_MIN_X <= x < self.WORLD_MAX_X) or not (-1 <= y < self.LEGACY_WORLD_DEPTH):
+            return None
+        
+        # Shop at y=-1 (above grass surface)
+        if y == -1:
+            if x == 4:  # Shop left
+                return "shop_left"
+            if x == 5:  # Shop right
+                return "shop_right"
+            return "air"
+        
+        # Surface (y=0) with grass
+        if y == 0:
+            return "grass"
+        
+        # Underground layers starting from y=1
+        biome = self.get_biome(y)
+        
+        # Stable procedural generation - deterministic seed per position
+        seed_value = (x * 73856093) ^ (y * 19349663) ^ self.seed
+        pos_rng = random.Random(seed_value)
+        noise = pos_rng.random()
+        blocks = biome["blocks"]
+        
+        # From depth 10+, use the second-layer palette (stone2/coal2/iron) with rare biome ores
+        if y >= 10:
+            # Probabilities: 60% stone2, 25% coal2, 10% iron, 5% rare biome ore
+            if noise < 0.60:
+                block = "stone2"
+            elif noise < 0.85:
+                block = "coal2"
+            elif noise < 0.95:
+                block = "iron"
+            else:
+                # Select ore from biome blocks (excluding stone/deepslate)
+                ores = [b for b in blocks if b not in ["stone", "deepslate"]]
+                if ores:
+                    block = pos_rng.choice(ores)
+                else:
+                    block = "stone2"
+            # Ensure 'coal' does not appear below depth 10 (use 'coal2' there)
+            return "coal2" if block == "coal" else block
+        
+        # Weight distribution (common blocks more frequent) for shallow depths (<10)
+        if noise < 0.6:
+            return blocks[0]  # Most common
+        elif noise < 0.85:
+            return blocks[1] if len(blocks) > 1 else blocks[0]
+        elif noise < 0.95:
+            return blocks[2] if len(blocks) > 2 else blocks[1]
+        return blocks[-1]  # Rarest
+    
     def generate_world(self, regenerate=False):
-        """Generate procedural world"""
+        """Generate procedural world.
+        
+        Terrain is not built here: chunks are generated on first access
+        (viewport, dynamite, structures), so this only places structures
+        and creatures.
+        """
         # If regenerating, clear EVERYTHING for fresh start
         if regenerate:
             self.structures = {}
@@ -183,79 +309,15 @@ class MiningGame:
             self.ladders = {}
             self.portals = {}
             self.portal_counter = 0
-            self.map_data = {}  # Clear all blocks including mined areas
+            self.map_data = self._new_world()  # Clear all blocks including mined areas
+            self.ore_states = {}
             self.other_players = {}  # Reset player positions
             # Reset player to spawn point
             self.x = 1
             self.y = -1
             # DON'T reset inventory - player keeps collected ores
         
-        # Generate shop at y=-1 (above grass surface)
-        for x in range(-50, 50):
-            if x == 4:  # Shop left
-                self.map_data[(x, -1)] = "shop_left"
-            elif x == 5:  # Shop right
-                self.map_data[(x, -1)] = "shop_right"
-            else:
-                self.map_data[(x, -1)] = "air"
-        
-        # Generate surface (y=0) with grass
-        for x in range(-50, 50):
-            self.map_data[(x, 0)] = "grass"
-        
-        # Generate underground layers starting from y=1
-        for y in range(1, 150):
-            biome = self.get_biome(y)
-            for x in range(-50, 50):
-                
-                # Stable procedural generation - deterministic seed per position
-                seed_value = (x * 73856093) ^ (y * 19349663) ^ self.seed
-                pos_rng = random.Random(seed_value)
-                noise = pos_rng.random()
-                blocks = biome["blocks"]
-                
-                # From depth 10+, use the second-layer palette (stone2/coal2/iron) with rare biome ores
-                if y >= 10:
-                    # Probabilities: 60% stone2, 25% coal2, 10% iron, 5% rare biome ore
-                    if noise < 0.60:
-                        block = "stone2"
-                    elif noise < 0.85:
-                        block = "coal2"
-                    elif noise < 0.95:
-                        block = "iron"
-                    else:
-                        # Select ore from biome blocks (excluding stone/deepslate)
-                        ores = [b for b in blocks if b not in ["stone", "deepslate"]]
-                        if ores:
-                            block = pos_rng.choice(ores)
-                        else:
-                            block = "stone2"
-                    self.map_data[(x, y)] = block
-                    continue
-                
-                # Weight distribution (common blocks more frequent) for shallow depths (<10)
-                if noise < 0.6:
-                    block = blocks[0]  # Most common
-                elif noise < 0.85:
-                    block = blocks[1] if len(blocks) > 1 else blocks[0]
-                elif noise < 0.95:
-                    block = blocks[2] if len(blocks) > 2 else blocks[1]
-                else:
-                    block = blocks[-1]  # Rarest
-                
-                self.map_data[(x, y)] = block
-        
-        # Ensure 'coal' does not appear below depth 10 (use 'coal2' there)
-        for (mx, my), mblock in list(self.map_data.items()):
-            if mblock == "coal" and my >= 10:
-                self.map_data[(mx, my)] = "coal2"
-        # Add ore states (cracked/irradiated) - 10% of ores get a state
-        valuable_ores = ["coal", "coal2", "iron", "gold", "redstone", "diamond", "emerald", "netherite", "ancient_debris"]
-        for (ox, oy), block_type in list(self.map_data.items()):
-            if block_type in valuable_ores:
-                if self.rng.random() < 0.10:  # 10% chance
-                    state = self.rng.choice(["cracked", "irradiated"])
-                    self.ore_states[(ox, oy)] = state
+        # Ore states (cracked/irradiated) are derived from the seed in get_ore_state
         
         # Generate structures on both first generation and regeneration
         self.generate_structures()
@@ -334,12 +396,29 @@ class MiningGame:
                     entrance_y = tunnel_y - tunnel_height + 2
                     self.map_data[(current_x, entrance_y)] = "mineshaft_entrance"
     
+    @classmethod
+    def _biome_depth(cls, depth: int) -> int:
+        i = bisect_right(cls._BIOME_DEPTHS, depth) - 1
+        return cls._BIOME_DEPTHS[max(i, 0)]
+    
     def get_biome(self, depth: int):
         """Get biome data for given depth"""
-        for min_depth in sorted(self.BIOMES.keys(), reverse=True):
-            if depth >= min_depth:
-                return self.BIOMES[min_depth]
-        return self.BIOMES[0]
+        return self.BIOMES[self._biome_depth(depth)]
+    
+    def get_ore_state(self, x: int, y: int):
+        """Ore state at (x, y): "cracked", "irradiated" or None.
+        
+        ore_states holds explicit states (all of them for version 1 worlds);
+        hash-generated worlds otherwise derive ~10% of ores' states from the seed.
+        """
+        state = self.ore_states.get((x, y))
+        if state is not None or self.map_data.version < 2:
+            return state
+        if self.map_data.get((x, y)) not in self.STATEFUL_ORES:
+            return None
+        if hash_unit(self.seed, x, y, 2) >= self.ORE_STATE_CHANCE:
+            return None
+        return "cracked" if hash_u32(self.seed, x, y, 3) & 1 else "irradiated"
     
     def get_block(self, x: int, y: int) -> str:
         """Get block at position"""
@@ -388,7 +467,7 @@ class MiningGame:
         energy_cost = max(1, int(biome["hardness"] / speed_bonus))
         
         # Check for irradiated ore (takes half of current energy)
-        ore_state = self.ore_states.get((x, y))
+        ore_state = self.get_ore_state(x, y)
         ore_state_msg = ""
         if ore_state == "irradiated":
             # Take half of current energy (minimum 1)
@@ -992,231 +1071,95 @@ class MiningGame:
             
             self.coins += achievement["reward"]
     
-    def render_map(self, bot=None) -> io.BytesIO:
-        """Render current view as image"""
-        block_size = 32
+    def _viewport_tiles(self, start_x: int, start_y: int) -> tuple:
+        """Static content of each visible cell (see mining_render.compose_background)"""
+        portal_names = {}
+        for portal_data in self.portals.values():
+            portal_names.setdefault((portal_data["x"], portal_data["y"]), portal_data["name"])
+        ladders, torches = self.ladders, self.torches
+        tiles = []
+        for world_y in range(start_y, start_y + self.height):
+            for world_x in range(start_x, start_x + self.width):
+                pos = (world_x, world_y)
+                tiles.append((
+                    self.get_block(world_x, world_y),
+                    self.get_ore_state(world_x, world_y),
+                    pos in ladders,
+                    pos in torches,
+                    portal_names.get(pos),
+                ))
+        return tuple(tiles)
+    
+    def _viewport_darkness(self, start_x: int, start_y: int):
+        """Darkness alpha per visible cell (darker the deeper you go, lit by torches), or None"""
+        if self.y <= 5:  # Surface level
+            return None
+        
+        # Calculate darkness intensity (0-240 alpha based on depth)
+        depth_factor = min((self.y - 5) / 55, 1.0)  # 0 at y=5, 1.0 at y=60
+        darkness_alpha = int(depth_factor * 240)
+        
+        # Torches light up to 5 blocks away - only those near the view matter
+        nearby_torches = [
+            (tx, ty) for tx, ty in self.torches
+            if start_x - 5 <= tx < start_x + self.width + 5 and start_y - 5 <= ty < start_y + self.height + 5
+        ]
+        alphas = []
+        for world_y in range(start_y, start_y + self.height):
+            for world_x in range(start_x, start_x + self.width):
+                light_distance = 999
+                for tx, ty in nearby_torches:
+                    distance = abs(tx - world_x) + abs(ty - world_y)
+                    if distance < light_distance:
+                        light_distance = distance
+                if light_distance <= 5:
+                    # Gradual light based on torch distance
+                    alphas.append(int(darkness_alpha * (light_distance / 6.0)))
+                else:
+                    alphas.append(darkness_alpha)
+        return tuple(alphas)
+    
+    def map_reset_enabled(self, bot=None) -> bool:
+        """Whether the 12h map reset applies (personal flag, or the guild's config for shared worlds)"""
+        if not self.is_shared:
+            # For singleplayer, check personal auto_reset_enabled flag
+            return self.auto_reset_enabled
+        if bot and self.guild_id:
+            # For shared world, check server config
+            server_config_cog = bot.get_cog("ServerConfig")
+            if server_config_cog:
+                config = server_config_cog.get_server_config(self.guild_id)
+                return config.get("mining_map_reset", True)
+        return True
+    
+    def render_map(self, bot=None, reset_enabled: bool = None) -> io.BytesIO:
+        """Render current view as image.
+        
+        Pure with respect to `self` when reset_enabled is given, so it can run
+        in a render worker process (bot is not picklable).
+        """
+        block_size = BLOCK_SIZE
         img_width = self.width * block_size
         img_height = self.height * block_size
-        
-        img = Image.new('RGB', (img_width, img_height), color=(135, 206, 235))
-        
-        # Cache for loaded textures
-        texture_cache = {}
-        
-        def load_texture(block_type: str) -> Image.Image:
-            """Load texture from assets folder"""
-            if block_type in texture_cache:
-                return texture_cache[block_type]
-            
-            # Map block types to asset files - use None for colored fallback
-            asset_map = {
-                #layer1
-                "air": "assets/mining/blocks/layer1/air.png",
-                "dirt": "assets/mining/blocks/layer1/dirt.png",
-                "grass": "assets/mining/blocks/layer1/grass.png",
-                "stone": "assets/mining/blocks/layer1/stone.png",
-                "coal": "assets/mining/blocks/layer1/coal.png",
-                #layer2
-                "stone2": "assets/mining/blocks/layer2/stone.png",
-                "coal2": "assets/mining/blocks/layer2/coal.png",
-                
-                "iron": None,  # Use color fallback for orange iron
-                "gold": None,  # Use color fallback for golden
-                "redstone": None,  # Use color fallback for red
-                "diamond": None,  # Use color fallback for cyan
-                "emerald": None,  # Use color fallback for green
-                "deepslate": None,  # Use color fallback
-                "netherite": None,  # Use color fallback
-                "ancient_debris": None,  # Use color fallback
-                "bedrock": None,  # Use color fallback
-                # Shop
-                "shop_left": "assets/mining/shop/shop1_left.png",
-                "shop_right": "assets/mining/shop/shop1_right.png",
-                # Structures
-                "mineshaft_wood": "assets/mining/structures/mineshaft/wood.png",
-                "mineshaft_support": "assets/mining/structures/mineshaft/support.png",
-                "mineshaft_rail": "assets/mining/structures/mineshaft/rail.png",
-                "mineshaft_entrance": "assets/mining/structures/mineshaft/entrance.png",
-            }
-            
-            asset_path = asset_map.get(block_type)
-            
-            # If no asset path or file doesn't exist, use colored fallback
-            if asset_path is None:
-                fallback = Image.new('RGBA', (block_size, block_size), self.BLOCK_COLORS.get(block_type, (0, 0, 0)))
-                texture_cache[block_type] = fallback
-                return fallback
-            
-            try:
-                texture = Image.open(asset_path).convert("RGBA")
-                texture = texture.resize((block_size, block_size), Image.LANCZOS)
-                texture_cache[block_type] = texture
-                return texture
-            except:
-                # Fallback to colored rectangle if asset missing
-                fallback = Image.new('RGBA', (block_size, block_size), self.BLOCK_COLORS.get(block_type, (0, 0, 0)))
-                texture_cache[block_type] = fallback
-                return fallback
+        atlas = get_atlas(self.BLOCK_COLORS)
         
         # Calculate view bounds (centered on player)
         start_x = self.x - self.width // 2
         start_y = self.y - self.height // 2
         
-        # Draw blocks
-        for dy in range(self.height):
-            for dx in range(self.width):
-                world_x = start_x + dx
-                world_y = start_y + dy
-                
-                # Get block type
-                block = self.get_block(world_x, world_y)
-                
-                # Load and paste texture
-                x1 = dx * block_size
-                y1 = dy * block_size
-                texture = load_texture(block)
-                img.paste(texture, (x1, y1), texture if texture.mode == 'RGBA' else None)
-                
-                # Draw ore state overlay if present
-                if (world_x, world_y) in self.ore_states:
-                    ore_state = self.ore_states[(world_x, world_y)]
-                    state_data = self.ORE_STATES.get(ore_state)
-                    if state_data:
-                        # Apply color modification
-                        try:
-                            # Create a semi-transparent overlay
-                            overlay = Image.new('RGBA', (block_size, block_size), (0, 0, 0, 0))
-                            overlay_draw = ImageDraw.Draw(overlay)
-                            
-                            if ore_state == "cracked":
-                                # Draw cracks across the block
-                                overlay_draw.line([(0, block_size//3), (block_size, block_size//2)], fill=(0, 0, 0, 150), width=2)
-                                overlay_draw.line([(0, 2*block_size//3), (block_size, block_size//2)], fill=(0, 0, 0, 150), width=2)
-                            elif ore_state == "irradiated":
-                                # Draw radioactive green tint
-                                overlay_draw.rectangle([0, 0, block_size, block_size], fill=(0, 255, 0, 60))
-                                # Draw radiation symbol
-                                center_x, center_y = block_size // 2, block_size // 2
-                            img.paste(overlay, (x1, y1), overlay)
-                        except:
-                            pass
-                
-                # Draw ladder overlay if placed here
-                if (world_x, world_y) in self.ladders:
-                    try:
-                        ladder_img = Image.open("assets/mining/items/ladder.png").convert("RGBA")
-                        ladder_img = ladder_img.resize((block_size, block_size), Image.LANCZOS)
-                        img.paste(ladder_img, (x1, y1), ladder_img)
-                    except:
-                        # Fallback: brown vertical lines
-                        draw_temp = ImageDraw.Draw(img)
-                        ladder_color = self.BLOCK_COLORS.get("ladder", (139, 90, 0))
-                        draw_temp.rectangle([x1 + 5, y1, x1 + 8, y1 + block_size], fill=ladder_color)
-                        draw_temp.rectangle([x1 + block_size - 8, y1, x1 + block_size - 5, y1 + block_size], fill=ladder_color)
-                
-                # Draw torch overlay if placed here
-                if (world_x, world_y) in self.torches:
-                    try:
-                        torch_img = Image.open("assets/mining/items/torch.png").convert("RGBA")
-                        torch_img = torch_img.resize((block_size // 2, block_size), Image.LANCZOS)
-                        img.paste(torch_img, (x1 + block_size // 4, y1), torch_img)
-                    except:
-                        # Fallback: yellow/orange glow
-                        draw_temp = ImageDraw.Draw(img)
-                        torch_color = self.BLOCK_COLORS.get("torch", (255, 200, 0))
-                        draw_temp.ellipse([x1 + block_size//3, y1 + 5, x1 + 2*block_size//3, y1 + block_size//2], fill=torch_color)
-                
-                # Draw portal overlay if placed here
-                for portal_id, portal_data in self.portals.items():
-                    if portal_data["x"] == world_x and portal_data["y"] == world_y:
-                        try:
-                            portal_img = Image.open("assets/mining/items/portal.png").convert("RGBA")
-                            portal_img = portal_img.resize((block_size, block_size), Image.LANCZOS)
-                            img.paste(portal_img, (x1, y1), portal_img)
-                            
-                            # Draw portal name ABOVE portal
-                            img_rgba = img.convert('RGBA')
-                            draw_temp = ImageDraw.Draw(img_rgba)
-                            try:
-                                portal_font = ImageFont.truetype("Arial.ttf", 10)
-                            except:
-                                portal_font = ImageFont.load_default()
-                            portal_name = portal_data["name"][:12]  # Limit name length
-                            # Get text size for background
-                            bbox = draw_temp.textbbox((0, 0), portal_name, font=portal_font)
-                            text_width = bbox[2] - bbox[0]
-                            text_height = bbox[3] - bbox[1]
-                            # Center text above portal
-                            text_x = x1 + (block_size - text_width) // 2
-                            text_y = y1 - text_height - 2
-                            # Draw semi-transparent background
-                            bg_padding = 2
-                            draw_temp.rectangle(
-                                [text_x - bg_padding, text_y - bg_padding,
-                                 text_x + text_width + bg_padding, text_y + text_height + bg_padding],
-                                fill=(138, 43, 226, 200)  # Purple background
-                            )
-                            # Draw text
-                            draw_temp.text((text_x, text_y), portal_name, fill=(255, 255, 255, 255), font=portal_font)
-                            img = img_rgba.convert('RGB')
-                        except:
-                            # Fallback: purple swirl
-                            draw_temp = ImageDraw.Draw(img)
-                            portal_color = (138, 43, 226)  # Purple
-                            draw_temp.ellipse([x1 + 5, y1 + 5, x1 + block_size - 5, y1 + block_size - 5], fill=portal_color, outline=(255, 255, 255), width=2)
-                            # Draw portal name above
-                            try:
-                                portal_font = ImageFont.truetype("Arial.ttf", 8)
-                            except:
-                                portal_font = ImageFont.load_default()
-                            portal_name = portal_data["name"][:8]  # Limit name length
-                            draw_temp.text((x1 + 2, y1 - 12), portal_name, fill=(255, 255, 255), font=portal_font)
-                        break
-        
-        # Apply darkness based on depth (darker the deeper you go)
-        if self.y > 5:  # Below surface level
-            darkness_overlay = Image.new('RGBA', (img_width, img_height), (0, 0, 0, 0))
-            darkness_draw = ImageDraw.Draw(darkness_overlay)
-            
-            # Calculate darkness intensity (0-240 alpha based on depth)
-            depth_factor = min((self.y - 5) / 55, 1.0)  # 0 at y=5, 1.0 at y=60
-            darkness_alpha = int(depth_factor * 240)
-            
-            # Draw darkness over entire map
-            for dy in range(self.height):
-                for dx in range(self.width):
-                    world_x = start_x + dx
-                    world_y = start_y + dy
-                    x1 = dx * block_size
-                    y1 = dy * block_size
-                    
-                    # Check if there's a torch nearby (within 5 blocks for brighter radius)
-                    lit = False
-                    light_distance = 999
-                    for tx, ty in self.torches.keys():
-                        distance = abs(tx - world_x) + abs(ty - world_y)
-                        if distance <= 5:  # Increased to 5 blocks
-                            lit = True
-                            light_distance = min(light_distance, distance)
-                    
-                    # Apply darkness if not lit by torch
-                    if not lit:
-                        darkness_draw.rectangle([x1, y1, x1 + block_size, y1 + block_size], 
-                                                fill=(0, 0, 0, darkness_alpha))
-                    else:
-                        # Gradual light based on torch distance (even brighter gradient)
-                        light_alpha = int(darkness_alpha * (light_distance / 6.0))  # Increased from 4.5 to 6.0
-                        darkness_draw.rectangle([x1, y1, x1 + block_size, y1 + block_size], 
-                                                fill=(0, 0, 0, light_alpha))
-            
-            img_rgba = img.convert('RGBA')
-            img_rgba = Image.alpha_composite(img_rgba, darkness_overlay)
-            img = img_rgba.convert('RGB')
+        # Terrain, placed items and darkness come from the viewport cache when this view was seen before
+        tiles = self._viewport_tiles(start_x, start_y)
+        darkness = self._viewport_darkness(start_x, start_y)
+        key = (tiles, darkness)
+        base = viewport_cache.get(key)
+        if base is None:
+            base = compose_background(atlas, tiles, darkness, self.width, self.height)
+            viewport_cache.put(key, base)
+        img = base.copy()
+        draw = ImageDraw.Draw(img)
         
         # Draw other players in multiplayer mode (before drawing current player)
         if self.is_shared and self.other_players:
-            img_rgba = img.convert('RGBA')
-            
             # Player colors for multiplayer
             player_colors = [
                 (255, 100, 100),  # Red
@@ -1228,148 +1171,71 @@ class MiningGame:
                 (255, 165, 0),    # Orange
                 (255, 192, 203),  # Pink
             ]
+            name_font = atlas.font(10)
             
             for idx, (other_user_id, other_data) in enumerate(self.other_players.items()):
-                other_x = other_data["x"]
-                other_y = other_data["y"]
-                
                 # Check if other player is in current view
-                view_dx = other_x - start_x
-                view_dy = other_y - start_y
+                view_dx = other_data["x"] - start_x
+                view_dy = other_data["y"] - start_y
                 
                 if 0 <= view_dx < self.width and 0 <= view_dy < self.height:
-                    # Draw other player as colored circle
+                    # Semi-transparent colored circle with white border
                     color = player_colors[idx % len(player_colors)]
-                    
-                    # Create a semi-transparent player marker
-                    marker_size = block_size
-                    marker = Image.new('RGBA', (marker_size, marker_size), (0, 0, 0, 0))
-                    marker_draw = ImageDraw.Draw(marker)
-                    
-                    center = marker_size // 2
-                    radius = marker_size // 3
-                    
-                    # Draw colored circle with border
-                    marker_draw.ellipse([center - radius, center - radius,
-                                       center + radius, center + radius],
-                                      fill=color + (200,),  # Add alpha
-                                      outline=(255, 255, 255, 255),
-                                      width=2)
-                    
-                    # Paste marker on map
+                    marker = atlas.marker(color + (200,), (255, 255, 255, 255))
                     paste_x = view_dx * block_size
                     paste_y = view_dy * block_size
-                    img_rgba.paste(marker, (paste_x, paste_y), marker)
+                    img.paste(marker, (paste_x, paste_y), marker)
                     
-                    # Draw username above player marker
+                    # Draw username above player marker, on a dark background
                     username = other_data.get("username", "Player")
-                    # Create small font for username
-                    try:
-                        name_font = ImageFont.truetype("assets/mining/fonts/Arial.ttf", 10)
-                    except:
-                        try:
-                            name_font = ImageFont.truetype("Arial.ttf", 10)
-                        except:
-                            name_font = ImageFont.load_default()
-                    
-                    # Draw username with background
-                    img_rgba_draw = ImageDraw.Draw(img_rgba)
-                    text_bbox = img_rgba_draw.textbbox((0, 0), username, font=name_font)
+                    text_bbox = draw.textbbox((0, 0), username, font=name_font)
                     text_width = text_bbox[2] - text_bbox[0]
                     text_height = text_bbox[3] - text_bbox[1]
-                    
-                    # Center text above marker
                     text_x = paste_x + (block_size - text_width) // 2
                     text_y = paste_y - text_height - 2
-                    
-                    # Draw semi-transparent background for text
                     bg_padding = 2
-                    img_rgba_draw.rectangle(
+                    draw.rectangle(
                         [text_x - bg_padding, text_y - bg_padding,
                          text_x + text_width + bg_padding, text_y + text_height + bg_padding],
-                        fill=(0, 0, 0, 180)
+                        fill=(0, 0, 0)
                     )
-                    
-                    # Draw text
-                    img_rgba_draw.text((text_x, text_y), username, fill=(255, 255, 255, 255), font=name_font)
-            
-            img = img_rgba.convert('RGB')
+                    draw.text((text_x, text_y), username, fill=(255, 255, 255), font=name_font)
         
         # Draw creatures
-        img_rgba = img.convert('RGBA')
         for creature_id, creature in self.creatures.items():
-            creature_x = creature["x"]
-            creature_y = creature["y"]
-            
             # Check if creature is in current view
-            view_dx = creature_x - start_x
-            view_dy = creature_y - start_y
+            view_dx = creature["x"] - start_x
+            view_dy = creature["y"] - start_y
             
             if 0 <= view_dx < self.width and 0 <= view_dy < self.height:
                 creature_type = creature["type"]
                 creature_data = self.CREATURE_TYPES[creature_type]
                 
-                # Draw creature as colored circle with emoji-like appearance
-                marker_size = block_size
-                marker = Image.new('RGBA', (marker_size, marker_size), (0, 0, 0, 0))
-                marker_draw = ImageDraw.Draw(marker)
-                
-                center = marker_size // 2
-                radius = marker_size // 3
-                
-                # Draw creature colored circle
-                creature_color = creature_data["color"]
-                marker_draw.ellipse([center - radius, center - radius,
-                                   center + radius, center + radius],
-                                  fill=creature_color + (220,),
-                                  outline=(0, 0, 0, 255),
-                                  width=2)
-                
-                # Paste marker on map
+                # Creature colored circle
+                marker = atlas.marker(creature_data["color"] + (220,), (0, 0, 0, 255))
                 paste_x = view_dx * block_size
                 paste_y = view_dy * block_size
-                img_rgba.paste(marker, (paste_x, paste_y), marker)
-                
-                # Draw creature type emoji/name above
-                creature_label = f"{creature_data['emoji']} {creature_type[:4]}"
-                try:
-                    creature_font = ImageFont.truetype("Arial.ttf", 8)
-                except:
-                    creature_font = ImageFont.load_default()
-                
-                img_rgba_draw = ImageDraw.Draw(img_rgba)
-                text_bbox = img_rgba_draw.textbbox((0, 0), creature_label, font=creature_font)
-                text_width = text_bbox[2] - text_bbox[0]
-                text_height = text_bbox[3] - text_bbox[1]
+                img.paste(marker, (paste_x, paste_y), marker)
                 
                 # Draw health bar
                 hp_width = block_size - 4
                 hp_height = 3
                 hp_x = paste_x + 2
                 hp_y = paste_y - 8
-                
-                # Health bar background
-                marker_draw_img = ImageDraw.Draw(img_rgba)
-                marker_draw_img.rectangle([hp_x, hp_y, hp_x + hp_width, hp_y + hp_height], fill=(100, 0, 0, 200))
-                
-                # Health bar fill
-                max_hp = self.CREATURE_TYPES[creature_type]["health"]
+                draw.rectangle([hp_x, hp_y, hp_x + hp_width, hp_y + hp_height], fill=(100, 0, 0))
+                max_hp = creature_data["health"]
                 current_hp = creature["health"]
                 hp_fill_width = int((current_hp / max_hp) * hp_width)
-                marker_draw_img.rectangle([hp_x, hp_y, hp_x + hp_fill_width, hp_y + hp_height], fill=(0, 255, 0, 255))
-        
-        img = img_rgba.convert('RGB')
+                draw.rectangle([hp_x, hp_y, hp_x + hp_fill_width, hp_y + hp_height], fill=(0, 255, 0))
         
         # Draw player overlay
         player_x = self.width // 2
         player_y = self.height // 2
-        try:
-            player_texture = Image.open("assets/mining/character/avatar.png").convert("RGBA")
-            player_texture = player_texture.resize((block_size, block_size), Image.LANCZOS)
+        player_texture = atlas.sprite("avatar")
+        if player_texture is not None:
             img.paste(player_texture, (player_x * block_size, player_y * block_size), player_texture)
-        except:
+        else:
             # Fallback to yellow circle if avatar missing
-            draw = ImageDraw.Draw(img)
             center_x = player_x * block_size + block_size // 2
             center_y = player_y * block_size + block_size // 2
             radius = block_size // 3
@@ -1378,48 +1244,20 @@ class MiningGame:
                        fill=self.BLOCK_COLORS["player"])
         
         # Draw UI overlay with stats
-        draw = ImageDraw.Draw(img)
-        
-        # Try to load font
-        try:
-            font = ImageFont.truetype("assets/mining/fonts/Arial.ttf", 14)
-            font_small = ImageFont.truetype("assets/mining/fonts/Arial.ttf", 12)
-        except:
-            try:
-                font = ImageFont.truetype("Arial.ttf", 14)
-                font_small = ImageFont.truetype("Arial.ttf", 12)
-            except:
-                font = ImageFont.load_default()
-                font_small = ImageFont.load_default()
+        font = atlas.font(14)
+        font_small = atlas.font(12)
         
         # UI background (semi-transparent dark overlay at top)
         ui_height = 35
-        overlay = Image.new('RGBA', (img_width, ui_height), (0, 0, 0, 180))
-        img_rgba = img.convert('RGBA')
-        img_rgba.paste(overlay, (0, 0), overlay)
-        img = img_rgba.convert('RGB')
-        draw = ImageDraw.Draw(img)
+        overlay = atlas.cached(("ui_bar", img_width), lambda: Image.new('RGBA', (img_width, ui_height), (0, 0, 0, 180)))
+        img.paste(overlay, (0, 0), overlay)
         
         # Draw stats with PNG icons
         inventory_size = sum(self.inventory.values())
-        icon_size = 20
-        
-        # Load UI icons
-        def load_ui_icon(path: str) -> Image.Image:
-            try:
-                icon = Image.open(path).convert("RGBA")
-                icon = icon.resize((icon_size, icon_size), Image.LANCZOS)
-                return icon
-            except:
-                # Return transparent fallback
-                return Image.new('RGBA', (icon_size, icon_size), (0, 0, 0, 0))
         
         # Energy icon and text (show "inf/inf" if infinite energy)
-        energy_icon = load_ui_icon("assets/mining/ui/energy.png")
-        img_rgba = img.convert('RGBA')
-        img_rgba.paste(energy_icon, (5, 3), energy_icon)
-        img = img_rgba.convert('RGB')
-        draw = ImageDraw.Draw(img)
+        energy_icon = atlas.icon("assets/mining/ui/energy.png")
+        img.paste(energy_icon, (5, 3), energy_icon)
         
         energy_text = "inf/inf" if self.infinite_energy else f"{self.energy}/{self.max_energy}"
         draw.text((28, 5), energy_text, fill=(255, 255, 100), font=font)
@@ -1438,11 +1276,8 @@ class MiningGame:
             draw.rectangle([bar_x, bar_y, bar_x + fill_width, bar_y + bar_height], fill=bar_color)
         
         # Coins icon and text
-        coins_icon = load_ui_icon("assets/mining/ui/coins.png")
-        img_rgba = img.convert('RGBA')
-        img_rgba.paste(coins_icon, (95, 3), coins_icon)
-        img = img_rgba.convert('RGB')
-        draw = ImageDraw.Draw(img)
+        coins_icon = atlas.icon("assets/mining/ui/coins.png")
+        img.paste(coins_icon, (95, 3), coins_icon)
         
         coins_text = f"{self.coins}"
         draw.text((118, 5), coins_text, fill=(255, 215, 0), font=font)
@@ -1450,11 +1285,8 @@ class MiningGame:
         # Inventory/backpack icon and text (show "blocks/inf" if infinite backpack)
         # Determine backpack level based on capacity
         backpack_level = (self.backpack_capacity - 20) // 10 + 1  # Level 1 = 20 cap, Level 2 = 30, etc.
-        backpack_icon = load_ui_icon(f"assets/mining/ui/backpack/backpack{backpack_level}.png")
-        img_rgba = img.convert('RGBA')
-        img_rgba.paste(backpack_icon, (228, 3), backpack_icon)
-        img = img_rgba.convert('RGB')
-        draw = ImageDraw.Draw(img)
+        backpack_icon = atlas.icon(f"assets/mining/ui/backpack/backpack{backpack_level}.png")
+        img.paste(backpack_icon, (228, 3), backpack_icon)
         
         if self.infinite_backpack:
             # Show inventory size when infinite (number of blocks, not value)
@@ -1466,32 +1298,20 @@ class MiningGame:
         draw.text((248, 5), inv_text, fill=inv_color, font=font)
         
         # Pickaxe icon and level
-        pickaxe_icon = load_ui_icon("assets/mining/ui/pickaxe.png")
-        img_rgba = img.convert('RGBA')
-        img_rgba.paste(pickaxe_icon, (300, 3), pickaxe_icon)
-        img = img_rgba.convert('RGB')
-        draw = ImageDraw.Draw(img)
+        pickaxe_icon = atlas.icon("assets/mining/ui/pickaxe.png")
+        img.paste(pickaxe_icon, (300, 3), pickaxe_icon)
         
         pick_text = f"Lv.{self.pickaxe_level}"
         draw.text((324, 5), pick_text, fill=(255, 255, 255), font=font)
         
         # Draw no energy warning in center if energy is 0
         if self.energy <= 0:
-            # Create warning overlay
-            try:
-                warning_font = ImageFont.truetype("assets/mining/fonts/Arial.ttf", 36)
-            except:
-                try:
-                    warning_font = ImageFont.truetype("Arial.ttf", 36)
-                except:
-                    warning_font = font
-            
+            warning_font = atlas.font(36)
             warning_text = "NO ENERGY!"
             
-            # Load energy icon for warning
-            energy_warning_icon = load_ui_icon("assets/mining/ui/energy.png")
+            # Energy icon for warning
             energy_warning_size = 40
-            energy_warning_icon = energy_warning_icon.resize((energy_warning_size, energy_warning_size), Image.LANCZOS)
+            energy_warning_icon = atlas.icon("assets/mining/ui/energy.png", energy_warning_size)
             
             # Get text size
             bbox = draw.textbbox((0, 0), warning_text, font=warning_font)
@@ -1511,21 +1331,13 @@ class MiningGame:
             bg_y1 = center_y - max(energy_warning_size, text_height) // 2 - padding
             bg_x2 = center_x + total_width // 2 + padding
             bg_y2 = center_y + max(energy_warning_size, text_height) // 2 + padding
-            
-            overlay_warning = Image.new('RGBA', (img_width, img_height), (0, 0, 0, 0))
-            draw_warning = ImageDraw.Draw(overlay_warning)
-            draw_warning.rectangle([bg_x1, bg_y1, bg_x2, bg_y2], fill=(139, 0, 0, 200))
-            
-            img_rgba = img.convert('RGBA')
-            img_rgba = Image.alpha_composite(img_rgba, overlay_warning)
+            bg_size = (bg_x2 - bg_x1 + 1, bg_y2 - bg_y1 + 1)
+            img.paste((139, 0, 0), (bg_x1, bg_y1, bg_x1 + bg_size[0], bg_y1 + bg_size[1]), Image.new('L', bg_size, 200))
             
             # Paste energy icon
             icon_x = center_x - total_width // 2
             icon_y = center_y - energy_warning_size // 2
-            img_rgba.paste(energy_warning_icon, (icon_x, icon_y), energy_warning_icon)
-            
-            img = img_rgba.convert('RGB')
-            draw = ImageDraw.Draw(img)
+            img.paste(energy_warning_icon, (icon_x, icon_y), energy_warning_icon)
             
             # Draw warning text
             text_x = icon_x + energy_warning_size + 12
@@ -1536,16 +1348,8 @@ class MiningGame:
         biome = self.get_biome(self.y)
         
         # Check if map reset is enabled
-        reset_enabled = True
-        if not self.is_shared:
-            # For singleplayer, check personal auto_reset_enabled flag
-            reset_enabled = self.auto_reset_enabled
-        elif bot and self.guild_id:
-            # For shared world, check server config
-            server_config_cog = bot.get_cog("ServerConfig")
-            if server_config_cog:
-                config = server_config_cog.get_server_config(self.guild_id)
-                reset_enabled = config.get("mining_map_reset", True)
+        if reset_enabled is None:
+            reset_enabled = self.map_reset_enabled(bot)
         
         # Calculate time until map reset or show "reset is off"
         if not reset_enabled:
@@ -1568,11 +1372,8 @@ class MiningGame:
         biome_text = f"{biome['name']} (Y: {self.y}) | {reset_text}"
         
         # Create semi-transparent background for biome text
-        biome_overlay = Image.new('RGBA', (img_width, 25), (0, 0, 0, 150))
-        img_rgba = img.convert('RGBA')
-        img_rgba.paste(biome_overlay, (0, 35), biome_overlay)
-        img = img_rgba.convert('RGB')
-        draw = ImageDraw.Draw(img)
+        biome_overlay = atlas.cached(("biome_bar", img_width), lambda: Image.new('RGBA', (img_width, 25), (0, 0, 0, 150)))
+        img.paste(biome_overlay, (0, 35), biome_overlay)
         
         # Draw biome text centered (only once!)
         bbox = draw.textbbox((0, 0), biome_text, font=font_small)
@@ -1582,7 +1383,7 @@ class MiningGame:
         
         # Convert to bytes
         buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
+        img.save(buffer, format='PNG', compress_level=1)  # fast zlib level: ~3x quicker, ~10% larger
         buffer.seek(0)
         return buffer
     
@@ -1602,10 +1403,7 @@ class MiningGame:
         return stats_text
     
     def to_dict(self) -> dict:
-        """Serialize game state to dictionary"""
-        # Convert map_data keys from tuples to strings for JSON
-        map_data_serialized = {f"{x},{y}": block for (x, y), block in self.map_data.items()}
-        
+        """Serialize game state to dictionary (world as modified chunks only)"""
         return {
             "user_id": self.user_id,
             "guild_id": self.guild_id,
@@ -1622,7 +1420,7 @@ class MiningGame:
             "inventory": self.inventory,
             "coins": self.coins,
             "last_map_regen": self.last_map_regen.isoformat(),
-            "map_data": map_data_serialized,
+            "world": self.map_data.to_dict(),
             "other_players": self.other_players,
             "infinite_energy": self.infinite_energy,
             "infinite_backpack": self.infinite_backpack,
@@ -1711,11 +1509,16 @@ class MiningGame:
             x, y = map(int, key.split(","))
             game.torches[(x, y)] = True
         
-        # Deserialize map_data
-        game.map_data = {}
-        for key, block in data["map_data"].items():
-            x, y = map(int, key.split(","))
-            game.map_data[(x, y)] = block
+        # Deserialize world: chunked format, or legacy {"x,y": block} map_data
+        if "world" in data:
+            world = data["world"]
+            game.map_data = ChunkedWorld.from_dict(world, game._generator(ChunkedWorld.version_of(world)))
+        else:
+            # Pre-chunk saves were generated (and had ore states assigned) by the version 1 generator
+            game.map_data = game._new_world(version=1)
+            for key, block in data.get("map_data", {}).items():
+                x, y = map(int, key.split(","))
+                game.map_data[(x, y)] = block  # only blocks that differ from the seed baseline mark chunks modified
         
         return game
 
@@ -1740,9 +1543,10 @@ class MiningView(discord.ui.LayoutView):
         # Regenerate energy before rendering
         view.game.regenerate_energy()
         
-        # Render map image in executor (prevents blocking)
-        loop = asyncio.get_event_loop()
-        map_image = await loop.run_in_executor(None, view.game.render_map, bot)
+        # Render map image in a render worker (prevents blocking)
+        map_image = await render_service.render_bytes_io(
+            view.game.render_map, reset_enabled=view.game.map_reset_enabled(bot)
+        )
         view.map_file = discord.File(map_image, filename="mining_map.png")
         
         # Build UI after render completes
@@ -1901,7 +1705,7 @@ class MiningView(discord.ui.LayoutView):
             visibility = "Public" if is_public else "Private"
             cog = modal_interaction.client.get_cog("Mining")
             if cog:
-                cog.save_data()
+                cog.save_data(self.game)
             await self.refresh(modal_interaction, f"🌀 Portal '{portal_name}' placed! ({visibility}, {self.game.items['portal']} left)")
         
         modal.on_submit = modal_callback
@@ -1959,7 +1763,7 @@ class MiningView(discord.ui.LayoutView):
             if success:
                 cog = interaction.client.get_cog("Mining")
                 if cog:
-                    cog.save_data()
+                    cog.save_data(self.game)
             await self.refresh(interaction, msg)
         
         elif action == "torch":
@@ -1967,7 +1771,7 @@ class MiningView(discord.ui.LayoutView):
             if success:
                 cog = interaction.client.get_cog("Mining")
                 if cog:
-                    cog.save_data()
+                    cog.save_data(self.game)
             await self.refresh(interaction, msg)
         
         elif action == "portal":
@@ -1979,7 +1783,7 @@ class MiningView(discord.ui.LayoutView):
             if success:
                 cog = interaction.client.get_cog("Mining")
                 if cog:
-                    cog.save_data()
+                    cog.save_data(self.game)
             await self.refresh(interaction, msg)
     
     async def toggle_reset_callback(self, interaction: discord.Interaction):
@@ -2170,9 +1974,10 @@ class MiningView(discord.ui.LayoutView):
             else:
                 message = "🔄 **Full map reset! (Ladders, portals, torches cleared. Inventory saved!)**"
         
-        # Render new map image in executor (prevents blocking)
-        loop = asyncio.get_event_loop()
-        map_image = await loop.run_in_executor(None, self.game.render_map, interaction.client)
+        # Render new map image in a render worker (prevents blocking)
+        map_image = await render_service.render_bytes_io(
+            self.game.render_map, reset_enabled=self.game.map_reset_enabled(interaction.client)
+        )
         self.map_file = discord.File(map_image, filename="mining_map.png")
         
         # Update display text
@@ -2401,7 +2206,7 @@ class MiningView(discord.ui.LayoutView):
                                 "username": username
                             }
             
-            cog.save_data()
+            cog.save_data(self.game)
 
 
 class OwnerMiningView(discord.ui.LayoutView):
@@ -2425,9 +2230,10 @@ class OwnerMiningView(discord.ui.LayoutView):
         # Regenerate energy before rendering
         view.game.regenerate_energy()
         
-        # Render map image in executor (prevents blocking)
-        loop = asyncio.get_event_loop()
-        map_image = await loop.run_in_executor(None, view.game.render_map, bot)
+        # Render map image in a render worker (prevents blocking)
+        map_image = await render_service.render_bytes_io(
+            view.game.render_map, reset_enabled=view.game.map_reset_enabled(bot)
+        )
         view.map_file = discord.File(map_image, filename="mining_map.png")
         
         # Build UI after render completes
@@ -2749,7 +2555,7 @@ class OwnerMiningView(discord.ui.LayoutView):
             visibility = "Public" if is_public else "Private"
             cog = modal_interaction.client.get_cog("Mining")
             if cog:
-                cog.save_data()
+                cog.save_data(self.game)
             await self.refresh(modal_interaction, f"🌀 Portal '{portal_name}' placed! ({visibility}, {self.game.items['portal']} left)")
         
         modal.on_submit = modal_callback
@@ -2807,7 +2613,7 @@ class OwnerMiningView(discord.ui.LayoutView):
             if success:
                 cog = interaction.client.get_cog("Mining")
                 if cog:
-                    cog.save_data()
+                    cog.save_data(self.game)
             await self.refresh(interaction, msg)
         
         elif action == "torch":
@@ -2815,7 +2621,7 @@ class OwnerMiningView(discord.ui.LayoutView):
             if success:
                 cog = interaction.client.get_cog("Mining")
                 if cog:
-                    cog.save_data()
+                    cog.save_data(self.game)
             await self.refresh(interaction, msg)
         
         elif action == "portal":
@@ -2827,7 +2633,7 @@ class OwnerMiningView(discord.ui.LayoutView):
             if success:
                 cog = interaction.client.get_cog("Mining")
                 if cog:
-                    cog.save_data()
+                    cog.save_data(self.game)
             await self.refresh(interaction, msg)
     
     async def dev_menu_callback(self, interaction: discord.Interaction):
@@ -2896,8 +2702,7 @@ class OwnerMiningView(discord.ui.LayoutView):
             await self.refresh(interaction, f"🗑️ Cleared {cleared} blocks in 5x5 area!")
         
         elif action == "forcereset":
-            # Force regenerate entire map - clear map_data first!
-            self.game.map_data = {}
+            # Force regenerate entire map (fresh chunked world)
             self.game.generate_world(regenerate=True)
             self.game.last_map_regen = discord.utils.utcnow()
             self.game.x = 5  # Reset to centerL!ownermine
@@ -2920,7 +2725,6 @@ class OwnerMiningView(discord.ui.LayoutView):
                     new_seed = int(seed_input.value)
                     self.game.seed = new_seed
                     self.game.rng = random.Random(new_seed)
-                    self.game.map_data = {}  # Clear map first!
                     self.game.generate_world(regenerate=True)
                     self.game.last_map_regen = discord.utils.utcnow()
                     self.game.x = 5
@@ -2965,7 +2769,7 @@ class OwnerMiningView(discord.ui.LayoutView):
                 emoji = creature_data.get("emoji", "🧟")
                 cog = interaction.client.get_cog("Mining")
                 if cog:
-                    cog.save_data()
+                    cog.save_data(self.game)
                 await self.refresh(interaction, f"{emoji} Spawned **{creature_type.title()}** at ({spawn_x}, {spawn_y})! HP: {creature_data['health']} | Patrol: {len(path)} waypoints")
             else:
                 await self.refresh(interaction, f"❌ Unknown creature type: {creature_type}")
@@ -2999,7 +2803,7 @@ class OwnerMiningView(discord.ui.LayoutView):
                         emoji = {"ladder": "🪜", "torch": "🔦", "portal": "🌀"}.get(item_type, "📦")
                         cog = modal_interaction.client.get_cog("Mining")
                         if cog:
-                            cog.save_data()
+                            cog.save_data(self.game)
                         await self.refresh(modal_interaction, f"{emoji} Added {quantity}x {item_type}! Total: {self.game.items[item_type]}")
                     except ValueError:
                         await self.refresh(modal_interaction, "❌ Invalid quantity! Please enter a number.")
@@ -3197,7 +3001,7 @@ class OwnerMiningView(discord.ui.LayoutView):
             
             cog = interaction.client.get_cog("Mining")
             if cog:
-                cog.save_data()
+                cog.save_data(self.game)
             
             await self.refresh(interaction, f"⛏️ Horizontal mineshaft generated! Length: {tunnel_length}, Height: {tunnel_height}")
         
@@ -3382,8 +3186,9 @@ class OwnerMiningView(discord.ui.LayoutView):
             else:
                 message = "🔄 **Full map reset! (Ladders, portals, torches cleared. Inventory saved!)**"
         
-        loop = asyncio.get_event_loop()
-        map_image = await loop.run_in_executor(None, self.game.render_map, interaction.client)
+        map_image = await render_service.render_bytes_io(
+            self.game.render_map, reset_enabled=self.game.map_reset_enabled(interaction.client)
+        )
         self.map_file = discord.File(map_image, filename="mining_map.png")
         
         display_text = f"# ⛏ MINING ADVENTURE [DEV MODE]\n\n{self.game.get_stats_text()}"
@@ -3752,7 +3557,7 @@ class OwnerMiningView(discord.ui.LayoutView):
                                 "username": username
                             }
             
-            cog.save_data()
+            cog.save_data(self.game)
 
 
 class Mining(commands.Cog):
@@ -3767,11 +3572,55 @@ class Mining(commands.Cog):
         if not os.access(_data_dir, os.W_OK):
             _data_dir = os.path.join(os.getcwd(), "data")
         os.makedirs(_data_dir, exist_ok=True)
+        # Legacy single-file save (migrated once into the per-game layout below)
         self.data_file = os.path.join(_data_dir, "mining_data.json")
+        # One file per personal game / shared world: mining/personal/<user_id>.json,
+        # mining/shared/<guild_id>.json. Worlds only store chunks changed from the seed.
+        self.save_dir = os.path.join(_data_dir, "mining")
+        self._dirty_entries = set()  # {("personal", user_id) | ("shared", guild_id)}
         self.load_data()
     
+    def _entry_path(self, kind: str, key: int) -> str:
+        return os.path.join(self.save_dir, kind, f"{key}.json")
+    
+    def _write_entry(self, kind: str, key: int, payload: dict):
+        """Atomically write one game/world file"""
+        path = self._entry_path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_file = f"{path}.tmp"
+        with open(temp_file, 'w') as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(temp_file, path)
+    
+    def _load_shared_world(self, guild_id: int, world_data: dict):
+        # Shared world stores one map + multiple players
+        world_game = MiningGame.from_dict(world_data["world_data"])
+        self.shared_worlds[guild_id] = {
+            "world_data": world_game,
+            "players": world_data.get("players", {})
+        }
+    
     def load_data(self):
         """Load saved mining data"""
+        for kind in ("personal", "shared"):
+            folder = os.path.join(self.save_dir, kind)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    key = int(name[:-5])
+                    with open(os.path.join(folder, name), 'r') as f:
+                        data = json.load(f)
+                    if kind == "personal":
+                        self.active_games[key] = MiningGame.from_dict(data["game"])
+                    else:
+                        self._load_shared_world(key, data)
+                except Exception as e:
+                    print(f"[Mining] Error loading {kind}/{name}: {e}")
+        
+        # One-time migration from the old mining_data.json (full "x,y" map dumps)
         if os.path.exists(self.data_file):
             try:
                 with open(self.data_file, 'r') as f:
@@ -3780,47 +3629,56 @@ class Mining(commands.Cog):
                     # Load personal games (old format compatibility)
                     for user_id_str, game_data in data.get("games", {}).items():
                         user_id = int(user_id_str)
-                        game = MiningGame.from_dict(game_data)
-                        self.active_games[user_id] = game
+                        if user_id not in self.active_games:
+                            self.active_games[user_id] = MiningGame.from_dict(game_data)
                     
-                    # Load shared worlds (new format)
+                    # Load shared worlds
                     for guild_id_str, world_data in data.get("shared_worlds", {}).items():
                         guild_id = int(guild_id_str)
-                        # Shared world stores one map_data + multiple players
-                        world_game = MiningGame.from_dict(world_data["world_data"])
-                        self.shared_worlds[guild_id] = {
-                            "world_data": world_game,
-                            "players": world_data.get("players", {})
-                        }
-                        
+                        if guild_id not in self.shared_worlds:
+                            self._load_shared_world(guild_id, world_data)
+                
+                self.save_data(full=True)
+                os.replace(self.data_file, f"{self.data_file}.migrated")
+                print(f"[Mining] Migrated {self.data_file} to {self.save_dir}")
             except Exception as e:
                 print(f"[Mining] Error loading data: {e}")
                 pass
     
-    def save_data(self):
-        """Save mining data"""
-        os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-        
-        # Serialize all personal games
-        games_data = {}
-        for user_id, game in self.active_games.items():
-            games_data[str(user_id)] = game.to_dict()
-        
-        # Serialize shared worlds
-        shared_worlds_data = {}
-        for guild_id, world_info in self.shared_worlds.items():
-            shared_worlds_data[str(guild_id)] = {
-                "world_data": world_info["world_data"].to_dict(),
-                "players": world_info["players"]
-            }
+    def save_data(self, game: MiningGame = None, full: bool = False):
+        """Save mining data.
         
-        data = {
-            "games": games_data,
-            "shared_worlds": shared_worlds_data
-        }
+        Only games marked dirty (the `game` just played, shared worlds it
+        belongs to) or whose world has unsaved chunk changes are written;
+        `full=True` rewrites everything.
+        """
+        if game is not None:
+            if game.is_shared and game.guild_id in self.shared_worlds:
+                self._dirty_entries.add(("shared", game.guild_id))
+            else:
+                self._dirty_entries.add(("personal", game.user_id))
         
-        with open(self.data_file, 'w') as f:
-            json.dump(data, f, indent=4)
+        try:
+            # Personal games
+            for user_id, g in self.active_games.items():
+                if full or g.map_data.dirty or ("personal", user_id) in self._dirty_entries:
+                    self._write_entry("personal", user_id, {"version": 2, "game": g.to_dict()})
+                    g.map_data.mark_clean()
+            
+            # Shared worlds
+            for guild_id, world_info in self.shared_worlds.items():
+                world_game = world_info["world_data"]
+                if full or world_game.map_data.dirty or ("shared", guild_id) in self._dirty_entries:
+                    self._write_entry("shared", guild_id, {
+                        "version": 2,
+                        "world_data": world_game.to_dict(),
+                        "players": world_info["players"]
+                    })
+                    world_game.map_data.mark_clean()
+            
+            self._dirty_entries.clear()
+        except Exception as e:
+            print(f"[Mining] Error saving data: {e}")
         
         # NOTE: User storage recording removed from save_data() to avoid blocking.
         # User game states can be saved separately in async context if needed.
@@ -3996,7 +3854,7 @@ class Mining(commands.Cog):
             view.message = await ctx.send(view=view, files=[view.map_file])
         
         # Save game state
-        self.save_data()
+        self.save_data(game)
 
 
     async def show_shop(self, interaction: discord.Interaction, game: MiningGame):
@@ -8,6 +8,8 @@ import random
 import asyncio
 from datetime import datetime
 
+from utils.leaderboard_index import leaderboard_index
+
 # ==================== CUSTOM ROLE MANAGER ====================
 
 _OWNER_DATA_DIR = os.getenv("RENDER_DISK_PATH", "data")
@@ -545,6 +547,7 @@ class Owner(commands.Cog):
         user_data["total_value"] += fish_info["value"] * quantity
         
         fishing_cog.save_fishing_data()
+        leaderboard_index.set("fishing", member.id, user_data["total_catches"], guild_id=ctx.guild.id if ctx.guild else None)
         
         fish_name = fish_info["name"]
         await ctx.send(f"🎣 Gave **{quantity}x {fish_name}** to {member.mention}!")
@@ -9,10 +9,12 @@ import sys
 import os
 import json
 import re
+import time
 import aiohttp
 from difflib import get_close_matches
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.embed_styles import EmbedBuilder, Colors, Emojis
+from utils.knowledge_index import KnowledgeIndex, normalize_question
 
 class LudusPersonality(commands.Cog):
     # Forbidden word categories
@@ -138,8 +140,6 @@ class LudusPersonality(commands.Cog):
         data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
         if not os.path.exists(data_dir):
             os.makedirs(data_dir, exist_ok=True)
-        self.knowledge_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "knowledge.json")
-        self.knowledge_data = self._load_knowledge()
         
         # Ludus custom emojis
         self.ludus_emojis = {
@@ -581,10 +581,28 @@ class LudusPersonality(commands.Cog):
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.knowledge_path = os.path.join(base_dir, "knowledge.json")
         self.knowledge_lock = asyncio.Lock()
-        self.knowledge_mtime = None
-        self.knowledge_data = self._load_knowledge()
+        # (mtime_ns, size) of knowledge.json when it was last loaded or saved
+        self.knowledge_signature = None
+        self.knowledge_checked_at = 0.0
+        # Filled in cog_load (in a thread - indexing a large file takes a while)
+        self.knowledge_index = KnowledgeIndex()
+        self.knowledge_data = {}
+
+    async def cog_load(self):
+        await self._reload_knowledge()
+
+    # How often (seconds) to stat knowledge.json for edits made outside the bot
+    KNOWLEDGE_CHECK_INTERVAL = 10
+
+    def _knowledge_file_signature(self):
+        try:
+            stat = os.stat(self.knowledge_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
     
-    def _load_knowledge(self):
+    def _read_knowledge(self):
+        """(data, signature, index) for knowledge.json. BLOCKING - run it in a thread."""
         default_structure = {
             "identity": {},
             "faq": {},
@@ -595,16 +613,21 @@ class LudusPersonality(commands.Cog):
         try:
             with open(self.knowledge_path, 'r', encoding='utf-8') as knowledge_file:
                 data = json.load(knowledge_file)
-            try:
-                self.knowledge_mtime = os.path.getmtime(self.knowledge_path)
-            except OSError:
-                self.knowledge_mtime = None
+            signature = self._knowledge_file_signature()
         except (FileNotFoundError, json.JSONDecodeError):
             data = {key: value.copy() if isinstance(value, dict) else value for key, value in default_structure.items()}
-            self.knowledge_mtime = None
+            signature = None
         if "user_taught" not in data or not isinstance(data["user_taught"], dict):
             data["user_taught"] = {}
-        return data
+        # Normalise / index every key once per load instead of once per question
+        return data, signature, KnowledgeIndex(data)
+
+    async def _reload_knowledge(self):
+        # Under the lock so a reload can't drop an answer being taught meanwhile
+        async with self.knowledge_lock:
+            data, signature, index = await asyncio.to_thread(self._read_knowledge)
+            self.knowledge_data, self.knowledge_signature, self.knowledge_index = data, signature, index
+            self.knowledge_checked_at = time.monotonic()
 
     def _save_knowledge(self):
         directory = os.path.dirname(self.knowledge_path)
@@ -612,26 +635,19 @@ class LudusPersonality(commands.Cog):
             os.makedirs(directory, exist_ok=True)
         with open(self.knowledge_path, 'w', encoding='utf-8') as knowledge_file:
             json.dump(self.knowledge_data, knowledge_file, indent=2, ensure_ascii=True)
-        try:
-            self.knowledge_mtime = os.path.getmtime(self.knowledge_path)
-        except OSError:
-            self.knowledge_mtime = None
+        self.knowledge_signature = self._knowledge_file_signature()
 
-    def _refresh_knowledge_if_needed(self):
-        try:
-            current_mtime = os.path.getmtime(self.knowledge_path)
-        except OSError:
-            current_mtime = None
-        if current_mtime != self.knowledge_mtime:
-            self.knowledge_data = self._load_knowledge()
+    async def _refresh_knowledge_if_needed(self):
+        # Stat the file at most every KNOWLEDGE_CHECK_INTERVAL seconds, reload only when it changed
+        now = time.monotonic()
+        if now - self.knowledge_checked_at < self.KNOWLEDGE_CHECK_INTERVAL:
+            return
+        self.knowledge_checked_at = now
+        if self._knowledge_file_signature() != self.knowledge_signature:
+            await self._reload_knowledge()
 
     def _normalize_question_text(self, text):
-        cleaned = text.lower()
-        cleaned = re.sub(r"<@!?\\d+>", " ", cleaned)
-        # Keep apostrophes for things like "what's" or possessives, but remove other punctuation
-        cleaned = re.sub(r"[^a-z0-9\s']", " ", cleaned)
-        cleaned = re.sub(r"\s+", " ", cleaned).strip()
-        return cleaned
+        return normalize_question(text)
 
     def _looks_like_question(self, text):
         if not text:
@@ -712,40 +728,7 @@ class LudusPersonality(commands.Cog):
         matches = get_close_matches(normalized_question, candidate_list, n=1, cutoff=0.78)
         return matches[0] if matches else None
 
-    def _resolve_answer_entry(self, entry):
-        if isinstance(entry, dict):
-            return entry.get("answer")
-        return entry
-
-    def _match_from_dict(self, normalized_question, data):
-        if not isinstance(data, dict):
-            return None
-        
-        # Original simple check (unlikely to work with normalized question vs raw keys)
-        if normalized_question in data:
-            return self._resolve_answer_entry(data[normalized_question])
-            
-        # BETTER CHECK: normalize keys as we iterate
-        for key, value in data.items():
-            key_norm = self._normalize_question_text(key)
-            # Check for exact match of normalized versions
-            if key_norm == normalized_question:
-                return self._resolve_answer_entry(value)
-            # Check for containment (question inside key or key inside question)
-            if key_norm in normalized_question or normalized_question in key_norm:
-                return self._resolve_answer_entry(value)
-                
-        # Fuzzy match currently uses raw keys, which might fail if casing differs a lot
-        # But get_close_matches is somewhat robust. Let's try iterating with normalized keys for fuzzy too if needed.
-        # But for now, let's stick to the existing fuzzy logic but maybe lower the cutoff?
-        fuzzy_key = self._fuzzy_key(normalized_question, data.keys())
-        if fuzzy_key:
-            return self._resolve_answer_entry(data[fuzzy_key])
-            
-        return None
-
     def _get_known_answer(self, question_text):
-        self._refresh_knowledge_if_needed()
         normalized_question = self._normalize_question_text(question_text)
         knowledge = self.knowledge_data or {}
 
@@ -775,33 +758,23 @@ class LudusPersonality(commands.Cog):
                 return "I'm not sure I have a favorite for that yet!"
 
         # 2. User-taught answers
-        user_taught = knowledge.get("user_taught", {})
-        answer = self._match_from_dict(normalized_question, user_taught)
+        index = self.knowledge_index
+        answer = index.match("user_taught", normalized_question)
         if answer:
             return answer
 
         # 3. FAQ
-        faq_lookup = {
-            self._normalize_question_text(key): value
-            for key, value in knowledge.get("faq", {}).items()
-        }
-        answer = self._match_from_dict(normalized_question, faq_lookup)
+        answer = index.match("faq", normalized_question)
         if answer:
             return answer
 
         # 4. Identity
-        for key, value in knowledge.get("identity", {}).items():
-            key_norm = self._normalize_question_text(key)
-            if key_norm and key_norm in normalized_question:
-                return value
+        answer = index.match_identity(normalized_question)
+        if answer:
+            return answer
 
-        # 5. General knowledge
-        general_knowledge = knowledge.get("general_knowledge", {})
-        # Merge with generic "knowledge" key if present (legacy/flat structure)
-        if "knowledge" in knowledge and isinstance(knowledge["knowledge"], dict):
-            general_knowledge.update(knowledge["knowledge"])
-            
-        answer = self._match_from_dict(normalized_question, general_knowledge)
+        # 5. General knowledge (merged with the legacy flat "knowledge" key when the index is built)
+        answer = index.match("general_knowledge", normalized_question)
         if answer:
             return answer
 
@@ -812,13 +785,15 @@ class LudusPersonality(commands.Cog):
         async with self.knowledge_lock:
             if "user_taught" not in self.knowledge_data or not isinstance(self.knowledge_data["user_taught"], dict):
                 self.knowledge_data["user_taught"] = {}
-            self.knowledge_data["user_taught"][normalized_question] = {
+            entry = {
                 "question": question_text.strip(),
                 "answer": answer_text.strip(),
                 # Never store or post user ID
                 "taught_by": None,
                 "taught_at": discord.utils.utcnow().isoformat()
             }
+            self.knowledge_data["user_taught"][normalized_question] = entry
+            self.knowledge_index.add("user_taught", normalized_question, entry)
             self._save_knowledge()
         # Immediately flush to disk for persistence
         await asyncio.sleep(0.1)
@@ -997,7 +972,7 @@ class LudusPersonality(commands.Cog):
         else:
             personality = "default"
         # Always refresh knowledge before responding
-        self._refresh_knowledge_if_needed()
+        await self._refresh_knowledge_if_needed()
         if not self._check_cooldown(message.author.id):
             return
         content = message.content.lower()
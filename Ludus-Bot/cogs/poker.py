@@ -15,6 +15,8 @@ import os
 import json
 import requests
 from io import BytesIO
+from utils import poker_equity, poker_eval
+from utils.render_service import render_service
 try:
     from utils.stat_hooks import us_inc as _pk_inc, us_mg as _pk_mg
 except Exception:
@@ -36,6 +38,22 @@ def load_card_emoji_mapping():
         print("❌ Poker: Missing cards_emoji_mapping.json file")
         CARD_EMOJI_MAPPING = {}
 
+
+async def equity_for(hole, board, opponents, time_budget=0.15):
+    """Memoised Monte-Carlo equity, computed in the render worker pool."""
+    cached = poker_equity.equity_cache.get(hole, board, opponents)
+    if cached is not None:
+        return cached
+    try:
+        equity = await render_service.run(poker_equity.estimate, list(hole), list(board), opponents,
+                                          time_budget=time_budget, timeout=time_budget + 5)
+    except Exception as e:
+        print(f"[Poker] Equity estimate failed: {e}")
+        return None
+    poker_equity.equity_cache.put(hole, board, opponents, equity)
+    return equity
+
+
 def create_settings_view(lobby_id, settings):
     """Creates view with poker settings"""
     settings_view = discord.ui.View(timeout=60)
@@ -283,27 +301,46 @@ class PokerGame:
         player['folded'] = True
         return True
     
-    def bot_action(self, player):
-        """AI bota"""
+    def bot_action(self, player, equity=None):
+        """AI bota: compares Monte-Carlo equity with pot odds and sizes raises from the edge.
+
+        `equity` is normally computed off the event loop by the caller (see equity_for);
+        without it a short in-process estimate is used.
+        """
         to_call = self.current_bet - player['bet']
-        roll = random.random()
+        if equity is None:
+            equity = poker_equity.estimate(player['cards'], self.community_cards,
+                                           self.opponents_of(player), time_budget=0.05)
+        big_blind = self.settings['big_blind']
+        pot_odds = to_call / (self.pot + to_call) if to_call > 0 else 0.0
+        edge = equity - pot_odds
+        bluff = random.random() < 0.05
+        
+        # Strong hand (or the odd bluff): bet/raise proportionally to the edge
+        if (equity > 0.6 and edge > 0.15) or (bluff and to_call <= big_blind * 2):
+            room = player['stack'] - to_call
+            size = int(self.pot * min(1.0, max(edge, 0.25) * 1.5))
+            size = max(big_blind * 2, size // big_blind * big_blind)
+            size = min(size, room)
+            if size > 0:
+                success, amt = self.action_raise(player, size)
+                if success:
+                    return 'raise', amt
         
         if to_call == 0:
             return 'check', 0
         
-        if roll < 0.3:
+        # Not getting the price: fold (small chance to float a cheap bet)
+        if edge < -0.05 and not (to_call <= big_blind and random.random() < 0.15):
             self.action_fold(player)
             return 'fold', 0
-        elif roll < 0.9:
-            success, amt = self.action_call(player)
-            return 'call', amt
-        else:
-            raise_amt = self.settings['big_blind'] * 2
-            success, amt = self.action_raise(player, raise_amt)
-            if success:
-                return 'raise', amt
-            success, amt = self.action_call(player)
-            return 'call', amt
+        
+        success, amt = self.action_call(player)
+        return 'call', amt
+    
+    def opponents_of(self, player):
+        """Players still contesting the pot against `player`."""
+        return sum(1 for p in self.players if p is not player and not p['folded'])
     
     def next_player(self):
         start = self.current_player
@@ -350,19 +387,15 @@ class PokerGame:
             winner['stack'] += self.pot
             return [(winner, self.pot, None)]
         
-        results = []
-        for player in active:
-            all_cards = player['cards'] + self.community_cards
-            best_hand, ranking, high_cards = get_best_hand(all_cards)
-            results.append((player, best_hand, (ranking, high_cards)))
-        
-        results.sort(key=lambda x: (x[2][0], x[2][1]), reverse=True)
-        winners = [results[0]]
-        for i in range(1, len(results)):
-            if compare_hands(results[i][2], results[0][2]) == 0:
-                winners.append(results[i])
-            else:
-                break
+        # One table lookup per player; equal ranks are exact ties (same as compare_hands)
+        ranks = poker_eval.rank_batch([
+            [poker_eval.card_id(c) for c in player['cards'] + self.community_cards] for player in active
+        ])
+        best = max(ranks)
+        winners = [
+            (player, None, poker_eval.decode(int(rank)))
+            for player, rank in zip(active, ranks) if rank == best
+        ]
         
         win_amt = self.pot // len(winners)
         for winner, hand, evaluation in winners:
@@ -412,7 +445,7 @@ class PokerGameView(discord.ui.View):
         card_deck = get_player_card_deck(guild_id, interaction.user.id)
         
         # Generuj obrazek ręki (w osobnym wątku aby nie blokować event loop)
-        hand_image = await asyncio.to_thread(create_hand_image, hole_cards_str, background_url, card_deck)
+        hand_image = await render_service.render_file(create_hand_image, hole_cards_str, background_url, card_deck)
         
         # Also show best hand if there are community cards
         
@@ -615,6 +648,25 @@ class PokerActionView(discord.ui.View):
         await interaction.response.edit_message(view=self)
         self.stop()
     
+    @discord.ui.button(label="📊 My Equity", style=discord.ButtonStyle.secondary, row=2)
+    async def equity_btn(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user.id != self.player['user'].id:
+            await interaction.response.send_message("❌ Not your turn!", ephemeral=True)
+            return
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        opponents = self.game.opponents_of(self.player)
+        equity = await equity_for(self.player['cards'], self.game.community_cards, opponents, time_budget=0.25)
+        if equity is None:
+            await interaction.followup.send("❌ Couldn't estimate your equity right now.", ephemeral=True)
+            return
+        to_call = self.game.current_bet - self.player['bet']
+        text = f"📊 **Equity:** {equity * 100:.1f}% against {opponents} opponent{'s' if opponents != 1 else ''}"
+        if to_call > 0:
+            pot_odds = to_call / (self.game.pot + to_call)
+            verdict = "✅ calling is profitable" if equity >= pot_odds else "⚠️ you're not getting the price"
+            text += f"\n💰 **Pot odds:** {pot_odds * 100:.1f}% ({to_call} to win {self.game.pot}) - {verdict}"
+        await interaction.followup.send(text, ephemeral=True)
+    
     @discord.ui.button(label="🚪 Leave", style=discord.ButtonStyle.secondary, row=2)
     async def leave_btn(self, interaction: discord.Interaction, button: discord.ui.Button):
         if interaction.user.id != self.player['user'].id:
@@ -998,6 +1050,10 @@ class PokerCog(commands.Cog):
                 self.owner_ids = config.get('owner_ids', [])
         except Exception as e:
             print(f"❌ Error loading owner_ids from config.json: {e}")
+
+    async def cog_load(self):
+        # Build the hand-rank tables (~0.8 s) off the event loop, not at the first showdown
+        await asyncio.to_thread(poker_eval.warm)
     
     def get_economy_cog(self):
         """Get economy cog for balance operations"""
@@ -1156,7 +1212,8 @@ class PokerCog(commands.Cog):
                 
                 # Bot
                 if player['is_bot']:
-                    action, amt = game.bot_action(player)
+                    equity = await equity_for(player['cards'], game.community_cards, game.opponents_of(player))
+                    action, amt = game.bot_action(player, equity)
                     
                     # Save action
                     if action == 'check':
@@ -1382,7 +1439,7 @@ class PokerCog(commands.Cog):
         player_deck = get_player_card_deck(interaction.guild.id if interaction.guild else None, interaction.user.id)
         
         # Create visual comparison image
-        comparison_image = await asyncio.to_thread(
+        comparison_image = await render_service.render_file(
             create_fast_poker_comparison_image,
             interaction.user.display_name,
             player_cards,
@@ -1544,7 +1601,7 @@ Additionally, please remember that **the odds are always in favor of the house.
         card_deck = 'classic'
         
         # Generate table image (in separate thread to avoid blocking event loop)
-        table_image = await asyncio.to_thread(
+        table_image = await render_service.render_file(
             create_poker_table_image,
             community_cards_str,
             game.pot,
@@ -1665,7 +1722,7 @@ Additionally, please remember that **the odds are always in favor of the house.
         card_deck = 'classic'
         
         # Generate table image with revealed cards (in separate thread to not block event loop)
-        table_image = await asyncio.to_thread(
+        table_image = await render_service.render_file(
             create_poker_table_image,
             community_cards_str,
             game.pot,
@@ -1749,7 +1806,7 @@ Additionally, please remember that **the odds are always in favor of the house.
                 card_deck = get_player_card_deck(guild_id, p['user'].id)
                 
                 # Generate hand image (in a separate thread to avoid blocking the event loop)
-                hand_image = await asyncio.to_thread(create_hand_image, hole_cards_str, background_url, card_deck)
+                hand_image = await render_service.render_file(create_hand_image, hole_cards_str, background_url, card_deck)
                 
                 embed = discord.Embed(
                     title="🃏 Your Cards",
@@ -2054,109 +2111,16 @@ def evaluate_hand(cards):
     """
     if len(cards) != 5:
         return (0, [])
-    
-    # Sort cards by value
-    rank_values = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, 
-                   '9': 9, '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
-    
-    ranks = [rank_values[card[0]] for card in cards]
-    suits = [card[1] for card in cards]
-    ranks.sort(reverse=True)
-    
-    # count ranks
-    rank_counts = {}
-    for rank in ranks:
-        rank_counts[rank] = rank_counts.get(rank, 0) + 1
-    
-    counts = sorted(rank_counts.values(), reverse=True)
-    unique_ranks = sorted(rank_counts.keys(), reverse=True)
-    
-    # Check for flush
-    is_flush = len(set(suits)) == 1
-    
-    # Check for straight
-    is_straight = False
-    if len(set(ranks)) == 5:
-        if ranks[0] - ranks[4] == 4:
-            is_straight = True
-        # Check for Ace-2-3-4-5 (wheel)
-        elif ranks == [14, 5, 4, 3, 2]:
-            is_straight = True
-            ranks = [5, 4, 3, 2, 1]  # Ace has lower value in wheel
-    
-    # Royal Flush: 10-J-Q-K-A of the same suit
-    if is_flush and is_straight and ranks[0] == 14 and ranks[4] == 10:
-        return (9, ranks)
-    
-    # Straight Flush
-    if is_flush and is_straight:
-        return (8, ranks)
-    
-    # Four of a Kind
-    if counts == [4, 1]:
-        # Return four of a kind and kicker
-        four_rank = [r for r, c in rank_counts.items() if c == 4][0]
-        kicker = [r for r, c in rank_counts.items() if c == 1][0]
-        return (7, [four_rank, four_rank, four_rank, four_rank, kicker])
-    
-    # Full House
-    if counts == [3, 2]:
-        three_rank = [r for r, c in rank_counts.items() if c == 3][0]
-        pair_rank = [r for r, c in rank_counts.items() if c == 2][0]
-        return (6, [three_rank, three_rank, three_rank, pair_rank, pair_rank])
-    
-    # Flush
-    if is_flush:
-        return (5, ranks)
-    
-    # Straight
-    if is_straight:
-        return (4, ranks)
-    
-    # Three of a Kind
-    if counts == [3, 1, 1]:
-        three_rank = [r for r, c in rank_counts.items() if c == 3][0]
-        kickers = sorted([r for r, c in rank_counts.items() if c == 1], reverse=True)
-        return (3, [three_rank, three_rank, three_rank] + kickers)
-    
-    # Two Pair
-    if counts == [2, 2, 1]:
-        pairs = sorted([r for r, c in rank_counts.items() if c == 2], reverse=True)
-        kicker = [r for r, c in rank_counts.items() if c == 1][0]
-        return (2, [pairs[0], pairs[0], pairs[1], pairs[1], kicker])
-    
-    # Pair
-    if counts == [2, 1, 1, 1]:
-        pair_rank = [r for r, c in rank_counts.items() if c == 2][0]
-        kickers = sorted([r for r, c in rank_counts.items() if c == 1], reverse=True)
-        return (1, [pair_rank, pair_rank] + kickers)
-    
-    # High Card
-    return (0, ranks)
+    return poker_eval.evaluate(cards)
 
 def get_best_hand(cards):
     """
         Znajduje najlepszy układ 5 kart z 7 dostępnych.
         Zwraca (best_hand, ranking, high_cards)
     """
-    from itertools import combinations
-    
     if len(cards) < 5:
         return ([], 0, [])
-    
-    best_ranking = -1
-    best_high_cards = []
-    best_hand = []
-    
-    # Check all combinations of 5 cards
-    for combo in combinations(cards, 5):
-        ranking, high_cards = evaluate_hand(list(combo))
-        if ranking > best_ranking or (ranking == best_ranking and high_cards > best_high_cards):
-            best_ranking = ranking
-            best_high_cards = high_cards
-            best_hand = list(combo)
-    
-    return (best_hand, best_ranking, best_high_cards)
+    return poker_eval.best_hand(cards)
 
 def compare_hands(hand1_data, hand2_data):
     """
@@ -7,6 +7,7 @@ from datetime import datetime
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.embed_styles import EmbedBuilder, Colors, Emojis
+from utils.leaderboard_index import leaderboard_index
 import copy
 
 
@@ -170,15 +171,11 @@ class ProfileManager:
         profile = self.get_profile(user_id).copy()
 
         # --- Merge data/users/{id}.json stats (the primary stat-tracking store) ---
+        # Read through user_storage so unflushed write-behind changes are included
         try:
-            import json as _json
-            users_file = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-                "data", "users", f"{user_id}.json"
-            )
-            if os.path.exists(users_file):
-                with open(users_file, 'r', encoding='utf-8') as _f:
-                    _udata = _json.load(_f)
+            from utils import user_storage
+            _udata = user_storage.peek_user(user_id)
+            if _udata:
                 for k, v in _udata.get("stats", {}).items():
                     # Let the new per-user file win for numeric stats
                     if isinstance(v, (int, float)):
@@ -436,6 +433,7 @@ class ProfileManager:
             # Create missing stat keys on demand
             profile[stat_name] = amount
         self.save_profiles()
+        leaderboard_index.set_stat(user_id, stat_name, profile[stat_name])
         return True
     
     def set_stat(self, user_id, stat_name, value):
@@ -444,6 +442,7 @@ class ProfileManager:
         if stat_name in profile:
             profile[stat_name] = value
             self.save_profiles()
+            leaderboard_index.set_stat(user_id, stat_name, value)
             return True
         return False
     
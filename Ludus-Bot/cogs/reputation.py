@@ -6,6 +6,8 @@ import os
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 
+from utils.leaderboard_index import leaderboard_index
+
 
 def _parse_ts(s):
     """Parse ISO timestamp – handles both naive (old data) and tz-aware strings."""
@@ -205,6 +207,8 @@ class Reputation(commands.Cog):
             profile_cog.increment_stat(member.id, "reputation_received")
 
         new_total = user_rep["total_rep"]
+        leaderboard_index.set("reputation", member.id, new_total,
+                              guild_id=ctx.guild.id if ctx.guild else None, username=member.display_name)
         tier, color = self.get_rep_tier(new_total)
 
         embed = discord.Embed(
@@ -259,6 +263,8 @@ class Reputation(commands.Cog):
             profile_cog.increment_stat(ctx.author.id, "reputation_given")
 
         new_total = user_rep["total_rep"]
+        leaderboard_index.set("reputation", member.id, new_total,
+                              guild_id=ctx.guild.id if ctx.guild else None, username=member.display_name)
         tier, color = self.get_rep_tier(new_total)
 
         embed = discord.Embed(
@@ -1,8 +1,12 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
+import asyncio
 import json
 import os
+from collections import OrderedDict
+
+from utils.journal import TransactionJournal
 
 _STARBOARD_DATA_DIR = os.getenv("RENDER_DISK_PATH", "data")
 if not os.access(_STARBOARD_DATA_DIR, os.W_OK):
@@ -10,6 +14,13 @@ if not os.access(_STARBOARD_DATA_DIR, os.W_OK):
 os.makedirs(_STARBOARD_DATA_DIR, exist_ok=True)
 STARBOARD_FILE = os.path.join(_STARBOARD_DATA_DIR, "starboard.json")
 
+# Reactions on one message within this window collapse into a single board edit
+RENDER_DEBOUNCE_SECONDS = 3.0
+# Messages whose reaction counts are kept in memory (least recently used are dropped)
+TALLY_CACHE_SIZE = 2000
+# Fold the posted-messages journal into starboard.json once it holds this many records
+COMPACT_AFTER_RECORDS = 500
+
 
 def load_starboards():
     if not os.path.exists(STARBOARD_FILE):
@@ -29,6 +40,24 @@ def save_starboards(data):
     os.replace(tmp, STARBOARD_FILE)
 
 
+class _Tally:
+    """Live reaction count for one (message, emoji), kept up to date from raw events.
+
+    Seeded by a single fetch_message; after that every add/remove payload
+    is a +1/-1, so reactions never cost a REST call.
+    """
+
+    __slots__ = ("guild_id", "emoji", "message", "count", "seeding", "dirty")
+
+    def __init__(self, guild_id: str, emoji: str):
+        self.guild_id = guild_id
+        self.emoji = emoji
+        self.message = None
+        self.count = 0
+        self.seeding = True   # fetch in flight: its count already includes new reactions
+        self.dirty = False    # changed since the last render
+
+
 # ─── Visual helpers ───────────────────────────────────────────────────────────
 
 def _star_color(count: int, needed: int) -> discord.Color:
@@ -214,11 +243,52 @@ class Starboard(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.data = load_starboards()
+        # starboard.json is the last snapshot; posted_messages changes since then are journaled
+        self.journal = TransactionJournal(f"{STARBOARD_FILE}.journal")
+        for record in self.journal.replay():
+            self._apply_posted(record.get("k"), record.get("m"))
+        self.journal_task = None
+        self._tallies: "OrderedDict[str, _Tally]" = OrderedDict()
+        self._renders: dict = {}
         self._group = StarboardGroup(self)
         bot.tree.add_command(self._group)
 
+    async def cog_load(self):
+        self.journal_task = asyncio.create_task(self.journal.run())
+
     def cog_unload(self):
         self.bot.tree.remove_command(self._group.name)
+        if self.journal_task:
+            self.journal_task.cancel()
+        for task in list(self._renders.values()):
+            task.cancel()
+        try:
+            self._compact()
+        except Exception as e:
+            print(f"[Starboard] Failed to save on unload: {e}")
+
+    # ── Posted messages (journaled) ──────────────────────────────────────────
+
+    def _apply_posted(self, message_key, board_message_id):
+        if not message_key:
+            return
+        if board_message_id is None:
+            self.data["posted_messages"].pop(message_key, None)
+        else:
+            self.data["posted_messages"][message_key] = board_message_id
+
+    def _set_posted(self, message_key: str, board_message_id):
+        """Record a board post (or its removal) with one journal line instead of a full rewrite."""
+        self._apply_posted(message_key, board_message_id)
+        self.journal.append({"k": message_key, "m": board_message_id})
+        if self.journal.records >= COMPACT_AFTER_RECORDS:
+            self._compact()
+
+    def _compact(self):
+        """Fold the journal into starboard.json and start a fresh segment."""
+        self.journal.rotate()
+        save_starboards(self.data)
+        self.journal.discard_rotated()
 
     # ── Prefix commands (backwards compat) ───────────────────────────────────
 
@@ -353,6 +423,35 @@ class Starboard(commands.Cog):
     async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
         await self._process_reaction(payload)
 
+    @commands.Cog.listener()
+    async def on_raw_reaction_clear(self, payload: discord.RawReactionClearEvent):
+        self._reset_tallies(payload.guild_id, payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_clear_emoji(self, payload: discord.RawReactionClearEmojiEvent):
+        self._reset_tallies(payload.guild_id, payload.message_id, str(payload.emoji))
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        # The cached message is stale; the next reaction re-fetches it
+        guild_id = str(payload.guild_id) if payload.guild_id else None
+        for emoji in self.data["boards"].get(guild_id, {}):
+            self._tallies.pop(f"{guild_id}_{payload.message_id}_{emoji}", None)
+
+    def _reset_tallies(self, guild_id, message_id, only_emoji: str = None):
+        """All reactions (or one emoji's) were cleared: drop the count to 0 and re-render."""
+        if not guild_id:
+            return
+        guild_id = str(guild_id)
+        for emoji in self.data["boards"].get(guild_id, {}):
+            if only_emoji is not None and emoji != only_emoji:
+                continue
+            message_key = f"{guild_id}_{message_id}_{emoji}"
+            tally = self._tallies.get(message_key)
+            if tally is not None and not tally.seeding:
+                tally.count = 0
+                self._schedule_render(message_key, tally)
+
     async def _process_reaction(self, payload: discord.RawReactionActionEvent):
         if not payload.guild_id:
             return
@@ -364,73 +463,126 @@ class Starboard(commands.Cog):
         if emoji not in boards:
             return
 
-        guild = self.bot.get_guild(payload.guild_id)
-        if not guild:
-            return
-
         board = boards[emoji]
-        needed = board["amount"]
-        sb_channel = guild.get_channel(board["channel"])
-        if not sb_channel:
+        # Ignore messages inside the starboard channel itself
+        if payload.channel_id == board["channel"]:
             return
 
-        src_channel = guild.get_channel(payload.channel_id)
-        if not src_channel:
-            return
-
-        try:
-            message = await src_channel.fetch_message(payload.message_id)
-        except (discord.NotFound, discord.Forbidden):
-            return
-
-        # Ignore bots and messages inside the starboard channel itself
-        if message.author.bot or src_channel.id == sb_channel.id:
+        adding = getattr(payload, "event_type", None) == "REACTION_ADD"
+        message_key = f"{guild_id}_{payload.message_id}_{emoji}"
+        tally = self._tallies.get(message_key)
+        if tally is None:
+            tally = await self._seed_tally(payload, message_key, guild_id, emoji)
+            if tally is None:
+                return
+        else:
+            self._tallies.move_to_end(message_key)
+            if tally.seeding:
+                return  # the fetch in flight will count this reaction
+            tally.count = max(0, tally.count + (1 if adding else -1))
+
+        message = tally.message
+        if message.author.bot:
             return
 
         # Self-star guard (only block on ADD)
         if (
             not board.get("self_star", False)
-            and getattr(payload, "event_type", None) == "REACTION_ADD"
+            and adding
             and payload.user_id == message.author.id
         ):
             return
 
+        self._schedule_render(message_key, tally)
+
+    async def _seed_tally(self, payload, message_key: str, guild_id: str, emoji: str):
+        """Fetch the message once and start counting its reactions locally."""
+        guild = self.bot.get_guild(payload.guild_id)
+        src_channel = guild.get_channel(payload.channel_id) if guild else None
+        if not src_channel:
+            return None
+
+        tally = _Tally(guild_id, emoji)
+        self._tallies[message_key] = tally
+        while len(self._tallies) > TALLY_CACHE_SIZE:
+            self._tallies.popitem(last=False)
+        try:
+            message = await src_channel.fetch_message(payload.message_id)
+        except (discord.NotFound, discord.Forbidden, discord.HTTPException):
+            if self._tallies.get(message_key) is tally:
+                del self._tallies[message_key]
+            return None
+
         # Count current reactions
-        count = 0
         for r in message.reactions:
             if str(r.emoji) == emoji:
-                count = r.count
+                tally.count = r.count
                 break
+        tally.message = message
+        tally.seeding = False
+        return tally
+
+    # ── Debounced board rendering ────────────────────────────────────────────
+
+    def _schedule_render(self, message_key: str, tally: _Tally):
+        tally.dirty = True
+        if message_key not in self._renders:
+            self._renders[message_key] = asyncio.create_task(self._render_later(message_key, tally))
 
-        message_key = f"{guild_id}_{message.id}_{emoji}"
+    async def _render_later(self, message_key: str, tally: _Tally):
+        """Wait out the burst, then render the latest count; repeat while it keeps changing."""
+        try:
+            while True:
+                await asyncio.sleep(RENDER_DEBOUNCE_SECONDS)
+                # A newer tally replaces this one if the old one was evicted or reset
+                current = self._tallies.get(message_key)
+                if current is not None and not current.seeding:
+                    tally = current
+                tally.dirty = False
+                await self._render(message_key, tally)
+                if not tally.dirty:
+                    break
+        except Exception as e:
+            print(f"[Starboard] Failed to render {message_key}: {e}")
+        finally:
+            self._renders.pop(message_key, None)
+
+    async def _render(self, message_key: str, tally: _Tally):
+        """Bring the board post in line with the tally: one send, edit or delete."""
+        board = self.data["boards"].get(tally.guild_id, {}).get(tally.emoji)
+        if not board:
+            return
+        guild = self.bot.get_guild(int(tally.guild_id))
+        sb_channel = guild.get_channel(board["channel"]) if guild else None
+        if not sb_channel:
+            return
+
+        message, emoji = tally.message, tally.emoji
+        count = tally.count
+        needed = board["amount"]
         star_icon = _star_icon(count, needed)
-        header = f"{star_icon} **{count}** — {src_channel.mention}"
+        header = f"{star_icon} **{count}** — {message.channel.mention}"
 
         # Below threshold → remove existing post if any
+        stored = self.data["posted_messages"].get(message_key)
         if count < needed:
-            stored = self.data["posted_messages"].get(message_key)
             if stored:
                 try:
-                    old = await sb_channel.fetch_message(stored)
-                    await old.delete()
+                    await sb_channel.get_partial_message(stored).delete()
                 except Exception:
                     pass
-                del self.data["posted_messages"][message_key]
-                save_starboards(self.data)
+                self._set_posted(message_key, None)
             return
 
         embed = self._build_embed(message, emoji, count, needed)
 
-        # Update existing post
-        stored = self.data["posted_messages"].get(message_key)
+        # Update existing post (a partial message edits without fetching it first)
         if stored:
             try:
-                sb_msg = await sb_channel.fetch_message(stored)
-                await sb_msg.edit(content=header, embed=embed)
-                save_starboards(self.data)
+                await sb_channel.get_partial_message(stored).edit(content=header, embed=embed)
                 return
             except discord.NotFound:
-                del self.data["posted_messages"][message_key]
+                self._set_posted(message_key, None)
             except Exception as e:
                 print(f"[Starboard] Failed to update: {e}")
                 return
@@ -438,8 +590,7 @@ class Starboard(commands.Cog):
         # Create new post
         try:
             sb_msg = await sb_channel.send(content=header, embed=embed)
-            self.data["posted_messages"][message_key] = sb_msg.id
-            save_starboards(self.data)
+            self._set_posted(message_key, sb_msg.id)
         except Exception as e:
             print(f"[Starboard] Error posting: {e}")
 
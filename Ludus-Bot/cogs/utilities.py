@@ -1,5 +1,5 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 from discord.ui import View, Button
 from typing import Optional
@@ -9,6 +9,8 @@ import os
 import math
 from datetime import datetime, timezone
 
+from utils.scheduler import scheduler
+
 # Optional: Import your embed styles if you have them
 # from utils.embed_styles import EmbedBuilder, Colors, Emojis
 
@@ -79,7 +81,12 @@ class Utilities(commands.Cog):
         self.prefixes = self.load_json(self.prefix_file)
 
     async def cog_load(self):
-        self.check_reminders.start()
+        scheduler.register("reminder", self._deliver_reminder)
+        self._migrate_reminders()
+
+    def cog_unload(self):
+        scheduler.unregister("reminder")
+        scheduler.flush()
 
     # ---------- JSON Helpers ----------
     def load_json(self, path):
@@ -99,29 +106,47 @@ class Utilities(commands.Cog):
             print(f"Error saving {path}: {e}")
 
     # ---------- Reminders ----------
-    @tasks.loop(seconds=60)
-    async def check_reminders(self):
-        now = discord.utils.utcnow()
-        updated = False
-        for user_id, reminders in list(self.reminders.items()):
-            for reminder in reminders[:]:
-                remind_time = _parse_ts(reminder['time'])
-                if now >= remind_time:
-                    try:
-                        user = await self.bot.fetch_user(int(user_id))
-                        embed = discord.Embed(
-                            title="⏰ Reminder!",
-                            description=reminder['message'],
-                            color=Colors.PRIMARY
-                        )
-                        embed.set_footer(text=f"Set {reminder.get('set_ago', 'some time ago')}")
-                        await user.send(embed=embed)
-                    except:
-                        pass
-                    reminders.remove(reminder)
-                    updated = True
-        if updated:
-            self.save_json(self.reminders_file, self.reminders)
+    def schedule_reminder(self, user_id, when, message, set_ago=None, key=None):
+        """DM `message` to the user at `when` (survives restarts via the scheduler)."""
+        data = {"user_id": int(user_id), "message": message}
+        if set_ago:
+            data["set_ago"] = set_ago
+        return scheduler.schedule("reminder", when, data, key=key, replace=False)
+
+    def _migrate_reminders(self):
+        """Move reminders left in reminders.json into the scheduler, once."""
+        if not any(self.reminders.values()):
+            return
+        moved = 0
+        for user_id, reminders in self.reminders.items():
+            for reminder in reminders:
+                try:
+                    when = _parse_ts(reminder['time'])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                # Stable key: re-running after a crash mid-migration adds nothing twice
+                self.schedule_reminder(user_id, when, reminder.get('message', ''), reminder.get('set_ago'),
+                                       key=f"reminder:{user_id}:{reminder['time']}")
+                moved += 1
+        scheduler.flush()
+        self.reminders = {}
+        self.save_json(self.reminders_file, self.reminders)
+        print(f"[Utilities] Moved {moved} reminders to the scheduler")
+
+    async def _deliver_reminder(self, job):
+        await self.bot.wait_until_ready()
+        user_id = job.data["user_id"]
+        try:
+            user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+            embed = discord.Embed(
+                title="⏰ Reminder!",
+                description=job.data.get('message', ''),
+                color=Colors.PRIMARY
+            )
+            embed.set_footer(text=f"Set {job.data.get('set_ago', 'some time ago')}")
+            await user.send(embed=embed)
+        except (discord.NotFound, discord.Forbidden):
+            pass
 
     # ---------- Core Commands ----------
     @commands.command(name="ping")
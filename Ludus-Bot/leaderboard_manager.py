@@ -49,7 +49,7 @@ class LeaderboardManager:
         
         self.save_stats()
     
-    def update_peak(self, guild_id: int, stat_name: str, value: int, server_name: str = None):
+    def update_peak(self, guild_id: int, stat_name: str, value: int, server_name: str = None, save: bool = True):
         guild_key = str(guild_id)
         server_stats = self.get_server_stats(guild_id)
         
@@ -60,7 +60,8 @@ class LeaderboardManager:
         if server_name:
             server_stats["server_name"] = server_name
         
-        self.save_stats()
+        if save:
+            self.save_stats()
     
     def get_top_servers(self, stat_name: str, limit: int = 10) -> List[Tuple[str, str, int]]:
         sorted_servers = sorted(
@@ -1,8 +1,5 @@
-
-import asyncio
-import json
 import logging
-import os
+import sys
 from pathlib import Path
 from utils.database import db
 
@@ -12,78 +9,27 @@ logger = logging.getLogger("Migration")
 
 DATA_DIR = Path("data") / "users"
 
-async def migrate():
+def migrate(force: bool = False):
+    """One-shot import of data/users/*.json into the SQLite user_documents table.
+    force=True re-runs it for users still missing from SQLite; existing
+    documents are never overwritten by the (older) JSON files."""
     print("Starting migration...")
-    
-    # Initialize schema first
-    await asyncio.to_thread(db.initialize_schema)
-    
+
     if not DATA_DIR.exists():
         print(f"No user data directory found at {DATA_DIR}")
         return
 
-    files = list(DATA_DIR.glob("*.json"))
-    print(f"Found {len(files)} user files to migrate.")
-
-    for i, file_path in enumerate(files):
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            user_id = int(data.get("user_id", file_path.stem))
-            username = data.get("username", "unknown")
-            
-            # Upsert User
-            await asyncio.to_thread(db.upsert_user, user_id, username)
-            
-            # Migrate Stats
-            stats = data.get("stats", {})
-            for key, value in stats.items():
-                if isinstance(value, (int, float)):
-                    await asyncio.to_thread(db.update_stat, user_id, key, value)
-            
-            # Migrate Minigame Stats (flattened)
-            minigames = data.get("minigames", {}).get("by_game", {})
-            for game, game_stats in minigames.items():
-                for stat, val in game_stats.items():
-                    stat_key = f"minigame_{game}_{stat}"
-                    if isinstance(val, (int, float)):
-                        await asyncio.to_thread(db.update_stat, user_id, stat_key, val)
-            
-            # Migrate Recent Activity
-            activities = data.get("activity", {}).get("recent", [])
-            for act in activities[:10]:
-                t = act.get("time")
-                atype = act.get("type", "unknown")
-                aname = act.get("name", "unknown")
-                
-                # Use synchronous wrapper in async context
-                def _log():
-                    db.log_activity(user_id, atype, aname, t)
-                await asyncio.to_thread(_log)
+    marker = DATA_DIR / ".migrated"
+    if force and marker.exists():
+        marker.unlink()
 
-            # Migrate Game States
-            games = data.get("games", {})
-            for game_name, game_data in games.items():
-                # game_data is likely {"state": ..., "updated_at": ...}
-                state = game_data.get("state", {})
-                await asyncio.to_thread(db.save_game_state, user_id, game_name, json.dumps(state))
-
-            if (i + 1) % 10 == 0:
-                print(f"Migrated {i + 1}/{len(files)} users...")
-                
-        except Exception as e:
-            print(f"Failed to migrate {file_path.name}: {e}")
-
-    print("Migration complete.")
+    db.initialize_schema()
+    count = db.migrate_json_tree(DATA_DIR)
+    db.flush()
+    print(f"Migration complete: {count} users imported into {db.db_path}.")
 
 if __name__ == "__main__":
     from dotenv import load_dotenv
     load_dotenv()
-    
-    # Check if DB credentials exist
-    if not os.getenv("DATABASE_HOST"):
-        print("Error: DATABASE_HOST not set in .env")
-        exit(1)
-        
-    asyncio.run(migrate())
+
+    migrate(force="--force" in sys.argv)
@@ -0,0 +1,82 @@
+"""Sanity checks and speed benchmark for the chess bot engine (utils/chess_engine.py).
+
+Runs a handful of mate-in-N puzzles (the engine must find the mating move
+within its depth/time budget), then reports nodes per second from a fixed
+set of middlegame positions.  Run from the Ludus-Bot directory:
+
+    python scripts/bench_chess_engine.py [seconds per position]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import chess
+
+from utils.chess_engine import DIFFICULTY_LEVELS, MATE, Engine, choose_move
+
+# (FEN, mate in N moves, accepted first moves in UCI)
+MATE_PUZZLES = [
+    ("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1", 1, {"a1a8"}),                                        # back rank
+    ("r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4", 1, {"h5f7"}),      # scholar's mate
+    ("k7/8/2K5/8/8/8/8/1Q6 w - - 0 1", 1, {"b1b7"}),
+    ("r2qkb1r/pp2nppp/3p4/2pNN1B1/2BnP3/3P4/PPP2PPP/R2bK2R w KQkq - 1 1", 2, {"d5f6"}),        # Legal's mate
+    ("kbK5/pp6/1P6/8/8/8/8/R7 w - - 0 1", 2, {"a1a6"}),                                         # rook sacrifice
+    ("6k1/8/6K1/8/8/8/8/7R w - - 0 1", 2, {"g6f6", "h1f1"}),                                    # waiting move
+    ("r1b1kb1r/pppp1ppp/5q2/4n3/3KP3/2N3PN/PPP4P/R1BQ1B1R b kq - 0 1", 3, {"f8c5"}),           # king hunt
+]
+
+BENCH_POSITIONS = [
+    "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3",
+    "r1bq1rk1/ppp2ppp/2np1n2/2b1p3/2B1P3/2NP1N2/PPP2PPP/R1BQ1RK1 w - - 0 7",
+    "r2q1rk1/pp2bppp/2n1pn2/3p4/3P4/2NBPN2/PP3PPP/R2Q1RK1 w - - 0 10",
+    "2rq1rk1/pb2bppp/1p2pn2/8/2PP4/P2B1N2/1B3PPP/R2Q1RK1 b - - 0 14",
+    "8/5pk1/6p1/3R4/5P2/6PK/r7/8 w - - 0 40",
+]
+
+
+def check_mates(time_limit):
+    failures = 0
+    for fen, n, accepted in MATE_PUZZLES:
+        board = chess.Board(fen)
+        result = Engine().search(board, max_depth=2 * n + 1, time_limit=time_limit)
+        # Shortest mate: score is MATE minus the plies to mate (2N - 1)
+        ok = result.score == MATE - (2 * n - 1) and result.move.uci() in accepted
+        failures += not ok
+        print(f"  mate in {n}: {'ok  ' if ok else 'FAIL'} {result.move} "
+              f"(score {result.score}, depth {result.depth}, {result.elapsed * 1000:.0f} ms)")
+    return failures
+
+
+def bench_nps(time_limit):
+    total_nodes = total_time = 0
+    for fen in BENCH_POSITIONS:
+        result = Engine().search(chess.Board(fen), max_depth=64, time_limit=time_limit)
+        total_nodes += result.nodes
+        total_time += result.elapsed
+        print(f"  depth {result.depth:2d}  {result.nps:7d} nps  best {result.move}  score {result.score}")
+    print(f"  overall: {int(total_nodes / total_time)} nodes/s")
+
+
+def bench_levels():
+    board = chess.Board(BENCH_POSITIONS[1])
+    for level, cfg in DIFFICULTY_LEVELS.items():
+        start = time.perf_counter()
+        move = choose_move(board, level)
+        print(f"  {level:>6}: {move} in {(time.perf_counter() - start) * 1000:.0f} ms (budget {cfg['time']}s)")
+
+
+def main():
+    time_limit = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    print("Mate puzzles:")
+    failures = check_mates(time_limit)
+    print("Search speed:")
+    bench_nps(time_limit)
+    print("Difficulty levels:")
+    bench_levels()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
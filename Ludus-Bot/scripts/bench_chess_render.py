@@ -0,0 +1,105 @@
+"""Micro-benchmark for chess board rendering (cogs/chess_checkers.render_board).
+
+Compares the old per-square path (font lookup per piece, 25 text draws per
+outlined piece) with the cached sprite path, on random positions from real
+games.  Run from the Ludus-Bot directory:
+
+    python scripts/bench_chess_render.py [positions]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import chess
+from PIL import Image, ImageDraw, ImageFont
+
+from cogs.chess_checkers import (BOARD_THEMES, CHESS_BOARD_MARGIN, CHESS_SQUARE_SIZE, PIECE_FONT_NAMES,
+                                 PIECE_SYMBOLS, render_board)
+
+
+def legacy_render(board, last_move=None, board_theme='classic'):
+    """The renderer as it was before the sprite cache (image only, no PNG encode)."""
+    square_size, margin = CHESS_SQUARE_SIZE, CHESS_BOARD_MARGIN
+    img_size = 8 * square_size + 2 * margin
+    img = Image.new('RGB', (img_size, img_size), color=(50, 50, 50))
+    draw = ImageDraw.Draw(img)
+    theme = BOARD_THEMES.get(board_theme, BOARD_THEMES['classic'])
+    for row in range(8):
+        for col in range(8):
+            x = margin + col * square_size
+            y = margin + row * square_size
+            color = theme['light'] if (row + col) % 2 == 0 else theme['dark']
+            if last_move:
+                square = chess.square(col, 7 - row)
+                if square in (last_move.from_square, last_move.to_square):
+                    color = tuple(int(c * 0.7 + 255 * 0.3) for c in color)
+            draw.rectangle([x, y, x + square_size, y + square_size], fill=color)
+            piece = board.piece_at(chess.square(col, 7 - row))
+            if piece:
+                piece_char = PIECE_SYMBOLS.get(piece.symbol(), piece.symbol())
+                font = None
+                for font_name in PIECE_FONT_NAMES:
+                    try:
+                        font = ImageFont.truetype(font_name, 64)
+                        break
+                    except Exception:
+                        continue
+                font = font or ImageFont.load_default()
+                bbox = draw.textbbox((0, 0), piece_char, font=font)
+                text_x = x + (square_size - (bbox[2] - bbox[0])) // 2
+                text_y = y + (square_size - (bbox[3] - bbox[1])) // 2 - 5
+                outline = (40, 40, 40) if piece.color == chess.WHITE else (220, 220, 220)
+                fill = (255, 255, 255) if piece.color == chess.WHITE else (0, 0, 0)
+                for dx in (-2, -1, 0, 1, 2):
+                    for dy in (-2, -1, 0, 1, 2):
+                        if dx or dy:
+                            draw.text((text_x + dx, text_y + dy), piece_char, fill=outline, font=font)
+                draw.text((text_x, text_y), piece_char, fill=fill, font=font)
+    try:
+        label_font = ImageFont.truetype("arial.ttf", 20)
+    except Exception:
+        label_font = ImageFont.load_default()
+    for i in range(8):
+        letter = chr(ord('a') + i)
+        x = margin + i * square_size + square_size // 2 - 5
+        draw.text((x, img_size - margin + 5), letter, fill='white', font=label_font)
+        draw.text((x, 5), letter, fill='white', font=label_font)
+        y = margin + i * square_size + square_size // 2 - 10
+        draw.text((5, y), str(8 - i), fill='white', font=label_font)
+        draw.text((img_size - margin + 5, y), str(8 - i), fill='white', font=label_font)
+    return img
+
+
+def random_positions(n, seed=1):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < n:
+        board = chess.Board()
+        for _ in range(rng.randint(0, 60)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        last = board.peek() if board.move_stack else None
+        positions.append((board, last, rng.choice(list(BOARD_THEMES))))
+    return positions
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    positions = random_positions(n)
+    render_board(*positions[0])  # warm the caches once, as a long-running worker would be
+
+    for label, fn in (("legacy", legacy_render), ("cached sprites", render_board)):
+        start = time.perf_counter()
+        for board, last, theme in positions:
+            fn(board, last, theme)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>15}: {elapsed * 1000 / n:7.3f} ms/board ({n} boards)")
+
+
+if __name__ == "__main__":
+    main()
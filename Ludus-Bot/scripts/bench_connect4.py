@@ -0,0 +1,253 @@
+"""Solver checks and speed benchmark for the Connect-4 AI (utils/connect4_engine.py).
+
+Checks the bitboard primitives against the grid rules, the solver against
+a brute-force minimax on random endgames, and a few tactical positions.
+Then compares positions searched per second with the old list-of-lists
+minimax (copied below as it was in cogs/boardgames.py).  Run from the
+Ludus-Bot directory:
+
+    python scripts/bench_connect4.py [positions]
+"""
+import os
+import random
+import sys
+import time
+from functools import lru_cache
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.connect4_engine import CELLS, HEIGHT, WIDTH, WIN, Position, Solver, best_move
+
+AI, PLAYER = "Y", "R"
+
+
+# ---------------------------------------------------------------------------
+# Legacy minimax (grid copies + full heuristic rescan), with a node counter
+# ---------------------------------------------------------------------------
+
+class Legacy:
+    def __init__(self):
+        self.nodes = 0
+
+    def check_winner(self, board, row, col):
+        symbol = board[row][col]
+        if symbol == " ":
+            return False
+        for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            count = 1
+            r, c = row + dr, col + dc
+            while 0 <= r < 6 and 0 <= c < 7 and board[r][c] == symbol:
+                count += 1; r += dr; c += dc
+            r, c = row - dr, col - dc
+            while 0 <= r < 6 and 0 <= c < 7 and board[r][c] == symbol:
+                count += 1; r -= dr; c -= dc
+            if count >= 4:
+                return True
+        return False
+
+    def is_terminal(self, board):
+        for r in range(6):
+            for c in range(7):
+                if board[r][c] != " " and self.check_winner(board, r, c):
+                    return True
+        return all(board[0][c] != " " for c in range(7))
+
+    def score_window(self, window, ai, opp):
+        a, o, e = window.count(ai), window.count(opp), window.count(" ")
+        if a == 4: return 1_000_000
+        if o == 4: return -1_000_000
+        if a == 3 and e == 1: return 50
+        if a == 2 and e == 2: return 10
+        if o == 3 and e == 1: return -80
+        if o == 2 and e == 2: return -5
+        return 0
+
+    def heuristic(self, board, ai, opp):
+        score = sum(1 for r in range(6) if board[r][3] == ai) * 6
+        for r in range(6):
+            for c in range(4):
+                score += self.score_window(board[r][c:c + 4], ai, opp)
+        for c in range(7):
+            col = [board[r][c] for r in range(6)]
+            for r in range(3):
+                score += self.score_window(col[r:r + 4], ai, opp)
+        for r in range(3):
+            for c in range(4):
+                score += self.score_window([board[r + i][c + i] for i in range(4)], ai, opp)
+        for r in range(3, 6):
+            for c in range(4):
+                score += self.score_window([board[r - i][c + i] for i in range(4)], ai, opp)
+        return score
+
+    def drop_copy(self, board, col, symbol):
+        for r in range(5, -1, -1):
+            if board[r][col] == " ":
+                nb = [row[:] for row in board]
+                nb[r][col] = symbol
+                return nb, r
+        return None, -1
+
+    def minimax(self, board, depth, alpha, beta, maximising, ai, opp):
+        self.nodes += 1
+        available = [c for c in range(7) if board[0][c] == " "]
+        if depth == 0 or not available or self.is_terminal(board):
+            return self.heuristic(board, ai, opp)
+        ordered = sorted(available, key=lambda c: abs(c - 3))
+        if maximising:
+            val = -10_000_000
+            for col in ordered:
+                nb, _ = self.drop_copy(board, col, ai)
+                val = max(val, self.minimax(nb, depth - 1, alpha, beta, False, ai, opp))
+                alpha = max(alpha, val)
+                if alpha >= beta:
+                    break
+            return val
+        val = 10_000_000
+        for col in ordered:
+            nb, _ = self.drop_copy(board, col, opp)
+            val = min(val, self.minimax(nb, depth - 1, alpha, beta, True, ai, opp))
+            beta = min(beta, val)
+            if alpha >= beta:
+                break
+        return val
+
+    def move(self, board, ai, opp, depth=5):
+        best_col, best = None, -10_000_000
+        for col in sorted((c for c in range(7) if board[0][c] == " "), key=lambda c: abs(c - 3)):
+            nb, _ = self.drop_copy(board, col, ai)
+            score = self.minimax(nb, depth, -10_000_000, 10_000_000, False, ai, opp)
+            if score > best:
+                best, best_col = score, col
+        return best_col
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def random_game(rng, plies):
+    """Random legal game of `plies` moves with no four-in-a-row; returns (grid, Position)."""
+    while True:
+        grid = [[" "] * WIDTH for _ in range(HEIGHT)]
+        pos, ok = Position(), True
+        for i in range(plies):
+            cols = [c for c in range(WIDTH) if pos.can_play(c) and not pos.is_winning_move(c)]
+            if not cols:
+                ok = False
+                break
+            c = rng.choice(cols)
+            pos.play(c)
+            row = max(r for r in range(HEIGHT) if grid[r][c] == " ")
+            grid[row][c] = PLAYER if i % 2 == 0 else AI
+        if ok:
+            return grid, pos
+
+
+@lru_cache(maxsize=None)
+def brute_force(current, mask, moves):
+    """Exact negamax score (same scale as the solver) by exhaustive search."""
+    pos = Position(current, mask, moves, None)
+    if moves == CELLS:
+        return 0
+    best = -WIN
+    for c in range(WIDTH):
+        if pos.can_play(c):
+            if pos.is_winning_move(c):
+                return WIN - moves - 1
+            child = pos.copy()
+            child.play(c)
+            best = max(best, -brute_force(child.current, child.mask, child.moves))
+    return best
+
+
+def check_primitives(rng):
+    legacy = Legacy()
+    for _ in range(300):
+        grid, pos = random_game(rng, rng.randint(0, 30))
+        for c in range(WIDTH):
+            if not pos.can_play(c):
+                continue
+            row = max(r for r in range(HEIGHT) if grid[r][c] == " ")
+            grid[row][c] = PLAYER if pos.moves % 2 == 0 else AI
+            expected = legacy.check_winner(grid, row, c)
+            grid[row][c] = " "
+            assert pos.is_winning_move(c) == expected, "win detection mismatch"
+    print("  bitboard primitives: ok")
+
+
+def check_endgames(rng, n=40, empties=10):
+    solver, failures = Solver(), 0
+    for _ in range(n):
+        _, pos = random_game(rng, CELLS - empties)
+        exact = brute_force(pos.current, pos.mask, pos.moves)
+        col, score, depth = solver.search(pos, time_limit=10.0)
+        child = pos.copy()
+        child.play(col)
+        achieved = WIN - pos.moves - 1 if pos.is_winning_move(col) else -brute_force(child.current, child.mask, child.moves)
+        if score != exact or achieved != exact:
+            failures += 1
+    print(f"  endgame solves vs brute force: {n - failures}/{n} exact")
+    return failures
+
+
+def check_tactics():
+    failures = 0
+    cases = [
+        ("010101", {0}, "take the vertical win"),
+        ("01010", {0}, "block the vertical threat"),
+        ("3344", {2, 5}, "make an open three"),
+    ]
+    for moves, expected, label in cases:
+        pos = Position.from_moves(moves)
+        col, score, _ = Solver().search(pos, time_limit=2.0)
+        ok = col in expected
+        failures += not ok
+        print(f"  {label}: {'ok  ' if ok else 'FAIL'} played {col} (score {score})")
+    return failures
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def bench(n):
+    rng = random.Random(7)
+    positions = [random_game(rng, rng.randint(4, 20)) for _ in range(n)]
+
+    legacy = Legacy()
+    start = time.perf_counter()
+    for grid, _ in positions:
+        legacy.move(grid, AI, PLAYER)
+    legacy_time = time.perf_counter() - start
+    print(f"  legacy minimax (depth 6): {legacy_time * 1000 / n:8.1f} ms/move  "
+          f"{int(legacy.nodes / legacy_time):7d} positions/s")
+
+    solver = Solver()
+    nodes = 0
+    start = time.perf_counter()
+    for grid, pos in positions:
+        solver.search(pos, max_depth=6, time_limit=30.0)
+        nodes += solver.nodes
+    fixed_time = time.perf_counter() - start
+    print(f"  bitboard (depth 6):       {fixed_time * 1000 / n:8.1f} ms/move  {int(nodes / fixed_time):7d} positions/s")
+
+    for level in ("medium", "hard"):
+        start = time.perf_counter()
+        for grid, pos in positions:
+            best_move(grid, AI if pos.moves % 2 else PLAYER, PLAYER if pos.moves % 2 else AI, level)
+        print(f"  best_move({level}):        {(time.perf_counter() - start) * 1000 / n:8.1f} ms/move")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rng = random.Random(1)
+    print("Checks:")
+    check_primitives(rng)
+    failures = check_endgames(rng) + check_tactics()
+    print("Benchmark:")
+    bench(n)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Cross-check and benchmark for the knowledge Q&A index (utils/knowledge_index.py).
+
+Grows the FAQ of knowledge.json with synthetic user-taught keys and, per
+size, compares the old per-question scan (normalise every key, substring
+test, difflib.get_close_matches over all keys) with KnowledgeSection.match
+on a mix of exact questions, near misses, typos and random word salad:
+time per question, index build time, and how often both give the same
+answer.  Run from the Ludus-Bot directory:
+
+    python scripts/bench_knowledge.py [knowledge.json] [--sizes 0,5000,20000]
+"""
+import json
+import os
+import random
+import sys
+import time
+from difflib import get_close_matches
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.knowledge_index import FUZZY_CUTOFF, KnowledgeSection, normalize_question, resolve_answer  # noqa: E402
+
+
+def legacy_match(question, data):
+    """The old per-question scan (LudusPersonality._match_from_dict)."""
+    if question in data:
+        return resolve_answer(data[question])
+    for key, value in data.items():
+        key_norm = normalize_question(key)
+        if key_norm == question or key_norm in question or question in key_norm:
+            return resolve_answer(value)
+    matches = get_close_matches(question, [k for k in data if k], n=1, cutoff=FUZZY_CUTOFF)
+    return resolve_answer(data[matches[0]]) if matches else None
+
+
+def make_questions(keys, words, rng, count=300):
+    out = []
+    for _ in range(count):
+        kind = rng.random()
+        key = rng.choice(keys)
+        if kind < 0.3:
+            out.append(key)                                                 # exact
+        elif kind < 0.5:
+            tokens = key.split()
+            out.append(" ".join(tokens[: max(1, len(tokens) - 1)]) + " x")  # near miss
+        elif kind < 0.7:
+            out.append(key.replace("e", "a", 1))                             # typo
+        else:
+            out.append(" ".join(rng.choice(words) for _ in range(rng.randint(3, 9))))
+    return [normalize_question(q) for q in out]
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    sizes = (0, 5_000, 20_000)
+    for a in sys.argv[1:]:
+        if a.startswith("--sizes="):
+            sizes = tuple(int(n) for n in a.split("=", 1)[1].split(","))
+    path = args[0] if args else os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                             "knowledge.json")
+    with open(path, "r", encoding="utf-8") as fh:
+        knowledge = json.load(fh)
+    faq = {normalize_question(k): v for k, v in knowledge.get("faq", {}).items()}
+    rng = random.Random(20)
+    words = " ".join(faq).split()
+
+    print(f"{'keys':>7} {'old us/q':>10} {'index us/q':>11} {'worst us':>9} {'build ms':>9}  answer agreement")
+    for extra in sizes:
+        data = dict(faq)
+        for i in range(extra):
+            taught = " ".join(rng.choice(words) for _ in range(rng.randint(3, 10)))
+            data[f"{taught} {i}"] = f"taught answer {i}"
+        qs = make_questions(list(faq), words, rng)
+
+        start = time.perf_counter()
+        section = KnowledgeSection(data)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        legacy_qs = qs if extra <= 5_000 else qs[:30]
+        start = time.perf_counter()
+        legacy = [legacy_match(q, data) for q in legacy_qs]
+        legacy_us = (time.perf_counter() - start) * 1e6 / len(legacy_qs)
+
+        indexed, worst = [], 0.0
+        start = time.perf_counter()
+        for q in qs:
+            t = time.perf_counter()
+            indexed.append(section.match(q))
+            worst = max(worst, time.perf_counter() - t)
+        index_us = (time.perf_counter() - start) * 1e6 / len(qs)
+
+        same = sum(a == b for a, b in zip(legacy, indexed))
+        print(f"{len(data):>7,} {legacy_us:>10.0f} {index_us:>11.0f} {worst * 1e6:>9.0f} {build_ms:>9.0f}  "
+              f"{same}/{len(legacy_qs)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Correctness checks and speed benchmark for the leaderboard index (utils/leaderboard_index.py).
+
+Writes synthetic economy.json / profiles.json / fishing_data.json files to a
+temporary directory, then:
+
+  * checks random score updates against a plain dict + full sort, for the
+    global and per-guild top 10, including members leaving;
+  * compares a top-10 page built the old way (load the JSON file, sort every
+    user) with an index query;
+  * times score updates, a rebuild from the data files and a snapshot load.
+
+Run from the Ludus-Bot directory:
+
+    python scripts/bench_leaderboard_index.py [users]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.leaderboard_index import LeaderboardIndex
+
+GUILDS = 20
+
+
+def make_files(data_dir, users, rng):
+    economy, profiles, fishing = {}, {}, {}
+    for i in range(users):
+        uid = str(100_000_000 + i)
+        economy[uid] = {"balance": rng.randint(0, 1_000_000), "username": f"user{i}"}
+        profiles[uid] = {"xp": rng.randint(0, 50_000), "minigames_played": rng.randint(0, 500)}
+        if rng.random() < 0.4:
+            fishing[uid] = {"total_catches": rng.randint(0, 2_000)}
+    for name, data in (("economy.json", economy), ("profiles.json", profiles),
+                       ("fishing_data.json", fishing)):
+        with open(os.path.join(data_dir, name), "w") as fh:
+            json.dump(data, fh)
+    members = {gid: [int(uid) for uid in economy if int(uid) % GUILDS == gid] for gid in range(GUILDS)}
+    return economy, members
+
+
+def expected_top(scores, n=10, members=None):
+    entries = [(uid, s) for uid, s in scores.items() if members is None or uid in members]
+    entries.sort(key=lambda e: (-e[1], e[0]))
+    return entries[:n]
+
+
+def check_updates(index, economy, members, rng, rounds):
+    scores = {int(uid): d["balance"] for uid, d in economy.items()}
+    membership = {gid: set(uids) for gid, uids in members.items()}
+    uids = list(scores)
+    failures = 0
+    for r in range(rounds):
+        uid = rng.choice(uids)
+        if rng.random() < 0.5:
+            scores[uid] = rng.randint(0, 1_100_000)
+            index.set("coins", uid, scores[uid])
+        else:
+            delta = rng.randint(-5_000, 5_000)
+            scores[uid] += delta
+            index.add("coins", uid, delta)
+        if rng.random() < 0.01:
+            gid = uid % GUILDS
+            membership[gid].discard(uid)
+            index.drop_member(gid, uid)
+        if r % 500 == 0:
+            gid = rng.randrange(GUILDS)
+            failures += index.top("coins", 10) != expected_top(scores)
+            failures += index.top("coins", 10, guild_id=gid) != expected_top(scores, members=membership[gid])
+    return failures
+
+
+def legacy_page(data_dir):
+    eco = json.load(open(os.path.join(data_dir, "economy.json")))
+    entries = [(d.get("username"), d.get("balance", 0)) for uid, d in eco.items()
+               if uid.isdigit() and isinstance(d, dict)]
+    entries.sort(key=lambda x: x[1], reverse=True)
+    return entries[:10]
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = random.Random(19)
+    with tempfile.TemporaryDirectory() as data_dir:
+        economy, members = make_files(data_dir, users, rng)
+        index = LeaderboardIndex(os.path.join(data_dir, "leaderboard_index.json"))
+
+        start = time.perf_counter()
+        index.rebuild(data_dir, members)
+        rebuild_ms = (time.perf_counter() - start) * 1000
+
+        failures = check_updates(index, economy, members, rng, 20_000)
+        print(f"Cross-check: {'OK' if not failures else f'{failures} MISMATCHES'} "
+              f"(20,000 updates, global + per-guild top 10)")
+
+        start = time.perf_counter()
+        for _ in range(20):
+            legacy_page(data_dir)
+        legacy_ms = (time.perf_counter() - start) * 1000 / 20
+        start = time.perf_counter()
+        for _ in range(10_000):
+            index.top("coins", 10, guild_id=3)
+        top_us = (time.perf_counter() - start) * 1e6 / 10_000
+
+        uids = [int(uid) for uid in economy]
+        start = time.perf_counter()
+        for _ in range(100_000):
+            index.add("coins", rng.choice(uids), 7)
+        update_us = (time.perf_counter() - start) * 1e6 / 100_000
+
+        start = time.perf_counter()
+        index.save(force=True)
+        save_ms = (time.perf_counter() - start) * 1000
+        reloaded = LeaderboardIndex(index.path)
+        start = time.perf_counter()
+        reloaded.load()
+        load_ms = (time.perf_counter() - start) * 1000
+        failures += reloaded.top("coins", 10) != index.top("coins", 10)
+        failures += reloaded.top("coins", 10, guild_id=5) != index.top("coins", 10, guild_id=5)
+
+        print(f"Users: {users:,}, guilds: {GUILDS}")
+        print(f"Top-10 page, old (read economy.json + sort): {legacy_ms:9.2f} ms")
+        print(f"Top-10 page, index:                          {top_us / 1000:9.4f} ms")
+        print(f"Score update (global + guild boards):        {update_us:9.2f} us")
+        print(f"Rebuild from data files:                     {rebuild_ms:9.1f} ms")
+        print(f"Snapshot save / load:                        {save_ms:9.1f} / {load_ms:.1f} ms")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Task count, early phase completion and restart resume for the Mafia phase engine.
+
+Drives cogs/mafia.py with fake guild/channel/user objects.  Hundreds of
+8-player games are started at once with long phase timers; the script
+counts asyncio tasks while they all wait (the old engine kept one sleeping
+coroutine per game), has every player act so nights and votes end early,
+then simulates a redeploy: snapshots and scheduler jobs are flushed, a
+fresh cog (with a fresh scheduler and store) loads them, and the games are
+checked to carry on from the same phase.  Run from the Ludus-Bot directory:
+
+    python scripts/bench_mafia.py [games]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ["RENDER_DISK_PATH"] = tempfile.mkdtemp(prefix="mafia_bench_")
+
+from cogs import mafia  # noqa: E402
+from utils import mafia_store as store_module  # noqa: E402
+from utils import scheduler as scheduler_module  # noqa: E402
+
+ROLES = mafia.PRESETS["mafia_normal"][8]
+LONG = 3600  # phase timers nobody waits out: only early completion moves games
+calls = Counter()
+
+
+class FakeChannel:
+    def __init__(self, channel_id):
+        self.id = channel_id
+        self.channels = []
+
+    async def send(self, content=None, view=None, **kwargs):
+        calls["send"] += 1
+        return SimpleNamespace(id=0)
+
+    async def set_permissions(self, *args, **kwargs):
+        pass
+
+    async def delete(self):
+        calls["delete"] += 1
+
+
+class FakeUser:
+    def __init__(self, user_id):
+        self.id = user_id
+        self.name = f"user{user_id}"
+
+    async def send(self, content=None, view=None, **kwargs):
+        calls["dm"] += 1
+
+
+class FakeBot:
+    def __init__(self):
+        self.channels = {}
+        self.guild = SimpleNamespace(id=1, get_channel=self.get_channel, default_role=None,
+                                     fetch_member=self.fetch_user)
+        self.guilds = [self.guild]
+
+    def get_channel(self, channel_id):
+        return self.channels.setdefault(channel_id, FakeChannel(channel_id))
+
+    def get_guild(self, guild_id):
+        return self.guild
+
+    def get_user(self, user_id):
+        return FakeUser(user_id)
+
+    async def fetch_user(self, user_id):
+        return FakeUser(user_id)
+
+    async def wait_until_ready(self):
+        pass
+
+
+def new_game(cog, n):
+    """The game_state start_mafia_game builds, minus the channel creation."""
+    base = 10_000 * (n + 1)
+    lobby_id = f"mafia_{base}"
+    game_state = {
+        "lobby_id": lobby_id, "guild_id": 1, "category_id": base, "main_channel_id": base + 1,
+        "evil_channel_id": base + 2, "dead_channel_id": base + 3, "voice_channels": [],
+        "center_voice_channel_id": None, "game_center_text_id": None,
+        "theme": "mafia", "mode": "normal", "language": "en",
+        "day_duration": 0.2, "night_duration": LONG, "vote_duration": LONG, "voice_mode": False,
+        "players": {}, "alive_players": [], "dead_players": [], "day_number": 0, "phase": "night",
+        "night_actions": {}, "votes": {},
+    }
+    for i, role_id in enumerate(ROLES):
+        pid = base + 100 + i
+        game_state["players"][pid] = {"role": role_id, "role_info": cog._lookup_role("mafia", "normal", role_id),
+                                      "faction": "MAFIA" if role_id in ("mafioso", "don") else "TOWN",
+                                      "alive": True, "protected": False, "votes": 0}
+        game_state["alive_players"].append(pid)
+    cog.active_games[lobby_id] = game_state
+    return lobby_id
+
+
+def town(game_state):
+    return [pid for pid in game_state["alive_players"] if game_state["players"][pid]["faction"] == "TOWN"]
+
+
+async def everyone_acts(cog, lobby_id):
+    """What the night/vote panels record, through the same hook the views call."""
+    game_state = cog.active_games[lobby_id]
+    if game_state["phase"] == "night":
+        for pid in game_state.get("awaiting", []):
+            game_state["power_actions"][pid] = {"type": game_state["players"][pid]["role_info"]["power"],
+                                                "target": pid}
+        game_state["night_actions"]["MAFIA"] = town(game_state)[0]
+    elif game_state["phase"] == "vote":
+        target = next(pid for pid in game_state["alive_players"] if pid not in town(game_state))
+        for pid in game_state["alive_players"]:
+            game_state["votes"][pid] = target
+    cog._on_player_action(lobby_id)
+
+
+async def wait_for(predicate, timeout=30):
+    end = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > end:
+            return False
+        await asyncio.sleep(0.02)
+    return True
+
+
+async def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    mafia.asyncio.sleep = _short_sleep  # the fixed 3 s pause after vote results
+    bot = FakeBot()
+    cog = mafia.MafiaCog(bot)
+    await cog.cog_load()
+    lobbies = [new_game(cog, n) for n in range(games)]
+
+    start = time.perf_counter()
+    for lobby_id in lobbies:
+        await cog._night_phase(lobby_id)
+    baseline = len(asyncio.all_tasks())
+    print(f"{games} games in night 1 (timers {LONG} s): {baseline} asyncio tasks alive "
+          f"(old engine: one sleeping game loop per game, {games}+)")
+
+    # Night: everyone acts -> day at once; day timer (0.2 s) -> vote; everyone votes -> night 2
+    for lobby_id in lobbies:
+        await everyone_acts(cog, lobby_id)
+    ok = await wait_for(lambda: all(cog.active_games[lid]["phase"] == "vote" for lid in lobbies))
+    for lobby_id in lobbies:
+        await everyone_acts(cog, lobby_id)
+    ok &= await wait_for(lambda: all(cog.active_games[lid]["phase"] == "night"
+                                     and cog.active_games[lid]["day_number"] == 2 for lid in lobbies))
+    elapsed = time.perf_counter() - start
+    print(f"Early completion: night -> day -> vote -> night 2 for all games in {elapsed:.2f} s "
+          f"(timers alone: {2 * LONG + 0.2:.0f} s): {'ok' if ok else 'FAIL'}")
+    print(f"  tasks alive while waiting: {len(asyncio.all_tasks())}; Discord calls {dict(calls)}")
+
+    # Redeploy: persist, drop everything, load into a fresh cog/scheduler/store
+    before = {lid: (g["phase"], g["day_number"], list(g["alive_players"])) for lid, g in cog.active_games.items()}
+    cog.cog_unload()
+    scheduler_module.scheduler.flush()
+    scheduler_module.scheduler._runner.cancel()
+    sizes = [os.path.getsize(mafia.mafia_store._path(lid)) for lid in lobbies]
+    mafia.scheduler = scheduler_module.Scheduler(scheduler_module.scheduler.path)
+    mafia.mafia_store = store_module.MafiaGameStore(mafia.mafia_store.folder)
+
+    resumed = mafia.MafiaCog(bot)
+    await resumed.cog_load()
+    after = {lid: (g["phase"], g["day_number"], list(g["alive_players"])) for lid, g in resumed.active_games.items()}
+    ok_resume = after == before and all(isinstance(pid, int) for g in resumed.active_games.values()
+                                        for pid in g["players"])
+    ok_resume &= all(p["role_info"] for g in resumed.active_games.values() for p in g["players"].values())
+    for lobby_id in lobbies:
+        await everyone_acts(resumed, lobby_id)
+    ok_resume &= await wait_for(lambda: all(resumed.active_games[lid]["phase"] in ("vote", "ended")
+                                            for lid in lobbies))
+    print(f"Restart: {len(after)} games restored (snapshots avg {sum(sizes) / len(sizes):.0f} bytes), "
+          f"same phase/day/players, and they keep going: {'ok' if ok_resume else 'FAIL'}")
+    resumed.cog_unload()
+    mafia.scheduler._runner.cancel()
+    return 0 if ok and ok_resume else 1
+
+
+_real_sleep = asyncio.sleep
+
+
+async def _short_sleep(delay, *args, **kwargs):
+    return await _real_sleep(min(delay, 0.01), *args, **kwargs)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
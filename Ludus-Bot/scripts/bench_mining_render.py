@@ -0,0 +1,62 @@
+"""Benchmark for the mining map renderer's texture atlas and viewport cache
+(utils/mining_render.py).
+
+Walks a random world and composes each viewport background three ways: the
+old path (reload and resize every texture per frame), the shared atlas, and
+atlas + viewport cache.  Run from the Ludus-Bot directory:
+
+    python scripts/bench_mining_render.py [viewports]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.mining_render import TextureAtlas, ViewportCache, compose_background  # noqa: E402
+
+
+def main(n=1000, width=11, height=10):
+    blocks = ["dirt", "stone", "coal", "stone2", "coal2", "iron", "gold", "diamond", "air"]
+    rng = random.Random(1)
+    # Random walk through a small world: realistic mix of repeated and new viewports
+    world = {(x, y): rng.choice(blocks) for x in range(-30, 30) for y in range(0, 60)}
+    views, px, py = [], 0, 30
+    for _ in range(n):
+        px = max(-24, min(24, px + rng.choice((-1, 0, 1))))
+        py = max(6, min(54, py + rng.choice((-1, 0, 1))))
+        tiles = tuple((world[(px - width // 2 + i % width, py - height // 2 + i // width)],
+                       None, False, False, None) for i in range(width * height))
+        views.append((tiles, (120,) * (width * height)))
+
+    def uncached(tiles, darkness):
+        # What render_map used to do: reload and resize every texture per frame
+        local = TextureAtlas({})
+        return compose_background(local, tiles, darkness, width, height)
+
+    atlas = TextureAtlas({})
+    atlas.preload()
+    cache = ViewportCache()
+
+    def cached(tiles, darkness):
+        key = (tiles, darkness)
+        img = cache.get(key)
+        if img is None:
+            img = compose_background(atlas, tiles, darkness, width, height)
+            cache.put(key, img)
+        return img.copy()
+
+    for label, fn in (("uncached", uncached),
+                      ("atlas", lambda t, d: compose_background(atlas, t, d, width, height)),
+                      ("atlas+viewport cache", cached)):
+        start = time.perf_counter()
+        for tiles, darkness in views:
+            fn(tiles, darkness)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>22}: {elapsed * 1000 / n:7.3f} ms/viewport ({n} viewports)")
+    print(f"viewport cache: {cache.hits} hits / {cache.misses} misses")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
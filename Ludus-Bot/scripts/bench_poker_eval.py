@@ -0,0 +1,181 @@
+"""Cross-check and benchmark for the lookup-table poker evaluator (utils/poker_eval.py).
+
+The old evaluator (combinations + dict counting, copied below as it was in
+cogs/poker.py) is the reference: on random deals the new one must return
+the same (best_hand, ranking, high_cards), order hands exactly like
+compare_hands, and rank_batch must agree with the scalar path.  Run from
+the Ludus-Bot directory:
+
+    python scripts/bench_poker_eval.py [deals] [--exhaustive]
+
+--exhaustive additionally checks all 2,598,960 five-card hands (about a minute).
+"""
+import os
+import random
+import sys
+import time
+from itertools import combinations
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils import poker_eval
+
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+SUITS = ['♠️', '♥️', '♦️', '♣️']
+DECK = [(rank, suit) for rank in RANKS for suit in SUITS]
+
+
+# ---------------------------------------------------------------------------
+# Legacy evaluator
+# ---------------------------------------------------------------------------
+
+def legacy_evaluate_hand(cards):
+    if len(cards) != 5:
+        return (0, [])
+    rank_values = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8,
+                   '9': 9, '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
+    ranks = [rank_values[card[0]] for card in cards]
+    suits = [card[1] for card in cards]
+    ranks.sort(reverse=True)
+    rank_counts = {}
+    for rank in ranks:
+        rank_counts[rank] = rank_counts.get(rank, 0) + 1
+    counts = sorted(rank_counts.values(), reverse=True)
+    is_flush = len(set(suits)) == 1
+    is_straight = False
+    if len(set(ranks)) == 5:
+        if ranks[0] - ranks[4] == 4:
+            is_straight = True
+        elif ranks == [14, 5, 4, 3, 2]:
+            is_straight = True
+            ranks = [5, 4, 3, 2, 1]
+    if is_flush and is_straight and ranks[0] == 14 and ranks[4] == 10:
+        return (9, ranks)
+    if is_flush and is_straight:
+        return (8, ranks)
+    if counts == [4, 1]:
+        four_rank = [r for r, c in rank_counts.items() if c == 4][0]
+        kicker = [r for r, c in rank_counts.items() if c == 1][0]
+        return (7, [four_rank, four_rank, four_rank, four_rank, kicker])
+    if counts == [3, 2]:
+        three_rank = [r for r, c in rank_counts.items() if c == 3][0]
+        pair_rank = [r for r, c in rank_counts.items() if c == 2][0]
+        return (6, [three_rank, three_rank, three_rank, pair_rank, pair_rank])
+    if is_flush:
+        return (5, ranks)
+    if is_straight:
+        return (4, ranks)
+    if counts == [3, 1, 1]:
+        three_rank = [r for r, c in rank_counts.items() if c == 3][0]
+        kickers = sorted([r for r, c in rank_counts.items() if c == 1], reverse=True)
+        return (3, [three_rank, three_rank, three_rank] + kickers)
+    if counts == [2, 2, 1]:
+        pairs = sorted([r for r, c in rank_counts.items() if c == 2], reverse=True)
+        kicker = [r for r, c in rank_counts.items() if c == 1][0]
+        return (2, [pairs[0], pairs[0], pairs[1], pairs[1], kicker])
+    if counts == [2, 1, 1, 1]:
+        pair_rank = [r for r, c in rank_counts.items() if c == 2][0]
+        kickers = sorted([r for r, c in rank_counts.items() if c == 1], reverse=True)
+        return (1, [pair_rank, pair_rank] + kickers)
+    return (0, ranks)
+
+
+def legacy_get_best_hand(cards):
+    if len(cards) < 5:
+        return ([], 0, [])
+    best_ranking, best_high_cards, best_hand = -1, [], []
+    for combo in combinations(cards, 5):
+        ranking, high_cards = legacy_evaluate_hand(list(combo))
+        if ranking > best_ranking or (ranking == best_ranking and high_cards > best_high_cards):
+            best_ranking, best_high_cards, best_hand = ranking, high_cards, list(combo)
+    return (best_hand, best_ranking, best_high_cards)
+
+
+def legacy_compare(a, b):
+    return (a[1], a[2]) > (b[1], b[2]) and 1 or ((a[1], a[2]) < (b[1], b[2]) and -1 or 0)
+
+
+# ---------------------------------------------------------------------------
+# Checks
+# ---------------------------------------------------------------------------
+
+def check_random(n, rng):
+    deals = [rng.sample(DECK, 7) for _ in range(n)]
+    mismatches = order_errors = 0
+    previous_legacy = previous_rank = None
+    for deal in deals:
+        size = rng.choice((5, 6, 7))
+        cards = deal[:size]
+        legacy = legacy_get_best_hand(cards)
+        new = poker_eval.best_hand(cards)
+        mismatches += legacy != new
+        rank = poker_eval.hand_rank(cards)
+        if previous_legacy is not None:
+            expected = legacy_compare(legacy, previous_legacy)
+            got = (rank > previous_rank) - (rank < previous_rank)
+            order_errors += expected != got
+        previous_legacy, previous_rank = legacy, rank
+    print(f"  best_hand vs legacy: {n - mismatches}/{n} identical, ordering errors: {order_errors}")
+
+    ids = [[poker_eval.card_id(c) for c in deal] for deal in deals]
+    batch = [int(r) for r in poker_eval.rank_batch(ids)]
+    batch_errors = sum(b != poker_eval.rank_ids(h) for b, h in zip(batch, ids))
+    print(f"  rank_batch vs scalar: {n - batch_errors}/{n} identical "
+          f"({'numpy' if poker_eval.np is not None else 'python loop'})")
+    return mismatches + order_errors + batch_errors
+
+
+def check_exhaustive():
+    errors = 0
+    start = time.perf_counter()
+    for count, combo in enumerate(combinations(DECK, 5), 1):
+        if legacy_evaluate_hand(list(combo)) != poker_eval.evaluate(combo):
+            errors += 1
+    print(f"  all {count} five-card hands: {errors} mismatches ({time.perf_counter() - start:.0f} s)")
+    return errors
+
+
+def bench(n, rng):
+    deals = [rng.sample(DECK, 7) for _ in range(n)]
+    poker_eval.hand_rank(deals[0])  # build the tables outside the timing
+
+    start = time.perf_counter()
+    for deal in deals:
+        legacy_get_best_hand(deal)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for deal in deals:
+        poker_eval.hand_rank(deal)
+    table_time = time.perf_counter() - start
+
+    ids = [[poker_eval.card_id(c) for c in deal] for deal in deals]
+    poker_eval.rank_batch(ids[:1])
+    start = time.perf_counter()
+    poker_eval.rank_batch(ids)
+    batch_time = time.perf_counter() - start
+
+    for label, elapsed in (("legacy get_best_hand", legacy_time), ("hand_rank", table_time),
+                           ("rank_batch", batch_time)):
+        print(f"  {label:>20}: {elapsed * 1e6 / n:8.2f} us/hand  ({n / elapsed:12,.0f} hands/s)")
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    n = int(args[0]) if args else 20000
+    rng = random.Random(11)
+
+    start = time.perf_counter()
+    poker_eval.hand_rank(DECK[:5])
+    print(f"Tables built in {(time.perf_counter() - start) * 1000:.0f} ms")
+    print("Cross-check:")
+    failures = check_random(n, rng)
+    if "--exhaustive" in sys.argv:
+        failures += check_exhaustive()
+    print("Benchmark (7-card hands):")
+    bench(n, rng)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
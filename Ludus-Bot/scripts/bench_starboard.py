@@ -0,0 +1,162 @@
+"""REST-call and disk-write count for the Starboard cog under a reaction burst.
+
+Drives cogs/starboard.py with fake guild/channel objects: a handful of
+messages go viral (hundreds of adds and some removes within a few seconds)
+and the script counts fetch_message / send / edit / delete calls and
+journal vs full-file writes.  Before the reaction tally cache every raw
+event cost two fetch_message calls, an edit and a rewrite of starboard.json.
+Also checks that the final board post shows the true reaction count.
+Run from the Ludus-Bot directory:
+
+    python scripts/bench_starboard.py [reactions_per_message]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ["RENDER_DISK_PATH"] = tempfile.mkdtemp(prefix="starboard_bench_")
+
+import discord  # noqa: E402
+
+from cogs import starboard  # noqa: E402
+
+starboard.RENDER_DEBOUNCE_SECONDS = 0.2
+GUILD_ID, SOURCE_ID, BOARD_ID = 1, 10, 20
+EMOJI = "⭐"
+calls = Counter()
+
+
+class FakeMessage:
+    def __init__(self, message_id, channel):
+        self.id = message_id
+        self.channel = channel
+        self.author = SimpleNamespace(id=999, bot=False, display_name="poster",
+                                      display_avatar=SimpleNamespace(url="https://example.invalid/a.png"))
+        self.content = "a very popular message"
+        self.attachments, self.embeds = [], []
+        self.reference = None
+        self.created_at = discord.utils.utcnow()
+        self.jump_url = f"https://discord.com/channels/{GUILD_ID}/{channel.id}/{message_id}"
+        self.stars = 0
+
+    @property
+    def reactions(self):
+        return [SimpleNamespace(emoji=EMOJI, count=self.stars)] if self.stars else []
+
+
+class FakePartial:
+    def __init__(self, channel, message_id):
+        self.channel, self.id = channel, message_id
+
+    async def edit(self, content=None, embed=None):
+        calls["edit"] += 1
+        self.channel.posts[self.id] = content
+
+    async def delete(self):
+        calls["delete"] += 1
+        self.channel.posts.pop(self.id, None)
+
+
+class FakeChannel:
+    def __init__(self, channel_id):
+        self.id = channel_id
+        self.name = f"channel{channel_id}"
+        self.mention = f"<#{channel_id}>"
+        self.messages, self.posts = {}, {}
+        self._next = 1000
+
+    async def fetch_message(self, message_id):
+        calls["fetch_message"] += 1
+        await asyncio.sleep(0.001)
+        return self.messages[message_id]
+
+    async def send(self, content=None, embed=None):
+        calls["send"] += 1
+        self._next += 1
+        self.posts[self._next] = content
+        return SimpleNamespace(id=self._next)
+
+    def get_partial_message(self, message_id):
+        return FakePartial(self, message_id)
+
+
+class FakeBot:
+    def __init__(self, guild):
+        self.guild = guild
+        self.tree = SimpleNamespace(add_command=lambda cmd: None, remove_command=lambda name: None)
+
+    def get_guild(self, guild_id):
+        return self.guild if guild_id == GUILD_ID else None
+
+
+def payload(message_id, user_id, add):
+    return SimpleNamespace(guild_id=GUILD_ID, channel_id=SOURCE_ID, message_id=message_id, user_id=user_id,
+                           emoji=EMOJI, event_type="REACTION_ADD" if add else "REACTION_REMOVE")
+
+
+async def main():
+    per_message = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    source, board = FakeChannel(SOURCE_ID), FakeChannel(BOARD_ID)
+    guild = SimpleNamespace(id=GUILD_ID, get_channel={SOURCE_ID: source, BOARD_ID: board}.get)
+    cog = starboard.Starboard(FakeBot(guild))
+    await cog.cog_load()
+    cog.data["boards"][str(GUILD_ID)] = {EMOJI: {"channel": BOARD_ID, "amount": 5, "self_star": False}}
+
+    saves = Counter()
+    original_save = starboard.save_starboards
+
+    def counting_save(data):
+        saves["starboard.json rewrites"] += 1
+        original_save(data)
+    starboard.save_starboards = counting_save
+
+    rng = random.Random(22)
+    messages = [FakeMessage(500 + i, source) for i in range(5)]
+    for m in messages:
+        source.messages[m.id] = m
+    events = []
+    for m in messages:
+        users = list(range(1, per_message + 1))
+        for u in users:
+            events.append((m, u, True))
+        for u in rng.sample(users, per_message // 10):
+            events.append((m, u, False))
+    rng.shuffle(events)
+    # Removes must follow their add: replay in an order where that holds
+    seen, ordered, later = set(), [], []
+    for m, u, add in events:
+        (ordered if add or (m.id, u) in seen else later).append((m, u, add))
+        if add:
+            seen.add((m.id, u))
+    events = ordered + later
+
+    start = time.perf_counter()
+    for m, u, add in events:
+        m.stars += 1 if add else -1  # what Discord would report on a fetch
+        await cog._process_reaction(payload(m.id, u, add))
+        await asyncio.sleep(0)
+    while cog._renders:
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - start
+    cog.journal.flush()
+
+    ok = all(board.posts.get(cog.data["posted_messages"][f"{GUILD_ID}_{m.id}_{EMOJI}"], "").find(f"**{m.stars}**") > 0
+             for m in messages)
+    rest = sum(calls.values())
+    print(f"Reaction events: {len(events)} on {len(messages)} messages ({elapsed:.2f} s)")
+    print(f"Old path: {3 * len(events)} REST calls, ~{len(events)} starboard.json rewrites")
+    print(f"New path: {rest} REST calls ({dict(calls)}), "
+          f"{saves['starboard.json rewrites']} rewrites, {cog.journal.records} journal lines")
+    print(f"Board posts show the true count: {'yes' if ok else 'NO'}")
+    cog.cog_unload()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,269 @@
+"""Solver checks and speed benchmark for the tic-tac-toe AI (utils/tictactoe_engine.py).
+
+Checks win detection against the old grid scan, that canonical keys are the
+same for all 8 symmetries of a position, that the shipped 3x3 table matches
+a fresh solve, and the searcher against brute force on small endgames.  Then
+compares move times with the old list-based minimax (copied below as it was
+in cogs/boardgames.py).  Run from the Ludus-Bot directory:
+
+    python scripts/bench_tictactoe.py [positions]
+"""
+import os
+import random
+import sys
+import time
+from functools import lru_cache
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.tictactoe_engine import (WIN, Solver, best_move, build_perfect_table, geometry,
+                                    to_masks, winner)
+from utils.tictactoe_table import PERFECT_3X3
+
+
+# ---------------------------------------------------------------------------
+# Legacy engine (flat list, full rescans), with a node counter
+# ---------------------------------------------------------------------------
+
+class Legacy:
+    def __init__(self):
+        self.nodes = 0
+
+    def check_winner(self, board, size):
+        win_length = 3 if size == 3 else 4
+        for row in range(size):
+            for col in range(size):
+                if board[row * size + col] == 0:
+                    continue
+                player = board[row * size + col]
+                if col + win_length <= size and all(board[row * size + col + i] == player for i in range(win_length)):
+                    return player
+                if row + win_length <= size and all(board[(row + i) * size + col] == player for i in range(win_length)):
+                    return player
+                if row + win_length <= size and col + win_length <= size and \
+                        all(board[(row + i) * size + col + i] == player for i in range(win_length)):
+                    return player
+                if row + win_length <= size and col - win_length >= -1 and \
+                        all(board[(row + i) * size + col - i] == player for i in range(win_length)):
+                    return player
+        return None
+
+    def evaluate_position(self, board, size, player, opponent):
+        for row in range(size):
+            for col in range(size):
+                if board[row * size + col] != 0:
+                    continue
+                threats = opportunities = 0
+                row_player = sum(1 for c in range(size) if board[row * size + c] == player)
+                row_opponent = sum(1 for c in range(size) if board[row * size + c] == opponent)
+                if row_opponent == 0 and row_player > 0:
+                    opportunities += row_player ** 2
+                if row_player == 0 and row_opponent > 0:
+                    threats += row_opponent ** 2
+                col_player = sum(1 for r in range(size) if board[r * size + col] == player)
+                col_opponent = sum(1 for r in range(size) if board[r * size + col] == opponent)
+                if col_opponent == 0 and col_player > 0:
+                    opportunities += col_player ** 2
+                if col_player == 0 and col_opponent > 0:
+                    threats += col_opponent ** 2
+        return opportunities - threats
+
+    def minimax(self, board, size, depth, is_maximizing, alpha, beta, player, opponent, max_depth):
+        self.nodes += 1
+        w = self.check_winner(board, size)
+        if w == player:
+            return 100 - depth
+        elif w == opponent:
+            return depth - 100
+        elif all(cell != 0 for cell in board):
+            return 0
+        if depth >= max_depth:
+            return self.evaluate_position(board, size, player, opponent)
+        best = -float("inf") if is_maximizing else float("inf")
+        for i in range(len(board)):
+            if board[i] == 0:
+                board[i] = player if is_maximizing else opponent
+                score = self.minimax(board, size, depth + 1, not is_maximizing, alpha, beta, player, opponent, max_depth)
+                board[i] = 0
+                if is_maximizing:
+                    best = max(best, score)
+                    alpha = max(alpha, score)
+                else:
+                    best = min(best, score)
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    break
+        return best
+
+    def choose_move(self, board, size, player):
+        opponent = 3 - player
+        max_depth = 9 if size == 3 else 5 if size == 4 else 3
+        if size >= 4:
+            for who in (player, opponent):
+                for i in range(len(board)):
+                    if board[i] == 0:
+                        board[i] = who
+                        if self.check_winner(board, size):
+                            board[i] = 0
+                            return i
+                        board[i] = 0
+        best_score, best_moves = -float("inf"), []
+        for i in range(len(board)):
+            if board[i] == 0:
+                board[i] = player
+                score = self.minimax(board, size, 0, False, -float("inf"), float("inf"), player, opponent, max_depth)
+                board[i] = 0
+                if score > best_score:
+                    best_score, best_moves = score, [i]
+                elif score == best_score:
+                    best_moves.append(i)
+        centre = size // 2
+        best_moves.sort(key=lambda m: abs(m // size - centre) + abs(m % size - centre))
+        return best_moves[0] if best_moves else 0
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def random_board(rng, size, stones):
+    """Random position with `stones` stones (player 1 first) and no completed line."""
+    while True:
+        board = [0] * (size * size)
+        cells = rng.sample(range(size * size), stones)
+        for n, i in enumerate(cells):
+            board[i] = 1 if n % 2 == 0 else 2
+        if winner(board, size) is None:
+            return board
+
+
+def exact_score(size, me, opp):
+    """Negamax score by exhaustive search (same scale as the engine)."""
+    geo = geometry(size)
+
+    @lru_cache(maxsize=None)
+    def solve(me, opp):
+        empty = geo.full & ~(me | opp)
+        stones = geo.cells - bin(empty).count("1")
+        if not empty:
+            return 0
+        best = -WIN
+        for i in range(geo.cells):
+            if empty >> i & 1:
+                after = me | 1 << i
+                if geo.wins(after, i):
+                    return WIN - stones - 1
+                best = max(best, -solve(opp, after))
+        return best
+
+    return solve(me, opp)
+
+
+def check_winner_scan(rng):
+    legacy = Legacy()
+    for size in (3, 4, 5):
+        for _ in range(2000):
+            board = [rng.choice((0, 0, 1, 2)) for _ in range(size * size)]
+            # Both players can have lines on a random board; compare "is there a winner"
+            assert (winner(board, size) is None) == (legacy.check_winner(board, size) is None), board
+    print("  win-line masks vs grid scan: ok")
+
+
+def check_symmetry(rng):
+    for size in (3, 4, 5):
+        geo = geometry(size)
+        for _ in range(300):
+            board = random_board(rng, size, rng.randint(0, size * size - 2))
+            me, opp = to_masks(board, 1)
+            key = geo.canonical(me, opp)[0]
+            for perm in geo.perms:
+                t_me = sum(1 << perm[i] for i in range(geo.cells) if me >> i & 1)
+                t_opp = sum(1 << perm[i] for i in range(geo.cells) if opp >> i & 1)
+                assert geo.canonical(t_me, t_opp)[0] == key
+    print("  canonical keys invariant under the 8 symmetries: ok")
+
+
+def check_table():
+    fresh = build_perfect_table(3)
+    ok = fresh == PERFECT_3X3
+    print(f"  shipped 3x3 table matches a fresh solve: {'ok' if ok else 'FAIL'} ({len(PERFECT_3X3)} positions)")
+    return not ok
+
+
+def check_perfect_play(rng, games=300):
+    """3x3: the engine never loses, against random play or the old AI, as either player."""
+    legacy, losses = Legacy(), 0
+    for g in range(games):
+        board, turn = [0] * 9, 1 + g % 2
+        engine_player = 1 + (g // 2) % 2
+        use_legacy = g % 3 == 0
+        while winner(board, 3) is None and 0 in board:
+            if turn == engine_player:
+                move = best_move(board, 3, turn)
+            elif use_legacy:
+                move = legacy.choose_move(board, 3, turn)
+            else:
+                move = rng.choice([i for i in range(9) if board[i] == 0])
+            board[move] = turn
+            turn = 3 - turn
+        losses += winner(board, 3) == 3 - engine_player
+    print(f"  3x3 games lost by the engine: {losses}/{games}")
+    return losses
+
+
+def check_endgames(rng, size=4, n=40, empties=9):
+    geo, failures = geometry(size), 0
+    solver = Solver(geo)
+    for _ in range(n):
+        board = random_board(rng, size, geo.cells - empties)
+        player = 1 if board.count(1) == board.count(2) else 2
+        me, opp = to_masks(board, player)
+        exact = exact_score(size, me, opp)
+        cell, score, _ = solver.search(me, opp, time_budget_ms=20_000)
+        after = me | 1 << cell
+        achieved = WIN - (geo.cells - empties) - 1 if geo.wins(after, cell) else -exact_score(size, opp, after)
+        failures += score != exact or achieved != exact
+    print(f"  {size}x{size} endgame solves vs brute force: {n - failures}/{n} exact")
+    return failures
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def bench(n):
+    rng = random.Random(21)
+    legacy = Legacy()
+    for size in (3, 4, 5):
+        positions = [random_board(rng, size, rng.randint(0, size * size // 3) // 2 * 2) for _ in range(n)]
+        legacy_n = n if size != 4 else max(1, n // 4)
+        start = time.perf_counter()
+        for board in positions[:legacy_n]:
+            legacy.choose_move(list(board), size, 1)
+        legacy_ms = (time.perf_counter() - start) * 1000 / legacy_n
+
+        start = time.perf_counter()
+        worst = 0.0
+        for board in positions:
+            t = time.perf_counter()
+            best_move(board, size, 1)
+            worst = max(worst, time.perf_counter() - t)
+        engine_ms = (time.perf_counter() - start) * 1000 / n
+        print(f"  {size}x{size}: old {legacy_ms:8.1f} ms/move   engine {engine_ms:7.2f} ms/move "
+              f"(worst {worst * 1000:.0f} ms)")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rng = random.Random(1)
+    print("Checks:")
+    check_winner_scan(rng)
+    check_symmetry(rng)
+    failures = check_table() + check_perfect_play(rng) + check_endgames(rng)
+    print("Benchmark:")
+    bench(n)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ import io
 import discord
 import os
 import random
+from functools import lru_cache
 
 # ==================== CONSTANTS ====================
 
@@ -35,8 +36,9 @@ CARD_IMAGE_CACHE = {}
 
 # ==================== FONT MANAGEMENT ====================
 
+@lru_cache(maxsize=64)
 def get_font(size, bold=False):
-    """Get font with fallback"""
+    """Get font with fallback (cached - fonts are immutable and reused across renders)"""
     try:
         if bold:
             return ImageFont.truetype("arialbd.ttf", size)
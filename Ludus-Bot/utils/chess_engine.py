@@ -0,0 +1,440 @@
+"""
+utils/chess_engine.py
+=====================
+Chess engine for the ChessCog bot opponent, built on python-chess.
+
+    * negamax alpha-beta with iterative deepening under a time budget
+    * transposition table keyed on board._transposition_key() (Zobrist-style)
+    * move ordering: TT move, MVV-LVA captures, promotions, killer moves,
+      history heuristic
+    * quiescence search over captures, check extension
+    * tapered piece-square-table evaluation (simplified evaluation function)
+    * repetition / fifty-move draws inside the search
+
+Difficulty tiers map to depth and time budgets (DIFFICULTY_LEVELS); "easy"
+also plays a random move now and then so it stays beatable.
+
+choose_move() is a pure, picklable entry point: the cog runs it in the
+shared worker pool (utils.render_service) so a search never blocks the
+event loop.  Each worker keeps its own Engine, so the transposition table
+carries over between moves of the same game.
+
+Benchmark and mate-in-N checks: python scripts/bench_chess_engine.py
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import chess
+
+MATE = 100_000
+MATE_BOUND = MATE - 1_000   # scores beyond this are "mate in N"
+INF = 1_000_000
+
+EXACT, LOWER, UPPER = 0, 1, 2
+TT_MAX_ENTRIES = 400_000
+
+PIECE_VALUES = {
+    chess.PAWN: 100, chess.KNIGHT: 320, chess.BISHOP: 330,
+    chess.ROOK: 500, chess.QUEEN: 900, chess.KING: 0,
+}
+
+# Piece-square tables, rank 8 first (index = square ^ 56 for white, square for black)
+_PST = {
+    chess.PAWN: [
+          0,   0,   0,   0,   0,   0,   0,   0,
+         50,  50,  50,  50,  50,  50,  50,  50,
+         10,  10,  20,  30,  30,  20,  10,  10,
+          5,   5,  10,  25,  25,  10,   5,   5,
+          0,   0,   0,  20,  20,   0,   0,   0,
+          5,  -5, -10,   0,   0, -10,  -5,   5,
+          5,  10,  10, -20, -20,  10,  10,   5,
+          0,   0,   0,   0,   0,   0,   0,   0,
+    ],
+    chess.KNIGHT: [
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20,   0,   0,   0,   0, -20, -40,
+        -30,   0,  10,  15,  15,  10,   0, -30,
+        -30,   5,  15,  20,  20,  15,   5, -30,
+        -30,   0,  15,  20,  20,  15,   0, -30,
+        -30,   5,  10,  15,  15,  10,   5, -30,
+        -40, -20,   0,   5,   5,   0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ],
+    chess.BISHOP: [
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,  10,  10,   5,   0, -10,
+        -10,   5,   5,  10,  10,   5,   5, -10,
+        -10,   0,  10,  10,  10,  10,   0, -10,
+        -10,  10,  10,  10,  10,  10,  10, -10,
+        -10,   5,   0,   0,   0,   0,   5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ],
+    chess.ROOK: [
+          0,   0,   0,   0,   0,   0,   0,   0,
+          5,  10,  10,  10,  10,  10,  10,   5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+          0,   0,   0,   5,   5,   0,   0,   0,
+    ],
+    chess.QUEEN: [
+        -20, -10, -10,  -5,  -5, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,   5,   5,   5,   0, -10,
+         -5,   0,   5,   5,   5,   5,   0,  -5,
+          0,   0,   5,   5,   5,   5,   0,  -5,
+        -10,   5,   5,   5,   5,   5,   0, -10,
+        -10,   0,   5,   0,   0,   0,   0, -10,
+        -20, -10, -10,  -5,  -5, -10, -10, -20,
+    ],
+}
+_KING_MG = [
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+     20,  20,   0,   0,   0,   0,  20,  20,
+     20,  30,  10,   0,   0,  10,  30,  20,
+]
+_KING_EG = [
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10,   0,   0, -10, -20, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -30,   0,   0,   0,   0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+]
+# Game phase weights (24 = all minor/major pieces on the board)
+_PHASE = {chess.KNIGHT: 1, chess.BISHOP: 1, chess.ROOK: 2, chess.QUEEN: 4}
+
+# Material + PST folded into one table per (piece type, colour), indexed by square
+_SQ_VALUE = {}
+for _pt, _table in _PST.items():
+    _SQ_VALUE[(_pt, chess.WHITE)] = [PIECE_VALUES[_pt] + _table[sq ^ 56] for sq in chess.SQUARES]
+    _SQ_VALUE[(_pt, chess.BLACK)] = [PIECE_VALUES[_pt] + _table[sq] for sq in chess.SQUARES]
+
+DIFFICULTY_LEVELS = {
+    # depth: iterative deepening limit, time: seconds, blunder: chance of a random move
+    "easy": {"depth": 2, "time": 0.3, "blunder": 0.25},
+    "medium": {"depth": 4, "time": 1.0, "blunder": 0.0},
+    "hard": {"depth": 64, "time": 3.0, "blunder": 0.0},
+}
+
+
+def evaluate(board: chess.Board) -> int:
+    """Static evaluation in centipawns from White's point of view."""
+    score = 0
+    phase = 0
+    for (pt, color), table in _SQ_VALUE.items():
+        mask = board.pieces_mask(pt, color)
+        if not mask:
+            continue
+        sub = 0
+        for sq in chess.scan_forward(mask):
+            sub += table[sq]
+        score += sub if color else -sub
+        if pt in _PHASE:
+            phase += _PHASE[pt] * chess.popcount(mask)
+
+    # Tapered king safety: shelter in the middlegame, centralisation in the endgame
+    phase = min(phase, 24)
+    wk, bk = board.king(chess.WHITE), board.king(chess.BLACK)
+    if wk is not None:
+        score += (_KING_MG[wk ^ 56] * phase + _KING_EG[wk ^ 56] * (24 - phase)) // 24
+    if bk is not None:
+        score -= (_KING_MG[bk] * phase + _KING_EG[bk] * (24 - phase)) // 24
+
+    # Bishop pair
+    if chess.popcount(board.pieces_mask(chess.BISHOP, chess.WHITE)) >= 2:
+        score += 30
+    if chess.popcount(board.pieces_mask(chess.BISHOP, chess.BLACK)) >= 2:
+        score -= 30
+    return score
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+
+@dataclass
+class SearchResult:
+    move: Optional[chess.Move]
+    score: int          # centipawns for the side to move (mate scores near +-MATE)
+    depth: int          # last fully searched depth
+    nodes: int
+    elapsed: float
+
+    @property
+    def nps(self) -> int:
+        return int(self.nodes / self.elapsed) if self.elapsed > 0 else 0
+
+
+class Engine:
+    """Alpha-beta searcher; keep one per process so the TT survives between moves."""
+
+    def __init__(self, tt_max_entries: int = TT_MAX_ENTRIES):
+        self.tt: dict = {}
+        self.tt_max_entries = tt_max_entries
+        self.killers: list = []
+        self.history: dict = {}
+        self.nodes = 0
+        self.deadline = 0.0
+        self._seen: dict = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def search(self, board: chess.Board, max_depth: int = 64, time_limit: float = 1.0) -> SearchResult:
+        """Best move for the side to move within max_depth plies / time_limit seconds."""
+        board = board.copy()
+        start = time.perf_counter()
+        self.deadline = start + time_limit
+        self.nodes = 0
+        self.killers = [[None, None] for _ in range(max_depth + 64)]
+        self.history = {}
+        if len(self.tt) > self.tt_max_entries:
+            self.tt.clear()
+        self._seen = self._game_history(board)
+
+        legal = list(board.legal_moves)
+        if not legal:
+            return SearchResult(None, 0, 0, 0, 0.0)
+        best = SearchResult(legal[0], 0, 0, 0, 0.0)
+        if len(legal) == 1:
+            best.elapsed = time.perf_counter() - start
+            return best
+
+        for depth in range(1, max_depth + 1):
+            try:
+                move, score = self._root(board, depth, best.move)
+            except SearchTimeout as partial:
+                # Keep a move found at this depth: the previous best is searched first,
+                # so anything that beat it is at least as good
+                if partial.args and partial.args[0] is not None:
+                    best.move = partial.args[0]
+                break
+            best = SearchResult(move, score, depth, self.nodes, 0.0)
+            if abs(score) >= MATE_BOUND or time.perf_counter() > start + time_limit * 0.5:
+                break  # mate found, or the next iteration would not finish
+
+        best.nodes = self.nodes
+        best.elapsed = time.perf_counter() - start
+        return best
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _game_history(board: chess.Board) -> dict:
+        """Position keys already reached in the game (for repetition draws)."""
+        seen = {}
+        replay = board.copy()
+        while replay.move_stack:
+            replay.pop()
+            key = replay._transposition_key()
+            seen[key] = seen.get(key, 0) + 1
+        return seen
+
+    def _root(self, board: chess.Board, depth: int, pv_move: Optional[chess.Move]):
+        alpha, beta = -INF, INF
+        best_move, best_score = None, -INF
+        key = board._transposition_key()
+        self._seen[key] = self._seen.get(key, 0) + 1
+        try:
+            for move in self._ordered_moves(board, pv_move, 0):
+                board.push(move)
+                try:
+                    score = -self._negamax(board, depth - 1, -beta, -alpha, 1)
+                except SearchTimeout:
+                    raise SearchTimeout(best_move)
+                finally:
+                    board.pop()
+                if score > best_score:
+                    best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+        finally:
+            self._seen[key] -= 1
+        self._store(key, depth, EXACT, best_score, best_move, 0)
+        return best_move, best_score
+
+    def _negamax(self, board: chess.Board, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if not self.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        key = board._transposition_key()
+        if self._seen.get(key) or board.halfmove_clock >= 100:
+            return 0  # repetition / fifty-move rule
+
+        in_check = board.is_check()
+        if in_check:
+            depth += 1  # check extension
+        if depth <= 0:
+            return self._quiesce(board, alpha, beta, ply)
+
+        # Mate distance pruning
+        alpha = max(alpha, -MATE + ply)
+        beta = min(beta, MATE - ply - 1)
+        if alpha >= beta:
+            return alpha
+
+        tt_move = None
+        entry = self.tt.get(key)
+        if entry is not None:
+            e_depth, flag, value, tt_move = entry
+            if e_depth >= depth:
+                value = self._from_tt(value, ply)
+                if flag == EXACT:
+                    return value
+                if flag == LOWER and value >= beta:
+                    return value
+                if flag == UPPER and value <= alpha:
+                    return value
+
+        moves = self._ordered_moves(board, tt_move, ply)
+        if not moves:
+            return -MATE + ply if in_check else 0
+
+        alpha_orig = alpha
+        best_score, best_move = -INF, None
+        self._seen[key] = self._seen.get(key, 0) + 1
+        try:
+            for move in moves:
+                board.push(move)
+                try:
+                    score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+                finally:
+                    board.pop()
+                if score > best_score:
+                    best_score, best_move = score, move
+                    if score > alpha:
+                        alpha = score
+                        if alpha >= beta:
+                            if not board.is_capture(move):
+                                self._record_cutoff(board, move, ply, depth)
+                            break
+        finally:
+            self._seen[key] -= 1
+
+        flag = UPPER if best_score <= alpha_orig else LOWER if best_score >= beta else EXACT
+        self._store(key, depth, flag, best_score, best_move, ply)
+        return best_score
+
+    def _quiesce(self, board: chess.Board, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if not self.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        stand_pat = evaluate(board)
+        if board.turn == chess.BLACK:
+            stand_pat = -stand_pat
+        if stand_pat >= beta:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        captures = []
+        for move in board.generate_legal_captures():
+            victim = chess.PAWN if board.is_en_passant(move) else board.piece_type_at(move.to_square)
+            gain = PIECE_VALUES[victim] + (PIECE_VALUES[move.promotion] - 100 if move.promotion else 0)
+            if stand_pat + gain + 200 < alpha:
+                continue  # delta pruning: even winning the piece can't raise alpha
+            captures.append((gain * 10 - PIECE_VALUES[board.piece_type_at(move.from_square)] // 10, move))
+        captures.sort(key=lambda item: item[0], reverse=True)
+
+        for _, move in captures:
+            board.push(move)
+            try:
+                score = -self._quiesce(board, -beta, -alpha, ply + 1)
+            finally:
+                board.pop()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    # ------------------------------------------------------------------
+    # Move ordering / tables
+    # ------------------------------------------------------------------
+
+    def _ordered_moves(self, board: chess.Board, tt_move: Optional[chess.Move], ply: int) -> list:
+        killers = self.killers[ply] if ply < len(self.killers) else (None, None)
+        history = self.history
+        turn = board.turn
+        scored = []
+        for move in board.legal_moves:
+            if move == tt_move:
+                score = 10_000_000
+            elif board.is_capture(move):
+                # MVV-LVA: most valuable victim first, then least valuable attacker
+                victim = chess.PAWN if board.is_en_passant(move) else board.piece_type_at(move.to_square)
+                attacker = board.piece_type_at(move.from_square)
+                score = 1_000_000 + PIECE_VALUES[victim] * 10 - PIECE_VALUES[attacker] // 10
+            elif move.promotion:
+                score = 900_000 + PIECE_VALUES[move.promotion]
+            elif move == killers[0]:
+                score = 800_000
+            elif move == killers[1]:
+                score = 790_000
+            else:
+                score = history.get((turn, move.from_square, move.to_square), 0)
+            scored.append((score, move))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored]
+
+    def _record_cutoff(self, board: chess.Board, move: chess.Move, ply: int, depth: int) -> None:
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        key = (board.turn, move.from_square, move.to_square)
+        self.history[key] = min(self.history.get(key, 0) + depth * depth, 700_000)
+
+    def _store(self, key, depth: int, flag: int, value: int, move, ply: int) -> None:
+        # Mate scores are stored relative to this node, not the root
+        if value >= MATE_BOUND:
+            value += ply
+        elif value <= -MATE_BOUND:
+            value -= ply
+        self.tt[key] = (depth, flag, value, move)
+
+    @staticmethod
+    def _from_tt(value: int, ply: int) -> int:
+        if value >= MATE_BOUND:
+            return value - ply
+        if value <= -MATE_BOUND:
+            return value + ply
+        return value
+
+
+_engine: Optional[Engine] = None
+
+
+def choose_move(board: chess.Board, difficulty: str = "medium") -> Optional[chess.Move]:
+    """Pick the bot's move for `difficulty` (see DIFFICULTY_LEVELS). Safe to run in a worker process."""
+    global _engine
+    level = DIFFICULTY_LEVELS.get(difficulty, DIFFICULTY_LEVELS["medium"])
+    legal = list(board.legal_moves)
+    if not legal:
+        return None
+    if level["blunder"] and random.random() < level["blunder"]:
+        return random.choice(legal)
+    if _engine is None:
+        _engine = Engine()
+    return _engine.search(board, max_depth=level["depth"], time_limit=level["time"]).move
@@ -0,0 +1,359 @@
+"""
+utils/connect4_engine.py
+========================
+Bitboard Connect-4 engine for the BoardGames AI (cogs/boardgames.py).
+
+A position is two integers (the layout popularised by Pascal Pons' solver):
+
+    mask     every occupied cell
+    current  the stones of the player to move
+
+Each column uses HEIGHT + 1 bits (the extra sentinel bit keeps columns
+apart), bit 0 of a column is the bottom cell.  Dropping a disc is one
+addition, four-in-a-row is four shift/and pairs, and "where could this
+player still complete a line" is a handful of shifts - so the search never
+copies a board or rescans the grid.
+
+The search is negamax alpha-beta with
+
+    * a transposition table keyed on current + mask (unique per position)
+    * iterative deepening under a time budget; once the depth covers every
+      remaining empty cell the result is an exact solve
+    * "non-losing moves" pruning (never play under an opponent threat,
+      always block a direct threat)
+    * move ordering: TT move, then moves creating the most threats, centre first
+    * a threat-counting heuristic at the depth horizon
+
+Win scores are absolute (WIN minus the number of discs on the board when
+the game ends) so they can be stored in the TT without ply adjustment and
+the engine prefers quick wins and slow losses.
+
+best_move() takes the cog's 6x7 list-of-lists grid and returns a column;
+it is picklable and is run in the shared worker pool so a search never
+blocks the event loop.
+
+Benchmark and solver checks: python scripts/bench_connect4.py
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Optional
+
+WIDTH = 7
+HEIGHT = 6
+H1 = HEIGHT + 1
+CELLS = WIDTH * HEIGHT
+
+WIN = 10_000          # scores above WIN - CELLS - 1 are forced wins
+TT_MAX_ENTRIES = 1_000_000
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+BOTTOM = [1 << (c * H1) for c in range(WIDTH)]
+TOP = [1 << (c * H1 + HEIGHT - 1) for c in range(WIDTH)]
+COLUMN = [((1 << HEIGHT) - 1) << (c * H1) for c in range(WIDTH)]
+BOTTOM_MASK = sum(BOTTOM)
+BOARD_MASK = BOTTOM_MASK * ((1 << HEIGHT) - 1)
+CENTRE_ORDER = (3, 2, 4, 1, 5, 0, 6)
+
+# Opening book: moves played so far (columns as digits) -> column.
+# Only lines settled by the published solutions of the game are listed
+# (the centre opening wins; answering it in the centre is the longest
+# defence); later positions are searched.
+OPENING_BOOK = {
+    "": 3,
+    "3": 3,
+}
+
+DIFFICULTY_LEVELS = {
+    # depth: search limit in plies, time: seconds, blunder: chance of a random move
+    "easy": {"depth": 2, "time": 0.2, "blunder": 0.3, "book": False},
+    "medium": {"depth": 6, "time": 0.5, "blunder": 0.0, "book": False},
+    "hard": {"depth": CELLS, "time": 2.0, "blunder": 0.0, "book": True},
+}
+
+
+def _popcount(x: int) -> int:
+    return bin(x).count("1")
+
+
+def is_alignment(stones: int) -> bool:
+    """True if `stones` contains four in a row."""
+    for shift in (1, H1, H1 - 1, H1 + 1):  # vertical, horizontal, diagonals
+        m = stones & (stones >> shift)
+        if m & (m >> (2 * shift)):
+            return True
+    return False
+
+
+def winning_cells(stones: int, mask: int) -> int:
+    """Empty cells that would complete four in a row for `stones`."""
+    # vertical
+    r = (stones << 1) & (stones << 2) & (stones << 3)
+    for s in (H1, H1 - 1, H1 + 1):
+        p = (stones << s) & (stones << (2 * s))
+        r |= p & (stones << (3 * s))
+        r |= p & (stones >> s)
+        p = (stones >> s) & (stones >> (2 * s))
+        r |= p & (stones << s)
+        r |= p & (stones >> (3 * s))
+    return r & (BOARD_MASK ^ mask)
+
+
+class Position:
+    """Bitboard position; `current` is the side to move."""
+
+    __slots__ = ("current", "mask", "moves", "history")
+
+    def __init__(self, current: int = 0, mask: int = 0, moves: int = 0, history: str = ""):
+        self.current = current
+        self.mask = mask
+        self.moves = moves
+        self.history = history
+
+    @classmethod
+    def from_grid(cls, grid, to_move, empty=" ") -> "Position":
+        """Build from the cog's grid (row 0 = top) with `to_move`'s symbol to play."""
+        current = mask = moves = 0
+        for c in range(WIDTH):
+            for h in range(HEIGHT):
+                cell = grid[HEIGHT - 1 - h][c]
+                if cell == empty:
+                    break
+                bit = 1 << (c * H1 + h)
+                mask |= bit
+                moves += 1
+                if cell == to_move:
+                    current |= bit
+        return cls(current, mask, moves, None)
+
+    @classmethod
+    def from_moves(cls, moves: str) -> "Position":
+        pos = cls()
+        for ch in moves:
+            pos.play(int(ch))
+        return pos
+
+    def copy(self) -> "Position":
+        return Position(self.current, self.mask, self.moves, self.history)
+
+    def key(self) -> int:
+        return self.current + self.mask
+
+    def can_play(self, col: int) -> bool:
+        return not self.mask & TOP[col]
+
+    def play(self, col: int) -> None:
+        self.current ^= self.mask
+        self.mask |= self.mask + BOTTOM[col]
+        self.moves += 1
+        if self.history is not None:
+            self.history += str(col)
+
+    def is_winning_move(self, col: int) -> bool:
+        move = (self.mask + BOTTOM[col]) & COLUMN[col]
+        return is_alignment(self.current | move)
+
+    def possible(self) -> int:
+        return (self.mask + BOTTOM_MASK) & BOARD_MASK
+
+    def can_win_next(self) -> bool:
+        return bool(winning_cells(self.current, self.mask) & self.possible())
+
+    def non_losing_moves(self) -> int:
+        """Playable cells that don't hand the opponent an immediate win (assumes no win for us now)."""
+        possible = self.possible()
+        opp_wins = winning_cells(self.current ^ self.mask, self.mask)
+        forced = possible & opp_wins
+        if forced:
+            if forced & (forced - 1):
+                return 0  # two threats at once: lost
+            possible = forced
+        return possible & ~(opp_wins >> 1)  # never play directly under an opponent threat
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+
+class Solver:
+    """Negamax searcher; keep one per process so the TT survives between moves."""
+
+    def __init__(self, tt_max_entries: int = TT_MAX_ENTRIES):
+        self.tt: dict = {}
+        self.tt_max_entries = tt_max_entries
+        self.nodes = 0
+        self.deadline = 0.0
+
+    def search(self, pos: Position, max_depth: int = CELLS, time_limit: float = 1.0):
+        """Return (column, score, depth reached) for the side to move."""
+        start = time.perf_counter()
+        self.deadline = start + time_limit
+        self.nodes = 0
+        if len(self.tt) > self.tt_max_entries:
+            self.tt.clear()
+
+        cols = [c for c in CENTRE_ORDER if pos.can_play(c)]
+        if not cols:
+            return None, 0, 0
+        for c in cols:
+            if pos.is_winning_move(c):
+                return c, WIN - pos.moves - 1, 1
+        safe = pos.non_losing_moves()
+        candidates = [c for c in cols if safe & COLUMN[c]] or cols
+
+        best_col, best_score, reached = candidates[0], -WIN, 0
+        remaining = CELLS - pos.moves
+        for depth in range(1, min(max_depth, remaining) + 1):
+            try:
+                col, score = self._root(pos, candidates, depth, best_col)
+            except SearchTimeout as partial:
+                if partial.args and partial.args[0] is not None:
+                    best_col = partial.args[0]
+                break
+            best_col, best_score, reached = col, score, depth
+            if abs(score) > WIN - CELLS - 1:
+                break  # forced result found
+            if time.perf_counter() > start + time_limit * 0.5:
+                break  # the next iteration would not finish
+        return best_col, best_score, reached
+
+    def _root(self, pos: Position, candidates: list, depth: int, first: int):
+        order = [first] + [c for c in candidates if c != first]
+        alpha, beta = -WIN, WIN
+        best_col, best_score = None, -WIN - 1
+        for col in order:
+            child = pos.copy()
+            child.play(col)
+            try:
+                score = -self._negamax(child, depth - 1, -beta, -alpha)
+            except SearchTimeout:
+                raise SearchTimeout(best_col)
+            if score > best_score:
+                best_col, best_score = col, score
+            if score > alpha:
+                alpha = score
+        return best_col, best_score
+
+    def _negamax(self, pos: Position, depth: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        if not self.nodes & 4095 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        current, mask, moves = pos.current, pos.mask, pos.moves
+        possible = (mask + BOTTOM_MASK) & BOARD_MASK
+        if winning_cells(current, mask) & possible:
+            return WIN - moves - 1
+        if moves >= CELLS - 1:
+            return 0  # the last disc cannot win (checked above): draw
+
+        opponent = current ^ mask
+        opp_wins = winning_cells(opponent, mask)
+        forced = possible & opp_wins
+        if forced:
+            if forced & (forced - 1):
+                return -(WIN - moves - 2)  # two threats: opponent wins next move
+            possible = forced
+        nonlosing = possible & ~(opp_wins >> 1)
+        if not nonlosing:
+            return -(WIN - moves - 2)
+
+        # Bounds from the number of discs left: can't win before our next move after this one
+        best_possible = WIN - moves - 3
+        if beta > best_possible:
+            beta = best_possible
+            if alpha >= beta:
+                return beta
+
+        if depth <= 0:
+            return self._evaluate(current, opponent, mask, opp_wins)
+
+        key = current + mask
+        entry = self.tt.get(key)
+        tt_col = None
+        if entry is not None:
+            e_depth, flag, value, tt_col = entry
+            if e_depth >= depth or abs(value) > WIN - CELLS - 1:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER and value >= beta:
+                    return value
+                if flag == UPPER and value <= alpha:
+                    return value
+
+        # Order: TT move, then moves creating the most threats, centre first
+        scored = []
+        for i, c in enumerate(CENTRE_ORDER):
+            move = nonlosing & COLUMN[c]
+            if move:
+                if c == tt_col:
+                    order = 1000
+                else:
+                    order = _popcount(winning_cells(current | move, mask | move)) * 16 - i
+                scored.append((order, c, move))
+        scored.sort(reverse=True)
+
+        alpha_orig = alpha
+        best, best_col = -WIN - 1, None
+        child = Position()
+        for _, c, move in scored:
+            child.current = opponent
+            child.mask = mask | move
+            child.moves = moves + 1
+            child.history = None
+            score = -self._negamax(child, depth - 1, -beta, -alpha)
+            if score > best:
+                best, best_col = score, c
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        flag = UPPER if best <= alpha_orig else LOWER if best >= beta else EXACT
+        self.tt[key] = (depth, flag, best, best_col)
+        return best
+
+    @staticmethod
+    def _evaluate(current: int, opponent: int, mask: int, opp_wins: int) -> int:
+        """Horizon score for the side to move: threats, then centre control."""
+        my_wins = winning_cells(current, mask)
+        score = 8 * (_popcount(my_wins) - _popcount(opp_wins))
+        # Threats on a cell directly above another threat of the same player are decisive later
+        score += 20 * (_popcount(my_wins & (my_wins >> 1)) - _popcount(opp_wins & (opp_wins >> 1)))
+        centre = COLUMN[3]
+        score += 3 * (_popcount(current & centre) - _popcount(opponent & centre))
+        return score
+
+
+_solver: Optional[Solver] = None
+
+
+def best_move(grid, ai_symbol, player_symbol, difficulty: str = "medium", empty=" ",
+              history: Optional[str] = None) -> int:
+    """Column (0-6) for `ai_symbol` to play on the cog's 6x7 grid. Safe to run in a worker process.
+
+    `history` (moves played so far as column digits) enables the opening book.
+    """
+    global _solver
+    level = DIFFICULTY_LEVELS.get(difficulty, DIFFICULTY_LEVELS["medium"])
+    pos = Position.from_grid(grid, ai_symbol, empty)
+    available = [c for c in CENTRE_ORDER if pos.can_play(c)]
+    if not available:
+        return 3
+
+    if level["book"]:
+        if history is None and pos.moves <= 1:
+            # Without a history, the first ply or two can be read off the grid
+            history = "".join(str(c) for c in range(WIDTH) if pos.mask & BOTTOM[c])
+        book = OPENING_BOOK.get(history) if history is not None else None
+        if book is not None and pos.can_play(book):
+            return book
+    if level["blunder"] and random.random() < level["blunder"]:
+        return random.choice(available)
+
+    if _solver is None:
+        _solver = Solver()
+    col, _, _ = _solver.search(pos, max_depth=level["depth"], time_limit=level["time"])
+    return col if col is not None else available[0]
@@ -1,9 +1,14 @@
-
 import os
+import json
+import queue
+import atexit
 import datetime
 import logging
 import sqlite3
-from typing import Optional, Dict, List, Any
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Optional, Dict, List, Any, Callable, Iterable, Tuple
 from contextlib import contextmanager
 from dotenv import load_dotenv
 
@@ -24,9 +29,127 @@ def convert_datetime(ts):
 sqlite3.register_adapter(datetime.datetime, adapt_datetime)
 sqlite3.register_converter("TIMESTAMP", convert_datetime)
 
+# Max queued write operations committed in a single transaction
+WRITE_BATCH_SIZE = 500
+
+# ---------------------------------------------------------------------------
+# Prepared statements (sqlite3 caches the compiled form per connection)
+# ---------------------------------------------------------------------------
+
+SQL_UPSERT_USER = """
+INSERT INTO users (user_id, username, created_at, updated_at, last_active)
+VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+ON CONFLICT(user_id) DO UPDATE SET
+    username = excluded.username,
+    updated_at = CURRENT_TIMESTAMP,
+    last_active = CURRENT_TIMESTAMP;
+"""
+
+SQL_SET_STAT = """
+INSERT INTO stats (user_id, stat_name, stat_value)
+VALUES (?, ?, ?)
+ON CONFLICT(user_id, stat_name) DO UPDATE SET
+    stat_value = excluded.stat_value;
+"""
+
+SQL_INC_STAT = """
+INSERT INTO stats (user_id, stat_name, stat_value)
+VALUES (?, ?, ?)
+ON CONFLICT(user_id, stat_name) DO UPDATE SET
+    stat_value = stats.stat_value + excluded.stat_value;
+"""
+
+SQL_UPSERT_DOCUMENT = """
+INSERT INTO user_documents (user_id, doc_json, updated_at)
+VALUES (?, ?, CURRENT_TIMESTAMP)
+ON CONFLICT(user_id) DO UPDATE SET
+    doc_json = excluded.doc_json,
+    updated_at = CURRENT_TIMESTAMP;
+"""
+
+SQL_UPSERT_DOCUMENT_USER = """
+INSERT INTO users (user_id, username, created_at, updated_at, last_active)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(user_id) DO UPDATE SET
+    username = excluded.username,
+    updated_at = excluded.updated_at,
+    last_active = excluded.last_active;
+"""
+
+
+class _WriterThread(threading.Thread):
+    """
+    Owns the single write connection. Queued operations are drained in
+    batches of up to WRITE_BATCH_SIZE and committed as one transaction;
+    each operation runs inside its own SAVEPOINT so one bad write cannot
+    poison the rest of the batch.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        super().__init__(name="LudusDB-writer", daemon=True)
+        self.conn = conn
+        self.queue: "queue.Queue[Optional[Tuple[Callable, Future]]]" = queue.Queue()
+
+    def submit(self, op: Callable[[sqlite3.Cursor], Any]) -> Future:
+        fut: Future = Future()
+        self.queue.put((op, fut))
+        return fut
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            batch = [item]
+            stop = False
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    nxt = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._commit_batch(batch)
+            if stop:
+                break
+
+    def _commit_batch(self, batch):
+        cursor = self.conn.cursor()
+        results = []
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            for op, fut in batch:
+                cursor.execute("SAVEPOINT op")
+                try:
+                    results.append((fut, op(cursor), None))
+                    cursor.execute("RELEASE op")
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO op")
+                    cursor.execute("RELEASE op")
+                    logger.error(f"Database write error: {e}")
+                    results.append((fut, None, e))
+            cursor.execute("COMMIT")
+        except Exception as e:
+            logger.error(f"Database transaction error: {e}")
+            try:
+                cursor.execute("ROLLBACK")
+            except Exception:
+                pass
+            results = [(fut, None, e) for _, fut in batch]
+        finally:
+            cursor.close()
+        for fut, value, err in results:
+            if err is not None:
+                fut.set_exception(err)
+            else:
+                fut.set_result(value)
+
+
 class DatabaseManager:
     _instance = None
-    
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DatabaseManager, cls).__new__(cls)
@@ -41,26 +164,56 @@ class DatabaseManager:
              self.db_path = os.path.join(render_path, "data", "database.db")
         else:
              self.db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "database.db")
-        
+
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        
+
+        # Connections are opened lazily, once, and live for the whole process.
+        self._read_conn: Optional[sqlite3.Connection] = None
+        self._read_lock = threading.Lock()
+        self._writer: Optional[_WriterThread] = None
+        self._start_lock = threading.Lock()
+        self._schema_ready = False
+        atexit.register(self.close)
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+            check_same_thread=False,
+            isolation_level=None,  # explicit BEGIN/COMMIT
+            timeout=30,
+        )
+        conn.row_factory = sqlite3.Row # Enable name-based access
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=OFF")
+        return conn
+
+    def _ensure_started(self):
+        if self._writer is not None:
+            return
+        with self._start_lock:
+            if self._writer is not None:
+                return
+            self._read_conn = self._open()
+            writer = _WriterThread(self._open())
+            writer.start()
+            self._writer = writer
+            if not self._schema_ready:
+                self._writer.submit(self._create_schema).result()
+                self._schema_ready = True
+
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections to ensure they are closed properly."""
-        conn = None
+        """Yield the shared read connection (serialised by a lock)."""
         try:
-            conn = sqlite3.connect(
-                self.db_path, 
-                detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
-            )
-            conn.row_factory = sqlite3.Row # Enable name-based access
-            yield conn
+            self._ensure_started()
         except Exception as e:
             logger.error(f"Database connection error: {e}")
             yield None
-        finally:
-            if conn:
-                conn.close()
+            return
+        with self._read_lock:
+            yield self._read_conn
 
     @contextmanager
     def get_cursor(self, commit: bool = False):
@@ -69,23 +222,62 @@ class DatabaseManager:
             if conn is None:
                 yield None
                 return
-                
+
             cursor = conn.cursor()
             try:
+                if commit:
+                    cursor.execute("BEGIN")
                 yield cursor
                 if commit:
-                    conn.commit()
+                    cursor.execute("COMMIT")
             except Exception as e:
-                if conn:
-                    conn.rollback()
+                if commit:
+                    try:
+                        cursor.execute("ROLLBACK")
+                    except Exception:
+                        pass
                 logger.error(f"Database query error: {e}")
                 # Don't raise, just log, to keep bot running
-                # raise 
+                # raise
             finally:
                 cursor.close()
 
-    def initialize_schema(self):
-        """Create the necessary tables if they do not exist."""
+    def submit(self, op: Callable[[sqlite3.Cursor], Any]) -> Future:
+        """Queue op(cursor) on the writer thread. Ops queued together share one transaction."""
+        self._ensure_started()
+        return self._writer.submit(op)
+
+    def _write(self, query: str, params: Iterable = ()) -> Future:
+        return self.submit(lambda cur: cur.execute(query, tuple(params)).rowcount)
+
+    def _write_many(self, query: str, rows: List[tuple]) -> Future:
+        return self.submit(lambda cur: cur.executemany(query, rows).rowcount)
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until every write queued so far has been committed."""
+        if self._writer is None:
+            return
+        self.submit(lambda cur: None).result(timeout)
+
+    def close(self):
+        """Commit pending writes, checkpoint the WAL and close both connections."""
+        writer, self._writer = self._writer, None
+        if writer is None:
+            return
+        try:
+            writer.queue.put(None)
+            writer.join(timeout=30)
+            writer.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            writer.conn.close()
+        except Exception as e:
+            logger.error(f"Database close error: {e}")
+        with self._read_lock:
+            if self._read_conn is not None:
+                self._read_conn.close()
+                self._read_conn = None
+
+    @staticmethod
+    def _create_schema(cursor: sqlite3.Cursor):
         queries = [
             """
             CREATE TABLE IF NOT EXISTS users (
@@ -111,6 +303,10 @@ class DatabaseManager:
             );
             """,
             """
+            CREATE INDEX IF NOT EXISTS idx_stats_leaderboard
+                ON stats (stat_name, stat_value DESC);
+            """,
+            """
             CREATE TABLE IF NOT EXISTS activity (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 user_id INTEGER REFERENCES users(user_id),
@@ -127,53 +323,39 @@ class DatabaseManager:
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 PRIMARY KEY (user_id, game_name)
             );
+            """,
             """
+            CREATE TABLE IF NOT EXISTS user_documents (
+                user_id INTEGER PRIMARY KEY,
+                doc_json TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            """,
         ]
-        
-        with self.get_cursor(commit=True) as cursor:
-            if cursor:
-                for query in queries:
-                    cursor.execute(query)
-                logger.info("Database schema initialized successfully (SQLite).")
+        for query in queries:
+            cursor.execute(query)
+
+    def initialize_schema(self):
+        """Create the necessary tables if they do not exist."""
+        self._ensure_started()
+        logger.info("Database schema initialized successfully (SQLite, WAL).")
 
     def upsert_user(self, user_id: int, username: str):
         """Insert a new user or update connection details."""
-        query = """
-        INSERT INTO users (user_id, username, created_at, updated_at, last_active)
-        VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-        ON CONFLICT(user_id) DO UPDATE SET
-            username = excluded.username,
-            updated_at = CURRENT_TIMESTAMP,
-            last_active = CURRENT_TIMESTAMP;
-        """
-        with self.get_cursor(commit=True) as cursor:
-            if cursor:
-                cursor.execute(query, (user_id, username))
+        return self._write(SQL_UPSERT_USER, (user_id, username))
 
     def update_stat(self, user_id: int, stat_name: str, value: Any, increment: bool = False):
         """Update or insert a specific stat for a user."""
-        if increment:
-            query = """
-            INSERT INTO stats (user_id, stat_name, stat_value)
-            VALUES (?, ?, ?)
-            ON CONFLICT(user_id, stat_name) DO UPDATE SET
-                stat_value = stats.stat_value + excluded.stat_value;
-            """
-        else:
-            query = """
-            INSERT INTO stats (user_id, stat_name, stat_value)
-            VALUES (?, ?, ?)
-            ON CONFLICT(user_id, stat_name) DO UPDATE SET
-                stat_value = excluded.stat_value;
-            """
-            
-        with self.get_cursor(commit=True) as cursor:
-            if cursor:
-                cursor.execute(query, (user_id, stat_name, value))
+        query = SQL_INC_STAT if increment else SQL_SET_STAT
+        return self._write(query, (user_id, stat_name, value))
 
     def increment_stat(self, user_id: int, stat_name: str, amount: int = 1):
         """Increment a stat by a specific amount."""
-        self.update_stat(user_id, stat_name, amount, increment=True)
+        return self.update_stat(user_id, stat_name, amount, increment=True)
+
+    def increment_stats(self, rows: List[Tuple[int, str, Any]]):
+        """Apply many (user_id, stat_name, amount) increments in one transaction."""
+        return self._write_many(SQL_INC_STAT, list(rows))
 
     def log_activity(self, user_id: int, activity_type: str, activity_name: str, timestamp: Optional[str] = None):
         """Log a user activity."""
@@ -189,20 +371,15 @@ class DatabaseManager:
             VALUES (?, ?, ?);
             """
             params = (user_id, activity_type, activity_name)
-            
-        with self.get_cursor(commit=True) as cursor:
-            if cursor:
-                cursor.execute(query, params)
-            
+        return self._write(query, params)
+
     def increment_command_count(self, user_id: int):
         """Increment the command usage counter."""
         query = """
         UPDATE users SET total_commands = total_commands + 1 WHERE user_id = ?;
         """
-        with self.get_cursor(commit=True) as cursor:
-            if cursor:
-                cursor.execute(query, (user_id,))
-    
+        return self._write(query, (user_id,))
+
     def save_game_state(self, user_id: int, game_name: str, state_json: str):
         """Save a game state to the database."""
         query = """
@@ -212,12 +389,118 @@ class DatabaseManager:
             state_json = excluded.state_json,
             updated_at = CURRENT_TIMESTAMP;
         """
-        with self.get_cursor(commit=True) as cursor:
-            if cursor:
-                cursor.execute(query, (user_id, game_name, state_json))
+        return self._write(query, (user_id, game_name, state_json))
+
+    # ------------------------------------------------------------------
+    # Whole-document storage (backend for utils.user_storage)
+    # ------------------------------------------------------------------
+
+    def save_documents(self, docs: List[Tuple[int, str]], overwrite: bool = True) -> Future:
+        """
+        Persist many (user_id, doc_json) user documents in ONE transaction.
+        Also mirrors username/meta into `users` and numeric stats into `stats`
+        so leaderboard queries never have to parse documents.
+        overwrite=False only inserts users that have no document yet (imports
+        must never replace newer data already in SQLite).
+        """
+        def _op(cur: sqlite3.Cursor):
+            user_rows, doc_rows, stat_rows = [], [], []
+            for user_id, doc_json in docs:
+                if not overwrite:
+                    cur.execute("SELECT 1 FROM user_documents WHERE user_id = ?", (user_id,))
+                    if cur.fetchone() is not None:
+                        continue
+                doc = json.loads(doc_json)
+                meta = doc.get("meta", {})
+                user_rows.append((user_id, doc.get("username"), meta.get("created_at"),
+                                  meta.get("updated_at"), meta.get("last_active")))
+                doc_rows.append((user_id, doc_json))
+                for name, value in doc.get("stats", {}).items():
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        stat_rows.append((user_id, name, value))
+            cur.executemany(SQL_UPSERT_DOCUMENT_USER, user_rows)
+            cur.executemany(SQL_UPSERT_DOCUMENT, doc_rows)
+            cur.executemany(SQL_SET_STAT, stat_rows)
+            return len(doc_rows)
+        return self.submit(_op)
+
+    def load_document(self, user_id: int) -> Optional[dict]:
+        """Return the stored user document, or None if the user has none."""
+        with self.get_cursor() as cursor:
+            if not cursor:
+                return None
+            cursor.execute("SELECT doc_json FROM user_documents WHERE user_id = ?", (user_id,))
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row["doc_json"])
+        except Exception:
+            return None
+
+    def count_documents(self) -> int:
+        with self.get_cursor() as cursor:
+            if not cursor:
+                return 0
+            cursor.execute("SELECT COUNT(*) FROM user_documents")
+            return cursor.fetchone()[0]
+
+    def top_stat(self, stat_name: str, limit: int = 10) -> List[Tuple[int, str, float]]:
+        """Top users for a numeric stat: [(user_id, username, value), ...] (index scan)."""
+        with self.get_cursor() as cursor:
+            if not cursor:
+                return []
+            cursor.execute(
+                """
+                SELECT s.user_id, u.username, s.stat_value
+                FROM stats s LEFT JOIN users u ON u.user_id = s.user_id
+                WHERE s.stat_name = ?
+                ORDER BY s.stat_value DESC
+                LIMIT ?;
+                """,
+                (stat_name, limit),
+            )
+            return [(r[0], r[1], r[2]) for r in cursor.fetchall()]
+
+    def migrate_json_tree(self, users_dir, batch_size: int = 500) -> int:
+        """
+        One-shot import of a data/users/*.json tree into user_documents.
+        Writes a `.migrated` marker into users_dir so it never runs twice;
+        the JSON files are left in place as a backup. Users that already have
+        a document are skipped, so a re-run never overwrites newer data.
+        Returns users imported.
+        """
+        users_dir = Path(users_dir)
+        marker = users_dir / ".migrated"
+        if not users_dir.exists() or marker.exists():
+            return 0
+
+        imported, batch = 0, []
+        for path in users_dir.glob("*.json"):
+            try:
+                doc = json.loads(path.read_text(encoding="utf-8"))
+                user_id = int(doc.get("user_id", path.stem))
+                doc["user_id"] = user_id
+            except Exception as e:
+                logger.error(f"Skipping unreadable user file {path.name}: {e}")
+                continue
+            batch.append((user_id, json.dumps(doc, ensure_ascii=False, separators=(",", ":"))))
+            if len(batch) >= batch_size:
+                imported += self.save_documents(batch, overwrite=False).result()
+                batch = []
+        if batch:
+            imported += self.save_documents(batch, overwrite=False).result()
+
+        marker.write_text(datetime.datetime.now(datetime.timezone.utc).isoformat(), encoding="utf-8")
+        logger.info(f"Migrated {imported} user files from {users_dir} into SQLite.")
+        return imported
 
     def get_user_data(self, user_id: int) -> Dict:
         """Retrieve all data for a user including stats, simulating the JSON structure."""
+        doc = self.load_document(user_id)
+        if doc is not None:
+            return doc
+
         with self.get_cursor() as cursor:
             if not cursor:
                 return {}
@@ -225,35 +508,34 @@ class DatabaseManager:
             # Get main user data
             cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
             user = cursor.fetchone()
-            
+
             if not user:
                 return {}
-                
+
             # Get stats
             cursor.execute("SELECT stat_name, stat_value FROM stats WHERE user_id = ?", (user_id,))
             stats = cursor.fetchall()
-            
+
             # Get game states
             cursor.execute("SELECT game_name, state_json FROM game_states WHERE user_id = ?", (user_id,))
             games = cursor.fetchall()
 
             # Format data to match old JSON structure somewhat
             user_data = dict(user)
-            
+
             # Stats dictionary
             stats_dict = {s['stat_name']: float(s['stat_value']) for s in stats}
             user_data['stats'] = stats_dict
-            
+
             # Games dictionary
             games_dict = {}
-            import json
             for g in games:
                 try:
                     games_dict[g['game_name']] = json.loads(g['state_json'])
                 except:
                     games_dict[g['game_name']] = {}
             user_data['games'] = games_dict
-            
+
             # Mock other structures if needed for compatibility
             user_data['minigames'] = {"by_game": {}, "recent_plays": []}
             user_data['activity'] = {"counts": {}, "by_name": {}, "recent": []}
@@ -262,7 +544,7 @@ class DatabaseManager:
                 "updated_at": str(user['updated_at']),
                 "last_active": str(user['last_active'])
             }
-            
+
             return user_data
 
 # Global instance
@@ -0,0 +1,174 @@
+"""
+utils/journal.py
+================
+Append-only JSON-lines transaction journal with group-commit fsync.
+
+A cog keeps its state in memory, appends one compact record per mutation,
+and periodically compacts the state into a snapshot file.  Records are
+buffered and written + fsynced in small batches (every `flush_interval`
+seconds or as soon as `batch_size` records are pending), so callers never
+wait on the disk.
+
+Compaction protocol (crash-safe):
+    1. rotate()          - pending records go to the current segment, which
+                           is renamed to <journal>.old; a new segment starts
+    2. write snapshot    - caller writes its state atomically
+    3. discard_rotated() - <journal>.old is deleted
+
+On startup replay() yields records from <journal>.old (if a crash happened
+between 1 and 3) and then the live segment.  Records should carry absolute
+values (not deltas) so replaying a record already covered by the snapshot
+is harmless.
+
+Usage:
+    journal = TransactionJournal("data/economy.json.journal")
+    for rec in journal.replay():
+        apply(rec)
+    journal.append({"t": "a", "u": "123", "f": {"balance": 150}})
+    asyncio.create_task(journal.run())      # background group commit
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+class TransactionJournal:
+    """Buffered, fsync-batched append-only journal (one JSON object per line)."""
+
+    def __init__(self, path, batch_size: int = 64, flush_interval: float = 0.5):
+        self.path = Path(path)
+        self.rotated_path = self.path.with_name(self.path.name + ".old")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.records = 0            # records appended since the last compaction
+        self._buf: list[str] = []
+        self._buf_lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._fh = None
+        self._wake: Optional[asyncio.Event] = None
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, record: dict) -> None:
+        """Buffer a record. Cheap and non-blocking; durability follows within flush_interval."""
+        line = json.dumps(record, separators=(",", ":"), ensure_ascii=False)
+        with self._buf_lock:
+            self._buf.append(line)
+            self.records += 1
+            pending = len(self._buf)
+        if pending >= self.batch_size and self._wake is not None:
+            self._wake.set()
+
+    def _open(self):
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.path, "a", encoding="utf-8")
+        return self._fh
+
+    def _write_locked(self, lines: list[str], sync: bool = True) -> None:
+        fh = self._open()
+        fh.write("\n".join(lines) + "\n")
+        fh.flush()
+        if sync:
+            os.fsync(fh.fileno())
+
+    def flush(self) -> int:
+        """Write and fsync every buffered record. BLOCKING - returns records written."""
+        with self._file_lock:
+            with self._buf_lock:
+                lines, self._buf = self._buf, []
+            if not lines:
+                return 0
+            try:
+                self._write_locked(lines)
+            except Exception:
+                with self._buf_lock:
+                    self._buf[:0] = lines  # retry on the next flush
+                raise
+            return len(lines)
+
+    async def run(self) -> None:
+        """Background group-commit loop: flush every flush_interval or when a batch fills."""
+        self._wake = asyncio.Event()
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                print(f"[journal] flush failed for {self.path.name}: {e}", file=sys.stderr)
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def rotate(self) -> None:
+        """Close the live segment (with all buffered records) as <journal>.old and start a new one."""
+        with self._file_lock:
+            with self._buf_lock:
+                lines, self._buf = self._buf, []
+                self.records = 0
+            if lines:
+                self._write_locked(lines, sync=False)
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if self.path.exists():
+                if self.rotated_path.exists():
+                    # A previous compaction never finished: keep both segments in order
+                    with open(self.rotated_path, "a", encoding="utf-8") as dst:
+                        dst.write(self.path.read_text(encoding="utf-8"))
+                    self.path.unlink()
+                else:
+                    os.replace(self.path, self.rotated_path)
+
+    def discard_rotated(self) -> None:
+        """Delete <journal>.old once the snapshot covering it is safely on disk."""
+        try:
+            self.rotated_path.unlink(missing_ok=True)
+        except Exception as e:
+            print(f"[journal] could not remove {self.rotated_path.name}: {e}", file=sys.stderr)
+
+    def close(self) -> None:
+        """Flush pending records and close the live segment."""
+        self.flush()
+        with self._file_lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+
+    def replay(self) -> Iterator[dict]:
+        """Yield every record from <journal>.old then the live segment, skipping torn lines."""
+        count = 0
+        for path in (self.rotated_path, self.path):
+            if not path.exists():
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn write from a crash
+                    count += 1
+                    yield record
+        self.records = count
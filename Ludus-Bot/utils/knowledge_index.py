@@ -0,0 +1,284 @@
+"""
+utils/knowledge_index.py
+========================
+Precompiled lookup tables for LudusPersonality's knowledge.json Q&A.
+
+The personality cog used to re-normalise every key with regexes on each
+question, test every key for substring containment and then run
+difflib.get_close_matches over all keys - and rebuilt the normalised FAQ
+dict per question.  A KnowledgeIndex is built once per knowledge.json
+change (and updated in place when a user teaches an answer):
+
+    index = KnowledgeIndex(knowledge_data)
+    index.match("faq", normalize_question(question))
+    index.add("user_taught", normalized_question, entry)
+
+Each section (faq, user_taught, general_knowledge, ...) keeps:
+
+    * its keys normalised once (normalize_question);
+    * exact lookup by normalised key;
+    * an inverted token index (token -> keys) for "question is part of a
+      key" checks, and contiguous token spans of the question looked up
+      directly for "key is part of the question" - both token aligned;
+    * a trigram index that shortlists fuzzy candidates, so difflib's
+      ratio is computed for a handful of keys instead of all of them.
+
+Matching order is the old one: raw key, then the first key (in file
+order) that equals / contains / is contained in the question, then the
+closest fuzzy match at or above the cutoff.
+
+Each lookup step looks at no more than MAX_SCAN keys, so its cost is
+bounded by the question length rather than the section size.  Common
+words and trigrams have long postings; past the budget only their
+earliest keys are checked.  A question made only of very common words
+can therefore miss a late key that the old full scan would have found.
+Building the index is still linear (about a second for 20k keys), so the
+cog builds it in a thread.
+
+Benchmark and cross-check against the old matcher:
+    python scripts/bench_knowledge.py
+"""
+
+from __future__ import annotations
+
+import re
+from difflib import SequenceMatcher
+from itertools import islice
+from typing import Any, Dict, List, Optional, Set
+
+FUZZY_CUTOFF = 0.78
+FUZZY_CANDIDATES = 12  # shortlisted keys that get a full difflib ratio
+MIN_SHARED_GRAMS = 0.5  # share of the question's trigrams a fuzzy candidate must have
+MAX_SCAN = 512  # keys one lookup step may look at, whatever the section size
+
+# Same cleaning as LudusPersonality._normalize_question_text, compiled once
+_MENTION = re.compile(r"<@!?\\d+>")
+_NON_WORD = re.compile(r"[^a-z0-9\s']")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_question(text: str) -> str:
+    cleaned = _MENTION.sub(" ", text.lower())
+    # Keep apostrophes for things like "what's" or possessives, but remove other punctuation
+    cleaned = _NON_WORD.sub(" ", cleaned)
+    return _SPACES.sub(" ", cleaned).strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def resolve_answer(entry: Any) -> Any:
+    """user_taught entries are dicts with an "answer"; the other sections store the answer directly."""
+    if isinstance(entry, dict):
+        return entry.get("answer")
+    return entry
+
+
+class KnowledgeSection:
+    """One knowledge.json section with normalised, token and trigram indexes."""
+
+    def __init__(self, entries: Optional[Dict[str, Any]] = None, cutoff: float = FUZZY_CUTOFF):
+        self.cutoff = cutoff
+        self.values: Dict[str, Any] = {}
+        self.rank: Dict[str, int] = {}
+        self.normalized: Dict[str, str] = {}
+        self.by_norm: Dict[str, List[str]] = {}
+        # token / trigram -> keys, as insertion-ordered dicts (roughly file order)
+        self.postings: Dict[str, Dict[str, None]] = {}
+        self.trigrams: Dict[str, Dict[str, None]] = {}
+        self.key_grams: Dict[str, frozenset] = {}
+        self.max_tokens = 0
+        self._next_rank = 0
+        for key, value in (entries or {}).items():
+            self.add(key, value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    # ── building ──────────────────────────────────────────────────────
+
+    def add(self, key: str, value: Any):
+        """Add or replace an entry; a replaced key keeps its position, like a dict."""
+        if not isinstance(key, str):
+            return
+        if key in self.values:
+            self._unindex(key)
+        else:
+            self.rank[key] = self._next_rank
+            self._next_rank += 1
+        self.values[key] = value
+        norm = normalize_question(key)
+        self.normalized[key] = norm
+        if not norm:
+            return
+        keys = self.by_norm.setdefault(norm, [])
+        keys.append(key)
+        keys.sort(key=self.rank.__getitem__)
+        tokens = norm.split(" ")
+        self.max_tokens = max(self.max_tokens, len(tokens))
+        for token in set(tokens):
+            self.postings.setdefault(token, {})[key] = None
+        grams = self.key_grams[key] = frozenset(_trigrams(norm))
+        for gram in grams:
+            self.trigrams.setdefault(gram, {})[key] = None
+
+    def remove(self, key: str):
+        if key in self.values:
+            self._unindex(key)
+            del self.values[key]
+            del self.rank[key]
+
+    def _unindex(self, key: str):
+        norm = self.normalized.pop(key, "")
+        if not norm:
+            return
+        keys = self.by_norm.get(norm)
+        if keys:
+            keys.remove(key)
+            if not keys:
+                del self.by_norm[norm]
+        for token in set(norm.split(" ")):
+            self.postings[token].pop(key, None)
+        for gram in self.key_grams.pop(key, ()):
+            self.trigrams[gram].pop(key, None)
+
+    # ── lookup ────────────────────────────────────────────────────────
+
+    def match_key(self, question: str) -> Optional[str]:
+        """Key answering an already normalised question, or None."""
+        if question in self.values:
+            return question
+        if not question:
+            return None
+        key = self._contained_key(question)
+        if key is None:
+            key = self.fuzzy_key(question)
+        return key
+
+    def match(self, question: str) -> Any:
+        key = self.match_key(question)
+        return resolve_answer(self.values[key]) if key is not None else None
+
+    def _contained_key(self, question: str) -> Optional[str]:
+        """First key (file order) equal to, inside, or containing the question - token aligned."""
+        best: Optional[str] = None
+        rank = self.rank
+
+        def consider(candidate: str):
+            nonlocal best
+            if best is None or rank[candidate] < rank[best]:
+                best = candidate
+
+        # The key is (a run of words) inside the question - includes the exact match
+        tokens = question.split(" ")
+        for start in range(len(tokens)):
+            for end in range(start + 1, min(len(tokens), start + self.max_tokens) + 1):
+                keys = self.by_norm.get(" ".join(tokens[start:end]))
+                if keys:
+                    consider(keys[0])
+
+        # The question is a run of words inside the key: such a key is in every token's
+        # posting, so scanning the rarest one is enough.  When even that is a very common
+        # word only its first MAX_SCAN keys (earliest in the file) are checked.
+        postings = [self.postings.get(token) for token in set(tokens)]
+        if all(postings):
+            padded = f" {question} "
+            normalized = self.normalized
+            for candidate in islice(min(postings, key=len), MAX_SCAN):
+                if padded in f" {normalized[candidate]} ":
+                    consider(candidate)
+        return best
+
+    def fuzzy_key(self, question: str, cutoff: Optional[float] = None) -> Optional[str]:
+        """Closest key by difflib ratio (>= cutoff), scored only for trigram-shortlisted keys."""
+        cutoff = self.cutoff if cutoff is None else cutoff
+        grams = _trigrams(question)
+        postings = sorted((self.trigrams.get(gram) or () for gram in grams), key=len)
+        # A close key shares at least MIN_SHARED_GRAMS of the question's trigrams, so it
+        # must appear in one of the rarest len - needed + 1 postings (prefix filter).
+        # At most MAX_SCAN keys are collected, rarest trigrams first; once common
+        # trigrams are reached only their earliest keys still fit in the budget.
+        needed = max(1, int(len(grams) * MIN_SHARED_GRAMS))
+        candidates: Set[str] = set()
+        for posting in postings[: len(grams) - needed + 1]:
+            budget = MAX_SCAN - len(candidates)
+            if budget <= 0:
+                break
+            candidates.update(islice(posting, budget))
+        if not candidates:
+            return None
+
+        # Dice coefficient on trigrams approximates difflib's ratio well enough to shortlist
+        size = len(grams)
+        # ratio >= cutoff is impossible when the lengths differ too much
+        low, high = len(question) * cutoff / (2 - cutoff), len(question) * (2 - cutoff) / cutoff
+        key_grams, normalized = self.key_grams, self.normalized
+        scored = []
+        for key in candidates:
+            if not low <= len(normalized[key]) <= high:
+                continue
+            shared = len(grams & key_grams[key])
+            if shared >= needed:
+                scored.append((-2 * shared / (size + len(key_grams[key])), self.rank[key], key))
+        scored.sort()
+
+        matcher = SequenceMatcher(autojunk=False)
+        matcher.set_seq2(question)
+        best, best_ratio = None, cutoff
+        for _, _, key in scored[:FUZZY_CANDIDATES]:
+            matcher.set_seq1(normalized[key])
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            # Ties go to the larger key, as with difflib.get_close_matches
+            if ratio > best_ratio or (ratio == best_ratio and (best is None or key > best)):
+                best, best_ratio = key, ratio
+        return best
+
+
+class KnowledgeIndex:
+    """KnowledgeSection per knowledge.json section, rebuilt when the file changes."""
+
+    SECTIONS = ("user_taught", "faq", "general_knowledge")
+
+    def __init__(self, knowledge: Optional[Dict[str, Any]] = None, cutoff: float = FUZZY_CUTOFF):
+        self.cutoff = cutoff
+        self.sections: Dict[str, KnowledgeSection] = {}
+        self.identity: List[tuple] = []
+        self.rebuild(knowledge or {})
+
+    def rebuild(self, knowledge: Dict[str, Any]):
+        sections = {}
+        for name in self.SECTIONS:
+            entries = knowledge.get(name)
+            entries = dict(entries) if isinstance(entries, dict) else {}
+            if name == "general_knowledge" and isinstance(knowledge.get("knowledge"), dict):
+                # Legacy flat "knowledge" key is merged into general knowledge
+                entries.update(knowledge["knowledge"])
+            sections[name] = KnowledgeSection(entries, self.cutoff)
+        self.sections = sections
+        identity = knowledge.get("identity")
+        self.identity = [
+            (normalize_question(key), value)
+            for key, value in (identity.items() if isinstance(identity, dict) else ())
+            if isinstance(key, str)
+        ]
+
+    def add(self, section: str, key: str, value: Any):
+        """Incremental update (e.g. a user-taught answer)."""
+        self.sections.setdefault(section, KnowledgeSection(cutoff=self.cutoff)).add(key, value)
+
+    def match(self, section: str, question: str) -> Any:
+        index = self.sections.get(section)
+        return index.match(question) if index is not None else None
+
+    def match_identity(self, question: str) -> Any:
+        for key_norm, value in self.identity:
+            if key_norm and key_norm in question:
+                return value
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {name: len(section) for name, section in self.sections.items()}
@@ -0,0 +1,417 @@
+"""
+utils/leaderboard_index.py
+==========================
+In-memory leaderboard index that cogs feed score changes into.
+
+Before this every leaderboard page re-read economy.json / profiles.json /
+fishing_data.json / ... from disk, chunked the guild for its member list,
+sorted every user for a top 10 and (for the coin leaderboard) fetched each
+of the ten users over HTTP.  Now cogs report changes as they happen:
+
+    from utils.leaderboard_index import leaderboard_index
+
+    leaderboard_index.set("coins", user_id, new_balance, username=name)
+    leaderboard_index.add("fishing", user_id, 1)
+    leaderboard_index.set_stat(user_id, "duels_won", value)   # profile stat names
+
+and pages read ``leaderboard_index.top("coins", 10, guild_id=guild.id)``.
+
+Structure:
+
+    * one RankedBoard per category globally and per (category, guild):
+      a dict of scores plus a list of (-score, user_id) kept sorted with
+      bisect, so an update is a binary search + one list insert/delete
+      and a top-N query is a slice - O(N), independent of the user count;
+    * guild membership (user -> guilds) is learned from activity and the
+      member cache (note_member / drop_member), never from guild.chunk();
+    * a username cache (remember_name) so pages never need fetch_user.
+
+The index is saved to data/leaderboard_index.json at most every
+SAVE_INTERVAL seconds while dirty and on unload.  The first call after
+startup loads that snapshot (one sort per board) instead of re-reading
+every data file; without a snapshot it is built from the files once.
+rebuild() recreates everything from the data files (L!synclb).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils import paths
+
+SNAPSHOT_VERSION = 1
+SAVE_INTERVAL = 300  # seconds
+
+# category -> (data file, field, include scores <= 0)
+CATEGORY_SOURCES: Dict[str, Tuple[str, str, bool]] = {
+    "coins":      ("economy.json",        "balance",                 True),
+    "fishing":    ("fishing_data.json",   "total_catches",           False),
+    "mining":     ("profiles.json",       "mining_total_mined",      False),
+    "farming":    ("profiles.json",       "farming_total_harvested", False),
+    "minigames":  ("profiles.json",       "minigames_played",        False),
+    "gambling":   ("gambling_stats.json", "total_games",             False),
+    "duels":      ("profiles.json",       "duels_won",               False),
+    "quests":     ("profiles.json",       "quests_completed",        False),
+    "reputation": ("reputation.json",     "total_rep",               False),
+    "xp":         ("profiles.json",       "xp",                      False),
+    "streak":     ("profiles.json",       "daily_longest_streak",    False),
+}
+
+# profiles.json stat name -> category (ProfileManager.increment_stat / set_stat)
+PROFILE_STAT_CATEGORIES: Dict[str, str] = {
+    field: category
+    for category, (filename, field, _) in CATEGORY_SOURCES.items()
+    if filename == "profiles.json"
+}
+
+
+class RankedBoard:
+    """Scores kept in descending order (ties: lower user id first)."""
+
+    __slots__ = ("scores", "order")
+
+    def __init__(self):
+        self.scores: Dict[int, float] = {}
+        self.order: List[Tuple[float, int]] = []
+
+    @classmethod
+    def from_scores(cls, scores: Dict[int, float]) -> "RankedBoard":
+        board = cls()
+        board.scores = dict(scores)
+        board.order = sorted((-score, uid) for uid, score in scores.items())
+        return board
+
+    def set(self, user_id: int, score: float) -> bool:
+        """Set a user's score; False if it didn't change."""
+        old = self.scores.get(user_id)
+        if old == score:
+            return False
+        if old is not None:
+            del self.order[bisect_left(self.order, (-old, user_id))]
+        self.scores[user_id] = score
+        insort(self.order, (-score, user_id))
+        return True
+
+    def remove(self, user_id: int) -> bool:
+        old = self.scores.pop(user_id, None)
+        if old is None:
+            return False
+        del self.order[bisect_left(self.order, (-old, user_id))]
+        return True
+
+    def get(self, user_id: int) -> Optional[float]:
+        return self.scores.get(user_id)
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """1-based position, or None if the user has no score."""
+        score = self.scores.get(user_id)
+        if score is None:
+            return None
+        return bisect_left(self.order, (-score, user_id)) + 1
+
+    def top(self, n: int, positive_only: bool = False) -> List[Tuple[int, float]]:
+        entries = []
+        for neg, uid in self.order[:n]:
+            if positive_only and neg >= 0:
+                break
+            entries.append((uid, -neg))
+        return entries
+
+    def total(self) -> float:
+        return sum(self.scores.values())
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+
+class LeaderboardIndex:
+    """Global + per-guild ranked boards for every leaderboard category."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.boards: Dict[str, RankedBoard] = {c: RankedBoard() for c in CATEGORY_SOURCES}
+        self.guild_boards: Dict[str, Dict[int, RankedBoard]] = {c: {} for c in CATEGORY_SOURCES}
+        self.user_guilds: Dict[int, Set[int]] = {}
+        self.names: Dict[int, str] = {}
+        self.loaded = False
+        self.dirty = False
+        self.last_save = 0.0
+
+        # Stats
+        self.updates = 0
+        self.queries = 0
+
+    # ── feeding ───────────────────────────────────────────────────────
+
+    def set(self, category: str, user_id, value, guild_id=None, username: Optional[str] = None):
+        """Record a user's current score in a category."""
+        if not self.loaded:
+            self.ensure_loaded()
+        board = self.boards.get(category)
+        if board is None or not isinstance(value, (int, float)):
+            return
+        uid = int(user_id)
+        if username:
+            self.remember_name(uid, username)
+        if guild_id is not None:
+            self.note_member(guild_id, uid)
+        if not board.set(uid, value):
+            return
+        guild_boards = self.guild_boards[category]
+        for gid in self.user_guilds.get(uid, ()):
+            guild_board = guild_boards.get(gid)
+            if guild_board is None:
+                guild_board = guild_boards[gid] = RankedBoard()
+            guild_board.set(uid, value)
+        self.updates += 1
+        self.dirty = True
+
+    def add(self, category: str, user_id, delta=1, guild_id=None, username: Optional[str] = None):
+        """Add a delta to a user's score in a category."""
+        if not self.loaded:
+            self.ensure_loaded()
+        board = self.boards.get(category)
+        if board is None:
+            return
+        self.set(category, user_id, (board.get(int(user_id)) or 0) + delta, guild_id, username)
+
+    def set_stat(self, user_id, stat_name: str, value, username: Optional[str] = None):
+        """Profile stat hook: stat names that back a leaderboard update it, others are ignored."""
+        category = PROFILE_STAT_CATEGORIES.get(stat_name)
+        if category is not None:
+            self.set(category, user_id, value, username=username)
+
+    def set_many(self, category: str, values: Dict, names: Optional[Dict] = None):
+        """Bulk set (e.g. after an economy compaction); unchanged scores cost a dict lookup."""
+        for user_id, value in values.items():
+            if str(user_id).isdigit():
+                self.set(category, user_id, value, username=(names or {}).get(user_id))
+
+    def remember_name(self, user_id, name: str):
+        if name:
+            self.names[int(user_id)] = name
+
+    def name(self, user_id, default: Optional[str] = None) -> str:
+        return self.names.get(int(user_id)) or default or f"User {user_id}"
+
+    # ── guild membership ──────────────────────────────────────────────
+
+    def note_member(self, guild_id, user_id):
+        """User belongs to a guild: add their scores to that guild's boards."""
+        if not self.loaded:
+            self.ensure_loaded()
+        uid, gid = int(user_id), int(guild_id)
+        guilds = self.user_guilds.get(uid)
+        if guilds is None:
+            guilds = self.user_guilds[uid] = set()
+        elif gid in guilds:
+            return
+        guilds.add(gid)
+        for category, board in self.boards.items():
+            score = board.get(uid)
+            if score is not None:
+                guild_boards = self.guild_boards[category]
+                guild_board = guild_boards.get(gid)
+                if guild_board is None:
+                    guild_board = guild_boards[gid] = RankedBoard()
+                guild_board.set(uid, score)
+        self.dirty = True
+
+    def note_members(self, guild_id, user_ids: Iterable):
+        for uid in user_ids:
+            self.note_member(guild_id, uid)
+
+    def drop_member(self, guild_id, user_id):
+        """User left a guild."""
+        uid, gid = int(user_id), int(guild_id)
+        guilds = self.user_guilds.get(uid)
+        if not guilds or gid not in guilds:
+            return
+        guilds.discard(gid)
+        for guild_boards in self.guild_boards.values():
+            guild_board = guild_boards.get(gid)
+            if guild_board is not None:
+                guild_board.remove(uid)
+        self.dirty = True
+
+    def drop_guild(self, guild_id):
+        """Bot left a guild."""
+        gid = int(guild_id)
+        for guild_boards in self.guild_boards.values():
+            guild_boards.pop(gid, None)
+        for guilds in self.user_guilds.values():
+            guilds.discard(gid)
+        self.dirty = True
+
+    def has_members(self, guild_id) -> bool:
+        gid = int(guild_id)
+        return any(gid in boards and len(boards[gid]) for boards in self.guild_boards.values())
+
+    # ── queries ───────────────────────────────────────────────────────
+
+    def top(self, category: str, n: int = 10, guild_id=None) -> List[Tuple[int, float]]:
+        """Top n (user_id, score) pairs, globally or within a guild."""
+        if not self.loaded:
+            self.ensure_loaded()
+        self.queries += 1
+        board = self.board(category, guild_id)
+        if board is None:
+            return []
+        return board.top(n, positive_only=not CATEGORY_SOURCES[category][2])
+
+    def board(self, category: str, guild_id=None) -> Optional[RankedBoard]:
+        if category not in self.boards:
+            return None
+        if guild_id is None:
+            return self.boards[category]
+        return self.guild_boards[category].get(int(guild_id))
+
+    def rank(self, category: str, user_id, guild_id=None) -> Optional[int]:
+        board = self.board(category, guild_id)
+        return board.rank(int(user_id)) if board is not None else None
+
+    def guild_total(self, category: str, guild_id) -> float:
+        board = self.board(category, guild_id)
+        return board.total() if board is not None else 0
+
+    # ── building / persistence ────────────────────────────────────────
+
+    def ensure_loaded(self):
+        """Load the snapshot on first use, or build from the data files if there is none."""
+        if self.loaded:
+            return
+        self.loaded = True  # rebuild() feeds nothing back, but don't recurse if it fails
+        if self.load():
+            return
+        data_dir = os.path.dirname(self.path) if self.path else paths.data_dir()
+        print("[LeaderboardIndex] No snapshot – building from data files…")
+        self.rebuild(data_dir)
+
+    def rebuild(self, data_dir: str, members: Optional[Dict[int, Iterable]] = None):
+        """Recreate every board from the data files (slow path, startup without snapshot / L!synclb)."""
+        files: Dict[str, dict] = {}
+        scores: Dict[str, Dict[int, float]] = {}
+        for category, (filename, field, _) in CATEGORY_SOURCES.items():
+            if filename not in files:
+                files[filename] = _load_json(os.path.join(data_dir, filename))
+            board_scores = {}
+            for uid, data in files[filename].items():
+                if not uid.isdigit() or not isinstance(data, dict):
+                    continue
+                value = data.get(field)
+                if field == "xp" and value is None:
+                    value = data.get("total_xp")
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    board_scores[int(uid)] = value
+            scores[category] = board_scores
+
+        names = {int(uid): d["username"] for uid, d in files.get("economy.json", {}).items()
+                 if uid.isdigit() and isinstance(d, dict) and d.get("username")}
+        user_guilds = {uid: set(guilds) for uid, guilds in self.user_guilds.items()}
+        for gid, user_ids in (members or {}).items():
+            for uid in user_ids:
+                user_guilds.setdefault(int(uid), set()).add(int(gid))
+        self._install(scores, user_guilds, {**self.names, **names})
+        self.dirty = True
+
+    def _install(self, scores: Dict[str, Dict[int, float]], user_guilds: Dict[int, Set[int]],
+                 names: Dict[int, str]):
+        boards = {c: RankedBoard.from_scores(scores.get(c, {})) for c in CATEGORY_SOURCES}
+        guild_boards: Dict[str, Dict[int, RankedBoard]] = {}
+        for category, board in boards.items():
+            # Walking the global order keeps every guild's entries sorted - no per-guild sort
+            per_guild: Dict[int, RankedBoard] = {}
+            for entry in board.order:
+                for gid in user_guilds.get(entry[1], ()):
+                    guild_board = per_guild.get(gid)
+                    if guild_board is None:
+                        guild_board = per_guild[gid] = RankedBoard()
+                    guild_board.scores[entry[1]] = -entry[0]
+                    guild_board.order.append(entry)
+            guild_boards[category] = per_guild
+        self.boards = boards
+        self.guild_boards = guild_boards
+        self.user_guilds = user_guilds
+        self.names = names
+        self.loaded = True
+
+    def load(self) -> bool:
+        """Load the snapshot; False if there is none (caller should rebuild)."""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        data = _load_json(self.path)
+        if data.get("version") != SNAPSHOT_VERSION:
+            return False
+        scores = {c: {int(uid): v for uid, v in data.get("scores", {}).get(c, {}).items()}
+                  for c in CATEGORY_SOURCES}
+        user_guilds = {int(uid): set(gids) for uid, gids in data.get("members", {}).items()}
+        names = {int(uid): n for uid, n in data.get("names", {}).items()}
+        self._install(scores, user_guilds, names)
+        self.dirty = False
+        return True
+
+    def snapshot(self, force: bool = False) -> Optional[dict]:
+        """Snapshot to save if dirty (and SAVE_INTERVAL has passed, unless forced), else None.
+
+        Taken on the event loop so no board changes while it is copied;
+        write() can then run in a thread.
+        """
+        if not self.path or not self.dirty:
+            return None
+        if not force and time.monotonic() - self.last_save < SAVE_INTERVAL:
+            return None
+        self.dirty = False
+        self.last_save = time.monotonic()
+        return {
+            "version": SNAPSHOT_VERSION,
+            "scores": {c: {str(uid): v for uid, v in b.scores.items()} for c, b in self.boards.items()},
+            "members": {str(uid): sorted(gids) for uid, gids in self.user_guilds.items() if gids},
+            "names": {str(uid): n for uid, n in self.names.items()},
+        }
+
+    def write(self, snapshot: dict) -> bool:
+        """Write a snapshot atomically (temp file + os.replace)."""
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(snapshot, fh, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.dirty = True
+            print(f"[LeaderboardIndex] Failed to save {self.path}: {e}")
+            return False
+        return True
+
+    def save(self, force: bool = False) -> bool:
+        snapshot = self.snapshot(force)
+        return self.write(snapshot) if snapshot is not None else False
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self.user_guilds),
+            "guilds": len({gid for boards in self.guild_boards.values() for gid in boards}),
+            "names": len(self.names),
+            "updates": self.updates,
+            "queries": self.queries,
+            "dirty": self.dirty,
+        }
+
+
+def _load_json(path: str) -> dict:
+    """Safely load a JSON file; return {} on any error."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+leaderboard_index = LeaderboardIndex(os.path.join(paths.data_dir(), "leaderboard_index.json"))
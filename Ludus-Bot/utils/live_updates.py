@@ -0,0 +1,290 @@
+"""
+utils/live_updates.py
+=====================
+One scheduler for every self-animating message (crash multiplier,
+fishing / Kraken minigames, ...).
+
+Before this each game ran its own ``while: edit(); sleep()`` task, so a
+busy channel could take more edits than Discord allows and every
+animation held a task of its own.  Views now register with the shared
+``live_updates`` scheduler instead:
+
+    self.live = live_updates.register(
+        message.edit,                      # any coroutine taking edit kwargs
+        channel_id=message.channel.id,
+        render=self._frame,                # () -> {"embed": ..., "view": ...}
+        step=self._advance,                # () -> False to finish, called every `interval`
+        interval=1.0,
+        on_stop=self._finished,            # optional coroutine run after the last edit
+    )
+
+and call ``self.live.invalidate()`` whenever their state changes outside
+``step`` (a button press answered with defer(), for instance).
+
+How frames are sent:
+
+    * one tick loop advances every animation and sends frames; it exits
+      when nothing is registered and restarts on the next register();
+    * frames are coalesced - a message only has a "dirty since" time, and
+      render() runs when the edit is actually sent, so the newest state
+      always wins and intermediate frames are dropped when behind;
+    * at most one edit per message is in flight;
+    * edits are paced by token buckets per channel (Discord allows about
+      5 message edits / 5 s per channel) and globally; a 429 empties the
+      channel bucket for its retry_after and the frame is retried;
+    * a message that no longer exists (404) stops its animation.
+
+metrics() reports edits sent, frames dropped, 429s and average staleness
+(time from a frame becoming dirty to its edit being sent).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+import discord
+
+CHANNEL_EDITS = 5        # edits ...
+CHANNEL_WINDOW = 5.0     # ... per this many seconds, per channel
+GLOBAL_EDITS = 40        # edits per second across the bot
+TICK = 0.1
+
+
+class RateBucket:
+    """Token bucket: `capacity` tokens refilled evenly over `window` seconds."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated", "blocked_until")
+
+    def __init__(self, capacity: int, window: float):
+        self.capacity = capacity
+        self.rate = capacity / window
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def ready(self, now: float) -> bool:
+        if now < self.blocked_until:
+            return False
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens >= 1.0
+
+    def take(self) -> None:
+        self.tokens -= 1.0
+
+    def block(self, seconds: float, now: float) -> None:
+        self.tokens = 0.0
+        self.updated = now
+        self.blocked_until = now + seconds
+
+
+class LiveHandle:
+    """A registered animation; returned by LiveUpdateScheduler.register()."""
+
+    def __init__(self, scheduler: "LiveUpdateScheduler", edit: Callable[..., Awaitable],
+                 channel_id: Optional[int], render: Callable[[], dict],
+                 step: Optional[Callable[[], Optional[bool]]], interval: float,
+                 on_stop: Optional[Callable[[], Awaitable]]):
+        self.scheduler = scheduler
+        self.edit = edit
+        self.channel_id = channel_id
+        self.render = render
+        self.step = step
+        self.interval = interval
+        self.on_stop = on_stop
+        self.next_step = time.monotonic() + interval
+        self.dirty_since: Optional[float] = None
+        self.in_flight: Optional[asyncio.Task] = None
+        self.stopped = False
+        self._done = asyncio.Event()
+
+    def invalidate(self) -> None:
+        """Mark the message out of date; the next edit renders the latest state."""
+        if self.stopped:
+            return
+        if self.dirty_since is None:
+            self.dirty_since = time.monotonic()
+        else:
+            self.scheduler.frames_dropped += 1  # superseded before it was sent
+
+    def skip_pending(self) -> None:
+        """Forget a pending frame (the caller just showed the current state itself)."""
+        if self.dirty_since is not None:
+            self.dirty_since = None
+            self.scheduler.frames_dropped += 1
+
+    def stop(self) -> None:
+        """Stop animating; no further scheduler edits are started."""
+        if self.stopped:
+            return
+        self.stopped = True
+        self.skip_pending()
+        self.scheduler._handles.discard(self)
+        self._done.set()
+
+    async def close(self) -> None:
+        """stop() and wait for an edit already in flight, so a final edit can't be overwritten."""
+        self.stop()
+        task = self.in_flight
+        if task is not None and task is not asyncio.current_task():
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def wait(self) -> None:
+        """Wait until the animation stops (step() returned False or stop() was called)."""
+        await self._done.wait()
+
+
+class LiveUpdateScheduler:
+    """Single tick loop driving and rate-limiting all live message edits."""
+
+    def __init__(self, tick: float = TICK, channel_edits: int = CHANNEL_EDITS,
+                 channel_window: float = CHANNEL_WINDOW, global_edits: int = GLOBAL_EDITS):
+        self.tick = tick
+        self.channel_edits = channel_edits
+        self.channel_window = channel_window
+        self._handles: set[LiveHandle] = set()
+        self._channels: dict[Optional[int], RateBucket] = {}
+        self._global = RateBucket(global_edits, 1.0)
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.registered = 0
+        self.steps = 0
+        self.edits_sent = 0
+        self.frames_dropped = 0
+        self.rate_limited = 0
+        self.failed = 0
+        self.total_staleness = 0.0
+        self.max_staleness = 0.0
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def register(self, edit: Callable[..., Awaitable], *, channel_id: Optional[int], render: Callable[[], dict],
+                 step: Optional[Callable[[], Optional[bool]]] = None, interval: float = 1.0,
+                 on_stop: Optional[Callable[[], Awaitable]] = None) -> LiveHandle:
+        """Start animating a message; see the module docstring. Must be called from the event loop."""
+        handle = LiveHandle(self, edit, channel_id, render, step, interval, on_stop)
+        self._handles.add(handle)
+        self.registered += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return handle
+
+    # ------------------------------------------------------------------
+    # Tick loop
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        try:
+            while self._handles:
+                now = time.monotonic()
+                for handle in list(self._handles):
+                    if handle.step is not None and now >= handle.next_step:
+                        self._step(handle, now)
+                    if (not handle.stopped and handle.dirty_since is not None
+                            and handle.in_flight is None):
+                        self._maybe_send(handle, now)
+                await asyncio.sleep(self.tick)
+        except Exception as e:
+            print(f"[LiveUpdates] Tick loop crashed: {e}")
+        finally:
+            self._task = None
+
+    def _step(self, handle: LiveHandle, now: float) -> None:
+        self.steps += 1
+        try:
+            keep_going = handle.step()
+        except Exception as e:
+            print(f"[LiveUpdates] Animation step failed: {e}")
+            keep_going = False
+        if keep_going is False:
+            self._finish(handle)
+            return
+        handle.next_step = now + handle.interval
+        handle.invalidate()
+
+    def _finish(self, handle: LiveHandle) -> None:
+        in_flight = handle.in_flight
+        handle.stop()
+        if handle.on_stop is not None:
+            async def run_on_stop():
+                if in_flight is not None:
+                    await asyncio.gather(in_flight, return_exceptions=True)
+                try:
+                    await handle.on_stop()
+                except Exception as e:
+                    print(f"[LiveUpdates] on_stop failed: {e}")
+            asyncio.create_task(run_on_stop())
+
+    def _bucket(self, channel_id: Optional[int]) -> RateBucket:
+        bucket = self._channels.get(channel_id)
+        if bucket is None:
+            bucket = self._channels[channel_id] = RateBucket(self.channel_edits, self.channel_window)
+        return bucket
+
+    def _maybe_send(self, handle: LiveHandle, now: float) -> None:
+        bucket = self._bucket(handle.channel_id)
+        if not (bucket.ready(now) and self._global.ready(now)):
+            return  # stays dirty; later state replaces this frame
+        bucket.take()
+        self._global.take()
+        handle.in_flight = asyncio.create_task(self._send(handle, bucket))
+
+    async def _send(self, handle: LiveHandle, bucket: RateBucket) -> None:
+        dirty_since = handle.dirty_since
+        handle.dirty_since = None
+        try:
+            frame = handle.render()
+            staleness = time.monotonic() - dirty_since
+            await handle.edit(**frame)
+            self.edits_sent += 1
+            self.total_staleness += staleness
+            if staleness > self.max_staleness:
+                self.max_staleness = staleness
+        except discord.NotFound:
+            handle.stop()
+        except discord.HTTPException as e:
+            if e.status == 429:
+                self.rate_limited += 1
+                retry_after = getattr(e, "retry_after", None) or self.channel_window
+                bucket.block(float(retry_after), time.monotonic())
+                if handle.dirty_since is None and not handle.stopped:
+                    handle.dirty_since = dirty_since  # retry with whatever is newest then
+            else:
+                self.failed += 1
+                print(f"[LiveUpdates] Edit failed ({e.status}): {e}")
+        except Exception as e:
+            self.failed += 1
+            print(f"[LiveUpdates] Edit failed: {e}")
+        finally:
+            handle.in_flight = None
+        # Drop buckets of channels that went quiet
+        if len(self._channels) > 256:
+            active = {h.channel_id for h in self._handles}
+            for channel_id in [c for c in self._channels if c not in active]:
+                del self._channels[channel_id]
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> dict:
+        sent = self.edits_sent or 1
+        return {
+            "active": len(self._handles),
+            "registered": self.registered,
+            "steps": self.steps,
+            "edits_sent": self.edits_sent,
+            "frames_dropped": self.frames_dropped,
+            "rate_limited": self.rate_limited,
+            "failed": self.failed,
+            "avg_staleness_ms": round(self.total_staleness * 1000 / sent, 1),
+            "max_staleness_ms": round(self.max_staleness * 1000, 1),
+        }
+
+
+live_updates = LiveUpdateScheduler()
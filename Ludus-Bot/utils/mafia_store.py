@@ -0,0 +1,183 @@
+"""
+utils/mafia_store.py
+====================
+Restart-safe snapshots of running Mafia/Werewolf games.
+
+cogs/mafia.py keeps each game in a plain dict (``active_games[lobby_id]``)
+and moves it through night -> day -> vote phases whose deadlines live in
+the shared scheduler (utils/scheduler.py).  This module saves that dict so
+a redeploy resumes games instead of killing them:
+
+    from utils.mafia_store import mafia_store
+
+    mafia_store.save(lobby_id, game_state)   # after every change (debounced)
+    games = mafia_store.load_all()           # cog_load: {lobby_id: state}
+    mafia_store.delete(lobby_id)             # game over
+
+Snapshots are compact:
+
+    * one small JSON file per game (data/mafia_games/<lobby_id>.json), so a
+      vote in one lobby never rewrites hundreds of others;
+    * derived data is dropped - each player's ``role_info`` is looked up
+      again from the role id on load (see ``compact`` / ``expand``);
+    * Discord ids used as dict keys (players, votes, power actions, ...)
+      become strings in JSON and are turned back into ints on load.
+
+Writes are coalesced: save() marks the game dirty and one background
+flush writes every dirty game about a second later, atomically (tmp file
++ os.replace) in a worker thread.  The flush keeps going while games
+are marked dirty during a write, and a failed write marks its games dirty
+again so the next pass retries them.  flush_now() writes synchronously
+for shutdown; the two never write at the same time, and a snapshot older
+than the one already on disk is dropped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+from typing import Any, Dict, Set
+
+from utils import paths
+
+SAVE_DELAY = 1.0
+DERIVED_PLAYER_FIELDS = ("role_info",)
+
+
+def compact(game_state: dict) -> dict:
+    """Copy of the game without fields that can be derived again on load."""
+    snapshot = dict(game_state)
+    snapshot["players"] = {
+        pid: {k: v for k, v in pdata.items() if k not in DERIVED_PLAYER_FIELDS}
+        for pid, pdata in game_state.get("players", {}).items()
+    }
+    return snapshot
+
+
+def _int_keys(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {int(k) if isinstance(k, str) and k.isdigit() else k: _int_keys(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_int_keys(v) for v in value]
+    return value
+
+
+def expand(snapshot: dict) -> dict:
+    """Inverse of compact() minus the derived fields (the cog fills those in)."""
+    return _int_keys(snapshot)
+
+
+class MafiaGameStore:
+    """Per-game snapshot files with coalesced background writes."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self._games: Dict[str, dict] = {}   # lobby_id -> live state (by reference)
+        self._dirty: Set[str] = set()
+        self._deleted: Set[str] = set()
+        self._flush_task = None
+        self._write_lock = threading.Lock()  # flush_now() and the flush loop's thread share .tmp files
+        self._write_seq = 0
+        self._written_seq: Dict[str, int] = {}  # lobby_id -> seq of the last write / delete on disk
+
+    def _path(self, lobby_id: str) -> str:
+        return os.path.join(self.folder, f"{lobby_id}.json")
+
+    def load_all(self) -> Dict[str, dict]:
+        games = {}
+        if not os.path.isdir(self.folder):
+            return games
+        for name in os.listdir(self.folder):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.folder, name), "r", encoding="utf-8") as fh:
+                    games[name[:-5]] = expand(json.load(fh))
+            except Exception as e:
+                print(f"[MafiaStore] Skipping unreadable snapshot {name}: {e}")
+        return games
+
+    def save(self, lobby_id: str, game_state: dict):
+        self._games[lobby_id] = game_state
+        self._deleted.discard(lobby_id)
+        self._dirty.add(lobby_id)
+        self._schedule_flush()
+
+    def delete(self, lobby_id: str):
+        self._games.pop(lobby_id, None)
+        self._dirty.discard(lobby_id)
+        self._deleted.add(lobby_id)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._flush_task is not None and not self._flush_task.done():
+            return  # the running flush loop picks the change up
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush_now()
+            return
+        self._flush_task = loop.create_task(self._flush_later())
+
+    def _take_pending(self):
+        writes = {lid: json.dumps(compact(self._games[lid]), separators=(",", ":"), default=str)
+                  for lid in self._dirty if lid in self._games}
+        deletes = set(self._deleted)
+        self._dirty.clear()
+        self._deleted.clear()
+        self._write_seq += 1
+        return writes, deletes, self._write_seq
+
+    def _requeue(self, writes: Dict[str, str], deletes: Set[str]):
+        """Mark a failed write's games pending again (unless deleted / re-saved since)."""
+        self._dirty.update(lid for lid in writes if lid in self._games)
+        self._deleted.update(lid for lid in deletes if lid not in self._games)
+
+    def _write(self, writes: Dict[str, str], deletes: Set[str], seq: int):
+        """Atomic writes; a game's snapshot older than one already on disk is dropped."""
+        with self._write_lock:
+            written = self._written_seq
+            os.makedirs(self.folder, exist_ok=True)
+            for lobby_id, payload in writes.items():
+                if seq < written.get(lobby_id, 0):
+                    continue
+                path = self._path(lobby_id)
+                tmp = path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as fh:
+                    fh.write(payload)
+                os.replace(tmp, path)
+                written[lobby_id] = seq
+            for lobby_id in deletes:
+                if seq < written.get(lobby_id, 0):
+                    continue
+                try:
+                    os.remove(self._path(lobby_id))
+                except FileNotFoundError:
+                    pass
+                written[lobby_id] = seq
+
+    async def _flush_later(self):
+        while self._dirty or self._deleted:
+            await asyncio.sleep(SAVE_DELAY)
+            # Serialize on the loop (the game dicts are mutated there), write in a thread
+            writes, deletes, seq = self._take_pending()
+            try:
+                await asyncio.to_thread(self._write, writes, deletes, seq)
+            except Exception as e:
+                self._requeue(writes, deletes)  # retry on the next pass
+                print(f"[MafiaStore] Failed to save games: {e}")
+
+    def flush_now(self):
+        """Write pending snapshots now (cog unload). BLOCKING."""
+        writes, deletes, seq = self._take_pending()
+        if writes or deletes:
+            try:
+                self._write(writes, deletes, seq)
+            except Exception:
+                self._requeue(writes, deletes)
+                raise
+
+
+mafia_store = MafiaGameStore(os.path.join(paths.data_dir(), "mafia_games"))
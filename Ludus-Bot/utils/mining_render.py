@@ -0,0 +1,283 @@
+"""
+utils/mining_render.py
+======================
+Shared texture atlas and viewport cache for MiningGame.render_map
+(cogs/mining.py).
+
+TextureAtlas
+    Process-wide store of every sprite the map renderer needs, loaded and
+    resized once: block textures (plus pre-tinted "cracked" / "irradiated"
+    variants), ladder / torch / portal / avatar sprites, UI icons, fonts and
+    small generated markers.  Missing assets fall back to the same coloured
+    squares the renderer always used.
+
+ViewportCache
+    LRU of composed viewport backgrounds (terrain + ladders, torches, portals
+    and depth darkness).  The key is the tuple of visible tiles and darkness
+    levels, so moving back and forth or re-rendering after a UI-only change
+    reuses the base and the per-move render is just a copy plus a few
+    sprite pastes for creatures, players and the HUD.
+
+Both live per process: render_map runs in a RenderService worker
+(utils/render_service.py), which preloads its own atlas at start-up.  They
+are also thread-safe, since the service falls back to threads when no
+process pool is available.
+
+Benchmark: scripts/bench_mining_render.py
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from PIL import Image, ImageDraw, ImageFont
+
+BLOCK_SIZE = 32
+ICON_SIZE = 20
+VIEWPORT_CACHE_SIZE = 128  # ~340 KB per 11x10 background
+SKY_COLOR = (135, 206, 235)
+FONT_PATHS = ("assets/mining/fonts/Arial.ttf", "Arial.ttf")
+
+# Map block types to asset files - None means coloured fallback
+BLOCK_ASSETS = {
+    # layer1
+    "air": "assets/mining/blocks/layer1/air.png",
+    "dirt": "assets/mining/blocks/layer1/dirt.png",
+    "grass": "assets/mining/blocks/layer1/grass.png",
+    "stone": "assets/mining/blocks/layer1/stone.png",
+    "coal": "assets/mining/blocks/layer1/coal.png",
+    # layer2
+    "stone2": "assets/mining/blocks/layer2/stone.png",
+    "coal2": "assets/mining/blocks/layer2/coal.png",
+    "iron": None,
+    "gold": None,
+    "redstone": None,
+    "diamond": None,
+    "emerald": None,
+    "deepslate": None,
+    "netherite": None,
+    "ancient_debris": None,
+    "bedrock": None,
+    # Shop
+    "shop_left": "assets/mining/shop/shop1_left.png",
+    "shop_right": "assets/mining/shop/shop1_right.png",
+    # Structures
+    "mineshaft_wood": "assets/mining/structures/mineshaft/wood.png",
+    "mineshaft_support": "assets/mining/structures/mineshaft/support.png",
+    "mineshaft_rail": "assets/mining/structures/mineshaft/rail.png",
+    "mineshaft_entrance": "assets/mining/structures/mineshaft/entrance.png",
+}
+
+SPRITE_ASSETS = {
+    "ladder": "assets/mining/items/ladder.png",
+    "torch": "assets/mining/items/torch.png",
+    "portal": "assets/mining/items/portal.png",
+    "avatar": "assets/mining/character/avatar.png",
+}
+
+
+def _load_png(path: str, size: tuple[int, int]) -> Optional[Image.Image]:
+    try:
+        return Image.open(path).convert("RGBA").resize(size, Image.LANCZOS)
+    except Exception:
+        return None
+
+
+def _tint(texture: Image.Image, state: str) -> Image.Image:
+    """Bake the cracked / irradiated overlay into a copy of a block texture."""
+    size = texture.width
+    overlay = Image.new("RGBA", texture.size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    if state == "cracked":
+        # Cracks across the block
+        draw.line([(0, size // 3), (size, size // 2)], fill=(0, 0, 0, 150), width=2)
+        draw.line([(0, 2 * size // 3), (size, size // 2)], fill=(0, 0, 0, 150), width=2)
+    elif state == "irradiated":
+        # Radioactive green tint
+        draw.rectangle([0, 0, size, size], fill=(0, 255, 0, 60))
+    return Image.alpha_composite(texture, overlay)
+
+
+class TextureAtlas:
+    """Lazily filled, process-wide cache of resized sprites and fonts."""
+
+    def __init__(self, colors: dict, block_size: int = BLOCK_SIZE):
+        self.colors = colors
+        self.size = block_size
+        self._lock = threading.Lock()
+        self._items: dict = {}
+
+    def cached(self, key, factory: Callable[[], object]):
+        """Return the item stored under `key`, building it once with `factory`."""
+        try:
+            return self._items[key]
+        except KeyError:
+            pass
+        value = factory()
+        with self._lock:
+            return self._items.setdefault(key, value)
+
+    def block(self, block_type: str, state: str = None) -> Image.Image:
+        """RGBA block texture, optionally with an ore-state overlay baked in."""
+        if state:
+            return self.cached(("block", block_type, state),
+                               lambda: _tint(self.block(block_type), state))
+        return self.cached(("block", block_type, None), lambda: self._load_block(block_type))
+
+    def _load_block(self, block_type: str) -> Image.Image:
+        path = BLOCK_ASSETS.get(block_type)
+        texture = _load_png(path, (self.size, self.size)) if path else None
+        if texture is None:
+            texture = Image.new("RGBA", (self.size, self.size), self.colors.get(block_type, (0, 0, 0)))
+        return texture
+
+    def sprite(self, name: str, size: tuple[int, int] = None) -> Optional[Image.Image]:
+        """Item / character sprite, or None when the asset is missing (caller draws a fallback)."""
+        size = size or (self.size, self.size)
+        return self.cached(("sprite", name, size), lambda: _load_png(SPRITE_ASSETS[name], size))
+
+    def icon(self, path: str, size: int = ICON_SIZE) -> Image.Image:
+        """UI icon; transparent square when missing."""
+        def load():
+            return _load_png(path, (size, size)) or Image.new("RGBA", (size, size), (0, 0, 0, 0))
+        return self.cached(("icon", path, size), load)
+
+    def font(self, size: int) -> ImageFont.ImageFont:
+        def load():
+            for path in FONT_PATHS:
+                try:
+                    return ImageFont.truetype(path, size)
+                except Exception:
+                    continue
+            return ImageFont.load_default()
+        return self.cached(("font", size), load)
+
+    def marker(self, fill: tuple, outline: tuple) -> Image.Image:
+        """Round player / creature marker of one block."""
+        def build():
+            marker = Image.new("RGBA", (self.size, self.size), (0, 0, 0, 0))
+            center, radius = self.size // 2, self.size // 3
+            ImageDraw.Draw(marker).ellipse(
+                [center - radius, center - radius, center + radius, center + radius],
+                fill=fill, outline=outline, width=2)
+            return marker
+        return self.cached(("marker", fill, outline), build)
+
+    def preload(self) -> None:
+        """Load every block texture and ore-state variant up front."""
+        for block_type in set(BLOCK_ASSETS) | set(self.colors):
+            self.block(block_type)
+            for state in ("cracked", "irradiated"):
+                self.block(block_type, state)
+        for name in SPRITE_ASSETS:
+            self.sprite(name)
+
+
+class ViewportCache:
+    """Thread-safe LRU of composed viewport backgrounds."""
+
+    def __init__(self, max_entries: int = VIEWPORT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[Image.Image]:
+        with self._lock:
+            img = self._entries.get(key)
+            if img is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return img
+
+    def put(self, key, img: Image.Image) -> None:
+        with self._lock:
+            self._entries[key] = img
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def compose_background(atlas: TextureAtlas, tiles: tuple, darkness: Optional[tuple],
+                       width: int, height: int) -> Image.Image:
+    """Draw the static part of a viewport.
+
+    tiles    row-major (block, ore_state, ladder, torch, portal_name) per cell
+    darkness row-major 0-255 darkness alpha per cell, or None above ground
+    """
+    bs = atlas.size
+    img = Image.new("RGB", (width * bs, height * bs), color=SKY_COLOR)
+    draw = ImageDraw.Draw(img)
+    ladder = atlas.sprite("ladder")
+    torch = atlas.sprite("torch", (bs // 2, bs))
+    portal = atlas.sprite("portal")
+
+    for i, (block, state, has_ladder, has_torch, portal_name) in enumerate(tiles):
+        x1 = (i % width) * bs
+        y1 = (i // width) * bs
+        texture = atlas.block(block, state)
+        img.paste(texture, (x1, y1), texture)
+
+        if has_ladder:
+            if ladder is not None:
+                img.paste(ladder, (x1, y1), ladder)
+            else:
+                # Fallback: brown vertical lines
+                ladder_color = atlas.colors.get("ladder", (139, 90, 0))
+                draw.rectangle([x1 + 5, y1, x1 + 8, y1 + bs], fill=ladder_color)
+                draw.rectangle([x1 + bs - 8, y1, x1 + bs - 5, y1 + bs], fill=ladder_color)
+
+        if has_torch:
+            if torch is not None:
+                img.paste(torch, (x1 + bs // 4, y1), torch)
+            else:
+                # Fallback: yellow/orange glow
+                torch_color = atlas.colors.get("torch", (255, 200, 0))
+                draw.ellipse([x1 + bs // 3, y1 + 5, x1 + 2 * bs // 3, y1 + bs // 2], fill=torch_color)
+
+        if portal_name is not None:
+            if portal is not None:
+                img.paste(portal, (x1, y1), portal)
+                # Portal name ABOVE portal on a purple label
+                name = portal_name[:12]
+                font = atlas.font(10)
+                bbox = draw.textbbox((0, 0), name, font=font)
+                text_width = bbox[2] - bbox[0]
+                text_height = bbox[3] - bbox[1]
+                text_x = x1 + (bs - text_width) // 2
+                text_y = y1 - text_height - 2
+                draw.rectangle([text_x - 2, text_y - 2, text_x + text_width + 2, text_y + text_height + 2],
+                               fill=(138, 43, 226))
+                draw.text((text_x, text_y), name, fill=(255, 255, 255), font=font)
+            else:
+                # Fallback: purple swirl
+                draw.ellipse([x1 + 5, y1 + 5, x1 + bs - 5, y1 + bs - 5],
+                             fill=(138, 43, 226), outline=(255, 255, 255), width=2)
+                draw.text((x1 + 2, y1 - 12), portal_name[:8], fill=(255, 255, 255), font=atlas.font(8))
+
+    if darkness is not None:
+        # One small mask scaled up instead of a rectangle per block
+        mask = Image.new("L", (width, height))
+        mask.putdata(darkness)
+        img.paste((0, 0, 0), (0, 0, img.width, img.height), mask.resize(img.size, Image.NEAREST))
+    return img
+
+
+_atlas: Optional[TextureAtlas] = None
+_atlas_lock = threading.Lock()
+viewport_cache = ViewportCache()
+
+
+def get_atlas(colors: dict) -> TextureAtlas:
+    """Process-wide atlas (created on first use with the given fallback colours)."""
+    global _atlas
+    if _atlas is None:
+        with _atlas_lock:
+            if _atlas is None:
+                _atlas = TextureAtlas(colors)
+    return _atlas
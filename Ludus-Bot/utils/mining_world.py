@@ -0,0 +1,243 @@
+"""
+utils/mining_world.py
+=====================
+Chunked block storage for the Mining cog (cogs/mining.py).
+
+A world is split into CHUNK_SIZE x CHUNK_SIZE chunks.  Each chunk is a
+bytearray of palette indices (one byte per block); the palette maps those
+indices to block names and is shared by the whole world.  Index 0 means
+"no block here" (the position is outside the generated world).
+
+Chunks are produced lazily from a terrain generator - a pure function
+``generator(x, y) -> block name | None`` derived from the world seed - so
+any chunk can be rebuilt at any time and only chunks someone actually looks
+at (or digs into) exist in memory.  Only chunks that players (or
+structures, creatures, dynamite...) changed are persisted:
+
+    modified  chunks that differ from the generated baseline (saved, pinned)
+    dirty     modified chunks changed since the last save (re-encoded)
+
+Unmodified chunks are a pure cache: past `max_cached_chunks` the least
+recently generated ones are dropped and regenerated on the next access, so
+memory stays bounded however far a world extends.
+
+hash_u32 / hash_unit are the fast integer hashes generators use instead of
+a random.Random per block.
+
+ChunkedWorld behaves like the old ``{(x, y): block}`` dict, so existing
+``map_data[(x, y)]`` / ``.get`` / ``in`` call sites keep working.
+
+Serialised form (JSON-friendly):
+    {
+        "chunk_size": 16,
+        "version": 2,                       # generator version the baseline came from
+        "palette": [null, "air", "grass", ...],
+        "chunks": {"cx,cy": "<base64 zlib bytes>", ...}
+    }
+"""
+
+from __future__ import annotations
+
+import base64
+import zlib
+from collections.abc import MutableMapping
+from typing import Callable, Iterator, Optional
+
+CHUNK_SIZE = 16
+MAX_CACHED_CHUNKS = 256  # unmodified chunks kept in memory per world
+
+Generator = Callable[[int, int], Optional[str]]
+
+
+def hash_u32(seed: int, x: int, y: int, salt: int = 0) -> int:
+    """Deterministic 32-bit hash of (seed, x, y, salt) (murmur3-style finaliser)."""
+    h = (x * 0x9E3779B1 + y * 0x85EBCA77 + seed * 0xC2B2AE3D + salt * 0x27D4EB2F) & 0xFFFFFFFF
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & 0xFFFFFFFF
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & 0xFFFFFFFF
+    h ^= h >> 16
+    return h
+
+
+def hash_unit(seed: int, x: int, y: int, salt: int = 0) -> float:
+    """hash_u32 scaled to a float in [0, 1)."""
+    return hash_u32(seed, x, y, salt) / 4294967296.0
+
+
+def _encode_chunk(buf: bytearray) -> str:
+    return base64.b64encode(zlib.compress(bytes(buf), 6)).decode("ascii")
+
+
+def _decode_chunk(text: str) -> bytearray:
+    return bytearray(zlib.decompress(base64.b64decode(text)))
+
+
+class ChunkedWorld(MutableMapping):
+    """Dict-compatible ``(x, y) -> block`` map backed by palette-indexed chunks."""
+
+    def __init__(self, generator: Generator, chunk_size: int = CHUNK_SIZE,
+                 version: int = 1, max_cached_chunks: int = MAX_CACHED_CHUNKS):
+        self.generator = generator
+        self.size = chunk_size
+        self.version = version
+        self.max_cached_chunks = max_cached_chunks
+        self.palette: list[Optional[str]] = [None]
+        self._ids: dict[Optional[str], int] = {None: 0}
+        self.chunks: dict[tuple[int, int], bytearray] = {}
+        self.modified: set[tuple[int, int]] = set()
+        self.dirty: set[tuple[int, int]] = set()
+        self._encoded: dict[tuple[int, int], str] = {}
+        self._clean: dict[tuple[int, int], None] = {}  # unmodified chunks, oldest first
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _id(self, block: Optional[str]) -> int:
+        idx = self._ids.get(block)
+        if idx is None:
+            idx = len(self.palette)
+            if idx > 255:
+                raise ValueError("ChunkedWorld palette is limited to 255 block types")
+            self.palette.append(block)
+            self._ids[block] = idx
+        return idx
+
+    def _generate(self, cx: int, cy: int) -> bytearray:
+        s = self.size
+        buf = bytearray(s * s)
+        x0, y0 = cx * s, cy * s
+        gen, ids, to_id = self.generator, self._ids, self._id
+        i = 0
+        for y in range(y0, y0 + s):
+            for x in range(x0, x0 + s):
+                block = gen(x, y)
+                if block is not None:
+                    idx = ids.get(block)
+                    buf[i] = idx if idx is not None else to_id(block)
+                i += 1
+        return buf
+
+    def _chunk(self, ck: tuple[int, int]) -> bytearray:
+        buf = self.chunks.get(ck)
+        if buf is None:
+            buf = self._generate(*ck)
+            self.chunks[ck] = buf
+            self._clean[ck] = None
+            if len(self._clean) > self.max_cached_chunks:
+                self._evict()
+        return buf
+
+    def _evict(self) -> None:
+        # Drop the oldest half of the cache in one go so eviction stays amortised O(1)
+        drop = len(self._clean) - self.max_cached_chunks // 2
+        for ck in list(self._clean)[:drop]:
+            del self._clean[ck]
+            self.chunks.pop(ck, None)
+
+    def _touch(self, ck: tuple[int, int]) -> None:
+        self.modified.add(ck)
+        self.dirty.add(ck)
+        self._clean.pop(ck, None)  # modified chunks are pinned
+
+    def _locate(self, key) -> tuple[tuple[int, int], int]:
+        x, y = key
+        s = self.size
+        return (x // s, y // s), (y % s) * s + (x % s)
+
+    # ------------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key) -> str:
+        ck, i = self._locate(key)
+        idx = self._chunk(ck)[i]
+        if not idx:
+            raise KeyError(key)
+        return self.palette[idx]
+
+    def get(self, key, default=None):
+        ck, i = self._locate(key)
+        idx = self._chunk(ck)[i]
+        return self.palette[idx] if idx else default
+
+    def __contains__(self, key) -> bool:
+        try:
+            ck, i = self._locate(key)
+        except (TypeError, ValueError):
+            return False
+        return bool(self._chunk(ck)[i])
+
+    def __setitem__(self, key, block: str) -> None:
+        ck, i = self._locate(key)
+        buf = self._chunk(ck)
+        idx = self._id(block)
+        if buf[i] != idx:
+            buf[i] = idx
+            self._touch(ck)
+
+    def __delitem__(self, key) -> None:
+        ck, i = self._locate(key)
+        buf = self._chunk(ck)
+        if not buf[i]:
+            raise KeyError(key)
+        buf[i] = 0
+        self._touch(ck)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        """Iterate positions of chunks currently in memory only."""
+        s = self.size
+        for (cx, cy), buf in list(self.chunks.items()):
+            for i, idx in enumerate(buf):
+                if idx:
+                    yield (cx * s + i % s, cy * s + i // s)
+
+    def __len__(self) -> int:
+        """Number of blocks in chunks currently in memory."""
+        return sum(len(buf) - buf.count(0) for buf in self.chunks.values())
+
+    # ------------------------------------------------------------------
+    # Chunk management
+    # ------------------------------------------------------------------
+
+    def materialise(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """Generate every chunk overlapping the half-open area [x0, x1) x [y0, y1)."""
+        s = self.size
+        for cy in range(y0 // s, (y1 - 1) // s + 1):
+            for cx in range(x0 // s, (x1 - 1) // s + 1):
+                self._chunk((cx, cy))
+
+    def mark_clean(self) -> None:
+        """Forget pending changes after a successful save."""
+        self.dirty.clear()
+
+    def to_dict(self) -> dict:
+        """Serialise modified chunks; clean chunks reuse their cached encoding."""
+        chunks = {}
+        for ck in self.modified:
+            enc = None if ck in self.dirty else self._encoded.get(ck)
+            if enc is None:
+                enc = _encode_chunk(self.chunks[ck])
+                self._encoded[ck] = enc
+            chunks[f"{ck[0]},{ck[1]}"] = enc
+        return {"chunk_size": self.size, "version": self.version,
+                "palette": self.palette, "chunks": chunks}
+
+    @classmethod
+    def from_dict(cls, data: dict, generator: Generator) -> "ChunkedWorld":
+        """Rebuild a world; `generator` must match data["version"] (see version_of)."""
+        world = cls(generator, data.get("chunk_size", CHUNK_SIZE), cls.version_of(data))
+        world.palette = list(data.get("palette") or [None])
+        world._ids = {block: i for i, block in enumerate(world.palette)}
+        for key, enc in data.get("chunks", {}).items():
+            cx, cy = map(int, key.split(","))
+            world.chunks[(cx, cy)] = _decode_chunk(enc)
+            world.modified.add((cx, cy))
+            world._encoded[(cx, cy)] = enc
+        return world
+
+    @staticmethod
+    def version_of(data: dict) -> int:
+        """Generator version a serialised world was built with (1 if unrecorded)."""
+        return int(data.get("version", 1))
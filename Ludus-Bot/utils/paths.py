@@ -0,0 +1,24 @@
+"""
+utils/paths.py
+==============
+Where the bot keeps its runtime state files.
+
+    from utils import paths
+
+    path = os.path.join(paths.data_dir(), "leaderboard_index.json")
+
+data_dir() is RENDER_DISK_PATH (the persistent disk on Render) or ./data,
+falling back to data/ under the working directory when that isn't
+writable.  The directory may not exist yet; writers create it.
+"""
+
+from __future__ import annotations
+
+import os
+
+
+def data_dir() -> str:
+    path = os.getenv("RENDER_DISK_PATH", "./data")
+    if not os.access(path, os.W_OK):
+        path = os.path.join(os.getcwd(), "data")
+    return path
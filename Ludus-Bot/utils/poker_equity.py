@@ -0,0 +1,172 @@
+"""
+utils/poker_equity.py
+=====================
+Monte-Carlo hand equity for the poker cog: bot decisions and the
+"show my equity" readout in PokerActionView.
+
+estimate() deals the unknown cards (rest of the board, opponents' hole
+cards) at random many times and scores every rollout with
+poker_eval.rank_batch.  With NumPy the rollouts are drawn in batches as
+arrays of remaining deck indices (argsort of a random matrix = one
+shuffle per row), so a batch of 2,000 rollouts costs a few array
+operations rather than 2,000 Python loops.  It stops at `iterations`
+rollouts or when `time_budget` runs out, whichever comes first.
+
+Equity is the share of the pot won on average: a win counts 1, a k-way
+tie 1/k.
+
+estimate() is pure and picklable - the cog runs it in the shared worker
+pool (utils.render_service).  EquityCache memoises results in the bot
+process keyed on (hole cards, board, opponents), so refreshing a view or
+a bot acting twice on the same street costs nothing.
+
+    python -m utils.poker_equity      # speed / accuracy check
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from utils import poker_eval
+
+np = poker_eval.np
+
+BATCH_SIZE = 2000
+DEFAULT_ITERATIONS = 20000
+
+
+def _card_ids(cards) -> list[int]:
+    return [poker_eval.card_id(c) for c in cards]
+
+
+def estimate(hole, board=(), opponents: int = 1, iterations: int = DEFAULT_ITERATIONS,
+             time_budget: float = 0.2, seed: Optional[int] = None) -> float:
+    """Equity (0-1) of `hole` against `opponents` random hands given the visible `board`."""
+    hole_ids, board_ids = _card_ids(hole), _card_ids(board)
+    opponents = max(0, int(opponents))
+    if opponents == 0:
+        return 1.0
+    known = set(hole_ids) | set(board_ids)
+    deck = [c for c in range(52) if c not in known]
+    board_missing = 5 - len(board_ids)
+    need = board_missing + 2 * opponents
+    if need > len(deck):
+        raise ValueError("not enough cards left for that many opponents")
+
+    deadline = time.perf_counter() + time_budget
+    if np is None:
+        return _estimate_python(hole_ids, board_ids, deck, opponents, board_missing, iterations, deadline, seed)
+
+    rng = np.random.default_rng(seed)
+    deck_arr = np.asarray(deck, dtype=np.int64)
+    fixed_board = np.asarray(board_ids, dtype=np.int64)
+    hole_arr = np.asarray(hole_ids, dtype=np.int64)
+    total = 0.0
+    done = 0
+    while done < iterations:
+        batch = min(BATCH_SIZE, iterations - done)
+        draws = deck_arr[rng.random((batch, len(deck))).argsort(axis=1)[:, :need]]
+        boards = np.concatenate([np.broadcast_to(fixed_board, (batch, len(board_ids))),
+                                 draws[:, :board_missing]], axis=1)
+        hero = poker_eval.rank_batch(
+            np.concatenate([np.broadcast_to(hole_arr, (batch, 2)), boards], axis=1))
+        best_opp = None
+        ties = None
+        for i in range(opponents):
+            cols = board_missing + 2 * i
+            opp = poker_eval.rank_batch(np.concatenate([draws[:, cols:cols + 2], boards], axis=1))
+            if best_opp is None:
+                best_opp, ties = opp, np.ones(batch, dtype=np.int64)
+            else:
+                ties = np.where(opp > best_opp, 1, ties + (opp == best_opp))
+                best_opp = np.maximum(best_opp, opp)
+        wins = hero > best_opp
+        split = hero == best_opp
+        total += float(wins.sum()) + float((split / (ties + 1)).sum())
+        done += batch
+        if time.perf_counter() > deadline:
+            break
+    return total / done
+
+
+def _estimate_python(hole_ids, board_ids, deck, opponents, board_missing, iterations, deadline, seed) -> float:
+    rng = random.Random(seed)
+    need = board_missing + 2 * opponents
+    total = 0.0
+    done = 0
+    while done < iterations:
+        draw = rng.sample(deck, need)
+        board = board_ids + draw[:board_missing]
+        hero = poker_eval.rank_ids(hole_ids + board)
+        best, ties = -1, 0
+        for i in range(opponents):
+            cols = board_missing + 2 * i
+            opp = poker_eval.rank_ids(draw[cols:cols + 2] + board)
+            if opp > best:
+                best, ties = opp, 1
+            elif opp == best:
+                ties += 1
+        if hero > best:
+            total += 1.0
+        elif hero == best:
+            total += 1.0 / (ties + 1)
+        done += 1
+        if not done & 255 and time.perf_counter() > deadline:
+            break
+    return total / done
+
+
+class EquityCache:
+    """LRU of equity results keyed on (hole cards, board, opponents)."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(hole, board, opponents: int) -> tuple:
+        # Card order doesn't change equity
+        return tuple(sorted(_card_ids(hole))), tuple(sorted(_card_ids(board))), int(opponents)
+
+    def get(self, hole, board, opponents: int) -> Optional[float]:
+        key = self.key(hole, board, opponents)
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, hole, board, opponents: int, value: float) -> None:
+        key = self.key(hole, board, opponents)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+equity_cache = EquityCache()
+
+
+def _benchmark() -> None:
+    cases = [
+        ((("A", "♠️"), ("A", "♥️")), (), 1, 0.85),
+        ((("7", "♠️"), ("2", "♥️")), (), 1, 0.35),
+        ((("A", "♠️"), ("K", "♠️")), (("Q", "♠️"), ("J", "♠️"), ("2", "♦️")), 3, None),
+    ]
+    for hole, board, opponents, expected in cases:
+        start = time.perf_counter()
+        value = estimate(hole, board, opponents, iterations=50000, time_budget=5.0, seed=1)
+        elapsed = (time.perf_counter() - start) * 1000
+        ref = f" (reference ~{expected:.2f})" if expected else ""
+        print(f"{hole} vs {opponents} on {len(board)}-card board: {value:.3f}{ref}  50k rollouts in {elapsed:.0f} ms")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,275 @@
+"""
+utils/poker_eval.py
+===================
+Lookup-table poker hand evaluator for cogs/poker.py (and anything else
+that scores Texas Hold'em hands).
+
+Every 5, 6 or 7 card hand maps to one integer rank; a higher rank is a
+better hand and equal ranks tie.  The integer is the old evaluator's
+``(ranking, high_cards)`` result packed in base 15:
+
+    rank = ranking * 15**5 + high_cards[0] * 15**4 + ... + high_cards[4]
+
+so it orders exactly like the tuple comparison the cog always used, and
+decode() gives the tuple back unchanged (royal flush = 9, wheel straights
+as [5, 4, 3, 2, 1], ...).
+
+Cactus-Kev style tables, built once (under a second) by warm() - the poker
+cog calls it in a thread at load - or else on first use:
+
+    _NONFLUSH  product of one prime per card rank -> best non-flush rank.
+               The product identifies the rank multiset, so one dict
+               lookup scores any 5-7 card hand without looking at suits.
+    _FLUSH     13-bit rank mask of one suit (5-7 bits set) -> best
+               flush / straight flush rank.
+
+A 7-card hand with five cards of one suit can't also hold quads or a full
+house, so the best hand is simply max(non-flush, flush).
+
+rank_batch() scores many hands at once; with NumPy it is fully vectorised
+(prime products + searchsorted + per-suit bit masks), otherwise it loops.
+
+Cards are (rank, suit) tuples as produced by poker.create_deck(), or card
+ids 0-51 (rank index * 4 + suit index) from card_id().
+
+Cross-check against the old evaluator and benchmark:
+    python scripts/bench_poker_eval.py
+"""
+
+from __future__ import annotations
+
+from itertools import combinations
+from typing import Iterable, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # batch evaluation falls back to a Python loop
+    np = None
+
+RANKS = ("2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A")
+RANK_VALUES = {r: i + 2 for i, r in enumerate(RANKS)}
+SUITS = ("♠️", "♥️", "♦️", "♣️")
+_SUIT_INDEX = {}
+for _i, _s in enumerate(SUITS):
+    for _alias in (_s, _s.replace("\ufe0f", ""), "shdc"[_i], "SHDC"[_i]):
+        _SUIT_INDEX[_alias] = _i
+_RANK_INDEX = {r: i for i, r in enumerate(RANKS)}
+_RANK_INDEX["T"] = 8
+
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_BASE = 15
+_WHEEL = 0b1000000001111  # A-5-4-3-2
+
+_NONFLUSH: Optional[dict] = None
+_FLUSH: Optional[list] = None
+_np_tables = None
+
+
+# ---------------------------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------------------------
+
+def encode(ranking: int, high_cards: Sequence[int]) -> int:
+    """Pack (ranking, five high card values) into a comparable integer."""
+    value = ranking
+    for card in high_cards:
+        value = value * _BASE + card
+    return value
+
+
+def decode(rank: int) -> tuple[int, list[int]]:
+    """Inverse of encode(): (ranking, high_cards) exactly as the old evaluator returned it."""
+    high = []
+    for _ in range(5):
+        rank, card = divmod(rank, _BASE)
+        high.append(card)
+    high.reverse()
+    return rank, high
+
+
+def card_id(card) -> int:
+    """0-51 id for a (rank, suit) tuple; ints pass through."""
+    if isinstance(card, int):
+        return card
+    return _RANK_INDEX[card[0]] * 4 + _SUIT_INDEX[card[1]]
+
+
+# ---------------------------------------------------------------------------
+# Table construction
+# ---------------------------------------------------------------------------
+
+def _straight_top(bits: int) -> int:
+    """Highest card value of the best straight in a 13-bit rank mask (0 if none)."""
+    for top in range(12, 3, -1):
+        run = 0b11111 << (top - 4)
+        if bits & run == run:
+            return top + 2
+    return 5 if bits & _WHEEL == _WHEEL else 0
+
+
+def _straight_cards(top: int) -> list[int]:
+    return [5, 4, 3, 2, 1] if top == 5 else list(range(top, top - 5, -1))
+
+
+def _best_nonflush(counts: list[int]) -> int:
+    """Best 5-card non-flush rank from per-rank counts (index 0 = deuce)."""
+    desc = [i + 2 for i in range(12, -1, -1) if counts[i]]
+    count = {v: counts[v - 2] for v in desc}
+    quads = [v for v in desc if count[v] >= 4]
+    trips = [v for v in desc if count[v] == 3]
+    pairs = [v for v in desc if count[v] == 2]
+
+    if quads:
+        q = quads[0]
+        return encode(7, [q] * 4 + [next(v for v in desc if v != q)])
+    if trips and (len(trips) > 1 or pairs):
+        t = trips[0]
+        p = max(trips[1:] + pairs)
+        return encode(6, [t, t, t, p, p])
+    bits = 0
+    for v in desc:
+        bits |= 1 << (v - 2)
+    top = _straight_top(bits)
+    if top:
+        return encode(4, _straight_cards(top))
+    if trips:
+        t = trips[0]
+        return encode(3, [t, t, t] + [v for v in desc if v != t][:2])
+    if len(pairs) >= 2:
+        p1, p2 = pairs[0], pairs[1]
+        return encode(2, [p1, p1, p2, p2, next(v for v in desc if v not in (p1, p2))])
+    if pairs:
+        p = pairs[0]
+        return encode(1, [p, p] + [v for v in desc if v != p][:3])
+    return encode(0, desc[:5])
+
+
+def _best_flush(bits: int) -> int:
+    """Best flush / straight flush rank for a suit holding the ranks in `bits` (>= 5 set)."""
+    top = _straight_top(bits)
+    if top == 14:
+        return encode(9, [14, 13, 12, 11, 10])
+    if top:
+        return encode(8, _straight_cards(top))
+    return encode(5, [i + 2 for i in range(12, -1, -1) if bits >> i & 1][:5])
+
+
+def _build_tables() -> None:
+    global _NONFLUSH, _FLUSH
+    nonflush = {}
+    counts = [0] * 13
+
+    def walk(rank: int, cards: int, product: int) -> None:
+        if rank == 13:
+            if cards >= 5:
+                nonflush[product] = _best_nonflush(counts)
+            return
+        for n in range(min(4, 7 - cards) + 1):
+            counts[rank] = n
+            walk(rank + 1, cards + n, product * PRIMES[rank] ** n)
+        counts[rank] = 0
+
+    walk(0, 0, 1)
+    flush = [0] * 8192
+    for bits in range(8192):
+        if 5 <= bin(bits).count("1") <= 7:
+            flush[bits] = _best_flush(bits)
+    _NONFLUSH, _FLUSH = nonflush, flush
+
+
+def _tables():
+    if _NONFLUSH is None:
+        _build_tables()
+    return _NONFLUSH, _FLUSH
+
+
+# ---------------------------------------------------------------------------
+# Evaluation
+# ---------------------------------------------------------------------------
+
+def rank_ids(ids: Iterable[int]) -> int:
+    """Rank of a 5-7 card hand given as card ids."""
+    if _NONFLUSH is None:
+        _build_tables()
+    nonflush, flush = _NONFLUSH, _FLUSH
+    product = 1
+    suit_bits = [0, 0, 0, 0]
+    suit_count = [0, 0, 0, 0]
+    for c in ids:
+        r, s = c >> 2, c & 3
+        product *= PRIMES[r]
+        suit_bits[s] |= 1 << r
+        suit_count[s] += 1
+    best = nonflush[product]
+    for s in range(4):
+        if suit_count[s] >= 5:
+            f = flush[suit_bits[s]]
+            if f > best:
+                best = f
+    return best
+
+
+def hand_rank(cards) -> int:
+    """Rank of a 5-7 card hand of (rank, suit) tuples or card ids."""
+    return rank_ids([card_id(c) for c in cards])
+
+
+def evaluate(cards) -> tuple[int, list[int]]:
+    """(ranking, high_cards) of the best 5-card hand among `cards` (5-7 cards)."""
+    return decode(hand_rank(cards))
+
+
+def best_hand(cards) -> tuple[list, int, list[int]]:
+    """(best five cards, ranking, high_cards); the five cards are the first
+    combination (in itertools order) reaching the best rank, as before."""
+    cards = list(cards)
+    ids = [card_id(c) for c in cards]
+    target = rank_ids(ids)
+    if len(cards) == 5:
+        return cards, *decode(target)
+    for combo in combinations(range(len(cards)), 5):
+        if rank_ids([ids[i] for i in combo]) == target:
+            return [cards[i] for i in combo], *decode(target)
+    raise AssertionError("no five-card combination matches the hand rank")
+
+
+def _numpy_tables():
+    global _np_tables
+    if _np_tables is None:
+        nonflush, flush = _tables()
+        keys = np.fromiter(sorted(nonflush), dtype=np.int64, count=len(nonflush))
+        values = np.fromiter((nonflush[k] for k in keys.tolist()), dtype=np.int64, count=len(keys))
+        _np_tables = (keys, values, np.asarray(flush, dtype=np.int64), np.asarray(PRIMES, dtype=np.int64))
+    return _np_tables
+
+
+def warm() -> None:
+    """Build every lookup table now. BLOCKING - call it via asyncio.to_thread."""
+    _tables()
+    if np is not None:
+        _numpy_tables()
+
+
+def rank_batch(hands):
+    """Ranks of many hands at once.
+
+    `hands` is an (N, k) array-like of card ids (5 <= k <= 7, all rows the
+    same length) or, without NumPy, any sequence of card-id sequences.
+    Returns an int64 array (NumPy) or a list of ints.
+    """
+    if np is None:
+        return [rank_ids(hand) for hand in hands]
+    keys, values, flush, primes = _numpy_tables()
+    hands = np.asarray(hands, dtype=np.int64)
+    if hands.ndim != 2 or hands.shape[0] == 0:
+        return np.zeros(hands.shape[:1], dtype=np.int64)
+    ranks = hands >> 2
+    suits = hands & 3
+    best = values[np.searchsorted(keys, primes[ranks].prod(axis=1))]
+    rank_bits = np.left_shift(1, ranks)
+    for s in range(4):
+        in_suit = suits == s
+        bits = np.where(in_suit, rank_bits, 0).sum(axis=1)
+        flushed = np.where(in_suit.sum(axis=1) >= 5, flush[bits], 0)
+        np.maximum(best, flushed, out=best)
+    return best
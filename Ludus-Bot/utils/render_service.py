@@ -0,0 +1,339 @@
+"""
+utils/render_service.py
+=======================
+Shared off-loop image rendering for every PIL-based game board.
+
+Rendering on the event loop (or in a thread, which still contends for the
+GIL) stalls heartbeats when a burst of boards is drawn at once.  The
+RenderService runs render jobs in a small ProcessPoolExecutor instead:
+
+    * jobs are plain picklable callables - a module-level function or a
+      bound method of a plain game object - plus picklable arguments;
+    * the job may return a discord.File, BytesIO, bytes or a PIL image; the
+      worker turns it into PNG bytes so only bytes cross the process boundary;
+    * workers preload fonts, card faces and mining textures once at start-up;
+    * at most `max_pending` jobs are submitted to the pool at a time, the rest
+      wait (asynchronously) for a slot - backpressure instead of an unbounded
+      executor queue;
+    * every job has a timeout covering both the wait and the render; a job
+      that times out keeps its slot until its worker is actually done;
+    * metrics() reports queue depth, in-flight jobs, latencies and failures.
+
+run() uses the same pool for other CPU-bound work whose result is a plain
+picklable value (the chess bot's search, for example).
+
+If a process pool cannot be used (RENDER_WORKERS=0, platform without fork,
+broken pool) jobs run in threads with the same limits.
+
+Usage:
+    from utils.render_service import render_service
+    file = await render_service.render_file(create_board_image, board, filename="chess.png")
+
+Configuration (environment):
+    RENDER_WORKERS      worker processes (default: min(2, cpu count); 0 = threads)
+    RENDER_MAX_PENDING  jobs in the pool at once (default: 4 per worker)
+    RENDER_TIMEOUT      seconds per job, waiting included (default: 15)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+import discord
+
+
+class RenderTimeout(Exception):
+    """A render job did not finish within its timeout."""
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+def _worker_init() -> None:
+    """Preload fonts, card faces and textures once per worker process."""
+    try:
+        from utils import card_visuals
+        for size in (10, 12, 14, 16, 18, 20, 22, 24, 28, 32, 36, 48):
+            card_visuals.get_font(size)
+            card_visuals.get_font(size, bold=True)
+        card_size = (int(card_visuals.CARD_WIDTH * 0.95), int(card_visuals.CARD_HEIGHT * 0.95))
+        for deck in ("classic", "dark", "platinum"):
+            for suit in "hdcs":
+                for rank in ("2", "3", "4", "5", "6", "7", "8", "9", "10", "j", "q", "k", "a"):
+                    card_visuals.load_card_image(rank, suit, deck, card_size)
+            card_visuals.load_card_back(deck, card_size)
+    except Exception as e:
+        print(f"[RenderService] Card preload skipped: {e}")
+    try:
+        from cogs.mining import MiningGame
+        from utils.mining_render import get_atlas
+        get_atlas(MiningGame.BLOCK_COLORS).preload()
+    except Exception as e:
+        print(f"[RenderService] Mining preload skipped: {e}")
+
+
+def _to_png(result: Any) -> tuple[bytes, Optional[str]]:
+    """Normalise a render result to (png bytes, suggested filename)."""
+    filename = None
+    if isinstance(result, discord.File):
+        filename = result.filename
+        result = result.fp
+    if hasattr(result, "save") and hasattr(result, "mode"):  # PIL image
+        buffer = io.BytesIO()
+        result.save(buffer, format="PNG")
+        return buffer.getvalue(), filename
+    if hasattr(result, "getvalue"):
+        return result.getvalue(), filename
+    if hasattr(result, "read"):
+        return result.read(), filename
+    return bytes(result), filename
+
+
+def _run_job(fn: Callable, args: tuple, kwargs: dict, encode: bool = True) -> tuple[Any, Optional[str], float]:
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    if encode:
+        data, filename = _to_png(result)
+    else:
+        data, filename = result, None
+    return data, filename, time.perf_counter() - start
+
+
+def _run_pickled(payload: bytes) -> tuple[bytes, Optional[str], float]:
+    return _run_job(*pickle.loads(payload))
+
+
+# ---------------------------------------------------------------------------
+# Service
+# ---------------------------------------------------------------------------
+
+class RenderService:
+    """Bounded process-pool renderer returning PNG bytes / discord.File objects."""
+
+    def __init__(self, workers: int = None, max_pending: int = None, timeout: float = None):
+        if workers is None:
+            workers = int(os.getenv("RENDER_WORKERS", min(2, os.cpu_count() or 1)))
+        self.workers = max(0, workers)
+        if max_pending is None:
+            max_pending = int(os.getenv("RENDER_MAX_PENDING", max(4, 4 * self.workers)))
+        self.max_pending = max(1, max_pending)
+        self.timeout = timeout if timeout is not None else float(os.getenv("RENDER_TIMEOUT", 15))
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._closed = False
+
+        # Metrics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.unpicklable = 0      # jobs run in a thread because their arguments can't be pickled
+        self.waiting = 0          # jobs waiting for a pool slot (queue depth)
+        self.in_flight = 0        # jobs handed to the pool
+        self.peak_waiting = 0
+        self.total_latency = 0.0  # submit -> result, seconds
+        self.max_latency = 0.0
+        self.total_render = 0.0   # time spent inside workers, seconds
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, warm: bool = True) -> None:
+        """Create the worker pool. Call early (setup_hook) so workers fork from a quiet process.
+        
+        warm=True blocks until the workers are up; lazy starts from the event loop pass False.
+        """
+        self._closed = False
+        if self._pool is not None or self.workers == 0:
+            return
+        if "fork" not in multiprocessing.get_all_start_methods():
+            # spawn/forkserver would re-import bot.py in every worker
+            print("[RenderService] fork unavailable - rendering in threads")
+            self.workers = 0
+            return
+        try:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_worker_init,
+            )
+            # Fork every worker now rather than on the first (latency-sensitive) render
+            warm_up = self._pool.submit(int)
+            if warm:
+                warm_up.result(timeout=30)
+            print(f"[RenderService] Started {self.workers} render workers (max pending {self.max_pending})")
+        except Exception as e:
+            print(f"[RenderService] Process pool unavailable, rendering in threads: {e}")
+            self._pool = None
+            self.workers = 0
+
+    def close(self) -> None:
+        self._closed = True
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _restart_pool(self) -> None:
+        print("[RenderService] Worker pool broke - restarting")
+        old, self._pool = self._pool, None
+        if old is not None:
+            old.shutdown(wait=False, cancel_futures=True)
+        self.start(warm=False)
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    async def render(self, fn: Callable, *args, timeout: float = None, **kwargs) -> tuple[bytes, Optional[str]]:
+        """Run `fn(*args, **kwargs)` off the event loop and return (png bytes, filename or None).
+
+        Raises RenderTimeout if the job (queueing included) takes longer than `timeout`.
+        """
+        return await self._submit(fn, args, kwargs, timeout, encode=True)
+
+    async def run(self, fn: Callable, *args, timeout: float = None, **kwargs) -> Any:
+        """Run a CPU-heavy non-render job (e.g. a bot search) in the pool and return its result.
+
+        The result must be picklable.  Same slots, timeout and metrics as render().
+        """
+        result, _ = await self._submit(fn, args, kwargs, timeout, encode=False)
+        return result
+
+    async def _submit(self, fn: Callable, args: tuple, kwargs: dict, timeout: Optional[float], encode: bool):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        if self._pool is None and self.workers and not self._closed:
+            self.start(warm=False)
+
+        timeout = self.timeout if timeout is None else timeout
+        self.submitted += 1
+        start = time.perf_counter()
+        try:
+            data, filename, render_time = await asyncio.wait_for(
+                self._run(fn, args, kwargs, encode), timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise RenderTimeout(f"render of {getattr(fn, '__qualname__', fn)} exceeded {timeout:g}s") from None
+        except Exception:
+            self.failed += 1
+            raise
+
+        latency = time.perf_counter() - start
+        self.completed += 1
+        self.total_latency += latency
+        self.total_render += render_time
+        if latency > self.max_latency:
+            self.max_latency = latency
+        return data, filename
+
+    async def _run(self, fn: Callable, args: tuple, kwargs: dict, encode: bool):
+        await self._acquire_slot()
+        try:
+            job = self._start_job(fn, args, kwargs, encode)
+        except BaseException:
+            self._release_slot()
+            raise
+        try:
+            return await self._hold_slot(job)
+        except BrokenProcessPool:
+            self._restart_pool()
+            await self._acquire_slot()
+            return await self._hold_slot(self._thread_job(fn, args, kwargs, encode))
+
+    async def _acquire_slot(self) -> None:
+        self.waiting += 1
+        if self.waiting > self.peak_waiting:
+            self.peak_waiting = self.waiting
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        self._slots.release()
+
+    def _hold_slot(self, job: asyncio.Future):
+        """Await `job`, keeping its slot until the job itself finishes.
+
+        A caller that times out stops waiting, but the worker is still busy:
+        the slot is released by the job's completion, not by the caller, so
+        max_pending always matches the real load on the pool.
+        """
+        def _done(f: asyncio.Future) -> None:
+            self._release_slot()
+            if not f.cancelled():
+                f.exception()  # mark retrieved: abandoned jobs must not log "never retrieved"
+        job.add_done_callback(_done)
+        return asyncio.shield(job)
+
+    def _thread_job(self, fn: Callable, args: tuple, kwargs: dict, encode: bool) -> asyncio.Future:
+        return asyncio.get_running_loop().run_in_executor(None, _run_job, fn, args, kwargs, encode)
+
+    def _start_job(self, fn: Callable, args: tuple, kwargs: dict, encode: bool) -> asyncio.Future:
+        pool = self._pool
+        if pool is None:
+            return self._thread_job(fn, args, kwargs, encode)
+        try:
+            # Pickle here so a bad argument fails fast instead of inside the pool's feeder thread
+            payload = pickle.dumps((fn, args, kwargs, encode), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            self.unpicklable += 1
+            if self.unpicklable == 1:
+                print(f"[RenderService] {getattr(fn, '__qualname__', fn)} is not picklable ({e}); rendering in a thread")
+            return self._thread_job(fn, args, kwargs, encode)
+        try:
+            return asyncio.wrap_future(pool.submit(_run_pickled, payload))
+        except BrokenProcessPool:
+            self._restart_pool()
+            return self._thread_job(fn, args, kwargs, encode)
+
+    async def render_file(self, fn: Callable, *args, filename: str = None,
+                          timeout: float = None, **kwargs) -> discord.File:
+        """render() wrapped in a discord.File (filename defaults to the one the job chose)."""
+        data, job_filename = await self.render(fn, *args, timeout=timeout, **kwargs)
+        return discord.File(io.BytesIO(data), filename=filename or job_filename or "image.png")
+
+    async def render_bytes_io(self, fn: Callable, *args, timeout: float = None, **kwargs) -> io.BytesIO:
+        """render() as a rewound BytesIO, for callers that build their own discord.File."""
+        data, _ = await self.render(fn, *args, timeout=timeout, **kwargs)
+        return io.BytesIO(data)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> dict:
+        done = self.completed or 1
+        return {
+            "mode": "process" if self._pool is not None else "thread",
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "queue_depth": self.waiting,
+            "peak_queue_depth": self.peak_waiting,
+            "in_flight": self.in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "unpicklable": self.unpicklable,
+            "avg_latency_ms": round(self.total_latency * 1000 / done, 2),
+            "max_latency_ms": round(self.max_latency * 1000, 2),
+            "avg_render_ms": round(self.total_render * 1000 / done, 2),
+        }
+
+
+render_service = RenderService()
@@ -0,0 +1,345 @@
+"""
+utils/scheduler.py
+==================
+One persistent timer service for every cog's scheduled work.
+
+Cogs used to run their own tasks.loop scans - reminders every 60 s over
+every user (re-parsing ISO timestamps each time), shipments every 5
+minutes over every business, the lottery hourly - each waking up whether
+anything was due or not.  Now they register a handler per job kind and
+schedule jobs:
+
+    from utils.scheduler import scheduler
+
+    scheduler.register("reminder", self._deliver_reminder)      # cog_load
+    scheduler.schedule("reminder", when, {"user_id": uid, "message": text})
+    scheduler.schedule("business.payroll", first, key="business:payroll",
+                       every=3600, replace=False)               # recurring
+    scheduler.cancel("lottery:drawing")
+    scheduler.unregister("reminder")                            # cog_unload
+
+A handler is ``async def handler(job)``; ``job.data`` is the JSON-safe
+dict given to schedule().  Jobs are:
+
+    * kept in a min-heap on their due time (epoch seconds, parsed once);
+      one runner task sleeps until the earliest job is due and is woken
+      early when an earlier job is scheduled - no polling;
+    * keyed: scheduling an existing key replaces it (or, with
+      replace=False, leaves it alone - handy for recurring jobs that must
+      survive restarts without being pushed back);
+    * persisted to data/scheduled_jobs.json (written behind, atomically,
+      about a second after a change and on flush() - which every cog
+      using the scheduler calls in cog_unload), so pending jobs survive a
+      restart and overdue ones run right after it;
+    * run at least once: a job stays stored until its handler returns,
+      so handlers should be idempotent (e.g. deliver whatever is due);
+    * parked while no handler is registered for their kind (cog not
+      loaded yet) and released when one registers.
+
+A handler that raises is logged; one-shot jobs are then dropped and
+recurring ones move on to their next due time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from utils import paths
+
+STORE_VERSION = 1
+SAVE_DELAY = 1.0        # seconds to coalesce changes before writing the store
+MAX_SLEEP = 3600.0      # re-check the heap at least this often (clock changes)
+
+When = Union[datetime, float, int]
+
+
+def _timestamp(when: When) -> float:
+    if isinstance(when, datetime):
+        return when.timestamp()  # naive datetimes are taken as local time, like datetime does
+    return float(when)
+
+
+class Job:
+    """A scheduled call of the handler registered for `kind`."""
+
+    __slots__ = ("key", "kind", "due", "data", "every", "seq")
+
+    def __init__(self, key: str, kind: str, due: float, data: Optional[dict] = None,
+                 every: Optional[float] = None):
+        self.key = key
+        self.kind = kind
+        self.due = due
+        self.data = data if data is not None else {}
+        self.every = every
+        self.seq = 0  # matches the job's live heap entry
+
+    def to_dict(self) -> dict:
+        record = {"key": self.key, "kind": self.kind, "due": self.due, "data": self.data}
+        if self.every:
+            record["every"] = self.every
+        return record
+
+    @classmethod
+    def from_dict(cls, record: dict) -> "Job":
+        return cls(record["key"], record["kind"], float(record["due"]),
+                   record.get("data") or {}, record.get("every"))
+
+    def __repr__(self) -> str:
+        return f"Job({self.key!r}, {self.kind!r}, due={self.due:.0f})"
+
+
+Handler = Callable[[Job], Awaitable[Any]]
+
+
+class Scheduler:
+    """Min-heap of persistent jobs served by a single runner task."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.jobs: Dict[str, Job] = {}
+        self.handlers: Dict[str, Handler] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count(1)
+        self._parked: Dict[str, List[Job]] = {}
+        self._loaded = False
+        self._wake: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._save_task: Optional[asyncio.Task] = None
+        self._dirty = False
+        self._write_lock = threading.Lock()  # flush() and the save loop's thread share the .tmp file
+        self._write_seq = itertools.count(1)
+        self._written_seq = 0
+        self._running: Dict[str, asyncio.Task] = {}
+        self.fired = 0
+        self.failed = 0
+
+    # ── Registration ──────────────────────────────────────────────────
+
+    def register(self, kind: str, handler: Handler):
+        """Route jobs of `kind` to `handler`; releases jobs that were waiting for it."""
+        self.ensure_loaded()
+        self.handlers[kind] = handler
+        now = time.time()
+        for job in self._parked.pop(kind, []):
+            if self.jobs.get(job.key) is job:
+                self._push(job, min(job.due, now))
+        self._start()
+
+    def unregister(self, kind: str):
+        self.handlers.pop(kind, None)
+
+    # ── Jobs ──────────────────────────────────────────────────────────
+
+    def schedule(self, kind: str, when: When, data: Optional[dict] = None, *, key: Optional[str] = None,
+                 every: Optional[float] = None, replace: bool = True) -> str:
+        """Schedule `kind` at `when` (datetime or epoch seconds); returns the job key."""
+        self.ensure_loaded()
+        key = key or f"{kind}:{uuid.uuid4().hex}"
+        if not replace and key in self.jobs:
+            return key
+        job = Job(key, kind, _timestamp(when), data, every)
+        self.jobs[key] = job
+        self._push(job, job.due)
+        self._mark_dirty()
+        self._start()
+        return key
+
+    def cancel(self, key: str) -> bool:
+        """Forget a job (its heap entry is skipped lazily)."""
+        self.ensure_loaded()
+        if self.jobs.pop(key, None) is None:
+            return False
+        self._mark_dirty()
+        return True
+
+    def get(self, key: str) -> Optional[Job]:
+        self.ensure_loaded()
+        return self.jobs.get(key)
+
+    def pending(self, kind: Optional[str] = None) -> List[Job]:
+        """Stored jobs (of one kind), soonest first."""
+        self.ensure_loaded()
+        return sorted((j for j in self.jobs.values() if kind is None or j.kind == kind), key=lambda j: j.due)
+
+    def _push(self, job: Job, due: float):
+        job.due = due
+        job.seq = next(self._seq)
+        heapq.heappush(self._heap, (due, job.seq, job.key))
+        if self._wake is not None and self._heap[0][1] == job.seq:
+            self._wake.set()  # new earliest job: re-arm the runner's sleep
+
+    # ── Runner ────────────────────────────────────────────────────────
+
+    def _start(self):
+        if self._runner is not None and not self._runner.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no loop yet: the first register()/schedule() inside one starts it
+        self._wake = asyncio.Event()
+        self._runner = loop.create_task(self._run())
+
+    def _next_live(self) -> Optional[Tuple[float, Job]]:
+        """Earliest heap entry that is still current, dropping stale ones."""
+        heap = self._heap
+        while heap:
+            due, seq, key = heap[0]
+            job = self.jobs.get(key)
+            if job is not None and job.seq == seq:
+                return due, job
+            heapq.heappop(heap)
+        return None
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            head = self._next_live()
+            if head is None:
+                await self._wake.wait()
+                continue
+            delay = head[0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=min(delay, MAX_SLEEP))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Everything due now
+            now = time.time()
+            while True:
+                head = self._next_live()
+                if head is None or head[0] > now:
+                    break
+                heapq.heappop(self._heap)
+                job = head[1]
+                job.seq = 0  # off the heap until it is rescheduled
+                if job.kind not in self.handlers:
+                    self._parked.setdefault(job.kind, []).append(job)
+                    continue
+                self._running[job.key] = asyncio.create_task(self._fire(job))
+
+    async def _fire(self, job: Job):
+        handler = self.handlers.get(job.kind)
+        try:
+            if handler is not None:
+                await handler(job)
+                self.fired += 1
+        except Exception as e:
+            self.failed += 1
+            print(f"[Scheduler] Job {job.key} ({job.kind}) failed: {e}")
+        finally:
+            if self._running.get(job.key) is asyncio.current_task():
+                del self._running[job.key]
+            # Unless the handler rescheduled or cancelled it meanwhile
+            if self.jobs.get(job.key) is job:
+                if job.every:
+                    now = time.time()
+                    due = job.due + job.every
+                    if due <= now:  # missed runs (downtime) collapse into one
+                        due += job.every * ((now - due) // job.every + 1)
+                    self._push(job, due)
+                else:
+                    del self.jobs[job.key]
+                self._mark_dirty()
+
+    # ── Persistence ───────────────────────────────────────────────────
+
+    def ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                store = json.load(fh)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"[Scheduler] Could not read {self.path}: {e}")
+            return
+        for record in store.get("jobs", []):
+            try:
+                job = Job.from_dict(record)
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.jobs[job.key] = job
+            self._push(job, job.due)
+        if self.jobs:
+            print(f"[Scheduler] Loaded {len(self.jobs)} pending jobs")
+
+    def _snapshot(self) -> Tuple[str, int]:
+        payload = json.dumps({"version": STORE_VERSION, "jobs": [j.to_dict() for j in self.jobs.values()]},
+                             separators=(",", ":"))
+        return payload, next(self._write_seq)
+
+    def _write(self, payload: str, seq: int):
+        """Atomic write; a snapshot older than one already written is dropped."""
+        with self._write_lock:
+            if seq < self._written_seq:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                fh.write(payload)
+            os.replace(tmp, self.path)
+            self._written_seq = seq
+
+    def _mark_dirty(self):
+        self._dirty = True
+        if self._save_task is not None and not self._save_task.done():
+            return  # the running save loop sees the flag
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()  # outside the bot (scripts): write through
+            return
+        self._save_task = loop.create_task(self._save_later())
+
+    async def _save_later(self):
+        # Loop until a write has covered every change: jobs changed while a write
+        # is in flight set the flag again, and a failed write is retried
+        while self._dirty:
+            await asyncio.sleep(SAVE_DELAY)
+            if not self._dirty:
+                break  # flush() wrote it meanwhile
+            self._dirty = False
+            try:
+                await asyncio.to_thread(self._write, *self._snapshot())
+            except Exception as e:
+                self._dirty = True
+                print(f"[Scheduler] Failed to save jobs: {e}")
+
+    def flush(self):
+        """Write the store now (shutdown / cog unload). BLOCKING."""
+        if self._loaded:
+            self._dirty = False
+            try:
+                self._write(*self._snapshot())
+            except Exception:
+                self._dirty = True
+                raise
+
+    def stats(self) -> Dict[str, Any]:
+        head = self._next_live() if self._loaded else None
+        return {
+            "jobs": len(self.jobs),
+            "handlers": sorted(self.handlers),
+            "parked": sum(len(v) for v in self._parked.values()),
+            "running": len(self._running),
+            "next_in": round(head[0] - time.time(), 1) if head else None,
+            "fired": self.fired,
+            "failed": self.failed,
+        }
+
+
+scheduler = Scheduler(os.path.join(paths.data_dir(), "scheduled_jobs.json"))
@@ -0,0 +1,474 @@
+"""
+utils/tictactoe_engine.py
+=========================
+Bitmask tic-tac-toe / gomoku engine for the BoardGames AI (cogs/boardgames.py).
+
+Boards are N x N (3, 4 or 5) with a win length of 3 on 3x3 and 4 on the
+larger boards - the same rules as the cog.  A position is two integers:
+
+    me    the stones of the player to move (bit r * N + c)
+    opp   the opponent's stones
+
+Everything that depends only on the board size is precomputed once per
+(size, win length) in a Geometry:
+
+    * every win line as a bit mask, and the lines through each cell
+    * the 8 rotations/reflections of the square, as per-row lookup tables
+      so a mask is transformed with N table reads instead of a cell loop
+    * a centre-first move order
+
+The search is negamax alpha-beta with
+
+    * a transposition table keyed on the canonical position - the smallest
+      (me, opp) encoding over the 8 symmetries - so mirrored or rotated
+      lines share entries; the stored best move is mapped back through
+      the symmetry that produced the key
+    * iterative deepening under a millisecond time budget; once the depth
+      covers every empty cell the result is an exact solve
+    * immediate wins, forced blocks and "two threats = lost" at every node
+    * an open-line heuristic at the depth horizon
+
+Win scores are absolute (WIN minus the stones on the board when the game
+ends), so TT entries need no ply adjustment and the engine prefers quick
+wins and slow losses.
+
+3x3 never searches: utils/tictactoe_table.py ships the exact score of
+every canonical position (generated by build_perfect_table(); regenerate
+with `python -m utils.tictactoe_engine --write-table`).
+
+best_move() takes the cog's flat board (0 empty, 1/2 players) and returns
+a cell index; it is picklable and is run in the shared worker pool so a
+search never blocks the event loop.
+
+Benchmark and solver checks: python scripts/bench_tictactoe.py
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+WIN = 10_000          # scores above WIN - MAX_CELLS - 1 are forced results
+MAX_CELLS = 25
+TT_MAX_ENTRIES = 500_000
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Horizon weight of a line holding n of one player's stones and none of the other's
+LINE_WEIGHTS = (0, 1, 6, 36, 216)
+
+# Search time per move (milliseconds) by board size; 3x3 is answered from the table
+TIME_BUDGET_MS = {3: 50, 4: 300, 5: 400}
+
+
+def win_length(size: int) -> int:
+    """3 in a row on 3x3, 4 in a row on 4x4 and larger."""
+    return 3 if size <= 3 else 4
+
+
+def _popcount(x: int) -> int:
+    return bin(x).count("1")
+
+
+class Geometry:
+    """Precomputed lines, symmetries and move order for one (size, win length)."""
+
+    def __init__(self, size: int, length: int):
+        self.size = size
+        self.length = length
+        self.cells = size * size
+        self.full = (1 << self.cells) - 1
+        self.row_mask = (1 << size) - 1
+
+        lines = []
+        for r in range(size):
+            for c in range(size):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    er, ec = r + dr * (length - 1), c + dc * (length - 1)
+                    if 0 <= er < size and 0 <= ec < size:
+                        lines.append(sum(1 << ((r + dr * i) * size + c + dc * i) for i in range(length)))
+        self.lines: Tuple[int, ...] = tuple(lines)
+        self.cell_lines: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(line for line in lines if line >> i & 1) for i in range(self.cells)
+        )
+
+        n = size - 1
+        transforms = (
+            lambda r, c: (r, c),
+            lambda r, c: (c, n - r),
+            lambda r, c: (n - r, n - c),
+            lambda r, c: (n - c, r),
+            lambda r, c: (r, n - c),
+            lambda r, c: (n - r, c),
+            lambda r, c: (c, r),
+            lambda r, c: (n - c, n - r),
+        )
+        self.perms: List[Tuple[int, ...]] = []
+        self.inverse: List[Tuple[int, ...]] = []
+        for transform in transforms:
+            perm = tuple(r * size + c for r, c in (transform(i // size, i % size) for i in range(self.cells)))
+            inv = [0] * self.cells
+            for i, j in enumerate(perm):
+                inv[j] = i
+            self.perms.append(perm)
+            self.inverse.append(tuple(inv))
+        # row_maps[sym][row][bits of that row] -> transformed mask
+        self.row_maps = [
+            [
+                [
+                    sum(1 << perm[r * size + c] for c in range(size) if bits >> c & 1)
+                    for bits in range(1 << size)
+                ]
+                for r in range(size)
+            ]
+            for perm in self.perms
+        ]
+
+        centre = (size - 1) / 2
+        self.order: Tuple[int, ...] = tuple(sorted(
+            range(self.cells),
+            key=lambda i: (abs(i // size - centre) + abs(i % size - centre), i),
+        ))
+
+    def canonical(self, me: int, opp: int) -> Tuple[int, int]:
+        """(smallest key over the 8 symmetries, index of that symmetry)."""
+        size, row_mask, cells = self.size, self.row_mask, self.cells
+        best_key, best_sym = -1, 0
+        for sym, rows in enumerate(self.row_maps):
+            t_me = t_opp = 0
+            for r in range(size):
+                shift = r * size
+                table = rows[r]
+                t_me |= table[(me >> shift) & row_mask]
+                t_opp |= table[(opp >> shift) & row_mask]
+            key = (t_me << cells) | t_opp
+            if best_key < 0 or key < best_key:
+                best_key, best_sym = key, sym
+        return best_key, best_sym
+
+    def wins(self, stones: int, cell: int) -> bool:
+        """Whether `stones` (which include `cell`) complete a line through `cell`."""
+        for line in self.cell_lines[cell]:
+            if stones & line == line:
+                return True
+        return False
+
+    def has_line(self, stones: int) -> bool:
+        for line in self.lines:
+            if stones & line == line:
+                return True
+        return False
+
+
+_geometries: Dict[Tuple[int, int], Geometry] = {}
+
+
+def geometry(size: int, length: Optional[int] = None) -> Geometry:
+    key = (size, length or win_length(size))
+    geo = _geometries.get(key)
+    if geo is None:
+        geo = _geometries[key] = Geometry(*key)
+    return geo
+
+
+def to_masks(board, player: int) -> Tuple[int, int]:
+    """(player's stones, opponent's stones) from the cog's flat board."""
+    me = opp = 0
+    for i, cell in enumerate(board):
+        if cell == player:
+            me |= 1 << i
+        elif cell:
+            opp |= 1 << i
+    return me, opp
+
+
+def winner(board, size: int) -> Optional[int]:
+    """The player (1 or 2) with a complete line on the cog's flat board, or None."""
+    geo = geometry(size)
+    ones, twos = to_masks(board, 1)
+    if geo.has_line(ones):
+        return 1
+    if geo.has_line(twos):
+        return 2
+    return None
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+
+class Solver:
+    """Negamax searcher for one geometry; keep one per process so the TT survives between moves."""
+
+    def __init__(self, geo: Geometry, tt_max_entries: int = TT_MAX_ENTRIES):
+        self.geo = geo
+        self.weights = LINE_WEIGHTS
+        self.tt: dict = {}
+        self.tt_max_entries = tt_max_entries
+        self.nodes = 0
+        self.deadline = 0.0
+
+    def search(self, me: int, opp: int, max_depth: int = MAX_CELLS, time_budget_ms: float = 300):
+        """Return (cell, score, depth reached) for the side to move."""
+        geo = self.geo
+        start = time.perf_counter()
+        self.deadline = start + time_budget_ms / 1000
+        self.nodes = 0
+        if len(self.tt) > self.tt_max_entries:
+            self.tt.clear()
+
+        occupied = me | opp
+        empty = geo.full & ~occupied
+        moves = [i for i in geo.order if empty >> i & 1]
+        if not moves:
+            return None, 0, 0
+        stones = _popcount(occupied)
+        for i in moves:
+            if geo.wins(me | 1 << i, i):
+                return i, WIN - stones - 1, 1
+
+        best_cell, best_score, reached = moves[0], -WIN, 0
+        for depth in range(1, min(max_depth, len(moves)) + 1):
+            try:
+                cell, score = self._root(me, opp, stones, moves, depth, best_cell)
+            except SearchTimeout as partial:
+                if partial.args and partial.args[0] is not None:
+                    best_cell = partial.args[0]
+                break
+            best_cell, best_score, reached = cell, score, depth
+            if abs(score) > WIN - MAX_CELLS - 1:
+                break  # forced result found
+            if time.perf_counter() > start + time_budget_ms / 1000 * 0.5:
+                break  # the next iteration would not finish
+        return best_cell, best_score, reached
+
+    def _root(self, me: int, opp: int, stones: int, moves: list, depth: int, first: int):
+        order = [first] + [i for i in moves if i != first]
+        alpha, beta = -WIN, WIN
+        best_cell, best_score = None, -WIN - 1
+        for i in order:
+            try:
+                score = -self._negamax(opp, me | 1 << i, stones + 1, depth - 1, -beta, -alpha)
+            except SearchTimeout:
+                raise SearchTimeout(best_cell)
+            if score > best_score:
+                best_cell, best_score = i, score
+            if score > alpha:
+                alpha = score
+        return best_cell, best_score
+
+    def _negamax(self, me: int, opp: int, stones: int, depth: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        if not self.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        geo = self.geo
+        empty = geo.full & ~(me | opp)
+        if not empty:
+            return 0
+
+        # One pass over the win lines: threats for both sides and the horizon score
+        weights, last = self.weights, geo.length - 1
+        my_wins = opp_wins = 0
+        score = 0
+        for line in geo.lines:
+            mine = line & me
+            theirs = line & opp
+            if not theirs:
+                if mine:
+                    n = _popcount(mine)
+                    score += weights[n]
+                    if n == last:
+                        my_wins |= line & ~me
+            elif not mine:
+                n = _popcount(theirs)
+                score -= weights[n]
+                if n == last:
+                    opp_wins |= line & ~opp
+
+        if my_wins & empty:
+            return WIN - stones - 1
+        if stones + 1 == geo.cells:
+            return 0  # the last stone cannot win (checked above): draw
+        forced = opp_wins & empty
+        if forced:
+            if forced & (forced - 1):
+                return -(WIN - stones - 2)  # two threats: opponent wins next move
+            moves_mask = forced
+        else:
+            moves_mask = empty
+
+        # Can't win before our next move after this one
+        best_possible = WIN - stones - 3
+        if beta > best_possible:
+            beta = best_possible
+            if alpha >= beta:
+                return beta
+
+        if depth <= 0:
+            return score
+
+        key, sym = geo.canonical(me, opp)
+        entry = self.tt.get(key)
+        tt_cell = None
+        if entry is not None:
+            e_depth, flag, value, canon_cell = entry
+            if e_depth >= depth or abs(value) > WIN - MAX_CELLS - 1:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER and value >= beta:
+                    return value
+                if flag == UPPER and value <= alpha:
+                    return value
+            if canon_cell is not None:
+                tt_cell = geo.inverse[sym][canon_cell]
+
+        order = [i for i in geo.order if moves_mask >> i & 1]
+        if tt_cell is not None and moves_mask >> tt_cell & 1:
+            order.remove(tt_cell)
+            order.insert(0, tt_cell)
+
+        alpha_orig = alpha
+        best, best_cell = -WIN - 1, None
+        for i in order:
+            value = -self._negamax(opp, me | 1 << i, stones + 1, depth - 1, -beta, -alpha)
+            if value > best:
+                best, best_cell = value, i
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        flag = UPPER if best <= alpha_orig else LOWER if best >= beta else EXACT
+        self.tt[key] = (depth, flag, best, geo.perms[sym][best_cell])
+        return best
+
+
+# ---------------------------------------------------------------------------
+# 3x3 perfect-play table
+# ---------------------------------------------------------------------------
+
+def build_perfect_table(size: int = 3) -> Dict[int, int]:
+    """Exact score (side to move) of every reachable non-terminal position, keyed canonically."""
+    geo = geometry(size)
+    table: Dict[int, int] = {}
+
+    def solve(me: int, opp: int, stones: int) -> int:
+        key, _ = geo.canonical(me, opp)
+        if key in table:
+            return table[key]
+        best = -WIN
+        empty = geo.full & ~(me | opp)
+        for i in geo.order:
+            if not empty >> i & 1:
+                continue
+            stones_after = me | 1 << i
+            if geo.wins(stones_after, i):
+                value = WIN - stones - 1
+            elif stones + 1 == geo.cells:
+                value = 0
+            else:
+                # Solved even when a win is available, so positions after a blunder are covered too
+                value = -solve(opp, stones_after, stones + 1)
+            if value > best:
+                best = value
+        table[key] = best
+        return best
+
+    solve(0, 0, 0)
+    return table
+
+
+def table_move(geo: Geometry, table: Dict[int, int], me: int, opp: int) -> Optional[int]:
+    """Best cell from a perfect-play table, or None if the position isn't in it."""
+    empty = geo.full & ~(me | opp)
+    stones = geo.cells - _popcount(empty)
+    if not empty or geo.canonical(me, opp)[0] not in table:
+        return None
+    best_cell, best = None, -WIN - 1
+    for i in geo.order:  # centre first on ties
+        if not empty >> i & 1:
+            continue
+        stones_after = me | 1 << i
+        if geo.wins(stones_after, i):
+            return i
+        if stones + 1 == geo.cells:
+            value = 0
+        else:
+            child = table.get(geo.canonical(opp, stones_after)[0])
+            if child is None:
+                return None
+            value = -child
+        if value > best:
+            best_cell, best = i, value
+    return best_cell
+
+
+# ---------------------------------------------------------------------------
+# Cog entry point
+# ---------------------------------------------------------------------------
+
+_solvers: Dict[Tuple[int, int], Solver] = {}
+
+
+def best_move(board, size: int, player: int, time_budget_ms: Optional[float] = None) -> int:
+    """Cell index for `player` (1 or 2) on the cog's flat board. Safe to run in a worker process."""
+    geo = geometry(size)
+    me, opp = to_masks(board, player)
+    empty = geo.full & ~(me | opp)
+    if not empty:
+        return 0
+
+    if size == 3:
+        from utils.tictactoe_table import PERFECT_3X3
+
+        cell = table_move(geo, PERFECT_3X3, me, opp)
+        if cell is not None:
+            return cell
+
+    solver = _solvers.get((geo.size, geo.length))
+    if solver is None:
+        solver = _solvers[(geo.size, geo.length)] = Solver(geo)
+    budget = TIME_BUDGET_MS.get(size, 400) if time_budget_ms is None else time_budget_ms
+    cell, _, _ = solver.search(me, opp, time_budget_ms=budget)
+    if cell is None:
+        cell = next(i for i in geo.order if empty >> i & 1)
+    return cell
+
+
+def _write_table(path: str):
+    table = build_perfect_table(3)
+    items = sorted(table.items())
+    lines = [
+        '"""',
+        "utils/tictactoe_table.py",
+        "========================",
+        "Exact 3x3 tic-tac-toe scores for utils/tictactoe_engine.py - generated, do not edit.",
+        "",
+        "Regenerate with:  python -m utils.tictactoe_engine --write-table",
+        "",
+        "Key: canonical position (Geometry.canonical of the side to move's and the",
+        "opponent's stones).  Value: score for the side to move - WIN minus the",
+        "stones on the board when it wins, the negative of that when it loses, 0",
+        "for a draw.",
+        '"""',
+        "",
+        f"# {len(items)} positions",
+        "PERFECT_3X3 = {",
+    ]
+    for start in range(0, len(items), 6):
+        lines.append("    " + " ".join(f"{k}: {v}," for k, v in items[start:start + 6]))
+    lines.append("}")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("\n".join(lines) + "\n")
+    print(f"[TicTacToe] Wrote {len(items)} positions to {path}")
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    if "--write-table" in sys.argv:
+        _write_table(os.path.join(os.path.dirname(os.path.abspath(__file__)), "tictactoe_table.py"))
+    else:
+        print("Usage: python -m utils.tictactoe_engine --write-table")
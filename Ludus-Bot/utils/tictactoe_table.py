@@ -0,0 +1,121 @@
+"""
+utils/tictactoe_table.py
+========================
+Exact 3x3 tic-tac-toe scores for utils/tictactoe_engine.py - generated, do not edit.
+
+Regenerate with:  python -m utils.tictactoe_engine --write-table
+
+Key: canonical position (Geometry.canonical of the side to move's and the
+opponent's stones).  Value: score for the side to move - WIN minus the
+stones on the board when it wins, the negative of that when it loses, 0
+for a draw.
+"""
+
+# 627 positions
+PERFECT_3X3 = {
+    0: 0, 1: 0, 2: 0, 16: 0, 514: 9993, 516: 9993,
+    518: 9992, 522: 0, 524: 0, 528: 0, 530: 0, 532: 0,
+    544: 9993, 546: 9992, 548: -9993, 552: 9992, 560: 0, 580: -9993,
+    608: 0, 672: 9992, 768: 9993, 770: 0, 772: -9993, 784: 0,
+    800: 9992, 1025: 0, 1029: 0, 1032: 9993, 1033: -9993, 1036: 0,
+    1040: 0, 1041: -9993, 1048: -9993, 1064: 9992, 1088: 9993, 1089: -9993,
+    1092: 0, 1096: 9992, 1104: -9993, 1120: 0, 1152: 0, 1153: 0,
+    1160: 0, 1168: 0, 1216: 0, 1344: -9993, 1548: 9993, 1556: 0,
+    1560: 9995, 1564: -9993, 1572: -9992, 1576: 9995, 1580: -9993, 1584: 9995,
+    1588: -9993, 1604: 9993, 1608: 9995, 1612: 9992, 1616: 9995, 1624: 9994,
+    1632: 9995, 1636: -9993, 1640: 9994, 1648: 9994, 1668: 0, 1672: 9995,
+    1676: -9991, 1680: 9995, 1684: 0, 1688: 9994, 1696: 9995, 1700: -9991,
+    1704: 9994, 1712: 9994, 1728: 9995, 1732: -9993, 1736: 9994, 1744: 9994,
+    1760: 9994, 1796: -9992, 1800: 9995, 1804: -9991, 1808: 9995, 1812: -9993,
+    1816: 9994, 1824: 9995, 1832: 9994, 1840: 9994, 1856: 9995, 1860: -9993,
+    1864: 9994, 1872: 9994, 1888: 9994, 1920: 9995, 1924: -9993, 1928: 9994,
+    1936: 9994, 1952: 9994, 2570: 9993, 2578: 0, 2584: 9995, 2586: -9993,
+    2600: 9995, 2602: 9992, 2626: 9993, 2632: 9995, 2634: 9992, 2640: 9995,
+    2642: 0, 2648: 9994, 2656: 9995, 2658: 0, 2664: 9994, 2672: 9994,
+    2690: 9993, 2696: 9995, 2698: 9992, 2704: 9995, 2712: 9994, 2728: 9994,
+    2752: 9995, 2754: -9993, 2760: 9994, 2768: 9994, 2784: 9994, 2880: 9995,
+    2882: 0, 2888: 9994, 2896: 9994, 5125: 9993, 5137: 0, 5140: 0,
+    5141: -9993, 5153: 0, 5156: 9991, 5157: 0, 5168: 9993, 5169: 0,
+    5172: -9993, 5188: 9993, 5189: 9992, 5216: 0, 5217: 0, 5220: -9993,
+    5232: 0, 5280: 9993, 5281: 0, 5284: 0, 5296: 9992, 5377: 9993,
+    5380: -9992, 5381: -9993, 5392: 9993, 5396: -9993, 5408: 9991, 5409: -9993,
+    5424: -9993, 5444: -9993, 5472: -9993, 5536: -9993, 5684: 9993, 5732: -9992,
+    5744: 9993, 5796: 9993, 5808: 9993, 5812: 9992, 5860: -9991, 5908: 9993,
+    5936: 9993, 5956: -9992, 5984: 9993, 6000: 9992, 6048: 9993, 6064: 9992,
+    6147: 9993, 6161: 0, 6162: 0, 6163: -9993, 6177: 0, 6178: 9993,
+    6179: 0, 6192: 9993, 6193: 0, 6194: 0, 6209: 9993, 6210: 9993,
+    6211: 9992, 6224: 0, 6225: 0, 6226: 0, 6240: 0, 6241: 0,
+    6242: 0, 6256: 0, 6273: 9993, 6274: 9993, 6275: 9992, 6288: 0,
+    6289: -9993, 6304: 9993, 6305: 0, 6306: 0, 6320: 0, 6336: 9991,
+    6337: 0, 6338: -9993, 6352: -9993, 6368: 0, 6401: 9993, 6402: 9993,
+    6403: 9992, 6416: 9993, 6418: -9993, 6432: 9993, 6433: 0, 6434: 9992,
+    6448: 9992, 6464: 0, 6465: -9993, 6466: 0, 6480: -9993, 6496: 0,
+    6528: 9993, 6529: -9993, 6530: -9993, 6544: -9993, 6560: 9992, 6706: 9993,
+    6738: 0, 6754: 0, 6768: 9993, 6770: 0, 6818: 9993, 6832: 9993,
+    6850: -9992, 6864: 9993, 6880: 9993, 6882: -9991, 6896: 9992, 6930: 9993,
+    6946: 9993, 6960: 9993, 6962: 9992, 6978: 0, 6992: 9993, 6994: 0,
+    7008: 9993, 7010: 0, 7024: 9992, 7042: 9993, 7056: 9993, 7072: 9993,
+    7074: 9992, 7088: 9992, 7217: 0, 7249: 0, 7265: 0, 7280: 9993,
+    7281: 0, 7313: 0, 7329: 0, 7344: 9993, 7345: 0, 7361: 0,
+    7376: 9993, 7377: 0, 7392: 9993, 7393: 0, 7408: 9992, 7457: 9991,
+    7472: 9993, 7489: -9992, 7504: 9993, 7520: 9993, 7521: -9991, 7536: 9992,
+    7553: -9992, 7568: 9993, 7584: 9993, 7585: -9991, 7600: 9992, 8193: 0,
+    8194: 9993, 8195: 0, 8197: 0, 8202: 0, 8204: 0, 8232: 9992,
+    8260: 0, 8710: 9995, 8714: 9995, 8716: 9995, 8718: 9994, 8738: 9995,
+    8740: 9995, 8742: 9994, 8744: 9995, 8746: 9994, 8748: 9994, 8772: 9995,
+    8774: 9994, 8800: 9995, 8802: 9994, 8804: 9994, 8808: 9994, 8864: 9995,
+    8866: 9994, 8868: 9994, 8962: 9993, 8964: 0, 8966: 0, 8970: 0,
+    8972: 0, 8992: 9993, 8994: 0, 9000: 9992, 9028: -9993, 9056: -9993,
+    9120: -9993, 9221: 9995, 9225: 9995, 9228: 9995, 9229: 9994, 9256: 9995,
+    9257: 9994, 9281: 9995, 9284: 9995, 9285: 9994, 9288: 9995, 9292: 9994,
+    9312: 9995, 9313: 9994, 9316: 9994, 9320: 9994, 9345: 0, 9349: 0,
+    9352: 9993, 9353: 0, 9356: 0, 9384: 9992, 9408: 0, 9409: -9993,
+    9412: 0, 9416: -9993, 9440: 0, 9536: 9995, 9537: 9994, 9544: 9994,
+    9772: 9993, 9804: 9993, 9828: 9993, 9832: 9993, 9836: 9992, 9868: 9993,
+    9892: 9993, 9896: 9993, 9900: 9992, 9924: 9993, 9928: 9993, 9932: 9992,
+    9952: 9993, 9956: 9992, 9960: 9992, 9996: 9993, 10024: 9993, 10052: 9993,
+    10056: 9993, 10060: 9992, 10080: 9993, 10088: 9992, 10116: -9992, 10120: 9993,
+    10124: -9991, 10144: 9993, 10152: 9992, 10794: 9993, 10826: 9993, 10850: 9993,
+    10856: 9993, 10858: 9992, 10890: 9993, 10920: 9993, 10922: 9992, 10946: 9993,
+    10952: 9993, 10954: 9992, 10976: 9993, 10978: 9992, 10984: 9992, 11074: 0,
+    11080: 9993, 11082: 0, 11112: 9992, 13349: 9993, 13381: 9993, 13409: 9993,
+    13412: 9993, 13413: 9992, 13473: 0, 13476: 0, 13477: 0, 13540: 0,
+    13573: 9993, 13601: 9993, 13636: 9993, 13637: 9992, 13664: 9993, 13665: 9992,
+    13728: -9992, 13729: -9991, 14052: 9991, 14371: 9993, 14403: 9993, 14433: 0,
+    14434: 0, 14435: 0, 14467: 9993, 14497: 9993, 14498: 9993, 14499: 9992,
+    14529: 9993, 14530: 9993, 14531: 9992, 14560: 0, 14561: 0, 14562: 0,
+    14595: 9993, 14625: 9993, 14626: 9993, 14627: 9992, 14657: 9993, 14658: 9993,
+    14659: 9992, 14688: 0, 14689: 0, 14690: 0, 14721: 9993, 14722: 9993,
+    14723: 9992, 14752: 9993, 14753: 9992, 14754: 9992, 15074: 9991, 15202: 0,
+    15266: 9991, 15585: 0, 15713: 9991, 15777: 9991, 20483: 9995, 20485: 9995,
+    20497: -9992, 20498: -9992, 20499: -9993, 20501: -9993, 20545: 9995, 20546: 9995,
+    20547: 9994, 20548: 9995, 20549: 9994, 20550: 9994, 20561: -9993, 20562: -9993,
+    20610: 9995, 20611: 9994, 20613: 9994, 21014: 9993, 21062: 9993, 21074: -9992,
+    21126: 9993, 21140: 9993, 21186: 9993, 21188: 9993, 21190: 9992, 21200: -9992,
+    21254: 9993, 21266: 9993, 21268: 9993, 21270: 9992, 21314: 9993, 21316: 9993,
+    21318: 9992, 21328: -9992, 21330: -9991, 21378: 9993, 21380: 9993, 21382: 9992,
+    21392: 9993, 21396: 9992, 21525: -9992, 21573: 9993, 21585: -9992, 21637: 9993,
+    21649: 0, 21653: -9991, 21697: 9993, 21700: 9993, 21701: 9992, 21712: -9992,
+    21713: -9991, 21825: 9993, 21829: 9992, 21840: -9992, 22420: 9991, 23378: 0,
+    34819: 9995, 34826: 9995, 34827: 9994, 34833: 9993, 34834: 0, 34835: -9993,
+    34842: -9993, 34849: 9995, 34850: 9995, 34851: 9994, 34856: 9995, 34857: 9994,
+    34858: 9994, 34865: -9993, 34866: -9993, 34977: 9994, 35073: 9995, 35075: 9994,
+    35354: -9992, 35370: 9993, 35378: 9993, 35490: 9993, 35498: 9992, 35504: 9993,
+    35594: 9993, 35602: 9993, 35610: -9991, 35618: 9993, 35624: 9993, 35626: 9992,
+    35632: 9993, 35634: 9992, 35744: 9993, 35746: 9992, 35760: 9992, 35865: -9992,
+    35881: 9993, 35889: -9992, 35977: 9993, 35985: 0, 35992: 9993, 35993: -9991,
+    36001: 9993, 36008: 9993, 36009: 9992, 36016: 9993, 36017: -9991, 36105: 9993,
+    36120: 9993, 36129: 9993, 36136: 9993, 36137: 9992, 36144: 9993, 36225: 9993,
+    36232: 9993, 36233: 9992, 36240: 9993, 36248: 9992, 36256: 9993, 36257: 9992,
+    36264: 9992, 36272: 9992, 40113: 0, 40353: 9991, 40368: 9991, 49678: 9991,
+    49686: 9993, 49690: 0, 49692: 0, 49694: 0, 49798: 9993, 49802: 9991,
+    49804: 0, 49806: 0, 49812: 9993, 49820: 0, 49926: 9993, 49932: 0,
+    49934: 0, 49940: 9993, 49942: 9992, 49948: 0, 50054: 9992, 50189: 9991,
+    50197: 0, 50201: 9991, 50204: 0, 50205: 0, 50309: 0, 50313: 9991,
+    50316: 0, 50317: 0, 50321: 0, 50325: 0, 50328: 9991, 50329: 0,
+    50332: 0, 50437: 9991, 50441: 9991, 50445: 0, 50569: 0, 50844: 0,
+    50972: 0, 51084: 0, 51092: 9991, 51096: 9991, 51994: 0, 52106: 9991,
+    52120: 9991, 52377: 9991, 52617: 9991, 54421: 0, 54661: 9991, 54676: 9991,
+    55683: 9991, 57998: 9991, 58126: 0, 58246: 9991, 58509: 0, 58637: 9991,
+    58761: 9991, 87365: 9991, 166570: 9991,
+}
@@ -1,13 +1,26 @@
 """
-user_storage.py  -  Per-user JSON files in data/users/{user_id}.json
-=====================================================================
+user_storage.py  -  Per-user documents (SQLite or data/users/{user_id}.json)
+===========================================================================
 
 HOW IT WORKS
 ------------
-Every Discord user gets their own file: data/users/123456789.json
-The file is created on their FIRST interaction (message, command, game).
-All reads/writes run in a thread pool so they never block the event loop.
-No batch queue - every save is direct and immediate for reliability.
+Every Discord user gets one JSON document, created on their FIRST
+interaction (message, command, game).  Where it is stored depends on
+USER_STORAGE_BACKEND:
+
+    sqlite (default)  row in data/database.db `user_documents`, written by the
+                      single WAL-mode writer thread in utils.database; numeric
+                      stats are mirrored into `stats` for indexed leaderboards.
+                      An existing data/users/*.json tree is imported once
+                      at startup (prepare_user_storage, before cogs load).
+    json              one file per user: data/users/123456789.json
+
+Documents live in an in-memory LRU cache (CACHE_MAX_USERS entries).
+Mutations update the cached document and mark the user dirty; a background
+flusher writes every dirty user once per FLUSH_INTERVAL seconds, so a burst
+of messages from one user costs a single atomic file write.  Dirty users are
+never evicted before they are flushed, and everything pending is written on
+shutdown (flush_all / atexit).
 
 FILE STRUCTURE
 --------------
@@ -61,10 +74,13 @@ data = await user_storage.get_user(user_id)
 """
 
 import asyncio
+import atexit
+import copy
 import json
 import os
 import sys
 import threading
+from collections import OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -80,6 +96,42 @@ TEMPLATE_FILE = DATA_DIR / "profile_template.json"
 # Ensure directory exists at import time
 USERS_DIR.mkdir(parents=True, exist_ok=True)
 
+# ---------------------------------------------------------------------------
+# Backend + write-behind cache settings
+# ---------------------------------------------------------------------------
+
+CACHE_MAX_USERS = int(os.getenv("USER_STORAGE_CACHE_SIZE", "5000"))
+FLUSH_INTERVAL  = float(os.getenv("USER_STORAGE_FLUSH_INTERVAL", "5"))
+BACKEND         = os.getenv("USER_STORAGE_BACKEND", "sqlite").lower()
+
+_db = None
+if BACKEND == "sqlite":
+    try:
+        from utils.database import db as _db
+    except Exception as e:
+        print(f"[user_storage] SQLite backend unavailable ({e}); using JSON files.", file=sys.stderr)
+        BACKEND = "json"
+
+_migrated = False
+_migrate_lock = threading.Lock()
+
+
+def _ensure_migrated() -> None:
+    """Import the legacy data/users/*.json tree into SQLite once (BLOCKING)."""
+    global _migrated
+    if _migrated or _db is None:
+        return
+    with _migrate_lock:
+        if _migrated:
+            return
+        try:
+            count = _db.migrate_json_tree(USERS_DIR)
+            if count:
+                print(f"[USER STORAGE] Imported {count} user files into SQLite.")
+        except Exception as e:
+            print(f"[user_storage] JSON -> SQLite migration failed: {e}", file=sys.stderr)
+        _migrated = True
+
 # ---------------------------------------------------------------------------
 # Per-user threading locks (prevent concurrent writes to the same file)
 # ---------------------------------------------------------------------------
@@ -95,10 +147,65 @@ def _get_lock(user_id: int) -> threading.Lock:
         return _locks[user_id]
 
 
+# ---------------------------------------------------------------------------
+# Document cache
+# ---------------------------------------------------------------------------
+
+_cache: "OrderedDict[int, dict]" = OrderedDict()   # user_id -> document, LRU order
+_dirty: set[int] = set()                           # user_ids with unflushed changes
+_flushing: dict[int, dict] = {}                    # user_id -> document a flush is writing
+_cache_lock  = threading.RLock()
+_flush_mutex = threading.Lock()                    # one flush at a time
+_flusher_task: asyncio.Task | None = None
+
+
+def _evict_locked() -> None:
+    """Drop least-recently-used clean documents. Caller holds _cache_lock.
+
+    A document a flush is still writing isn't clean yet: evicting it would make
+    the next read load the older stored row.
+    """
+    if len(_cache) <= CACHE_MAX_USERS:
+        return
+    for uid in list(_cache):
+        if len(_cache) <= CACHE_MAX_USERS:
+            break
+        if uid not in _dirty and uid not in _flushing:
+            del _cache[uid]
+
+
+def _cache_put(user_id: int, data: dict, dirty: bool) -> dict:
+    """Insert/refresh a document in the cache and return the cached instance."""
+    with _cache_lock:
+        _cache[user_id] = data
+        _cache.move_to_end(user_id)
+        if dirty:
+            _dirty.add(user_id)
+        _evict_locked()
+        return data
+
+
+def _cache_get(user_id: int) -> dict | None:
+    with _cache_lock:
+        data = _cache.get(user_id)
+        if data is None:
+            # Being written: the stored row may still be the old one
+            data = _flushing.get(user_id)
+            if data is not None:
+                _cache[user_id] = data
+        if data is not None:
+            _cache.move_to_end(user_id)
+        return data
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+_template_cache: dict | None = None
+_template_mtime: float | None = None
+
+
 def _now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -108,16 +215,23 @@ def _user_path(user_id: int) -> Path:
 
 
 def _load_template() -> dict:
-    """Load profile_template.json, return numeric-stat fields only."""
+    """Return a copy of the numeric-stat fields from profile_template.json.
+
+    The parsed template is cached and only re-read when the file changes.
+    """
+    global _template_cache, _template_mtime
     try:
         if TEMPLATE_FILE.exists():
-            raw = json.loads(TEMPLATE_FILE.read_text(encoding="utf-8"))
-            # Strip non-stat fields that don't belong in the stats sub-dict
-            for k in ("_comment", "created_at", "coins_balance", "fishing_stats",
-                      "farming_stats", "most_played_games", "most_played_with",
-                      "inventory", "badges", "user_id", "username", "meta"):
-                raw.pop(k, None)
-            return raw
+            mtime = TEMPLATE_FILE.stat().st_mtime
+            if _template_cache is None or mtime != _template_mtime:
+                raw = json.loads(TEMPLATE_FILE.read_text(encoding="utf-8"))
+                # Strip non-stat fields that don't belong in the stats sub-dict
+                for k in ("_comment", "created_at", "coins_balance", "fishing_stats",
+                          "farming_stats", "most_played_games", "most_played_with",
+                          "inventory", "badges", "user_id", "username", "meta"):
+                    raw.pop(k, None)
+                _template_cache, _template_mtime = raw, mtime
+            return copy.deepcopy(_template_cache)
     except Exception as e:
         print(f"[user_storage] template load error: {e}", file=sys.stderr)
     return {}
@@ -148,61 +262,166 @@ def _make_default(user_id: int, username: str | None) -> dict:
     }
 
 
+def _touch_meta(data: dict, username: str | None) -> None:
+    now = _now()
+    meta = data.setdefault("meta", {})
+    meta["last_active"] = now
+    meta["updated_at"]  = now
+    if username:
+        data["username"] = username
+
+
 # ---------------------------------------------------------------------------
-# Synchronous read / write  (always called via asyncio.to_thread)
+# Synchronous read / write  (disk I/O is always called via asyncio.to_thread)
 # ---------------------------------------------------------------------------
 
-def _sync_load(user_id: int, username: str | None = None) -> dict:
-    """
-    Load user document, creating the file from template if it does not exist.
-    This is a BLOCKING call - always wrap with asyncio.to_thread.
-    """
-    path = _user_path(int(user_id))
-    lock = _get_lock(int(user_id))
-
-    with lock:
-        if path.exists():
+def _read_stored(user_id: int) -> dict | None:
+    """Read a user document from the backend, back-filling new template stats. None if missing/corrupt."""
+    if _db is not None:
+        data = _db.load_document(user_id)
+        if data is None:
+            return None
+    else:
+        path = _user_path(user_id)
+        with _get_lock(user_id):
+            if not path.exists():
+                return None
             try:
                 data = json.loads(path.read_text(encoding="utf-8"))
-                # Back-fill any new stats keys that were added to the template
-                template_stats = _load_template()
-                template_stats.pop("_comment", None)
-                stats = data.setdefault("stats", {})
-                for k, v in template_stats.items():
-                    if k not in stats:
-                        stats[k] = v
-                return data
             except Exception:
-                pass  # corrupted - fall through to recreate
+                return None  # corrupted - caller recreates
+    # Back-fill any new stats keys that were added to the template
+    stats = data.setdefault("stats", {})
+    for k, v in _load_template().items():
+        if k not in stats:
+            stats[k] = v
+    return data
+
 
-        # File missing or corrupted: create it right now
-        data = _make_default(int(user_id), username)
-        _atomic_write(path, data)
+def _sync_load(user_id: int, username: str | None = None) -> dict:
+    """
+    Return the cached user document, loading (or creating) it on a cache miss.
+    A miss may touch the disk - call via asyncio.to_thread from async code.
+    The returned dict is the live cached document; persist edits with _sync_save.
+    """
+    uid = int(user_id)
+    data = _cache_get(uid)
+    if data is not None:
         return data
 
+    data = _read_stored(uid)
+    created = data is None
+    if created:
+        data = _make_default(uid, username)
+
+    with _cache_lock:
+        # Another thread may have loaded it while we were reading
+        existing = _cache_get(uid)
+        if existing is not None:
+            return existing
+        return _cache_put(uid, data, dirty=created)
 
-def _atomic_write(path: Path, data: dict) -> None:
-    """Write dict to path atomically using a .tmp file."""
+
+def _atomic_write(path: Path, data: dict | str) -> bool:
+    """Write a dict (or pre-serialised JSON) to path atomically using a .tmp file."""
     tmp = path.with_suffix(".tmp")
     path.parent.mkdir(parents=True, exist_ok=True)
     try:
-        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        text = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False, indent=2)
+        tmp.write_text(text, encoding="utf-8")
         os.replace(str(tmp), str(path))
+        return True
     except Exception as e:
         try:
             tmp.unlink(missing_ok=True)
         except Exception:
             pass
         print(f"[user_storage] write failed for {path.name}: {e}", file=sys.stderr)
+        return False
 
 
 def _sync_save(data: dict) -> None:
-    """Atomically save a user dict. BLOCKING - always wrap with asyncio.to_thread."""
+    """Store a user dict in the cache and mark it dirty; the flusher writes it."""
     user_id = int(data.get("user_id", 0))
-    path = _user_path(user_id)
-    lock = _get_lock(user_id)
-    with lock:
-        _atomic_write(path, data)
+    _cache_put(user_id, data, dirty=True)
+
+
+def flush_all() -> int:
+    """
+    Write every dirty document to the backend: one SQLite transaction for the
+    whole batch, or one atomic file write per user on the JSON backend.
+    BLOCKING - safe to call from any thread, atexit, or via asyncio.to_thread.
+    Returns the number of users written.
+
+    The batch's documents stay in _flushing (never evicted, served to reads)
+    until the write has committed or its failures are marked dirty again.
+    """
+    with _flush_mutex:
+        with _cache_lock:
+            if not _dirty:
+                return 0
+            batch, failed = [], []
+            for uid in _dirty:
+                doc = _cache.get(uid)
+                if doc is None:
+                    continue
+                _flushing[uid] = doc
+                try:
+                    if _db is not None:
+                        payload = json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+                    else:
+                        payload = json.dumps(doc, ensure_ascii=False, indent=2)
+                    batch.append((uid, payload))
+                except Exception as e:
+                    # e.g. a legacy caller mutating the live dict from another thread
+                    print(f"[user_storage] serialise failed for {uid}: {e}", file=sys.stderr)
+                    failed.append(uid)
+            _dirty.clear()
+
+        if _db is not None and batch:
+            try:
+                _ensure_migrated()
+                _db.save_documents(batch).result()
+            except Exception as e:
+                print(f"[user_storage] SQLite flush failed: {e}", file=sys.stderr)
+                failed.extend(uid for uid, _ in batch)
+        else:
+            for uid, payload in batch:
+                with _get_lock(uid):
+                    if not _atomic_write(_user_path(uid), payload):
+                        failed.append(uid)
+
+        with _cache_lock:
+            _dirty.update(failed)
+            _flushing.clear()
+            _evict_locked()
+        return len(batch) - len(failed)
+
+
+def peek_user(user_id: int) -> dict | None:
+    """Return the current document (cache first, then backend) without creating one."""
+    uid = int(user_id)
+    data = _cache_get(uid)
+    if data is not None:
+        return data
+    return _read_stored(uid)
+
+
+atexit.register(flush_all)
+
+
+async def _mutate(user_id: int, username: str | None, fn) -> None:
+    """Apply fn(data) to the cached document and mark it dirty."""
+    uid = int(user_id)
+    data = _cache_get(uid)
+    if data is None:
+        data = await asyncio.to_thread(_sync_load, uid, username)
+    with _cache_lock:
+        # Re-resolve in case the clean copy was evicted and reloaded meanwhile
+        data = _cache.get(uid, data)
+        fn(data)
+        _touch_meta(data, username)
+        _cache_put(uid, data, dirty=True)
 
 
 # ---------------------------------------------------------------------------
@@ -210,35 +429,32 @@ def _sync_save(data: dict) -> None:
 # ---------------------------------------------------------------------------
 
 async def get_user(user_id: int, username: str | None = None) -> dict:
-    """Return user data dict (creates file if missing)."""
-    return await asyncio.to_thread(_sync_load, int(user_id), username)
+    """Return a copy of the user data dict (creates the document if missing)."""
+    uid = int(user_id)
+    data = _cache_get(uid)
+    if data is None:
+        data = await asyncio.to_thread(_sync_load, uid, username)
+    with _cache_lock:
+        return copy.deepcopy(data)
 
 
 async def touch_user(user_id: int, username: str | None = None) -> None:
     """
-    Ensure user file exists and refresh last_active + messages_sent counter.
+    Ensure user document exists and refresh last_active + messages_sent counter.
     Call this on every incoming message.
     """
-    def _do():
-        data = _sync_load(int(user_id), username)
-        now = _now()
-        data["meta"]["last_active"] = now
-        data["meta"]["updated_at"]  = now
-        if username:
-            data["username"] = username
+    def _do(data):
         stats = data.setdefault("stats", {})
         stats["messages_sent"] = stats.get("messages_sent", 0) + 1
-        _sync_save(data)
 
-    await asyncio.to_thread(_do)
+    await _mutate(user_id, username, _do)
 
 
 async def record_activity(user_id: int, username: str | None,
                           activity_type: str, name: str,
                           extra: dict | None = None) -> None:
     """Record a command / interaction in the user's activity log."""
-    def _do():
-        data = _sync_load(int(user_id), username)
+    def _do(data):
         activity = data.setdefault("activity", {"counts": {}, "by_name": {}, "recent": []})
         activity["counts"][activity_type] = activity["counts"].get(activity_type, 0) + 1
         activity["by_name"][name]         = activity["by_name"].get(name, 0) + 1
@@ -251,14 +467,29 @@ async def record_activity(user_id: int, username: str | None,
             recent[:] = recent[:100]
         stats = data.setdefault("stats", {})
         stats["commands_used"] = stats.get("commands_used", 0) + 1
-        now = _now()
-        data["meta"]["last_active"] = now
-        data["meta"]["updated_at"]  = now
-        if username:
-            data["username"] = username
-        _sync_save(data)
 
-    await asyncio.to_thread(_do)
+    await _mutate(user_id, username, _do)
+
+
+# Map game_name → which stats.* fields to increment (win_field, loss_field, played_field)
+# None means no dedicated stats field for that outcome
+_GAME_STAT_MAP: dict[str, tuple] = {
+    "trivia":        ("trivia_wins",    "trivia_losses",    "trivia_played"),
+    "wordle":        ("wordle_wins",     "wordle_losses",    "wordle_played"),
+    "hangman":       ("hangman_wins",    "hangman_losses",   "hangman_played"),
+    "memory":        ("memory_wins",     "memory_losses",    None),
+    "rps":           ("rps_wins",        "rps_losses",       None),
+    "coinflip":      ("coinflip_wins",   "coinflip_losses",  None),
+    "dice":          ("dice_wins",       "dice_losses",      None),
+    "minesweeper":   ("minesweeper_wins","minesweeper_losses",None),
+    "riddle":        ("riddles_solved",  None,               "riddle_played"),
+    "quick_math":    ("math_correct",    None,               "math_played"),
+    "typing_race":   (None,              None,               "typing_games_played"),
+    "uno_gofish":    ("uno_wins",        "uno_losses",       "uno_played"),
+    "flood":         ("flood_wins",      "flood_losses",     "flood_played"),
+    "lights_out":    ("lights_out_wins", "lights_out_losses","lights_out_played"),
+    "sliding_puzzle":("sliding_wins",    "sliding_losses",   "sliding_played"),
+}
 
 
 async def record_minigame_result(user_id: int, game_name: str, result: str,
@@ -267,28 +498,7 @@ async def record_minigame_result(user_id: int, game_name: str, result: str,
     Record a minigame play.
     result: 'win' | 'loss' | 'draw'
     """
-    # Map game_name → which stats.* fields to increment (win_field, loss_field, played_field)
-    # None means no dedicated stats field for that outcome
-    _GAME_STAT_MAP: dict[str, tuple] = {
-        "trivia":        ("trivia_wins",    "trivia_losses",    "trivia_played"),
-        "wordle":        ("wordle_wins",     "wordle_losses",    "wordle_played"),
-        "hangman":       ("hangman_wins",    "hangman_losses",   "hangman_played"),
-        "memory":        ("memory_wins",     "memory_losses",    None),
-        "rps":           ("rps_wins",        "rps_losses",       None),
-        "coinflip":      ("coinflip_wins",   "coinflip_losses",  None),
-        "dice":          ("dice_wins",       "dice_losses",      None),
-        "minesweeper":   ("minesweeper_wins","minesweeper_losses",None),
-        "riddle":        ("riddles_solved",  None,               "riddle_played"),
-        "quick_math":    ("math_correct",    None,               "math_played"),
-        "typing_race":   (None,              None,               "typing_games_played"),
-        "uno_gofish":    ("uno_wins",        "uno_losses",       "uno_played"),
-        "flood":         ("flood_wins",      "flood_losses",     "flood_played"),
-        "lights_out":    ("lights_out_wins", "lights_out_losses","lights_out_played"),
-        "sliding_puzzle":("sliding_wins",    "sliding_losses",   "sliding_played"),
-    }
-
-    def _do():
-        data = _sync_load(int(user_id), username)
+    def _do(data):
         stats = data.setdefault("stats", {})
         stats["minigames_played"] = stats.get("minigames_played", 0) + 1
         if result == "win":
@@ -329,81 +539,79 @@ async def record_minigame_result(user_id: int, game_name: str, result: str,
         if len(recent) > 100:
             recent[:] = recent[:100]
 
-        now = _now()
-        data["meta"]["last_active"] = now
-        data["meta"]["updated_at"]  = now
-        if username:
-            data["username"] = username
-        _sync_save(data)
-
-    await asyncio.to_thread(_do)
+    await _mutate(user_id, username, _do)
 
 
 async def increment_stat(user_id: int, stat_name: str,
                           amount: int = 1, username: str | None = None) -> None:
     """Increment any numeric field under stats.  Safe to call from any cog."""
-    def _do():
-        data = _sync_load(int(user_id), username)
+    def _do(data):
         stats = data.setdefault("stats", {})
         stats[stat_name] = stats.get(stat_name, 0) + amount
-        now = _now()
-        data["meta"]["updated_at"]  = now
-        data["meta"]["last_active"] = now
-        if username:
-            data["username"] = username
-        _sync_save(data)
 
-    await asyncio.to_thread(_do)
+    await _mutate(user_id, username, _do)
 
 
 async def set_stat(user_id: int, stat_name: str,
                    value, username: str | None = None) -> None:
     """Set any field under stats to an explicit value."""
-    def _do():
-        data = _sync_load(int(user_id), username)
+    def _do(data):
         data.setdefault("stats", {})[stat_name] = value
-        now = _now()
-        data["meta"]["updated_at"]  = now
-        data["meta"]["last_active"] = now
-        if username:
-            data["username"] = username
-        _sync_save(data)
 
-    await asyncio.to_thread(_do)
+    await _mutate(user_id, username, _do)
 
 
 async def record_game_state(user_id: int, username: str | None,
                              game_name: str, state: dict) -> None:
     """Store a game-state snapshot for a user."""
-    def _do():
-        data = _sync_load(int(user_id), username)
+    def _do(data):
         data.setdefault("games", {})[game_name] = {
             "updated_at": _now(),
             "state": state
         }
-        now = _now()
-        data["meta"]["updated_at"]  = now
-        data["meta"]["last_active"] = now
-        if username:
-            data["username"] = username
-        _sync_save(data)
 
-    await asyncio.to_thread(_do)
+    await _mutate(user_id, username, _do)
 
 
 # ---------------------------------------------------------------------------
-# Backwards-compatibility stubs
+# Flusher lifecycle + backwards-compatibility helpers
 # (older cog code calls these - keep them so nothing crashes)
 # ---------------------------------------------------------------------------
 
+async def _flush_loop() -> None:
+    """Background flusher: coalesce all pending mutations every FLUSH_INTERVAL."""
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(flush_all)
+        except Exception as e:
+            print(f"[user_storage] flush error: {e}", file=sys.stderr)
+
+
 def init_user_storage_worker(loop=None):
-    """No-op: no batch queue needed. Kept for backwards compatibility."""
-    print("[USER STORAGE] Ready - direct async/thread writes, no queue.")
+    """Start the background write-behind flusher (idempotent)."""
+    global _flusher_task
+    if _flusher_task is not None and not _flusher_task.done():
+        return
+    try:
+        loop = loop or asyncio.get_running_loop()
+    except RuntimeError:
+        print("[USER STORAGE] No running loop - pending writes flush at exit only.")
+        return
+    _flusher_task = loop.create_task(_flush_loop())
+    print(f"[USER STORAGE] Ready - {BACKEND} backend, write-behind cache, flush every {FLUSH_INTERVAL:g}s.")
+
+
+async def prepare_user_storage():
+    """Run the one-time JSON -> SQLite import off the event loop. Await this
+    before any cog reads profiles (reads never migrate on their own)."""
+    if _db is not None:
+        await asyncio.to_thread(_ensure_migrated)
 
 
 async def flush_user_storage_queue():
-    """No-op kept for backwards compatibility."""
-    pass
+    """Flush every pending user document to disk now."""
+    await asyncio.to_thread(flush_all)
 
 
 async def enqueue_user_storage(func, *args, **kwargs):
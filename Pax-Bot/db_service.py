@@ -4,15 +4,69 @@ Provides async PostgreSQL operations for persistent data storage
 """
 
 import os
+import time
 import asyncpg
 import json
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Hashable, Tuple
 from datetime import datetime
 
+# Errors caused by the data in a row (bad type, out of range, constraint) rather than
+# the connection; sync_changed skips such rows instead of failing the guild
+_ROW_ERRORS = (asyncpg.DataError, asyncpg.IntegrityConstraintViolationError,
+               TypeError, ValueError, OverflowError)
+
+
+class ChangeTracker:
+    """Remembers the last row written per key so a sync only sends rows that differ"""
+
+    def __init__(self):
+        self.synced: Dict[Hashable, Any] = {}
+        self.rejected: Dict[Hashable, Any] = {}
+
+    def changed(self, rows: Dict[Hashable, Any]) -> Dict[Hashable, Any]:
+        """Subset of rows (key -> immutable fingerprint) not yet written as-is"""
+        synced, rejected = self.synced, self.rejected
+        return {key: row for key, row in rows.items()
+                if synced.get(key) != row and rejected.get(key) != row}
+
+    def commit(self, rows: Dict[Hashable, Any]):
+        """Record rows as written (call after the transaction committed)"""
+        self.synced.update(rows)
+        for key in rows:
+            self.rejected.pop(key, None)
+
+    def reject(self, rows: Dict[Hashable, Any]):
+        """Record rows the database refused; they are skipped until they change"""
+        self.rejected.update(rows)
+
+    def forget(self, keys=None):
+        """Drop remembered rows (all if keys is None) so they are sent again"""
+        if keys is None:
+            self.synced.clear()
+            self.rejected.clear()
+        else:
+            for key in keys:
+                self.synced.pop(key, None)
+                self.rejected.pop(key, None)
+
+
 class DatabaseService:
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
         self.database_url = os.environ.get("DATABASE_URL")
+        self.user_tracker = ChangeTracker()
+        self.garden_tracker = ChangeTracker()
+        self.sync_stats: Dict[str, Any] = {
+            "cycles": 0,
+            "failures": 0,
+            "rows_total": 0,
+            "last_users": 0,
+            "last_gardens": 0,
+            "last_plants": 0,
+            "last_duration_ms": 0.0,
+            "last_rejected": 0,
+            "last_error": None,
+        }
         
     async def connect(self):
         """Initialize database connection pool"""
@@ -29,6 +83,10 @@ class DatabaseService:
         # Initialize schema
         await self.init_schema()
         
+        # A new pool may point at another database - resend everything once
+        self.user_tracker.forget()
+        self.garden_tracker.forget()
+        
     async def disconnect(self):
         """Close database connection pool"""
         if self.pool:
@@ -493,6 +551,204 @@ class DatabaseService:
             
             return int(result.split()[-1])
     
+    # ============================================
+    # BULK SYNC OPERATIONS (change-tracked)
+    # ============================================
+    
+    @staticmethod
+    def _text_array(values) -> Tuple[str, ...]:
+        return tuple(str(v) for v in (values or []))
+    
+    def _user_row(self, user_id: int, user_data: Dict[str, Any], guild_id: int) -> tuple:
+        """Row as stored in users (also used as the change-tracking fingerprint)"""
+        return (
+            user_id,
+            self._normalize_guild_id(user_id, guild_id),
+            user_data.get("chi", 0),
+            user_data.get("rebirths", 0),
+            self._text_array(user_data.get("milestones_claimed")),
+            self._text_array(user_data.get("mini_quests")),
+            user_data.get("active_pet"),
+        )
+    
+    def _garden_row(self, user_id: int, garden: Dict[str, Any], guild_id: int) -> tuple:
+        """(user_id, guild_id, tier, level, ((plant_name, planted_at), ...)) as stored in gardens/garden_plants"""
+        plants = []
+        for plant in garden.get("plants") or []:
+            if isinstance(plant, dict) and ("name" in plant or "seed" in plant):
+                plant_name = plant.get("name") or plant.get("seed")
+                planted_at = plant.get("planted_at", plant.get("mature_at", 0))
+                if plant_name and planted_at:
+                    try:
+                        plants.append((plant_name, float(planted_at)))
+                    except (TypeError, ValueError):
+                        continue
+        return (
+            user_id,
+            self._normalize_guild_id(user_id, guild_id),
+            garden.get("tier", "rare"),
+            garden.get("level", 1),
+            tuple(plants),
+        )
+    
+    async def bulk_upsert_users(self, conn, rows: List[tuple]) -> int:
+        """COPY user rows into a temp table and merge them into users with one statement"""
+        if not rows:
+            return 0
+        await conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS _sync_users (
+                user_id BIGINT, guild_id BIGINT, chi INTEGER, rebirths INTEGER,
+                milestones_claimed TEXT[], mini_quests TEXT[], active_pet TEXT
+            ) ON COMMIT DELETE ROWS
+        """)
+        await conn.copy_records_to_table(
+            "_sync_users",
+            records=[(r[0], r[1], r[2], r[3], list(r[4]), list(r[5]), r[6]) for r in rows],
+        )
+        await conn.execute("""
+            INSERT INTO users (user_id, guild_id, chi, rebirths, milestones_claimed, mini_quests, active_pet, updated_at)
+            SELECT user_id, guild_id, chi, rebirths, milestones_claimed, mini_quests, active_pet, NOW()
+            FROM _sync_users
+            ON CONFLICT (guild_id, user_id) DO UPDATE SET
+                chi = EXCLUDED.chi,
+                rebirths = EXCLUDED.rebirths,
+                milestones_claimed = EXCLUDED.milestones_claimed,
+                mini_quests = EXCLUDED.mini_quests,
+                active_pet = EXCLUDED.active_pet,
+                updated_at = NOW()
+        """)
+        return len(rows)
+    
+    async def bulk_upsert_gardens(self, conn, rows: List[tuple]) -> int:
+        """Merge garden rows and replace their unharvested plants; returns plants written"""
+        if not rows:
+            return 0
+        await conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS _sync_gardens (
+                user_id BIGINT, guild_id BIGINT, tier TEXT, level INTEGER
+            ) ON COMMIT DELETE ROWS
+        """)
+        await conn.copy_records_to_table("_sync_gardens", records=[r[:4] for r in rows])
+        
+        # Ensure users exist, then upsert gardens
+        await conn.execute("""
+            INSERT INTO users (user_id, guild_id)
+            SELECT user_id, guild_id FROM _sync_gardens
+            ON CONFLICT (guild_id, user_id) DO NOTHING
+        """)
+        await conn.execute("""
+            INSERT INTO gardens (user_id, guild_id, tier, level)
+            SELECT user_id, guild_id, tier, level FROM _sync_gardens
+            ON CONFLICT (guild_id, user_id) DO UPDATE SET
+                tier = EXCLUDED.tier,
+                level = EXCLUDED.level,
+                updated_at = NOW()
+        """)
+        
+        # Clear existing plants and re-add them
+        await conn.execute("""
+            DELETE FROM garden_plants gp
+            USING _sync_gardens s
+            WHERE gp.user_id = s.user_id AND gp.guild_id = s.guild_id AND gp.harvested = FALSE
+        """)
+        plants = [
+            (r[0], r[1], plant_name, datetime.fromtimestamp(planted_at))
+            for r in rows
+            for plant_name, planted_at in r[4]
+        ]
+        if plants:
+            await conn.copy_records_to_table(
+                "garden_plants",
+                records=plants,
+                columns=["user_id", "guild_id", "plant_name", "planted_at"],
+            )
+        return len(plants)
+    
+    async def sync_changed(self, users: Dict[str, Dict[str, Any]], gardens: Dict[str, Dict[str, Any]],
+                           *, guild_id: int) -> Dict[str, Any]:
+        """Write users/gardens modified since the last successful sync in one transaction.
+        
+        users/gardens are the in-memory maps (user id string -> data).  Rows
+        are compared with what the last committed sync wrote, so unchanged
+        users cost no database traffic.  If the transaction fails the rows are
+        retried one at a time, and rows the database refuses (e.g. a chi out of
+        INTEGER range) are skipped until they change, so one bad record doesn't
+        block the guild.  Returns this cycle's stats.
+        """
+        start = time.perf_counter()
+        stats = self.sync_stats
+        stats["cycles"] += 1
+        
+        user_rows = {}
+        for user_id_str, user_data in list(users.items()):
+            try:
+                row = self._user_row(int(user_id_str), user_data, guild_id)
+            except (TypeError, ValueError):
+                continue
+            user_rows[(row[1], row[0])] = row
+        garden_rows = {}
+        for user_id_str, garden in list(gardens.items()):
+            try:
+                row = self._garden_row(int(user_id_str), garden, guild_id)
+            except (TypeError, ValueError):
+                continue
+            garden_rows[(row[1], row[0])] = row
+        
+        changed_users = self.user_tracker.changed(user_rows)
+        changed_gardens = self.garden_tracker.changed(garden_rows)
+        
+        plants = 0
+        rejected = 0
+        last_error = None
+        try:
+            if changed_users or changed_gardens:
+                async with self.pool.acquire() as conn:
+                    async with conn.transaction():
+                        await self.bulk_upsert_users(conn, list(changed_users.values()))
+                        plants = await self.bulk_upsert_gardens(conn, list(changed_gardens.values()))
+        except _ROW_ERRORS as e:
+            stats["failures"] += 1
+            last_error = str(e)
+            print(f"⚠️ Bulk sync for guild {guild_id} failed ({e}), retrying row by row")
+            changed_users, bad_users = await self._upsert_each(self.bulk_upsert_users, changed_users)
+            changed_gardens, bad_gardens = await self._upsert_each(self.bulk_upsert_gardens, changed_gardens)
+            plants = sum(len(row[4]) for row in changed_gardens.values())
+            self.user_tracker.reject(bad_users)
+            self.garden_tracker.reject(bad_gardens)
+            rejected = len(bad_users) + len(bad_gardens)
+        except Exception as e:
+            stats["failures"] += 1
+            stats["last_error"] = str(e)
+            raise
+        
+        # Only remember rows once the transaction has committed
+        self.user_tracker.commit(changed_users)
+        self.garden_tracker.commit(changed_gardens)
+        
+        stats["last_users"] = len(changed_users)
+        stats["last_gardens"] = len(changed_gardens)
+        stats["last_plants"] = plants
+        stats["last_rejected"] = rejected
+        stats["rows_total"] += len(changed_users) + len(changed_gardens)
+        stats["last_duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        stats["last_error"] = last_error
+        return stats
+    
+    async def _upsert_each(self, upsert, rows: Dict[Hashable, tuple]) -> Tuple[Dict[Hashable, tuple], Dict[Hashable, tuple]]:
+        """Write rows one transaction each; returns (written, refused) by key"""
+        written, refused = {}, {}
+        async with self.pool.acquire() as conn:
+            for key, row in rows.items():
+                try:
+                    async with conn.transaction():
+                        await upsert(conn, [row])
+                except _ROW_ERRORS as e:
+                    print(f"⚠️ Skipping row {key} in sync: {e}")
+                    refused[key] = row
+                else:
+                    written[key] = row
+        return written, refused
+    
     # ============================================
     # COMPREHENSIVE DATA SAVE OPERATIONS (DEPRECATED - Use guild-aware methods)
     # ============================================
@@ -0,0 +1,173 @@
+"""
+Database Sync Check
+Runs the change-tracked bulk sync (DatabaseService.sync_changed) against a local
+PostgreSQL and compares it with the old one-upsert-per-user loop.
+
+Usage (uses a throwaway schema, drops it afterwards):
+    DATABASE_URL=postgresql://localhost/pax_test python db_sync_check.py [users]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+import asyncpg
+
+from db_service import DatabaseService
+
+SCHEMA = "pax_sync_check"
+
+TABLES_SQL = f"""
+CREATE SCHEMA {SCHEMA};
+SET search_path TO {SCHEMA};
+CREATE TABLE users (
+    user_id BIGINT NOT NULL,
+    guild_id BIGINT NOT NULL DEFAULT 0,
+    chi INTEGER DEFAULT 0,
+    rebirths INTEGER DEFAULT 0,
+    milestones_claimed TEXT[] DEFAULT '{{}}',
+    mini_quests TEXT[] DEFAULT '{{}}',
+    active_pet TEXT DEFAULT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    UNIQUE (guild_id, user_id)
+);
+CREATE TABLE gardens (
+    user_id BIGINT NOT NULL,
+    guild_id BIGINT NOT NULL,
+    tier TEXT NOT NULL,
+    level INTEGER DEFAULT 1,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    UNIQUE (guild_id, user_id)
+);
+CREATE TABLE garden_plants (
+    id SERIAL PRIMARY KEY,
+    user_id BIGINT NOT NULL,
+    guild_id BIGINT NOT NULL,
+    plant_name TEXT NOT NULL,
+    planted_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    harvested BOOLEAN DEFAULT FALSE
+);
+"""
+
+GUILD_ID = 1234
+
+
+def make_data(count, rng):
+    chi_data, gardens = {}, {}
+    for i in range(count):
+        user_id = str(10_000 + i)
+        chi_data[user_id] = {
+            "chi": rng.randint(-50, 5000),
+            "rebirths": rng.randint(0, 3),
+            "milestones_claimed": [str(m) for m in range(rng.randint(0, 4))],
+            "mini_quests": [],
+            "active_pet": rng.choice([None, "panda", "tiger"]),
+        }
+        if rng.random() < 0.3:
+            gardens[user_id] = {
+                "tier": rng.choice(["rare", "epic"]),
+                "level": rng.randint(1, 5),
+                "plants": [{"name": "bamboo", "planted_at": time.time() - rng.randint(0, 9000)}
+                           for _ in range(rng.randint(0, 3))],
+            }
+    return chi_data, gardens
+
+
+async def check_database(conn, chi_data, gardens):
+    rows = await conn.fetch("SELECT user_id, chi, rebirths FROM users WHERE guild_id = $1", GUILD_ID)
+    stored = {str(r["user_id"]): (r["chi"], r["rebirths"]) for r in rows}
+    expected = {k: (v["chi"], v["rebirths"]) for k, v in chi_data.items()}
+    plants = await conn.fetchval("SELECT COUNT(*) FROM garden_plants WHERE harvested = FALSE")
+    expected_plants = sum(len(g["plants"]) for g in gardens.values())
+    return stored == expected and plants == expected_plants
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    url = os.environ.get("DATABASE_URL")
+    if not url:
+        print("Set DATABASE_URL to a local test database")
+        return 2
+
+    rng = random.Random(17)
+    chi_data, gardens = make_data(count, rng)
+
+    try:
+        admin = await asyncpg.connect(url)
+    except (OSError, asyncpg.PostgresError) as e:
+        print(f"Could not connect to {url}: {e}")
+        return 2
+    await admin.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await admin.execute(TABLES_SQL)
+    service = DatabaseService()
+    service.pool = await asyncpg.create_pool(url, min_size=1, max_size=4,
+                                             server_settings={"search_path": SCHEMA})
+    failures = 0
+    try:
+        # Old path: one pool.acquire() + upsert round trip per user
+        start = time.perf_counter()
+        for user_id_str, user in chi_data.items():
+            await service.create_or_update_user(
+                int(user_id_str), guild_id=GUILD_ID, chi=user["chi"], rebirths=user["rebirths"],
+                milestones_claimed=user["milestones_claimed"], mini_quests=user["mini_quests"],
+                active_pet=user["active_pet"],
+            )
+        legacy_ms = (time.perf_counter() - start) * 1000
+        print(f"Per-user upserts:     {count} users in {legacy_ms:8.0f} ms")
+        await admin.execute(f"TRUNCATE {SCHEMA}.users, {SCHEMA}.gardens, {SCHEMA}.garden_plants")
+
+        # First cycle sends everything
+        stats = dict(await service.sync_changed(chi_data, gardens, guild_id=GUILD_ID))
+        print(f"Bulk sync (initial):  {stats['last_users']} users, {stats['last_gardens']} gardens, "
+              f"{stats['last_plants']} plants in {stats['last_duration_ms']:8.0f} ms")
+
+        # Nothing changed: nothing sent
+        stats = dict(await service.sync_changed(chi_data, gardens, guild_id=GUILD_ID))
+        print(f"Bulk sync (idle):     {stats['last_users']} users, {stats['last_gardens']} gardens "
+              f"in {stats['last_duration_ms']:8.1f} ms")
+        failures += stats["last_users"] != 0 or stats["last_gardens"] != 0
+
+        # Touch 1% of users (in-place, like the bot does) and a few gardens
+        touched = rng.sample(sorted(chi_data), max(1, count // 100))
+        for user_id in touched:
+            chi_data[user_id]["chi"] += 7
+            chi_data[user_id]["milestones_claimed"].append("new")
+        for user_id in list(gardens)[:10]:
+            gardens[user_id]["plants"].append({"name": "lotus", "planted_at": time.time()})
+        stats = dict(await service.sync_changed(chi_data, gardens, guild_id=GUILD_ID))
+        print(f"Bulk sync (1% dirty): {stats['last_users']} users, {stats['last_gardens']} gardens "
+              f"in {stats['last_duration_ms']:8.1f} ms")
+        failures += stats["last_users"] != len(touched) or stats["last_gardens"] != min(10, len(gardens))
+
+        async with service.pool.acquire() as conn:
+            consistent = await check_database(conn, chi_data, gardens)
+        print(f"Database matches memory: {'yes' if consistent else 'NO'}")
+        failures += not consistent
+
+        # A chi outside INTEGER range fails the bulk transaction: the other rows
+        # still go through one by one and the bad row is skipped until it changes
+        bad, good = touched[0], touched[-1]
+        chi_data[bad]["chi"] = 2 ** 40
+        chi_data[good]["chi"] += 1
+        stats = dict(await service.sync_changed(chi_data, gardens, guild_id=GUILD_ID))
+        print(f"Bulk sync (bad row):  {stats['last_users']} users, {stats['last_rejected']} rejected "
+              f"in {stats['last_duration_ms']:8.1f} ms")
+        failures += stats["last_users"] != 1 or stats["last_rejected"] != 1
+        stats = dict(await service.sync_changed(chi_data, gardens, guild_id=GUILD_ID))
+        failures += stats["last_users"] != 0 or stats["last_rejected"] != 0
+        async with service.pool.acquire() as conn:
+            stored = await conn.fetchval("SELECT chi FROM users WHERE guild_id = $1 AND user_id = $2",
+                                         GUILD_ID, int(good))
+        print(f"Good row written past the bad one: {'yes' if stored == chi_data[good]['chi'] else 'NO'}")
+        failures += stored != chi_data[good]["chi"]
+    finally:
+        await service.pool.close()
+        await admin.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await admin.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
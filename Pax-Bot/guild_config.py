@@ -0,0 +1,250 @@
+"""
+Process-wide cache of per-guild server configuration
+Loads server_config.json once, serves reads from memory and writes through on updates
+"""
+
+import copy
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_MISSING = object()
+
+DEFAULT_GUILD_CONFIG = {
+    "channels": {
+        "log_channel_id": None,
+        "garden_channels": [],
+        "duel_channels": [],
+        "pet_channels": [],
+        "updates_channel_id": None,
+    },
+    "roles": {
+        "admin_role_id": None,
+        "quest_completer_role_id": None,
+        "positive_role_id": None,
+        "negative_role_id": None,
+    },
+    "features": {"setup_complete": False},
+}
+
+
+class GuildConfigCache:
+    """In-memory guild configs with precompiled dot-path lookups.
+
+    Reads never touch the disk: get() returns the cached guild dict and
+    value() answers ``"channels.log_channel_id"``-style paths from a per
+    (guild, path) memo, so a lookup in the message path is one dict get.
+    The memo of a guild is dropped whenever that guild's config changes.
+
+    update()/remove() write the whole file through immediately (temp file
+    + os.replace) and notify listeners with ``callback(guild_id_str, config)``
+    (config is None after remove).  Guilds without a stored config get the
+    defaults in memory only; they are written on their first update.
+
+    If the file is edited by hand while the bot runs, check_for_changes()
+    (polled by the bot when watching is enabled) notices the new mtime,
+    reloads and notifies listeners for every guild that changed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.configs: Dict[str, Any] = {"guilds": {}}
+        self._paths: Dict[str, Tuple[str, ...]] = {}
+        self._values: Dict[Tuple[str, str], Any] = {}
+        self._listeners: List[Callable[[str, Optional[Dict[str, Any]]], None]] = []
+        self._signature: Optional[Tuple[int, int]] = None
+        self.loaded = False
+
+        # Stats
+        self.reads = 0
+        self.memo_hits = 0
+        self.writes = 0
+        self.reloads = 0
+
+    # ============================================
+    # LOADING / SAVING
+    # ============================================
+
+    def load(self) -> Dict[str, Any]:
+        """(Re)load the file into memory, migrating the old single-guild format"""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            signature = self._file_signature()
+        except FileNotFoundError:
+            data, signature = {"guilds": {}}, None
+
+        migrated = False
+        if "guilds" not in data:
+            # Legacy format - migrate that guild's config if it had one
+            if data.get("guild_id") is not None:
+                data = {
+                    "guilds": {
+                        str(data["guild_id"]): {
+                            "channels": data.get("channels", {}),
+                            "roles": data.get("roles", {}),
+                            "features": data.get("features", {}),
+                        }
+                    }
+                }
+                migrated = True
+            else:
+                data = {"guilds": {}}
+
+        self.configs = data
+        self._values.clear()
+        self._signature = signature
+        self.loaded = True
+        if migrated:
+            self.save()
+        return self.configs
+
+    def ensure_loaded(self) -> Dict[str, Any]:
+        """Load the file on first use; afterwards just return the cached configs"""
+        if not self.loaded:
+            self.load()
+        return self.configs
+
+    def save(self):
+        """Write the full config file atomically"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.configs, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self._signature = self._file_signature()
+        self.writes += 1
+
+    def _file_signature(self) -> Tuple[int, int]:
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def replace(self, configs: Dict[str, Any]):
+        """Swap in a whole new config mapping (legacy save_server_configs path)"""
+        # The caller may have edited the cached mapping in place - then every guild may have changed
+        old = {} if configs is self.configs else self.configs.get("guilds", {})
+        self.configs = configs
+        self._values.clear()
+        self.save()
+        self._notify_changed(old, configs.get("guilds", {}))
+
+    # ============================================
+    # READS
+    # ============================================
+
+    def get(self, guild_id) -> Dict[str, Any]:
+        """Config dict for a guild (defaults if the guild has none stored yet)"""
+        self.ensure_loaded()
+        guild_id_str = str(guild_id)
+        guilds = self.configs["guilds"]
+        config = guilds.get(guild_id_str)
+        if config is None:
+            config = guilds[guild_id_str] = copy.deepcopy(DEFAULT_GUILD_CONFIG)
+        return config
+
+    def compile_path(self, path: str) -> Tuple[str, ...]:
+        keys = self._paths.get(path)
+        if keys is None:
+            keys = self._paths[path] = tuple(path.split("."))
+        return keys
+
+    def value(self, guild_id, path: str, default=None):
+        """Config value by dot path (e.g. 'channels.log_channel_id'); None counts as unset"""
+        self.reads += 1
+        memo_key = (str(guild_id), path)
+        value = self._values.get(memo_key, _MISSING)
+        if value is not _MISSING:
+            self.memo_hits += 1
+        else:
+            value = self.get(guild_id)
+            for key in self.compile_path(path):
+                if isinstance(value, dict) and key in value:
+                    value = value[key]
+                else:
+                    value = None
+                    break
+            self._values[memo_key] = value
+        return value if value is not None else default
+
+    # ============================================
+    # WRITES
+    # ============================================
+
+    def update(self, guild_id, updates: Dict[str, Any]) -> Dict[str, Any]:
+        """Deep-merge updates into a guild's config, save and notify"""
+        guild_id_str = str(guild_id)
+        config = self.get(guild_id_str)
+        for key, value in updates.items():
+            if isinstance(value, dict) and isinstance(config.get(key), dict):
+                config[key].update(value)
+            else:
+                config[key] = value
+        self._invalidate(guild_id_str)
+        self.save()
+        self._notify(guild_id_str, config)
+        return config
+
+    def remove(self, guild_id) -> bool:
+        """Forget a guild's config (bot left the guild)"""
+        self.ensure_loaded()
+        guild_id_str = str(guild_id)
+        if self.configs["guilds"].pop(guild_id_str, None) is None:
+            return False
+        self._invalidate(guild_id_str)
+        self.save()
+        self._notify(guild_id_str, None)
+        return True
+
+    def _invalidate(self, guild_id_str: str):
+        for memo_key in [k for k in self._values if k[0] == guild_id_str]:
+            del self._values[memo_key]
+
+    # ============================================
+    # CHANGE NOTIFICATIONS / WATCHING
+    # ============================================
+
+    def add_listener(self, callback: Callable[[str, Optional[Dict[str, Any]]], None]):
+        """Call callback(guild_id_str, config_or_None) after every change"""
+        self._listeners.append(callback)
+
+    def _notify(self, guild_id_str: str, config: Optional[Dict[str, Any]]):
+        for callback in self._listeners:
+            try:
+                callback(guild_id_str, config)
+            except Exception as e:
+                print(f"⚠️ Guild config listener failed: {e}")
+
+    def _notify_changed(self, old: Dict[str, Any], new: Dict[str, Any]):
+        if not self._listeners:
+            return
+        for guild_id_str in set(old) | set(new):
+            if old.get(guild_id_str) != new.get(guild_id_str):
+                self._notify(guild_id_str, new.get(guild_id_str))
+
+    def check_for_changes(self) -> bool:
+        """Reload if the file was modified outside the bot; True if it was"""
+        try:
+            signature = self._file_signature()
+        except FileNotFoundError:
+            return False
+        if signature == self._signature:
+            return False
+        # load() builds a new mapping, so the old one stays intact for the diff
+        old = self.configs.get("guilds", {})
+        try:
+            self.load()
+        except (json.JSONDecodeError, OSError) as e:
+            # Half-written by an editor - keep the cached config and try again later
+            print(f"⚠️ Could not reload {self.path}: {e}")
+            return False
+        self.reloads += 1
+        self._notify_changed(old, self.configs.get("guilds", {}))
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "guilds": len(self.configs.get("guilds", {})),
+            "reads": self.reads,
+            "memo_hits": self.memo_hits,
+            "writes": self.writes,
+            "reloads": self.reloads,
+        }
@@ -0,0 +1,197 @@
+"""
+Per-guild runtime state for the bot
+Keeps duels, trainings, boss battles and chi events per guild instead of in module globals
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Set
+
+# Guild id used for commands run outside a guild (DMs)
+NO_GUILD = 0
+
+
+class GuildState:
+    """Everything a guild can have going on at once.
+
+    Each guild gets its own duel, training, boss battle and chi event, so
+    activity in one server never blocks or overwrites another.
+    """
+
+    __slots__ = (
+        "guild_id",
+        "duel",
+        "training",
+        "npc_training",
+        "boss_battle",
+        "team_duel",
+        "team_boss_battle",
+        "event_active",
+        "event_claimer",
+        "event_message",
+        "event_type",
+        "next_event_time",
+        "event_task",
+        "last_active",
+    )
+
+    def __init__(self, guild_id: int):
+        self.guild_id = guild_id
+        self.duel: Optional[Dict[str, Any]] = None
+        self.training: Optional[Dict[str, Any]] = None
+        self.npc_training: Optional[Dict[str, Any]] = None
+        self.boss_battle: Optional[Dict[str, Any]] = None
+        self.team_duel: Optional[Dict[str, Any]] = None
+        self.team_boss_battle: Optional[Dict[str, Any]] = None
+
+        # Chi event scheduler
+        self.event_active = False
+        self.event_claimer = None
+        self.event_message = None
+        self.event_type = "positive"
+        self.next_event_time = None
+        self.event_task: Optional[asyncio.Task] = None
+
+        self.last_active = time.monotonic()
+
+    def is_busy(self) -> bool:
+        """Whether anything is in progress that must not be dropped"""
+        return bool(
+            self.duel
+            or self.training
+            or self.npc_training
+            or self.boss_battle
+            or self.team_duel
+            or self.team_boss_battle
+            or self.event_active
+            or (self.event_task is not None and not self.event_task.done())
+        )
+
+
+class GuildStateStore:
+    """GuildState objects keyed by guild id, created on first activity.
+
+    Memory grows with the guilds that are actually active: evict_idle()
+    drops states that have been idle for a while and have nothing in
+    progress (their data stays in the JSON files / database).
+
+    Guild data is loaded from the database the first time a guild is
+    active (ensure_loaded), not for every guild at startup.  The store
+    also remembers which guild each user was last active in, so writes
+    for that user go to the right guild's rows.
+    """
+
+    def __init__(self):
+        self.states: Dict[int, GuildState] = {}
+        self.loaded_guilds: Set[int] = set()
+        self.user_guilds: Dict[str, int] = {}
+        self._load_locks: Dict[int, asyncio.Lock] = {}
+        self.loads = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(guild) -> int:
+        if guild is None:
+            return NO_GUILD
+        return int(getattr(guild, "id", guild))
+
+    def get(self, guild) -> GuildState:
+        """State for a guild (object or id; None means DMs), created if needed"""
+        key = self._key(guild)
+        state = self.states.get(key)
+        if state is None:
+            state = self.states[key] = GuildState(key)
+        state.last_active = time.monotonic()
+        return state
+
+    def peek(self, guild) -> Optional[GuildState]:
+        """State for a guild if it exists, without creating or touching it"""
+        return self.states.get(self._key(guild))
+
+    def __iter__(self) -> Iterator[GuildState]:
+        return iter(list(self.states.values()))
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def find(self, predicate: Callable[[GuildState], bool]) -> Optional[GuildState]:
+        for state in self.states.values():
+            if predicate(state):
+                return state
+        return None
+
+    async def ensure_loaded(self, guild, loader: Callable[[int], Awaitable[bool]]) -> GuildState:
+        """Run loader(guild_id) once per guild per process, on first activity.
+
+        Concurrent callers wait for the same load; a failed load (loader
+        returns False or raises) is retried on the next activity.  Evicting
+        a state doesn't reload it - the in-memory data is newer than the database.
+        """
+        state = self.get(guild)
+        key = state.guild_id
+        if key in self.loaded_guilds or key == NO_GUILD:
+            return state
+        lock = self._load_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if key not in self.loaded_guilds:
+                self.loads += 1
+                try:
+                    if await loader(key):
+                        self.loaded_guilds.add(key)
+                except Exception as e:
+                    print(f"⚠️ Failed to load data for guild {key}: {e}")
+        return state
+
+    def is_loaded(self, guild) -> bool:
+        return self._key(guild) in self.loaded_guilds
+
+    # ============================================
+    # USER -> GUILD
+    # ============================================
+
+    def note_user(self, guild, user_id):
+        """Remember the guild a user was last active in"""
+        key = self._key(guild)
+        if key != NO_GUILD:
+            self.user_guilds[str(user_id)] = key
+
+    def home_guild(self, user_id, default: Optional[int] = None) -> Optional[int]:
+        """Guild whose database rows hold this user's data"""
+        return self.user_guilds.get(str(user_id), default)
+
+    def evict_idle(self, max_idle: float) -> int:
+        """Forget states idle for max_idle seconds with nothing in progress"""
+        cutoff = time.monotonic() - max_idle
+        evicted = 0
+        for key, state in list(self.states.items()):
+            if state.last_active < cutoff and not state.is_busy():
+                del self.states[key]
+                evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    def remove(self, guild) -> List[str]:
+        """Drop a guild's state (bot left the guild); returns the users homed there"""
+        key = self._key(guild)
+        self.loaded_guilds.discard(key)
+        state = self.states.pop(key, None)
+        if state is not None and state.event_task is not None:
+            state.event_task.cancel()
+        users = [user_id for user_id, guild_id in self.user_guilds.items() if guild_id == key]
+        for user_id in users:
+            del self.user_guilds[user_id]
+        return users
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "guilds": len(self.states),
+            "busy": sum(1 for s in self.states.values() if s.is_busy()),
+            "loaded": len(self.loaded_guilds),
+            "users": len(self.user_guilds),
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
+
+
+# Global guild state store
+guild_states = GuildStateStore()
@@ -2,7 +2,6 @@
 import discord
 from discord.ext import commands, tasks
 import json
-import re
 import os
 import random
 import asyncio
@@ -10,6 +9,10 @@ from datetime import datetime, timedelta, timezone
 import time
 from deep_translator import GoogleTranslator
 from db_service import db
+from persistence import persistence
+from guild_config import GuildConfigCache
+from word_matcher import WordMatcher
+from guild_state import guild_states
 from interaction_views import (
     DuelView,
     GardenView,
@@ -78,105 +81,39 @@ except Exception:
 
 
 # Server Configuration System (Multi-Guild)
+# Configs live in memory (guild_config.GuildConfigCache); the file is read once
+# and written through on updates.
+guild_configs = GuildConfigCache(SERVER_CONFIG_FILE)
+CONFIG_WATCH_ENABLED = os.getenv("PAX_CONFIG_WATCH", "1") != "0"
+
+
 def load_server_configs():
-    """Load all server configurations from file"""
-    try:
-        with open(SERVER_CONFIG_FILE, "r") as f:
-            data = json.load(f)
-
-            # Migrate old single-guild format to multi-guild
-            if "guilds" not in data:
-                # Legacy format - migrate to new format
-                if "guild_id" in data and data["guild_id"] is not None:
-                    # Has a guild_id, migrate that guild's config
-                    guild_id_str = str(data["guild_id"])
-                    migrated = {
-                        "guilds": {
-                            guild_id_str: {
-                                "channels": data.get("channels", {}),
-                                "roles": data.get("roles", {}),
-                                "features": data.get("features", {}),
-                            }
-                        }
-                    }
-                    save_server_configs(migrated)
-                    return migrated
-                else:
-                    # No guild_id, start fresh
-                    return {"guilds": {}}
-            return data
-    except FileNotFoundError:
-        return {"guilds": {}}
+    """Return all server configurations (cached; loaded from file on first use)"""
+    return guild_configs.ensure_loaded()
 
 
 def save_server_configs(configs):
-    """Save all server configurations to file"""
-    with open(SERVER_CONFIG_FILE, "w") as f:
-        json.dump(configs, f, indent=2)
+    """Replace and save all server configurations"""
+    guild_configs.replace(configs)
 
 
 def get_guild_config(guild_id):
     """Get configuration for a specific guild"""
-    configs = load_server_configs()
-    guild_id_str = str(guild_id)
-
-    if guild_id_str not in configs["guilds"]:
-        # Create default config for this guild
-        configs["guilds"][guild_id_str] = {
-            "channels": {
-                "log_channel_id": None,
-                "garden_channels": [],
-                "duel_channels": [],
-                "pet_channels": [],
-                "updates_channel_id": None,
-            },
-            "roles": {
-                "admin_role_id": None,
-                "quest_completer_role_id": None,
-                "positive_role_id": None,
-                "negative_role_id": None,
-            },
-            "features": {"setup_complete": False},
-        }
-        save_server_configs(configs)
-
-    return configs["guilds"][guild_id_str]
+    return guild_configs.get(guild_id)
 
 
 def update_guild_config(guild_id, updates):
     """Update configuration for a specific guild"""
-    configs = load_server_configs()
-    guild_id_str = str(guild_id)
-
-    if guild_id_str not in configs["guilds"]:
-        configs["guilds"][guild_id_str] = get_guild_config(guild_id)
-
-    # Deep merge updates
-    for key, value in updates.items():
-        if isinstance(value, dict) and key in configs["guilds"][guild_id_str]:
-            configs["guilds"][guild_id_str][key].update(value)
-        else:
-            configs["guilds"][guild_id_str][key] = value
-
-    save_server_configs(configs)
-    return configs["guilds"][guild_id_str]
+    return guild_configs.update(guild_id, updates)
 
 
 def get_config_value(guild_id, path, default=None):
     """Get a config value for a guild using dot notation (e.g., 'channels.log_channel_id')"""
-    config = get_guild_config(guild_id)
-    keys = path.split(".")
-    value = config
-    for key in keys:
-        if isinstance(value, dict) and key in value:
-            value = value[key]
-        else:
-            return default
-    return value if value is not None else default
+    return guild_configs.value(guild_id, path, default)
 
 
 # Load configs on startup
-server_configs = load_server_configs()
+guild_configs.load()
 
 # Error logging system
 error_logs = []
@@ -1872,16 +1809,11 @@ FEED_COOLDOWN = 60
 ADMIN_BYPASS_COMMANDS = ["stop", "start", "blacklist"]
 COOLDOWN_COMMANDS = ["claim", "buy", "rebirth", "feed"]
 pax_active = True
-event_active = False
-event_claimer = None
-current_event_message = None
-active_duel = None
-active_training = None
-active_npc_training = None  # Format: {"player_id": int, "npc_key": str, "npc_hp": int, "player_hp": int, "player_max_hp": int, "turn": str, "channel_id": int, "guild_id": int, "start_time": datetime}
+# Duels, trainings, NPC training, boss battles and chi events are per guild: guild_states.get(guild)
+# gs.npc_training format: {"player_id": int, "npc_key": str, "npc_hp": int, "player_hp": int, "player_max_hp": int, "turn": str, "channel_id": int, "guild_id": int, "start_time": datetime}
+# gs.boss_battle format: {"player_id": int, "boss_key": str, "boss_hp": int, "player_hp": int, "player_max_hp": int, "turn": int, "burn_turns": 0, "channel_id": int, "guild_id": int, "start_time": datetime}
+GUILD_STATE_IDLE_SECONDS = 24 * 60 * 60
 active_team_event = None  # Format: {"name": str, "registered_teams": [team_ids]}
-active_boss_battle = None  # Format: {"player_id": int, "boss_key": str, "boss_hp": int, "player_hp": int, "player_max_hp": int, "turn": int, "burn_turns": 0, "channel_id": int, "guild_id": int, "start_time": datetime}
-current_event_type = "positive"
-next_event_time = None
 chi_party_messages = []
 chi_party_active = False
 chi_party_tokens = []
@@ -2186,10 +2118,6 @@ def load_chi_data():
     except FileNotFoundError:
         return {}
 
-def save_chi_data():
-    with open(DATA_FILE, "w") as f:
-        json.dump(chi_data, f, indent=4)
-
 # Load chi_data on startup
 chi_data = load_chi_data()
 
@@ -2305,6 +2233,27 @@ except FileNotFoundError:
     with open(GARDENS_DATA_FILE, "w") as f:
         json.dump(gardens_data, f, indent=2)
 
+
+# Fingerprints of users / teams / gardens as loaded from the JSON files.  The files
+# are committed to git, so after a republish they can be older than PostgreSQL:
+# a guild's first load lets its database rows win unless this process has changed
+# the record since startup (see load_guild_data).
+def _record_digest(record):
+    return hash(json.dumps(record, sort_keys=True, default=str))
+
+
+_startup_digests = {
+    "users": {key: _record_digest(value) for key, value in chi_data.items()},
+    "teams": {key: _record_digest(value) for key, value in teams_data["teams"].items()},
+    "gardens": {key: _record_digest(value) for key, value in gardens_data["gardens"].items()},
+}
+
+
+def changed_since_startup(kind, key, record):
+    """Whether this process created or modified a users/teams/gardens record"""
+    digest = _startup_digests[kind].get(key)
+    return digest is None or digest != _record_digest(record)
+
 try:
     with open(POTIONS_DATA_FILE, "r") as f:
         potions_data = json.load(f)
@@ -2391,63 +2340,74 @@ except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
 
 
 # Define save functions first (needed for migration)
+# Collections are written by the persistence manager's background thread a
+# couple of seconds after they change; the save_* functions only mark them dirty.
+# The large per-user maps are saved compact (C encoder, consistent snapshot).
+
+persistence.register("chi", DATA_FILE, lambda: chi_data, indent=None)
+persistence.register("teams", TEAMS_DATA_FILE, lambda: teams_data, indent=None)
+persistence.register("gardens", GARDENS_DATA_FILE, lambda: gardens_data, indent=None)
+persistence.register("quests", QUEST_DATA_FILE, lambda: quest_data, indent=4)
+persistence.register("shop", SHOP_DATA_FILE, lambda: shop_data, indent=4)
+persistence.register("chi_shop", CHI_SHOP_DATA_FILE, lambda: chi_shop_data, indent=4)
+persistence.register("blacklist", BLACKLIST_FILE, lambda: blacklisted_users, indent=4)
+persistence.register("artifact_state", ARTIFACT_STATE_FILE, lambda: artifact_state)
+persistence.register("pet_catalog", PET_CATALOG_FILE, lambda: pet_catalog)
+persistence.register("potions", POTIONS_DATA_FILE, lambda: potions_data)
+persistence.register("player_shops", PLAYER_SHOPS_FILE, lambda: player_shops_data)
+persistence.start()
+
 
 def save_data():
-    """Save chi data to JSON file (database writes happen async)"""
-    save_chi_data()
+    """Mark chi data for saving (database writes happen async)"""
+    persistence.mark_dirty("chi")
+
+
+def save_chi_data():
+    persistence.mark_dirty("chi")
 
 
 def save_quests():
-    with open(QUEST_DATA_FILE, "w") as f:
-        json.dump(quest_data, f, indent=4)
+    persistence.mark_dirty("quests")
 
 
 def save_shop():
-    with open(SHOP_DATA_FILE, "w") as f:
-        json.dump(shop_data, f, indent=4)
+    persistence.mark_dirty("shop")
 
 
 def save_teams():
-    """Save teams data to JSON file (database writes happen async)"""
-    with open(TEAMS_DATA_FILE, "w") as f:
-        json.dump(teams_data, f, indent=4)
+    """Mark teams data for saving (database writes happen async)"""
+    persistence.mark_dirty("teams")
 
 
 def save_artifact_state():
-    with open(ARTIFACT_STATE_FILE, "w") as f:
-        json.dump(artifact_state, f, indent=2)
+    persistence.mark_dirty("artifact_state")
 
 
 def save_chi_shop():
-    with open(CHI_SHOP_DATA_FILE, "w") as f:
-        json.dump(chi_shop_data, f, indent=4)
+    persistence.mark_dirty("chi_shop")
 
 
 def save_blacklist():
-    with open(BLACKLIST_FILE, "w") as f:
-        json.dump(blacklisted_users, f, indent=4)
+    persistence.mark_dirty("blacklist")
 
 
 def save_gardens():
-    """Save gardens data to JSON file (database writes happen async)"""
-    with open(GARDENS_DATA_FILE, "w") as f:
-        json.dump(gardens_data, f, indent=2)
+    """Mark gardens data for saving (database writes happen async)"""
+    persistence.mark_dirty("gardens")
 
 
 def save_pet_catalog():
-    with open(PET_CATALOG_FILE, "w") as f:
-        json.dump(pet_catalog, f, indent=2)
+    persistence.mark_dirty("pet_catalog")
 
 
 def save_potions():
-    with open(POTIONS_DATA_FILE, "w") as f:
-        json.dump(potions_data, f, indent=2)
+    persistence.mark_dirty("potions")
 
 
 def save_player_shops():
-    """Save player shops data to JSON file"""
-    with open(PLAYER_SHOPS_FILE, "w") as f:
-        json.dump(player_shops_data, f, indent=2)
+    """Mark player shops data for saving"""
+    persistence.mark_dirty("player_shops")
 
 
 def _save_error_logs_sync():
@@ -2527,8 +2487,8 @@ async def sync_user_to_db(user_id: int):
             return
 
         user_data = chi_data[user_id_str]
-        # Use primary guild (first guild) for now - TODO: make guild-aware
-        guild_id = bot.guilds[0].id
+        # Rows live under the guild the user was last active in
+        guild_id = guild_states.home_guild(user_id_str, default=bot.guilds[0].id)
         await db.create_or_update_user(
             user_id=user_id,
             guild_id=guild_id,
@@ -2555,8 +2515,8 @@ async def sync_team_to_db(team_id: int):
 
         team = teams[team_id_str]
 
-        # Use primary guild (first guild) for now - TODO: make guild-aware
-        guild_id = bot.guilds[0].id
+        # Teams live under their leader's guild
+        guild_id = guild_states.home_guild(team.get("leader"), default=bot.guilds[0].id)
         # Update team chi
         await db.update_team_chi(team_id=team_id, guild_id=guild_id, team_chi=team.get("team_chi", 0))
     except Exception as e:
@@ -2597,8 +2557,8 @@ async def sync_garden_to_db(user_id: int):
 
             garden["plants"] = valid_plants
 
-        # Use primary guild (first guild) for now - TODO: make guild-aware
-        guild_id = bot.guilds[0].id
+        # Rows live under the guild the user was last active in
+        guild_id = guild_states.home_guild(user_id_str, default=bot.guilds[0].id)
         # Save to database using db_service
         await db.create_or_update_garden(
             user_id=user_id,
@@ -2799,22 +2759,27 @@ def get_current_theme():
     return ("Tutorial Quests", TUTORIAL_QUESTS)
 
 
+# Built once from the word lists; call chi_word_matcher.rebuild(...) if they change
+chi_word_matcher = WordMatcher(POSITIVE_WORDS, NEGATIVE_WORDS, SECRET_WORDS)
+_word_list_matchers = {}  # tuple(word_list) -> WordMatcher, so an edited list gets a fresh matcher
+
+
 def check_words(message, word_list):
-    return any(re.search(rf"\b{word}\b", message.content.lower()) for word in word_list)
+    """Whether the message contains any word from word_list (as a whole word)"""
+    if word_list is POSITIVE_WORDS:
+        return chi_word_matcher.scan(message.content).positive
+    if word_list is NEGATIVE_WORDS:
+        return chi_word_matcher.scan(message.content).negative
+    key = tuple(word_list)
+    matcher = _word_list_matchers.get(key)
+    if matcher is None:
+        matcher = _word_list_matchers[key] = WordMatcher(word_list, ())
+    return matcher.scan(message.content).positive
 
 
 def has_context_words(message):
     """Check if message has at least one word that isn't a positive/negative word."""
-    message_lower = message.content.lower()
-    words = re.findall(r"\b\w+\b", message_lower)
-
-    all_chi_words = set(POSITIVE_WORDS + NEGATIVE_WORDS)
-
-    for word in words:
-        if word not in all_chi_words:
-            return True
-
-    return False
+    return chi_word_matcher.scan(message.content).has_context
 
 
 
@@ -3216,13 +3181,14 @@ def parse_weapon_id(attack_input):
 
 def process_duel_bets(winner_id, guild):
     """Process all bets from the active duel and return results."""
+    gs = guild_states.get(guild)
 
-    if not active_duel or "bets" not in active_duel:
+    if not gs.duel or "bets" not in gs.duel:
         return []
 
     bet_results = []
 
-    for bet in active_duel["bets"]:
+    for bet in gs.duel["bets"]:
         bettor_id = str(bet["bettor_id"])
         bet_amount = bet["bet_amount"]
         bet_on_user_id = bet["bet_on_user_id"]
@@ -3299,92 +3265,87 @@ def sanitize_datetime_fields(data_dict):
     return sanitized
 
 
-async def load_data_from_database():
-    """Load all data from PostgreSQL database on startup for persistence"""
+async def load_guild_data(guild_id: int):
+    """Load one guild's users, teams and gardens from PostgreSQL into memory.
 
-    # Clear existing data to avoid mixing old and new state
-    temp_chi_data = {}
-    temp_teams_data = {"teams": {}}
-    temp_gardens_data = {"gardens": {}, "garden_event": {"active": False, "end_time": None}}
-
-    loaded_successfully = False
-
-    # Use primary guild for data loading - TODO: support multi-guild storage
-    if not bot.guilds:
-        print("⚠️ No guilds available yet, skipping database load")
-        return False
+    Called by guild_states.ensure_loaded() the first time a guild is active,
+    so startup doesn't pull every guild's rows.  The database is authoritative
+    (ensures persistence across republishes - the JSON files in the repo may be
+    stale): its rows replace the in-memory records, except those this process
+    has already changed and users whose data comes from another guild's rows.
+    """
+    if not db.pool:
+        # JSON files are the only storage - nothing to load
+        return True
 
-    guild_id = bot.guilds[0].id
+    sections_loaded = 0
 
+    # Load users with granular error handling
     try:
-        # Load all users with granular error handling
-        try:
-            all_users = await db.get_all_users(guild_id=guild_id)
-            if all_users:
-                for user_id, user_dict in all_users.items():
-                    # Sanitize datetime fields before storing
-                    sanitized_data = sanitize_datetime_fields(user_dict)
-                    temp_chi_data[str(user_id)] = sanitized_data
-                print(f"📊 Loaded {len(all_users)} users from database")
-        except Exception as e:
-            print(f"⚠️ Failed to load users from database: {e}")
-
-        # Load all teams with granular error handling
-        try:
-            all_teams = await db.get_all_teams(guild_id=guild_id)
-            if all_teams:
-                for team_id, team_dict in all_teams.items():
-                    # Sanitize datetime fields before storing
-                    sanitized_data = sanitize_datetime_fields(team_dict)
-                    temp_teams_data["teams"][str(team_id)] = sanitized_data
-                print(f"👥 Loaded {len(all_teams)} teams from database")
-        except Exception as e:
-            print(f"⚠️ Failed to load teams from database: {e}")
-
-        # Load all gardens with granular error handling
-        try:
-            all_gardens = await db.get_all_gardens(guild_id=guild_id)
-            if all_gardens:
-                for user_id, garden_dict in all_gardens.items():
-                    # Sanitize datetime fields before storing
-                    sanitized_data = sanitize_datetime_fields(garden_dict)
-                    temp_gardens_data["gardens"][str(user_id)] = sanitized_data
-                print(f"🌸 Loaded {len(all_gardens)} gardens from database")
-        except Exception as e:
-            print(f"⚠️ Failed to load gardens from database: {e}")
-
-        # Update each global ONLY if that section loaded successfully
-        sections_loaded = 0
-
-        if temp_chi_data:
-            chi_data.clear()
-            chi_data.update(temp_chi_data)
+        all_users = await db.get_all_users(guild_id=guild_id)
+        for user_id, user_dict in (all_users or {}).items():
+            user_id_str = str(user_id)
+            home = guild_states.home_guild(user_id_str)
+            if home not in (None, guild_id):
+                continue
+            if home is None:
+                # Writes for this user go to rows that exist, until they're active somewhere
+                guild_states.note_user(guild_id, user_id_str)
+            current = chi_data.get(user_id_str)
+            if current is not None and changed_since_startup("users", user_id_str, current):
+                continue
+            # Sanitize datetime fields before storing
+            chi_data[user_id_str] = sanitize_datetime_fields(user_dict)
+        if all_users:
             sections_loaded += 1
-        else:
-            print("⚠️ No user data loaded, preserving existing chi_data")
+            print(f"📊 Loaded {len(all_users)} users from database for guild {guild_id}")
+    except Exception as e:
+        print(f"⚠️ Failed to load users from database for guild {guild_id}: {e}")
 
-        if temp_teams_data["teams"]:
-            teams_data["teams"] = temp_teams_data["teams"]
+    # Load teams with granular error handling
+    try:
+        all_teams = await db.get_all_teams(guild_id=guild_id)
+        for team_id, team_dict in (all_teams or {}).items():
+            current = teams_data["teams"].get(str(team_id))
+            if current is not None and changed_since_startup("teams", str(team_id), current):
+                continue
+            teams_data["teams"][str(team_id)] = sanitize_datetime_fields(team_dict)
+        if all_teams:
             sections_loaded += 1
-        else:
-            print("⚠️ No team data loaded, preserving existing teams_data")
+            print(f"👥 Loaded {len(all_teams)} teams from database for guild {guild_id}")
+    except Exception as e:
+        print(f"⚠️ Failed to load teams from database for guild {guild_id}: {e}")
 
-        if temp_gardens_data["gardens"]:
-            gardens_data["gardens"] = temp_gardens_data["gardens"]
+    # Load gardens with granular error handling
+    try:
+        all_gardens = await db.get_all_gardens(guild_id=guild_id)
+        for user_id, garden_dict in (all_gardens or {}).items():
+            user_id_str = str(user_id)
+            if guild_states.home_guild(user_id_str) not in (None, guild_id):
+                continue
+            current = gardens_data["gardens"].get(user_id_str)
+            if current is not None and changed_since_startup("gardens", user_id_str, current):
+                continue
+            gardens_data["gardens"][user_id_str] = sanitize_datetime_fields(garden_dict)
+        if all_gardens:
             sections_loaded += 1
-        else:
-            print("⚠️ No garden data loaded, preserving existing gardens_data")
+            print(f"🌸 Loaded {len(all_gardens)} gardens from database for guild {guild_id}")
+    except Exception as e:
+        print(f"⚠️ Failed to load gardens from database for guild {guild_id}: {e}")
 
-        if sections_loaded > 0:
-            loaded_successfully = True
-            print(f"✅ Loaded {sections_loaded}/3 data sections from database successfully!")
-        else:
-            print("⚠️ No data loaded from database, using existing JSON data")
+    if sections_loaded == 0:
+        print(f"⚠️ No database data for guild {guild_id}, using existing JSON data")
+    return True
 
-        return loaded_successfully
-    except Exception as e:
-        print(f"⚠️ Critical error during database load: {e}")
-        return False
+
+async def ensure_guild_loaded(guild, user_id=None):
+    """Load a guild's data on its first activity and remember where the user is active"""
+    if guild is None:
+        return
+    if not guild_states.is_loaded(guild):
+        await guild_states.ensure_loaded(guild, load_guild_data)
+    if user_id is not None:
+        guild_states.note_user(guild, user_id)
 
 
 # ==================== ACHIEVEMENTS SYSTEM ====================
@@ -3553,8 +3514,6 @@ async def view_achievements(ctx, category: str = ""):
 
 @bot.event
 async def on_ready():
-    global next_event_time
-
     # Track bot start time for uptime monitoring
     bot.start_time = time.time()
 
@@ -3562,9 +3521,7 @@ async def on_ready():
     try:
         await db.connect()
         print("✅ Database connected - data will persist across updates!")
-
-        # Load data from database (this ensures persistence across republishes!)
-        await load_data_from_database()
+        # Each guild's data is loaded from the database on its first activity (ensure_guild_loaded)
     except Exception as e:
         print(f"⚠️ Database connection failed: {e}")
         print("   Falling back to JSON file storage")
@@ -3604,10 +3561,11 @@ async def on_ready():
         artifact_spawner.start()
     if not database_sync_task.is_running():
         database_sync_task.start()
+    if CONFIG_WATCH_ENABLED and not config_watch_task.is_running():
+        config_watch_task.start()
 
-    next_event_time = datetime.now(timezone.utc) + timedelta(
-        seconds=random.randint(CHI_EVENT_MIN_INTERVAL, CHI_EVENT_MAX_INTERVAL)
-    )
+    for guild in bot.guilds:
+        schedule_next_chi_event(guild_states.get(guild))
 
 
 # Duplicate/earlier `on_command_error` removed — using later, full handler defined further down
@@ -3636,6 +3594,8 @@ async def on_resumed():
         artifact_spawner.start()
     if not database_sync_task.is_running():
         database_sync_task.start()
+    if CONFIG_WATCH_ENABLED and not config_watch_task.is_running():
+        config_watch_task.start()
 
 
 @bot.event
@@ -3655,18 +3615,14 @@ async def on_guild_remove(guild):
             print(f"✅ Cleaned up {total_deleted} database rows for guild {guild.id}")
 
         # Remove guild config from server_config.json
-        configs = load_server_configs()
-        guild_id_str = str(guild.id)
-
-        if guild_id_str in configs["guilds"]:
-            del configs["guilds"][guild_id_str]
-            save_server_configs(configs)
+        if guild_configs.remove(guild.id):
             print(f"✅ Removed server config for guild {guild.id}")
 
-        # Reload in-memory data from database to reflect deletions
-        # This ensures data is consistent after guild removal
-        await load_data_from_database()
-        print("✅ Reloaded data from database after guild removal")
+        # Drop the guild's runtime state and user -> guild mapping.  chi_data and
+        # gardens are per user across every guild, so those records stay.
+        removed_users = guild_states.remove(guild.id)
+        if removed_users:
+            print(f"✅ Unmapped {len(removed_users)} users from guild {guild.id}")
 
     except Exception as e:
         print(f"❌ Error cleaning up guild {guild.id}: {e}")
@@ -4328,6 +4284,7 @@ async def check_cooldown_before_command(ctx):
 
     user_id = ctx.author.id
     command_name = ctx.command.name if ctx.command else None
+    await ensure_guild_loaded(ctx.guild, user_id)
 
     if command_name in ADMIN_BYPASS_COMMANDS:
         if ctx.guild and ctx.author.guild_permissions.administrator:
@@ -4391,6 +4348,8 @@ async def on_message(message):
     if message.author.bot:
         return
 
+    await ensure_guild_loaded(message.guild, message.author.id)
+
     # Process commands
 
     global chi_party_messages
@@ -4436,25 +4395,25 @@ async def on_message(message):
         on_cooldown, time_remaining = check_chi_cooldown(user_id)
         if not on_cooldown:
             chi_awarded = False
-            message_lower = message.content.lower()
-
-            for secret_word, (min_chi, max_chi) in SECRET_WORDS.items():
-                if re.search(r"\b" + re.escape(secret_word) + r"\b", message_lower):
-                    secret_chi = random.randint(min_chi, max_chi)
-                    rebirth_msg = update_chi(user_id, secret_chi)
-                    update_chi_cooldown(user_id)
-                    chi_awarded = True
-                    try:
-                        await message.add_reaction("🎁")
-                        await message.add_reaction("✨")
-                    except Exception as e:
-                        print(f"Failed to add secret word reaction: {e}")
-                    await message.channel.send(f"🎁 Secret word found! +{secret_chi} chi!")
-                    if rebirth_msg:
-                        await message.channel.send(rebirth_msg)
-                    break
+            # One pass over the message finds secret, positive and negative words
+            word_hits = chi_word_matcher.scan(message.content)
 
-            if not chi_awarded and check_words(message, POSITIVE_WORDS) and has_context_words(message):
+            if word_hits.secret:
+                min_chi, max_chi = SECRET_WORDS[word_hits.secret]
+                secret_chi = random.randint(min_chi, max_chi)
+                rebirth_msg = update_chi(user_id, secret_chi)
+                update_chi_cooldown(user_id)
+                chi_awarded = True
+                try:
+                    await message.add_reaction("🎁")
+                    await message.add_reaction("✨")
+                except Exception as e:
+                    print(f"Failed to add secret word reaction: {e}")
+                await message.channel.send(f"🎁 Secret word found! +{secret_chi} chi!")
+                if rebirth_msg:
+                    await message.channel.send(rebirth_msg)
+
+            if not chi_awarded and word_hits.positive and word_hits.has_context:
                 positive_chi = random.randint(1, 8)  # Harder to earn - avg 4.5 chi (was avg 7 before)
                 update_chi(user_id, positive_chi)
                 update_chi_cooldown(user_id)
@@ -4477,7 +4436,7 @@ async def on_message(message):
                     if chi_data[user_id_str]["positive_word_count"] >= 5:
                         await auto_complete_tutorial_quest(user_id, 0, message.channel)
 
-            elif not chi_awarded and check_words(message, NEGATIVE_WORDS) and has_context_words(message):
+            elif not chi_awarded and word_hits.negative and word_hits.has_context:
                 negative_chi = random.randint(5, 15)
                 update_chi(user_id, -negative_chi)
                 update_chi_cooldown(user_id)
@@ -5913,7 +5872,8 @@ async def quest_leaderboard(ctx):
 
 @bot.command()
 async def claim(ctx, *, args: str = ""):
-    global chi_party_active, active_food_event, event_active, event_claimer
+    global chi_party_active, active_food_event
+    gs = guild_states.get(ctx.guild)
     user_id = str(ctx.author.id)
 
     # Handle food event claiming
@@ -6005,13 +5965,13 @@ async def claim(ctx, *, args: str = ""):
         await ctx.send(msg)
         return
 
-    if not event_active or event_claimer is not None:
+    if not gs.event_active or gs.event_claimer is not None:
         await ctx.send(f"❌ No active Chi Event or Chi Party to claim right now, {ctx.author.display_name}.")
         return
 
-    event_active = False
-    event_claimer = user_id
-    event_type = current_event_type
+    gs.event_active = False
+    gs.event_claimer = user_id
+    event_type = gs.event_type
 
     if user_id not in chi_data:
         chi_data[user_id] = {
@@ -6178,9 +6138,9 @@ async def find_artifact(ctx, *, args: str = ""):
 async def event_command(ctx, event_type: str = ""):
     """Admin command to spawn events manually"""
     global chi_party_last_spawn
-    global event_active, event_claimer, current_event_message, current_event_type
     global chi_party_active
     global active_food_event, active_rift_battle, rift_event_participants
+    gs = guild_states.get(ctx.guild)
 
     if not ctx.guild or not ctx.author.guild_permissions.administrator:
         await ctx.send("❌ You don't have permission to summon events.")
@@ -6236,10 +6196,9 @@ async def event_command(ctx, event_type: str = ""):
         await ctx.send(embed=embed)
 
         # Trigger the chi event system
-        global event_active, current_event_type, event_claimer
-        event_active = True
-        current_event_type = "positive" if is_positive else "negative"
-        event_claimer = None
+        gs.event_active = True
+        gs.event_type = "positive" if is_positive else "negative"
+        gs.event_claimer = None
 
     # Food Event
     elif event_type == "food":
@@ -6426,11 +6385,11 @@ async def event_command(ctx, event_type: str = ""):
         ended_events = []
 
         # End mini chi events
-        if event_active:
-            event_active = False
-            event_claimer = None
-            current_event_message = None
-            current_event_type = "positive"
+        if gs.event_active:
+            gs.event_active = False
+            gs.event_claimer = None
+            gs.event_message = None
+            gs.event_type = "positive"
             ended_events.append("Mini Chi Event")
 
         # End chi party
@@ -6862,6 +6821,7 @@ async def message_stats(ctx, mode: str = ""):
 @is_bot_owner()
 async def log_command(ctx, mode: str = None, target: str = None):
     """Enhanced admin command: P!log [page/command/channel] [value]"""
+    gs = guild_states.get(ctx.guild)
 
     if not ctx.guild or not ctx.author.guild_permissions.administrator:
         await ctx.send("❌ You don't have permission to view logs.")
@@ -7013,8 +6973,8 @@ async def log_command(ctx, mode: str = None, target: str = None):
     active_events = []
     if chi_party_active:
         active_events.append("Chi Party")
-    if event_active:
-        active_events.append(f"{current_event_type.title()} Event")
+    if gs.event_active:
+        active_events.append(f"{gs.event_type.title()} Event")
     if active_food_event:
         active_events.append("Food Event")
     if active_rift_battle:
@@ -7180,15 +7140,16 @@ async def artifact_give(ctx, target: discord.Member = None, artifact_type: str =
 
 @bot.command(name="debug")
 async def debug_events(ctx):
-    global event_active, event_claimer, current_event_message, chi_party_active, chi_party_tokens, chi_party_claims
+    global chi_party_active, chi_party_tokens, chi_party_claims
+    gs = guild_states.get(ctx.guild)
 
     if not ctx.guild or not ctx.author.guild_permissions.administrator:
         await ctx.send("❌ You don't have permission to use debug commands.")
         return
 
-    event_active = False
-    event_claimer = None
-    current_event_message = None
+    gs.event_active = False
+    gs.event_claimer = None
+    gs.event_message = None
     chi_party_active = False
     chi_party_tokens = []
     chi_party_claims = {}
@@ -7294,6 +7255,7 @@ async def blacklist_cmd(ctx, action: str = "", user_id: str = ""):
 @is_bot_owner()
 async def reset_all_chi(ctx):
     """Reset EVERYTHING for all users - chi, rebirths, gardens, inventory, everything! (admin only)"""
+    gs = guild_states.get(ctx.guild)
     if not ctx.guild or not ctx.author.guild_permissions.administrator:
         await ctx.send("❌ You don't have permission to use this command.")
         return
@@ -7370,11 +7332,10 @@ async def reset_all_chi(ctx):
         gardens_data["garden_event"] = {"active": False, "end_time": None}
 
         # Clear all active duels, trainings, boss battles
-        global active_duel, active_training, active_npc_training, active_boss_battle
-        active_duel = None
-        active_training = None
-        active_npc_training = None
-        active_boss_battle = None
+        gs.duel = None
+        gs.training = None
+        gs.npc_training = None
+        gs.boss_battle = None
 
         save_data()
         save_teams()
@@ -7488,9 +7449,9 @@ async def reset_all_chi(ctx):
 
 @bot.command()
 async def next(ctx):
-
-    if next_event_time:
-        time_remaining = (next_event_time - datetime.now(timezone.utc)).total_seconds()
+    gs = guild_states.get(ctx.guild)
+    if gs.next_event_time:
+        time_remaining = (gs.next_event_time - datetime.now(timezone.utc)).total_seconds()
         if time_remaining > 0:
             minutes = int(time_remaining // 60)
             seconds = int(time_remaining % 60)
@@ -7503,7 +7464,7 @@ async def next(ctx):
 
 @bot.command()
 async def spawn(ctx, event_type: str = "positive"):
-    global event_active, event_claimer, current_event_message, current_event_type
+    gs = guild_states.get(ctx.guild)
 
     if not ctx.guild or not ctx.author.guild_permissions.administrator:
         await ctx.send("❌ You don't have permission to spawn chi events.")
@@ -7516,7 +7477,7 @@ async def spawn(ctx, event_type: str = "positive"):
         )
         return
 
-    if event_active:
+    if gs.event_active:
         await ctx.send("⚠️ A chi event is already active! Wait for it to expire or be claimed.")
         return
 
@@ -7533,16 +7494,16 @@ async def spawn(ctx, event_type: str = "positive"):
             color=discord.Color.dark_red(),
         )
 
-    current_event_message = await ctx.send(embed=embed)
-    event_active = True
-    event_claimer = None
-    current_event_type = event_type
+    gs.event_message = await ctx.send(embed=embed)
+    gs.event_active = True
+    gs.event_claimer = None
+    gs.event_type = event_type
 
     await discord.utils.sleep_until(datetime.utcnow() + timedelta(seconds=CHI_EVENT_CLAIM_TIME))
-    if event_active:
-        event_active = False
-        event_claimer = None
-        await current_event_message.edit(
+    if gs.event_active:
+        gs.event_active = False
+        gs.event_claimer = None
+        await gs.event_message.edit(
             embed=discord.Embed(
                 title=f"{'✨' if event_type == 'positive' else '💀'}🐼 Chi Event Expired!",
                 description="No one claimed it in time… maybe next round!",
@@ -9672,7 +9633,7 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
     - P!duel attack <item> - Attack with weapon
     - P!duel heal <item> - Heal with item
     """
-    global active_duel
+    gs = guild_states.get(ctx.guild)
 
     if not action_or_user:
         await ctx.send(
@@ -9684,11 +9645,11 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
 
     # Check for betting FIRST before processing mentions (betting has mentions too)
     if action_or_user == "bet":
-        if active_duel is None or active_duel["status"] != "active":
+        if gs.duel is None or gs.duel["status"] != "active":
             await ctx.send("⚔️ There's no active duel to bet on right now!")
             return
 
-        if ctx.author.id in [active_duel["challenger"], active_duel["challenged"]]:
+        if ctx.author.id in [gs.duel["challenger"], gs.duel["challenged"]]:
             await ctx.send("💰 You can't bet on a duel you're in!")
             return
 
@@ -9711,7 +9672,7 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
 
         bet_on_user = ctx.message.mentions[0]
 
-        if bet_on_user.id not in [active_duel["challenger"], active_duel["challenged"]]:
+        if bet_on_user.id not in [gs.duel["challenger"], gs.duel["challenged"]]:
             await ctx.send("⚔️ You can only bet on one of the duelists!")
             return
 
@@ -9729,12 +9690,12 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
             await ctx.send(f"❌ You don't have enough chi! You have {chi_data[bettor_id]['chi']} chi.")
             return
 
-        for bet in active_duel["bets"]:
+        for bet in gs.duel["bets"]:
             if bet["bettor_id"] == ctx.author.id:
                 await ctx.send("💰 You've already placed a bet on this duel!")
                 return
 
-        active_duel["bets"].append(
+        gs.duel["bets"].append(
             {"bettor_id": ctx.author.id, "bet_amount": bet_amount, "bet_on_user_id": bet_on_user.id}
         )
 
@@ -9745,7 +9706,7 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
             description=f"{ctx.author.mention} bet **{bet_amount} chi** on {bet_on_user.mention}!\n\n✅ **Win:** Gain {bet_amount * 2} chi (net +{bet_amount} chi)\n❌ **Lose:** Lose {bet_amount} chi",
             color=discord.Color.gold(),
         )
-        embed.set_footer(text=f"Total bets on this duel: {len(active_duel['bets'])}")
+        embed.set_footer(text=f"Total bets on this duel: {len(gs.duel['bets'])}")
         await ctx.send(embed=embed)
         return
 
@@ -9783,11 +9744,11 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
                 )
                 return
 
-        if active_duel is not None:
+        if gs.duel is not None:
             await ctx.send("⚔️ A duel is already in progress! Wait for it to finish.")
             return
 
-        active_duel = {
+        gs.duel = {
             "challenger": ctx.author.id,
             "challenged": target.id,
             "status": "pending",
@@ -9807,26 +9768,26 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
         await ctx.send(embed=embed)
 
         await discord.utils.sleep_until(datetime.utcnow() + timedelta(minutes=2))
-        if active_duel and active_duel["status"] == "pending":
-            active_duel = None
+        if gs.duel and gs.duel["status"] == "pending":
+            gs.duel = None
             await ctx.send(f"⚔️ {target.mention} didn't respond in time. The challenge has expired.")
         return
 
     if action_or_user == "accept":
-        if active_duel is None:
+        if gs.duel is None:
             await ctx.send("⚔️ There's no active duel challenge!")
             return
 
-        if ctx.author.id != active_duel["challenged"]:
+        if ctx.author.id != gs.duel["challenged"]:
             await ctx.send("⚔️ This challenge isn't for you!")
             return
 
-        if active_duel["status"] != "pending":
+        if gs.duel["status"] != "pending":
             await ctx.send("⚔️ This duel has already started!")
             return
 
-        challenger_id = str(active_duel["challenger"])
-        challenged_id = str(active_duel["challenged"])
+        challenger_id = str(gs.duel["challenger"])
+        challenged_id = str(gs.duel["challenged"])
 
         if challenger_id not in chi_data:
             chi_data[challenger_id] = {
@@ -9846,24 +9807,24 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
             }
 
         # Calculate HP based on artifacts and permanent upgrades
-        challenger_hp = calculate_max_hp(active_duel["challenger"])
-        challenged_hp = calculate_max_hp(active_duel["challenged"])
+        challenger_hp = calculate_max_hp(gs.duel["challenger"])
+        challenged_hp = calculate_max_hp(gs.duel["challenged"])
 
-        active_duel["status"] = "active"
-        active_duel["challenger_hp"] = challenger_hp
-        active_duel["challenged_hp"] = challenged_hp
-        active_duel["challenger_max_hp"] = challenger_hp
-        active_duel["challenged_max_hp"] = challenged_hp
+        gs.duel["status"] = "active"
+        gs.duel["challenger_hp"] = challenger_hp
+        gs.duel["challenged_hp"] = challenged_hp
+        gs.duel["challenger_max_hp"] = challenger_hp
+        gs.duel["challenged_max_hp"] = challenged_hp
 
         # Auto-complete tutorial quest 3: Start a duel
-        await auto_complete_tutorial_quest(active_duel["challenger"], 3, ctx.channel)
-        await auto_complete_tutorial_quest(active_duel["challenged"], 3, ctx.channel)
-        active_duel["turn"] = active_duel["challenger"]
-        active_duel["start_time"] = datetime.utcnow()
-        active_duel["item_uses"] = {}
+        await auto_complete_tutorial_quest(gs.duel["challenger"], 3, ctx.channel)
+        await auto_complete_tutorial_quest(gs.duel["challenged"], 3, ctx.channel)
+        gs.duel["turn"] = gs.duel["challenger"]
+        gs.duel["start_time"] = datetime.utcnow()
+        gs.duel["item_uses"] = {}
 
-        challenger = ctx.guild.get_member(active_duel["challenger"])
-        challenged = ctx.guild.get_member(active_duel["challenged"])
+        challenger = ctx.guild.get_member(gs.duel["challenger"])
+        challenged = ctx.guild.get_member(gs.duel["challenged"])
 
         embed = discord.Embed(
             title="⚔️ DUEL BEGINS!",
@@ -9901,28 +9862,28 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
         embed.set_footer(text=f"🎯 {challenger.display_name}'s turn! • Duel expires in 10 minutes")
 
         session_key = f"duel_{ctx.channel.id}"
-        duel_view = DuelView(active_duel, session_key, session_manager)
-        session_manager.create_session(session_key, active_duel)
+        duel_view = DuelView(gs.duel, session_key, session_manager)
+        session_manager.create_session(session_key, gs.duel)
 
         message = await ctx.send(embed=embed, view=duel_view)
         duel_view.message = message
         return
 
     if action_or_user == "deny":
-        if active_duel is None:
+        if gs.duel is None:
             await ctx.send("⚔️ There's no active duel challenge!")
             return
 
-        if ctx.author.id != active_duel["challenged"]:
+        if ctx.author.id != gs.duel["challenged"]:
             await ctx.send("⚔️ This challenge isn't for you!")
             return
 
-        if active_duel["status"] != "pending":
+        if gs.duel["status"] != "pending":
             await ctx.send("⚔️ This duel has already started!")
             return
 
-        challenger = ctx.guild.get_member(active_duel["challenger"])
-        active_duel = None
+        challenger = ctx.guild.get_member(gs.duel["challenger"])
+        gs.duel = None
 
         await ctx.send(
             f"🐼 *Aw sorry... {ctx.author.mention} doesn't want to battle you, {challenger.mention}. How about we try peace, if that doesn't work then we can always use fists!*"
@@ -9930,11 +9891,11 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
         return
 
     if action_or_user == "attack":
-        if active_duel is None or active_duel["status"] != "active":
+        if gs.duel is None or gs.duel["status"] != "active":
             await ctx.send("⚔️ There's no active duel right now!")
             return
 
-        if ctx.author.id != active_duel["turn"]:
+        if ctx.author.id != gs.duel["turn"]:
             await ctx.send("⚔️ It's not your turn!")
             return
 
@@ -10020,22 +9981,22 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
 
         if "uses" in item_found:
             use_key = f"{user_id}_{item_found['name']}"
-            current_uses = active_duel["item_uses"].get(use_key, 0)
+            current_uses = gs.duel["item_uses"].get(use_key, 0)
             if current_uses >= item_found["uses"]:
                 await ctx.send(f"❌ {item_found['name']} has no uses left! You need to buy it again.")
                 return
-            active_duel["item_uses"][use_key] = current_uses + 1
+            gs.duel["item_uses"][use_key] = current_uses + 1
 
-        if ctx.author.id == active_duel["challenger"]:
-            opponent_id = active_duel["challenged"]
-            active_duel["challenged_hp"] -= damage
-            opponent_hp = active_duel["challenged_hp"]
-            active_duel["turn"] = active_duel["challenged"]
+        if ctx.author.id == gs.duel["challenger"]:
+            opponent_id = gs.duel["challenged"]
+            gs.duel["challenged_hp"] -= damage
+            opponent_hp = gs.duel["challenged_hp"]
+            gs.duel["turn"] = gs.duel["challenged"]
         else:
-            opponent_id = active_duel["challenger"]
-            active_duel["challenger_hp"] -= damage
-            opponent_hp = active_duel["challenger_hp"]
-            active_duel["turn"] = active_duel["challenger"]
+            opponent_id = gs.duel["challenger"]
+            gs.duel["challenger_hp"] -= damage
+            opponent_hp = gs.duel["challenger_hp"]
+            gs.duel["turn"] = gs.duel["challenger"]
 
         opponent = ctx.guild.get_member(opponent_id)
 
@@ -10050,7 +10011,7 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
                 chi_data[user_id]["custom_attacks"][weapon_name] = []
 
             # Check if using same attack as last turn
-            last_attack = active_duel.get("last_attack", {}).get(str(ctx.author.id))
+            last_attack = gs.duel.get("last_attack", {}).get(str(ctx.author.id))
             if last_attack and last_attack.lower() == custom_attack.lower():
                 await ctx.send(
                     f"❌ You can't use the same attack **{custom_attack}** twice in a row! Choose a different attack."
@@ -10058,9 +10019,9 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
                 return
 
             # Store this attack as the last used
-            if "last_attack" not in active_duel:
-                active_duel["last_attack"] = {}
-            active_duel["last_attack"][str(ctx.author.id)] = custom_attack
+            if "last_attack" not in gs.duel:
+                gs.duel["last_attack"] = {}
+            gs.duel["last_attack"][str(ctx.author.id)] = custom_attack
 
             # Check if this is a pre-configured attack from the weapon
             preconfigured_attacks = item_found.get("custom_attacks", {})
@@ -10083,14 +10044,14 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
                 modified_damage = random.randint(min_dmg, max_dmg)
 
                 # Update opponent HP
-                if ctx.author.id == active_duel["challenger"]:
-                    active_duel["challenged_hp"] += damage  # Undo base damage
-                    active_duel["challenged_hp"] -= modified_damage
-                    opponent_hp = active_duel["challenged_hp"]
+                if ctx.author.id == gs.duel["challenger"]:
+                    gs.duel["challenged_hp"] += damage  # Undo base damage
+                    gs.duel["challenged_hp"] -= modified_damage
+                    opponent_hp = gs.duel["challenged_hp"]
                 else:
-                    active_duel["challenger_hp"] += damage  # Undo base damage
-                    active_duel["challenger_hp"] -= modified_damage
-                    opponent_hp = active_duel["challenger_hp"]
+                    gs.duel["challenger_hp"] += damage  # Undo base damage
+                    gs.duel["challenger_hp"] -= modified_damage
+                    opponent_hp = gs.duel["challenger_hp"]
 
                 await ctx.send(
                     f"⚔️ {ctx.author.mention} used **{weapon_name}** to unleash *{custom_attack}* and dealt **{modified_damage} damage** to {opponent.mention}! 🏛️"
@@ -10108,14 +10069,14 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
                 modified_damage = max(1, damage + damage_variation)
 
                 # Update opponent HP with modified damage
-                if ctx.author.id == active_duel["challenger"]:
-                    active_duel["challenged_hp"] += damage  # Undo original damage
-                    active_duel["challenged_hp"] -= modified_damage
-                    opponent_hp = active_duel["challenged_hp"]
+                if ctx.author.id == gs.duel["challenger"]:
+                    gs.duel["challenged_hp"] += damage  # Undo original damage
+                    gs.duel["challenged_hp"] -= modified_damage
+                    opponent_hp = gs.duel["challenged_hp"]
                 else:
-                    active_duel["challenger_hp"] += damage  # Undo original damage
-                    active_duel["challenger_hp"] -= modified_damage
-                    opponent_hp = active_duel["challenger_hp"]
+                    gs.duel["challenger_hp"] += damage  # Undo original damage
+                    gs.duel["challenger_hp"] -= modified_damage
+                    opponent_hp = gs.duel["challenger_hp"]
 
                 await ctx.send(
                     f"⚔️ {ctx.author.mention} used **{weapon_name}** to unleash *{custom_attack}* and dealt **{modified_damage} damage** to {opponent.mention}!"
@@ -10128,10 +10089,10 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
         if opponent_hp <= 0:
             winner = ctx.author
             loser = opponent
-            is_tournament = active_duel.get("is_tournament", False)
+            is_tournament = gs.duel.get("is_tournament", False)
 
             bet_results = process_duel_bets(winner.id, ctx.guild)
-            active_duel = None
+            gs.duel = None
 
             winner_id = str(winner.id)
             loser_id = str(loser.id)
@@ -10200,25 +10161,25 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
             embed = discord.Embed(title="🏆 DUEL COMPLETE!", description=description, color=discord.Color.gold())
             await ctx.send(embed=embed)
         else:
-            next_turn_user = ctx.guild.get_member(active_duel["turn"])
+            next_turn_user = ctx.guild.get_member(gs.duel["turn"])
 
-            challenger = ctx.guild.get_member(active_duel["challenger"])
-            challenged = ctx.guild.get_member(active_duel["challenged"])
+            challenger = ctx.guild.get_member(gs.duel["challenger"])
+            challenged = ctx.guild.get_member(gs.duel["challenged"])
 
             embed = discord.Embed(
                 title="⚔️ Duel Status",
-                description=f"**HP:**\n{challenger.mention}: {active_duel['challenger_hp']}/{active_duel['challenger_max_hp']} HP\n{challenged.mention}: {active_duel['challenged_hp']}/{active_duel['challenged_max_hp']} HP\n\n{next_turn_user.mention}'s turn!",
+                description=f"**HP:**\n{challenger.mention}: {gs.duel['challenger_hp']}/{gs.duel['challenger_max_hp']} HP\n{challenged.mention}: {gs.duel['challenged_hp']}/{gs.duel['challenged_max_hp']} HP\n\n{next_turn_user.mention}'s turn!",
                 color=discord.Color.orange(),
             )
             await ctx.send(embed=embed)
         return
 
     if action_or_user == "heal":
-        if active_duel is None or active_duel["status"] != "active":
+        if gs.duel is None or gs.duel["status"] != "active":
             await ctx.send("⚔️ There's no active duel right now!")
             return
 
-        if ctx.author.id != active_duel["turn"]:
+        if ctx.author.id != gs.duel["turn"]:
             await ctx.send("⚔️ It's not your turn!")
             return
 
@@ -10248,55 +10209,55 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
         item_level = get_item_level(ctx.author.id, item_found["name"])
         healing = calculate_healing_with_level(base_healing, user_level, item_level)
 
-        if ctx.author.id == active_duel["challenger"]:
-            old_hp = active_duel["challenger_hp"]
-            active_duel["challenger_hp"] = min(active_duel["challenger_hp"] + healing, active_duel["challenger_max_hp"])
-            actual_healing = active_duel["challenger_hp"] - old_hp
-            active_duel["turn"] = active_duel["challenged"]
+        if ctx.author.id == gs.duel["challenger"]:
+            old_hp = gs.duel["challenger_hp"]
+            gs.duel["challenger_hp"] = min(gs.duel["challenger_hp"] + healing, gs.duel["challenger_max_hp"])
+            actual_healing = gs.duel["challenger_hp"] - old_hp
+            gs.duel["turn"] = gs.duel["challenged"]
         else:
-            old_hp = active_duel["challenged_hp"]
-            active_duel["challenged_hp"] = min(active_duel["challenged_hp"] + healing, active_duel["challenged_max_hp"])
-            actual_healing = active_duel["challenged_hp"] - old_hp
-            active_duel["turn"] = active_duel["challenger"]
+            old_hp = gs.duel["challenged_hp"]
+            gs.duel["challenged_hp"] = min(gs.duel["challenged_hp"] + healing, gs.duel["challenged_max_hp"])
+            actual_healing = gs.duel["challenged_hp"] - old_hp
+            gs.duel["turn"] = gs.duel["challenger"]
 
         await ctx.send(f"💚 {ctx.author.mention} used **{item_found['name']}** and healed for **{actual_healing} HP**!")
 
-        next_turn_user = ctx.guild.get_member(active_duel["turn"])
+        next_turn_user = ctx.guild.get_member(gs.duel["turn"])
 
-        challenger = ctx.guild.get_member(active_duel["challenger"])
-        challenged = ctx.guild.get_member(active_duel["challenged"])
+        challenger = ctx.guild.get_member(gs.duel["challenger"])
+        challenged = ctx.guild.get_member(gs.duel["challenged"])
 
         embed = discord.Embed(
             title="⚔️ Duel Status",
-            description=f"**HP:**\n{challenger.mention}: {active_duel['challenger_hp']}/{active_duel['challenger_max_hp']} HP\n{challenged.mention}: {active_duel['challenged_hp']}/{active_duel['challenged_max_hp']} HP\n\n{next_turn_user.mention}'s turn!",
+            description=f"**HP:**\n{challenger.mention}: {gs.duel['challenger_hp']}/{gs.duel['challenger_max_hp']} HP\n{challenged.mention}: {gs.duel['challenged_hp']}/{gs.duel['challenged_max_hp']} HP\n\n{next_turn_user.mention}'s turn!",
             color=discord.Color.green(),
         )
         await ctx.send(embed=embed)
         return
 
     if action_or_user == "run":
-        if active_duel is None or active_duel["status"] != "active":
+        if gs.duel is None or gs.duel["status"] != "active":
             await ctx.send("⚔️ There's no active duel to run from!")
             return
 
-        if ctx.author.id not in [active_duel["challenger"], active_duel["challenged"]]:
+        if ctx.author.id not in [gs.duel["challenger"], gs.duel["challenged"]]:
             await ctx.send("⚔️ You're not in this duel!")
             return
 
         runner = ctx.author
-        if ctx.author.id == active_duel["challenger"]:
-            winner_id = active_duel["challenged"]
+        if ctx.author.id == gs.duel["challenger"]:
+            winner_id = gs.duel["challenged"]
         else:
-            winner_id = active_duel["challenger"]
+            winner_id = gs.duel["challenger"]
 
         winner = ctx.guild.get_member(winner_id)
         if not winner:
             await ctx.send("⚔️ Error: Could not find the other duelist!")
-            active_duel = None
+            gs.duel = None
             return
 
         bet_results = process_duel_bets(winner_id, ctx.guild)
-        active_duel = None
+        gs.duel = None
 
         runner_id = str(runner.id)
         winner_id_str = str(winner_id)
@@ -10341,6 +10302,7 @@ async def duel(ctx, action_or_user: str = "", *, item_name: str = ""):
 @is_bot_owner()
 async def tournament(ctx, user1: discord.Member = None, user2: discord.Member = None):
     """Admin-only: Force two users to duel in a tournament"""
+    gs = guild_states.get(ctx.guild)
     if not ctx.guild or not ctx.author.guild_permissions.administrator:
         await ctx.send("⚔️ This command requires administrator permissions!")
         return
@@ -10357,9 +10319,7 @@ async def tournament(ctx, user1: discord.Member = None, user2: discord.Member =
         await ctx.send("🐼 A user can't fight themselves in a tournament!")
         return
 
-    global active_duel
-
-    if active_duel is not None:
+    if gs.duel is not None:
         await ctx.send("⚔️ A duel is already in progress! Wait for it to finish.")
         return
 
@@ -10386,7 +10346,7 @@ async def tournament(ctx, user1: discord.Member = None, user2: discord.Member =
     user1_hp = 100 + (chi_data[user1_id].get("rebirths", 0) * 25)
     user2_hp = 100 + (chi_data[user2_id].get("rebirths", 0) * 25)
 
-    active_duel = {
+    gs.duel = {
         "challenger": user1.id,
         "challenged": user2.id,
         "status": "active",
@@ -10422,7 +10382,7 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
     - P!boss heal <item> - Heal yourself
     - P!boss run - Forfeit and flee (lose 100 chi)
     """
-    global active_boss_battle
+    gs = guild_states.get(ctx.guild)
 
     if not action:
         await ctx.send(
@@ -10460,7 +10420,7 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
         return
 
     if action == "fight":
-        if active_boss_battle is not None:
+        if gs.boss_battle is not None:
             await ctx.send("⚔️ A boss battle is already in progress!")
             return
 
@@ -10492,7 +10452,7 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
         # Calculate HP based on artifacts and permanent upgrades
         player_hp = calculate_max_hp(ctx.author.id)
 
-        active_boss_battle = {
+        gs.boss_battle = {
             "player_id": ctx.author.id,
             "boss_key": boss_key,
             "boss_hp": boss_info["hp"],
@@ -10523,11 +10483,11 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
         return
 
     if action == "attack":
-        if active_boss_battle is None:
+        if gs.boss_battle is None:
             await ctx.send("⚔️ There's no active boss battle! Use `P!boss fight <boss_name>` to start one.")
             return
 
-        if ctx.author.id != active_boss_battle["player_id"]:
+        if ctx.author.id != gs.boss_battle["player_id"]:
             await ctx.send("⚔️ This is not your boss battle!")
             return
 
@@ -10578,7 +10538,7 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
                 await ctx.send(f"❌ You don't own **{item_found['name']}**! Purchase it from the Chi Shop first.")
                 return
 
-        boss_info = BOSS_DATA[active_boss_battle["boss_key"]]
+        boss_info = BOSS_DATA[gs.boss_battle["boss_key"]]
 
         weapon_damage = item_found.get("damage", 10)
         min_dmg = int(weapon_damage * 0.8)
@@ -10588,12 +10548,12 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
         item_level = get_item_level(user_id, item_found["name"])
         damage = calculate_damage_with_level(base_damage, user_level, item_level)
 
-        active_boss_battle["boss_hp"] -= damage
+        gs.boss_battle["boss_hp"] -= damage
 
         attack_message = f"⚔️ {ctx.author.mention} attacks with **{item_found['name']}** for **{damage} damage**!"
 
-        if active_boss_battle["boss_hp"] <= 0:
-            active_boss_battle["boss_hp"] = 0
+        if gs.boss_battle["boss_hp"] <= 0:
+            gs.boss_battle["boss_hp"] = 0
 
             rewards = boss_info["rewards"]
             chi_data[user_id]["chi"] += rewards["chi"]
@@ -10626,7 +10586,7 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
 
             # Winter Wonderland - Boss-specific ingredient drops!
             ingredient_drops = []
-            boss_key = active_boss_battle["boss_key"]
+            boss_key = gs.boss_battle["boss_key"]
 
             # GUARANTEED boss essence drop (1-2 pieces)
             essence_amount = random.randint(1, 2)
@@ -10693,7 +10653,7 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
                 title=f"{boss_info['emoji']} BOSS DEFEATED!", description=description, color=discord.Color.gold()
             )
 
-            active_boss_battle = None
+            gs.boss_battle = None
             await ctx.send(embed=embed)
             return
 
@@ -10706,33 +10666,33 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
 
         if (
             boss_info["special"].get("trigger_turn")
-            and active_boss_battle["turn"] % boss_info["special"]["trigger_turn"] == 0
+            and gs.boss_battle["turn"] % boss_info["special"]["trigger_turn"] == 0
         ):
             heal_amount = int(boss_info["hp"] * boss_info["special"]["heal_percent"])
-            active_boss_battle["boss_hp"] = min(active_boss_battle["boss_hp"] + heal_amount, boss_info["hp"])
+            gs.boss_battle["boss_hp"] = min(gs.boss_battle["boss_hp"] + heal_amount, boss_info["hp"])
             attack_message += f"\n🛡️ **{boss_info['special']['name']}!** Boss healed {heal_amount} HP!"
 
         if (
             "burn_damage" in boss_info["special"]
-            and active_boss_battle["burn_turns"] == 0
-            and active_boss_battle["turn"] == 1
+            and gs.boss_battle["burn_turns"] == 0
+            and gs.boss_battle["turn"] == 1
         ):
-            active_boss_battle["burn_turns"] = boss_info["special"]["burn_turns"]
+            gs.boss_battle["burn_turns"] = boss_info["special"]["burn_turns"]
             attack_message += f"\n🔥 **{boss_info['special']['name']}!** You are burning for {boss_info['special']['burn_turns']} turns!"
 
         attack_message += f"\n⚔️ **{boss_info['name']}** strikes back for **{boss_damage} damage**!"
-        active_boss_battle["player_hp"] -= boss_damage
+        gs.boss_battle["player_hp"] -= boss_damage
 
-        if active_boss_battle["burn_turns"] > 0:
+        if gs.boss_battle["burn_turns"] > 0:
             burn_damage = boss_info["special"]["burn_damage"]
-            active_boss_battle["player_hp"] -= burn_damage
-            active_boss_battle["burn_turns"] -= 1
+            gs.boss_battle["player_hp"] -= burn_damage
+            gs.boss_battle["burn_turns"] -= 1
             attack_message += (
-                f"\n🔥 Burn damage: {burn_damage} HP (Burn: {active_boss_battle['burn_turns']} turns remaining)"
+                f"\n🔥 Burn damage: {burn_damage} HP (Burn: {gs.boss_battle['burn_turns']} turns remaining)"
             )
 
-        if active_boss_battle["player_hp"] <= 0:
-            active_boss_battle["player_hp"] = 0
+        if gs.boss_battle["player_hp"] <= 0:
+            gs.boss_battle["player_hp"] = 0
 
             update_chi(user_id, -100)
             save_data()
@@ -10748,18 +10708,18 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
                 color=discord.Color.dark_red(),
             )
 
-            active_boss_battle = None
+            gs.boss_battle = None
             await ctx.send(embed=embed)
             return
 
-        active_boss_battle["turn"] += 1
+        gs.boss_battle["turn"] += 1
 
         embed = discord.Embed(
             title=f"{boss_info['emoji']} BOSS BATTLE",
             description=(
                 f"{attack_message}\n\n"
-                f"**Boss HP:** {active_boss_battle['boss_hp']}/{boss_info['hp']}\n"
-                f"**Your HP:** {active_boss_battle['player_hp']}/{active_boss_battle['player_max_hp']}\n\n"
+                f"**Boss HP:** {gs.boss_battle['boss_hp']}/{boss_info['hp']}\n"
+                f"**Your HP:** {gs.boss_battle['player_hp']}/{gs.boss_battle['player_max_hp']}\n\n"
                 "*Your turn! Use `P!boss attack <weapon>` or `P!boss heal <item>`*"
             ),
             color=discord.Color.orange(),
@@ -10768,11 +10728,11 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
         return
 
     if action == "heal":
-        if active_boss_battle is None:
+        if gs.boss_battle is None:
             await ctx.send("⚔️ There's no active boss battle!")
             return
 
-        if ctx.author.id != active_boss_battle["player_id"]:
+        if ctx.author.id != gs.boss_battle["player_id"]:
             await ctx.send("⚔️ This is not your boss battle!")
             return
 
@@ -10795,18 +10755,18 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
                 if artifact["name"].lower() == item_name.lower():
                     tier = artifact["tier"]
                     heal_percent = ARTIFACT_CONFIG[tier]["heal_percent"]
-                    base_healing = int(active_boss_battle["player_max_hp"] * (heal_percent / 100))
+                    base_healing = int(gs.boss_battle["player_max_hp"] * (heal_percent / 100))
 
-                    old_hp = active_boss_battle["player_hp"]
-                    active_boss_battle["player_hp"] = min(
-                        active_boss_battle["player_hp"] + base_healing, active_boss_battle["player_max_hp"]
+                    old_hp = gs.boss_battle["player_hp"]
+                    gs.boss_battle["player_hp"] = min(
+                        gs.boss_battle["player_hp"] + base_healing, gs.boss_battle["player_max_hp"]
                     )
-                    actual_healing = active_boss_battle["player_hp"] - old_hp
+                    actual_healing = gs.boss_battle["player_hp"] - old_hp
 
                     chi_data[user_id]["artifacts"].remove(artifact)
                     save_data()
 
-                    boss_info = BOSS_DATA[active_boss_battle["boss_key"]]
+                    boss_info = BOSS_DATA[gs.boss_battle["boss_key"]]
                     boss_damage = random.randint(boss_info["damage_min"], boss_info["damage_max"])
 
                     heal_message = f"💚 {ctx.author.mention} used **{artifact['emoji']} {artifact['name']}** and healed for **{actual_healing} HP**!"
@@ -10818,33 +10778,33 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
 
                     if (
                         boss_info["special"].get("trigger_turn")
-                        and active_boss_battle["turn"] % boss_info["special"]["trigger_turn"] == 0
+                        and gs.boss_battle["turn"] % boss_info["special"]["trigger_turn"] == 0
                     ):
                         heal_amount = int(boss_info["hp"] * boss_info["special"]["heal_percent"])
-                        active_boss_battle["boss_hp"] = min(
-                            active_boss_battle["boss_hp"] + heal_amount, boss_info["hp"]
+                        gs.boss_battle["boss_hp"] = min(
+                            gs.boss_battle["boss_hp"] + heal_amount, boss_info["hp"]
                         )
                         heal_message += f"\n🛡️ **{boss_info['special']['name']}!** Boss healed {heal_amount} HP!"
 
                     if (
                         "burn_damage" in boss_info["special"]
-                        and active_boss_battle["burn_turns"] == 0
-                        and active_boss_battle["turn"] == 1
+                        and gs.boss_battle["burn_turns"] == 0
+                        and gs.boss_battle["turn"] == 1
                     ):
-                        active_boss_battle["burn_turns"] = boss_info["special"]["burn_turns"]
+                        gs.boss_battle["burn_turns"] = boss_info["special"]["burn_turns"]
                         heal_message += f"\n🔥 **{boss_info['special']['name']}!** You are burning for {boss_info['special']['burn_turns']} turns!"
 
                     heal_message += f"\n⚔️ **{boss_info['name']}** strikes for **{boss_damage} damage**!"
-                    active_boss_battle["player_hp"] -= boss_damage
+                    gs.boss_battle["player_hp"] -= boss_damage
 
-                    if active_boss_battle["burn_turns"] > 0:
+                    if gs.boss_battle["burn_turns"] > 0:
                         burn_damage = boss_info["special"]["burn_damage"]
-                        active_boss_battle["player_hp"] -= burn_damage
-                        active_boss_battle["burn_turns"] -= 1
-                        heal_message += f"\n🔥 Burn damage: {burn_damage} HP (Burn: {active_boss_battle['burn_turns']} turns remaining)"
+                        gs.boss_battle["player_hp"] -= burn_damage
+                        gs.boss_battle["burn_turns"] -= 1
+                        heal_message += f"\n🔥 Burn damage: {burn_damage} HP (Burn: {gs.boss_battle['burn_turns']} turns remaining)"
 
-                    if active_boss_battle["player_hp"] <= 0:
-                        active_boss_battle["player_hp"] = 0
+                    if gs.boss_battle["player_hp"] <= 0:
+                        gs.boss_battle["player_hp"] = 0
                         update_chi(user_id, -100)
                         save_data()
 
@@ -10858,18 +10818,18 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
                             color=discord.Color.dark_red(),
                         )
 
-                        active_boss_battle = None
+                        gs.boss_battle = None
                         await ctx.send(embed=embed)
                         return
 
-                    active_boss_battle["turn"] += 1
+                    gs.boss_battle["turn"] += 1
 
                     embed = discord.Embed(
                         title=f"{boss_info['emoji']} BOSS BATTLE",
                         description=(
                             f"{heal_message}\n\n"
-                            f"**Boss HP:** {active_boss_battle['boss_hp']}/{boss_info['hp']}\n"
-                            f"**Your HP:** {active_boss_battle['player_hp']}/{active_boss_battle['player_max_hp']}"
+                            f"**Boss HP:** {gs.boss_battle['boss_hp']}/{boss_info['hp']}\n"
+                            f"**Your HP:** {gs.boss_battle['player_hp']}/{gs.boss_battle['player_max_hp']}"
                         ),
                         color=discord.Color.green(),
                     )
@@ -10890,13 +10850,13 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
         item_level = get_item_level(user_id, item_found["name"])
         healing = calculate_healing_with_level(base_healing, user_level, item_level)
 
-        old_hp = active_boss_battle["player_hp"]
-        active_boss_battle["player_hp"] = min(
-            active_boss_battle["player_hp"] + healing, active_boss_battle["player_max_hp"]
+        old_hp = gs.boss_battle["player_hp"]
+        gs.boss_battle["player_hp"] = min(
+            gs.boss_battle["player_hp"] + healing, gs.boss_battle["player_max_hp"]
         )
-        actual_healing = active_boss_battle["player_hp"] - old_hp
+        actual_healing = gs.boss_battle["player_hp"] - old_hp
 
-        boss_info = BOSS_DATA[active_boss_battle["boss_key"]]
+        boss_info = BOSS_DATA[gs.boss_battle["boss_key"]]
         boss_damage = random.randint(boss_info["damage_min"], boss_info["damage_max"])
 
         heal_message = f"💚 {ctx.author.mention} used **{item_found['name']}** and healed for **{actual_healing} HP**!"
@@ -10908,33 +10868,33 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
 
         if (
             boss_info["special"].get("trigger_turn")
-            and active_boss_battle["turn"] % boss_info["special"]["trigger_turn"] == 0
+            and gs.boss_battle["turn"] % boss_info["special"]["trigger_turn"] == 0
         ):
             heal_amount = int(boss_info["hp"] * boss_info["special"]["heal_percent"])
-            active_boss_battle["boss_hp"] = min(active_boss_battle["boss_hp"] + heal_amount, boss_info["hp"])
+            gs.boss_battle["boss_hp"] = min(gs.boss_battle["boss_hp"] + heal_amount, boss_info["hp"])
             heal_message += f"\n🛡️ **{boss_info['special']['name']}!** Boss healed {heal_amount} HP!"
 
         if (
             "burn_damage" in boss_info["special"]
-            and active_boss_battle["burn_turns"] == 0
-            and active_boss_battle["turn"] == 1
+            and gs.boss_battle["burn_turns"] == 0
+            and gs.boss_battle["turn"] == 1
         ):
-            active_boss_battle["burn_turns"] = boss_info["special"]["burn_turns"]
+            gs.boss_battle["burn_turns"] = boss_info["special"]["burn_turns"]
             heal_message += f"\n🔥 **{boss_info['special']['name']}!** You are burning for {boss_info['special']['burn_turns']} turns!"
 
         heal_message += f"\n⚔️ **{boss_info['name']}** strikes for **{boss_damage} damage**!"
-        active_boss_battle["player_hp"] -= boss_damage
+        gs.boss_battle["player_hp"] -= boss_damage
 
-        if active_boss_battle["burn_turns"] > 0:
+        if gs.boss_battle["burn_turns"] > 0:
             burn_damage = boss_info["special"]["burn_damage"]
-            active_boss_battle["player_hp"] -= burn_damage
-            active_boss_battle["burn_turns"] -= 1
+            gs.boss_battle["player_hp"] -= burn_damage
+            gs.boss_battle["burn_turns"] -= 1
             heal_message += (
-                f"\n🔥 Burn damage: {burn_damage} HP (Burn: {active_boss_battle['burn_turns']} turns remaining)"
+                f"\n🔥 Burn damage: {burn_damage} HP (Burn: {gs.boss_battle['burn_turns']} turns remaining)"
             )
 
-        if active_boss_battle["player_hp"] <= 0:
-            active_boss_battle["player_hp"] = 0
+        if gs.boss_battle["player_hp"] <= 0:
+            gs.boss_battle["player_hp"] = 0
             update_chi(user_id, -100)
             save_data()
 
@@ -10948,18 +10908,18 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
                 color=discord.Color.dark_red(),
             )
 
-            active_boss_battle = None
+            gs.boss_battle = None
             await ctx.send(embed=embed)
             return
 
-        active_boss_battle["turn"] += 1
+        gs.boss_battle["turn"] += 1
 
         embed = discord.Embed(
             title=f"{boss_info['emoji']} BOSS BATTLE",
             description=(
                 f"{heal_message}\n\n"
-                f"**Boss HP:** {active_boss_battle['boss_hp']}/{boss_info['hp']}\n"
-                f"**Your HP:** {active_boss_battle['player_hp']}/{active_boss_battle['player_max_hp']}"
+                f"**Boss HP:** {gs.boss_battle['boss_hp']}/{boss_info['hp']}\n"
+                f"**Your HP:** {gs.boss_battle['player_hp']}/{gs.boss_battle['player_max_hp']}"
             ),
             color=discord.Color.green(),
         )
@@ -10967,16 +10927,16 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
         return
 
     if action == "run":
-        if active_boss_battle is None:
+        if gs.boss_battle is None:
             await ctx.send("⚔️ There's no active boss battle to flee from!")
             return
 
-        if ctx.author.id != active_boss_battle["player_id"]:
+        if ctx.author.id != gs.boss_battle["player_id"]:
             await ctx.send("⚔️ This is not your boss battle!")
             return
 
         user_id = str(ctx.author.id)
-        boss_info = BOSS_DATA[active_boss_battle["boss_key"]]
+        boss_info = BOSS_DATA[gs.boss_battle["boss_key"]]
 
         update_chi(user_id, -100)
         save_data()
@@ -10991,7 +10951,7 @@ async def boss(ctx, action: str = "", *, item_name: str = ""):
             color=discord.Color.dark_grey(),
         )
 
-        active_boss_battle = None
+        gs.boss_battle = None
         await ctx.send(embed=embed)
         return
 
@@ -11006,7 +10966,7 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
     - P!train attack <item> - Attack with weapon
     - P!train heal <item> - Heal with item
     """
-    global active_training, active_npc_training
+    gs = guild_states.get(ctx.guild)
 
     if not action_or_user:
         await ctx.send(
@@ -11018,11 +10978,11 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
 
     # Check if training against NPC
     if action_or_user in ["dummy", "easy", "medium", "hard"]:
-        if active_npc_training is not None:
+        if gs.npc_training is not None:
             await ctx.send("🎯 An NPC training session is already in progress! Finish it first.")
             return
 
-        if active_training is not None:
+        if gs.training is not None:
             await ctx.send("🥊 A player training session is already in progress! Wait for it to finish.")
             return
 
@@ -11042,7 +11002,7 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
         # Calculate HP based on artifacts and permanent upgrades
         player_hp = calculate_max_hp(ctx.author.id)
 
-        active_npc_training = {
+        gs.npc_training = {
             "player_id": ctx.author.id,
             "npc_key": npc_key,
             "npc_hp": npc_info["hp"],
@@ -11117,11 +11077,11 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
             )
             return
 
-        if active_training is not None:
+        if gs.training is not None:
             await ctx.send("🥊 A training session is already in progress! Wait for it to finish.")
             return
 
-        active_training = {
+        gs.training = {
             "challenger": ctx.author.id,
             "challenged": target.id,
             "status": "pending",
@@ -11141,26 +11101,26 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
         await ctx.send(embed=embed)
 
         await discord.utils.sleep_until(datetime.utcnow() + timedelta(minutes=2))
-        if active_training and active_training["status"] == "pending":
-            active_training = None
+        if gs.training and gs.training["status"] == "pending":
+            gs.training = None
             await ctx.send(f"🥊 {target.mention} didn't respond in time. The challenge has expired.")
         return
 
     if action_or_user == "accept":
-        if active_training is None:
+        if gs.training is None:
             await ctx.send("🥊 There's no active training challenge!")
             return
 
-        if ctx.author.id != active_training["challenged"]:
+        if ctx.author.id != gs.training["challenged"]:
             await ctx.send("🥊 This challenge isn't for you!")
             return
 
-        if active_training["status"] != "pending":
+        if gs.training["status"] != "pending":
             await ctx.send("🥊 This training has already started!")
             return
 
-        challenger_id = str(active_training["challenger"])
-        challenged_id = str(active_training["challenged"])
+        challenger_id = str(gs.training["challenger"])
+        challenged_id = str(gs.training["challenged"])
 
         if challenger_id not in chi_data:
             chi_data[challenger_id] = {
@@ -11182,17 +11142,17 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
         challenger_hp = 100 + (chi_data[challenger_id].get("rebirths", 0) * 25)
         challenged_hp = 100 + (chi_data[challenged_id].get("rebirths", 0) * 25)
 
-        active_training["status"] = "active"
-        active_training["challenger_hp"] = challenger_hp
-        active_training["challenged_hp"] = challenged_hp
-        active_training["challenger_max_hp"] = challenger_hp
-        active_training["challenged_max_hp"] = challenged_hp
-        active_training["turn"] = active_training["challenger"]
-        active_training["start_time"] = datetime.utcnow()
-        active_training["item_uses"] = {}
+        gs.training["status"] = "active"
+        gs.training["challenger_hp"] = challenger_hp
+        gs.training["challenged_hp"] = challenged_hp
+        gs.training["challenger_max_hp"] = challenger_hp
+        gs.training["challenged_max_hp"] = challenged_hp
+        gs.training["turn"] = gs.training["challenger"]
+        gs.training["start_time"] = datetime.utcnow()
+        gs.training["item_uses"] = {}
 
-        challenger = ctx.guild.get_member(active_training["challenger"])
-        challenged = ctx.guild.get_member(active_training["challenged"])
+        challenger = ctx.guild.get_member(gs.training["challenger"])
+        challenged = ctx.guild.get_member(gs.training["challenged"])
 
         embed = discord.Embed(
             title="🥊 TRAINING BEGINS!",
@@ -11204,20 +11164,20 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
         return
 
     if action_or_user == "deny":
-        if active_training is None:
+        if gs.training is None:
             await ctx.send("🥊 There's no active training challenge!")
             return
 
-        if ctx.author.id != active_training["challenged"]:
+        if ctx.author.id != gs.training["challenged"]:
             await ctx.send("🥊 This challenge isn't for you!")
             return
 
-        if active_training["status"] != "pending":
+        if gs.training["status"] != "pending":
             await ctx.send("🥊 This training has already started!")
             return
 
-        challenger = ctx.guild.get_member(active_training["challenger"])
-        active_training = None
+        challenger = ctx.guild.get_member(gs.training["challenger"])
+        gs.training = None
 
         await ctx.send(
             f"🐼 *Aw sorry... {ctx.author.mention} doesn't want to train with you, {challenger.mention}. Maybe another time!*"
@@ -11226,8 +11186,8 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
 
     if action_or_user == "attack":
         # Check for NPC training first
-        if active_npc_training is not None:
-            if ctx.author.id != active_npc_training["player_id"]:
+        if gs.npc_training is not None:
+            if ctx.author.id != gs.npc_training["player_id"]:
                 await ctx.send("🎯 This is not your NPC training session!")
                 return
 
@@ -11323,7 +11283,7 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
                     chi_data[user_id]["custom_attacks"][weapon_name] = []
 
                 # Check if using same attack as last turn
-                last_attack = active_npc_training.get("last_attack")
+                last_attack = gs.npc_training.get("last_attack")
                 if last_attack and last_attack.lower() == custom_attack.lower():
                     await ctx.send(
                         f"❌ You can't use the same attack **{custom_attack}** twice in a row! Choose a different attack."
@@ -11331,7 +11291,7 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
                     return
 
                 # Store this attack as the last used
-                active_npc_training["last_attack"] = custom_attack
+                gs.npc_training["last_attack"] = custom_attack
 
                 preconfigured_attacks = item_found.get("custom_attacks", {})
                 attack_found = None
@@ -11363,8 +11323,8 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
                     damage_variation = (attack_hash % 41) - 20  # Range: -20 to +20
                     damage = max(1, damage + damage_variation)
 
-            active_npc_training["npc_hp"] -= damage
-            npc_info = NPC_DATA[active_npc_training["npc_key"]]
+            gs.npc_training["npc_hp"] -= damage
+            npc_info = NPC_DATA[gs.npc_training["npc_key"]]
 
             if custom_attack:
                 await ctx.send(
@@ -11376,14 +11336,14 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
                 )
 
             # Check if NPC is defeated
-            if active_npc_training["npc_hp"] <= 0:
+            if gs.npc_training["npc_hp"] <= 0:
                 chi_reward = {"dummy": 0, "easy": 40, "medium": 75, "hard": 150}[
-                    active_npc_training["npc_key"]
+                    gs.npc_training["npc_key"]
                 ]  # Moderate 50-60% increase
                 if chi_reward > 0:
                     update_chi(user_id, chi_reward)
 
-                active_npc_training = None
+                gs.npc_training = None
 
                 embed = discord.Embed(
                     title="🏆 TRAINING COMPLETE!",
@@ -11398,16 +11358,16 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
                 return
 
             # NPC's turn (except dummy)
-            if active_npc_training["npc_key"] != "dummy":
+            if gs.npc_training["npc_key"] != "dummy":
                 npc_damage = random.randint(npc_info["damage_min"], npc_info["damage_max"])
-                active_npc_training["player_hp"] -= npc_damage
+                gs.npc_training["player_hp"] -= npc_damage
 
                 await ctx.send(f"{npc_info['emoji']} {npc_info['name']} counterattacks for **{npc_damage} damage**!")
 
                 # Check if player is defeated
-                if active_npc_training["player_hp"] <= 0:
+                if gs.npc_training["player_hp"] <= 0:
                     update_chi(user_id, -50)
-                    active_npc_training = None
+                    gs.npc_training = None
 
                     embed = discord.Embed(
                         title="💀 DEFEATED!",
@@ -11420,18 +11380,18 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
             # Display status
             embed = discord.Embed(
                 title=f"{npc_info['emoji']} Training Status",
-                description=f"**HP:**\n{ctx.author.mention}: {active_npc_training['player_hp']}/{active_npc_training['player_max_hp']} HP\n{npc_info['emoji']} {npc_info['name']}: {active_npc_training['npc_hp']}/{active_npc_training['npc_max_hp']} HP\n\n{ctx.author.mention}'s turn!",
+                description=f"**HP:**\n{ctx.author.mention}: {gs.npc_training['player_hp']}/{gs.npc_training['player_max_hp']} HP\n{npc_info['emoji']} {npc_info['name']}: {gs.npc_training['npc_hp']}/{gs.npc_training['npc_max_hp']} HP\n\n{ctx.author.mention}'s turn!",
                 color=discord.Color.blue(),
             )
             await ctx.send(embed=embed)
             return
 
         # Regular player vs player training
-        if active_training is None or active_training["status"] != "active":
+        if gs.training is None or gs.training["status"] != "active":
             await ctx.send("🥊 There's no active training session right now!")
             return
 
-        if ctx.author.id != active_training["turn"]:
+        if ctx.author.id != gs.training["turn"]:
             await ctx.send("🥊 It's not your turn!")
             return
 
@@ -11518,22 +11478,22 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
 
         if "uses" in item_found:
             use_key = f"{user_id}_{item_found['name']}"
-            current_uses = active_training["item_uses"].get(use_key, 0)
+            current_uses = gs.training["item_uses"].get(use_key, 0)
             if current_uses >= item_found["uses"]:
                 await ctx.send(f"❌ {item_found['name']} has no uses left! You need to buy it again.")
                 return
-            active_training["item_uses"][use_key] = current_uses + 1
+            gs.training["item_uses"][use_key] = current_uses + 1
 
-        if ctx.author.id == active_training["challenger"]:
-            active_training["challenged_hp"] -= damage
-            opponent_id = active_training["challenged"]
-            opponent_hp = active_training["challenged_hp"]
-            active_training["turn"] = active_training["challenged"]
+        if ctx.author.id == gs.training["challenger"]:
+            gs.training["challenged_hp"] -= damage
+            opponent_id = gs.training["challenged"]
+            opponent_hp = gs.training["challenged_hp"]
+            gs.training["turn"] = gs.training["challenged"]
         else:
-            active_training["challenger_hp"] -= damage
-            opponent_id = active_training["challenger"]
-            opponent_hp = active_training["challenger_hp"]
-            active_training["turn"] = active_training["challenger"]
+            gs.training["challenger_hp"] -= damage
+            opponent_id = gs.training["challenger"]
+            opponent_hp = gs.training["challenger_hp"]
+            gs.training["turn"] = gs.training["challenger"]
 
         opponent = ctx.guild.get_member(opponent_id)
 
@@ -11548,7 +11508,7 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
                 chi_data[user_id]["custom_attacks"][weapon_name] = []
 
             # Check if using same attack as last turn
-            last_attack = active_training.get("last_attack", {}).get(str(ctx.author.id))
+            last_attack = gs.training.get("last_attack", {}).get(str(ctx.author.id))
             if last_attack and last_attack.lower() == custom_attack.lower():
                 await ctx.send(
                     f"❌ You can't use the same attack **{custom_attack}** twice in a row! Choose a different attack."
@@ -11556,9 +11516,9 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
                 return
 
             # Store this attack as the last used
-            if "last_attack" not in active_training:
-                active_training["last_attack"] = {}
-            active_training["last_attack"][str(ctx.author.id)] = custom_attack
+            if "last_attack" not in gs.training:
+                gs.training["last_attack"] = {}
+            gs.training["last_attack"][str(ctx.author.id)] = custom_attack
 
             preconfigured_attacks = item_found.get("custom_attacks", {})
             attack_found = None
@@ -11580,14 +11540,14 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
                 modified_damage = random.randint(min_dmg, max_dmg)
 
                 # Update opponent HP with modified damage
-                if ctx.author.id == active_training["challenger"]:
-                    active_training["challenged_hp"] += damage  # Undo base damage
-                    active_training["challenged_hp"] -= modified_damage
-                    opponent_hp = active_training["challenged_hp"]
+                if ctx.author.id == gs.training["challenger"]:
+                    gs.training["challenged_hp"] += damage  # Undo base damage
+                    gs.training["challenged_hp"] -= modified_damage
+                    opponent_hp = gs.training["challenged_hp"]
                 else:
-                    active_training["challenger_hp"] += damage  # Undo base damage
-                    active_training["challenger_hp"] -= modified_damage
-                    opponent_hp = active_training["challenger_hp"]
+                    gs.training["challenger_hp"] += damage  # Undo base damage
+                    gs.training["challenger_hp"] -= modified_damage
+                    opponent_hp = gs.training["challenger_hp"]
 
                 await ctx.send(
                     f"🥊 {ctx.author.mention} used **{weapon_name}** to unleash *{custom_attack}* and dealt **{modified_damage} damage** to {opponent.mention}!"
@@ -11605,14 +11565,14 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
                 modified_damage = max(1, damage + damage_variation)
 
                 # Update opponent HP with modified damage
-                if ctx.author.id == active_training["challenger"]:
-                    active_training["challenged_hp"] += damage  # Undo base damage
-                    active_training["challenged_hp"] -= modified_damage
-                    opponent_hp = active_training["challenged_hp"]
+                if ctx.author.id == gs.training["challenger"]:
+                    gs.training["challenged_hp"] += damage  # Undo base damage
+                    gs.training["challenged_hp"] -= modified_damage
+                    opponent_hp = gs.training["challenged_hp"]
                 else:
-                    active_training["challenger_hp"] += damage  # Undo base damage
-                    active_training["challenger_hp"] -= modified_damage
-                    opponent_hp = active_training["challenger_hp"]
+                    gs.training["challenger_hp"] += damage  # Undo base damage
+                    gs.training["challenger_hp"] -= modified_damage
+                    opponent_hp = gs.training["challenger_hp"]
 
                 await ctx.send(
                     f"🥊 {ctx.author.mention} used **{weapon_name}** to unleash *{custom_attack}* and dealt **{modified_damage} damage** to {opponent.mention}!"
@@ -11625,10 +11585,10 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
         if opponent_hp <= 0:
             winner = ctx.author
             loser = opponent
-            is_tournament = active_training.get("is_tournament", False)
+            is_tournament = gs.training.get("is_tournament", False)
 
             bet_results = process_duel_bets(winner.id, ctx.guild)
-            active_training = None
+            gs.training = None
 
             winner_id = str(winner.id)
             loser_id = str(loser.id)
@@ -11664,14 +11624,14 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
             embed = discord.Embed(title="🏆 TRAINING COMPLETE!", description=description, color=discord.Color.blue())
             await ctx.send(embed=embed)
         else:
-            next_turn_user = ctx.guild.get_member(active_training["turn"])
+            next_turn_user = ctx.guild.get_member(gs.training["turn"])
 
-            challenger = ctx.guild.get_member(active_training["challenger"])
-            challenged = ctx.guild.get_member(active_training["challenged"])
+            challenger = ctx.guild.get_member(gs.training["challenger"])
+            challenged = ctx.guild.get_member(gs.training["challenged"])
 
             embed = discord.Embed(
                 title="🥊 Training Status",
-                description=f"**HP:**\n{challenger.mention}: {active_training['challenger_hp']}/{active_training['challenger_max_hp']} HP\n{challenged.mention}: {active_training['challenged_hp']}/{active_training['challenged_max_hp']} HP\n\n{next_turn_user.mention}'s turn!",
+                description=f"**HP:**\n{challenger.mention}: {gs.training['challenger_hp']}/{gs.training['challenger_max_hp']} HP\n{challenged.mention}: {gs.training['challenged_hp']}/{gs.training['challenged_max_hp']} HP\n\n{next_turn_user.mention}'s turn!",
                 color=discord.Color.blue(),
             )
             await ctx.send(embed=embed)
@@ -11679,8 +11639,8 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
 
     if action_or_user == "heal":
         # Check for NPC training first
-        if active_npc_training is not None:
-            if ctx.author.id != active_npc_training["player_id"]:
+        if gs.npc_training is not None:
+            if ctx.author.id != gs.npc_training["player_id"]:
                 await ctx.send("🎯 This is not your NPC training session!")
                 return
 
@@ -11714,28 +11674,28 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
             item_level = get_item_level(ctx.author.id, item_found["name"])
             healing = calculate_healing_with_level(base_healing, user_level, item_level)
 
-            old_hp = active_npc_training["player_hp"]
-            active_npc_training["player_hp"] = min(
-                active_npc_training["player_hp"] + healing, active_npc_training["player_max_hp"]
+            old_hp = gs.npc_training["player_hp"]
+            gs.npc_training["player_hp"] = min(
+                gs.npc_training["player_hp"] + healing, gs.npc_training["player_max_hp"]
             )
-            actual_healing = active_npc_training["player_hp"] - old_hp
+            actual_healing = gs.npc_training["player_hp"] - old_hp
 
-            npc_info = NPC_DATA[active_npc_training["npc_key"]]
+            npc_info = NPC_DATA[gs.npc_training["npc_key"]]
             await ctx.send(
                 f"💚 {ctx.author.mention} used **{item_found['name']}** and healed for **{actual_healing} HP**!"
             )
 
             # NPC's turn (except dummy)
-            if active_npc_training["npc_key"] != "dummy":
+            if gs.npc_training["npc_key"] != "dummy":
                 npc_damage = random.randint(npc_info["damage_min"], npc_info["damage_max"])
-                active_npc_training["player_hp"] -= npc_damage
+                gs.npc_training["player_hp"] -= npc_damage
 
                 await ctx.send(f"{npc_info['emoji']} {npc_info['name']} attacks for **{npc_damage} damage**!")
 
                 # Check if player is defeated
-                if active_npc_training["player_hp"] <= 0:
+                if gs.npc_training["player_hp"] <= 0:
                     update_chi(user_id, -50)
-                    active_npc_training = None
+                    gs.npc_training = None
 
                     embed = discord.Embed(
                         title="💀 DEFEATED!",
@@ -11748,18 +11708,18 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
             # Display status
             embed = discord.Embed(
                 title=f"{npc_info['emoji']} Training Status",
-                description=f"**HP:**\n{ctx.author.mention}: {active_npc_training['player_hp']}/{active_npc_training['player_max_hp']} HP\n{npc_info['emoji']} {npc_info['name']}: {active_npc_training['npc_hp']}/{active_npc_training['npc_max_hp']} HP\n\n{ctx.author.mention}'s turn!",
+                description=f"**HP:**\n{ctx.author.mention}: {gs.npc_training['player_hp']}/{gs.npc_training['player_max_hp']} HP\n{npc_info['emoji']} {npc_info['name']}: {gs.npc_training['npc_hp']}/{gs.npc_training['npc_max_hp']} HP\n\n{ctx.author.mention}'s turn!",
                 color=discord.Color.green(),
             )
             await ctx.send(embed=embed)
             return
 
         # Regular player vs player training attack
-        if active_training is None or active_training["status"] != "active":
+        if gs.training is None or gs.training["status"] != "active":
             await ctx.send("🥊 There's no active training session right now!")
             return
 
-        if ctx.author.id != active_training["turn"]:
+        if ctx.author.id != gs.training["turn"]:
             await ctx.send("🥊 It's not your turn!")
             return
 
@@ -11791,31 +11751,31 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
         item_level = get_item_level(ctx.author.id, item_found["name"])
         healing = calculate_healing_with_level(base_healing, user_level, item_level)
 
-        if ctx.author.id == active_training["challenger"]:
-            old_hp = active_training["challenger_hp"]
-            active_training["challenger_hp"] = min(
-                active_training["challenger_hp"] + healing, active_training["challenger_max_hp"]
+        if ctx.author.id == gs.training["challenger"]:
+            old_hp = gs.training["challenger_hp"]
+            gs.training["challenger_hp"] = min(
+                gs.training["challenger_hp"] + healing, gs.training["challenger_max_hp"]
             )
-            actual_healing = active_training["challenger_hp"] - old_hp
-            active_training["turn"] = active_training["challenged"]
+            actual_healing = gs.training["challenger_hp"] - old_hp
+            gs.training["turn"] = gs.training["challenged"]
         else:
-            old_hp = active_training["challenged_hp"]
-            active_training["challenged_hp"] = min(
-                active_training["challenged_hp"] + healing, active_training["challenged_max_hp"]
+            old_hp = gs.training["challenged_hp"]
+            gs.training["challenged_hp"] = min(
+                gs.training["challenged_hp"] + healing, gs.training["challenged_max_hp"]
             )
-            actual_healing = active_training["challenged_hp"] - old_hp
-            active_training["turn"] = active_training["challenger"]
+            actual_healing = gs.training["challenged_hp"] - old_hp
+            gs.training["turn"] = gs.training["challenger"]
 
         await ctx.send(f"💚 {ctx.author.mention} used **{item_found['name']}** and healed for **{actual_healing} HP**!")
 
-        next_turn_user = ctx.guild.get_member(active_training["turn"])
+        next_turn_user = ctx.guild.get_member(gs.training["turn"])
 
-        challenger = ctx.guild.get_member(active_training["challenger"])
-        challenged = ctx.guild.get_member(active_training["challenged"])
+        challenger = ctx.guild.get_member(gs.training["challenger"])
+        challenged = ctx.guild.get_member(gs.training["challenged"])
 
         embed = discord.Embed(
             title="🥊 Training Status",
-            description=f"**HP:**\n{challenger.mention}: {active_training['challenger_hp']}/{active_training['challenger_max_hp']} HP\n{challenged.mention}: {active_training['challenged_hp']}/{active_training['challenged_max_hp']} HP\n\n{next_turn_user.mention}'s turn!",
+            description=f"**HP:**\n{challenger.mention}: {gs.training['challenger_hp']}/{gs.training['challenger_max_hp']} HP\n{challenged.mention}: {gs.training['challenged_hp']}/{gs.training['challenged_max_hp']} HP\n\n{next_turn_user.mention}'s turn!",
             color=discord.Color.green(),
         )
         await ctx.send(embed=embed)
@@ -11823,16 +11783,16 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
 
     if action_or_user == "run":
         # Check for NPC training first
-        if active_npc_training is not None:
-            if ctx.author.id != active_npc_training["player_id"]:
+        if gs.npc_training is not None:
+            if ctx.author.id != gs.npc_training["player_id"]:
                 await ctx.send("🎯 This is not your NPC training session!")
                 return
 
             user_id = str(ctx.author.id)
-            npc_info = NPC_DATA[active_npc_training["npc_key"]]
+            npc_info = NPC_DATA[gs.npc_training["npc_key"]]
 
             update_chi(user_id, -50)
-            active_npc_training = None
+            gs.npc_training = None
 
             embed = discord.Embed(
                 title="🏃 RETREAT!",
@@ -11843,28 +11803,28 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
             return
 
         # Regular player vs player training run
-        if active_training is None or active_training["status"] != "active":
+        if gs.training is None or gs.training["status"] != "active":
             await ctx.send("🥊 There's no active training to run from!")
             return
 
-        if ctx.author.id not in [active_training["challenger"], active_training["challenged"]]:
+        if ctx.author.id not in [gs.training["challenger"], gs.training["challenged"]]:
             await ctx.send("🥊 You're not in this training!")
             return
 
         runner = ctx.author
-        if ctx.author.id == active_training["challenger"]:
-            winner_id = active_training["challenged"]
+        if ctx.author.id == gs.training["challenger"]:
+            winner_id = gs.training["challenged"]
         else:
-            winner_id = active_training["challenger"]
+            winner_id = gs.training["challenger"]
 
         winner = ctx.guild.get_member(winner_id)
         if not winner:
             await ctx.send("🥊 Error: Could not find the other person!")
-            active_training = None
+            gs.training = None
             return
 
         bet_results = process_duel_bets(winner_id, ctx.guild)
-        active_training = None
+        gs.training = None
 
         runner_id = str(runner.id)
         winner_id_str = str(winner_id)
@@ -11893,11 +11853,11 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
         return
 
     if action_or_user == "bet":
-        if active_training is None or active_training["status"] != "active":
+        if gs.training is None or gs.training["status"] != "active":
             await ctx.send("🥊 There's no active training to bet on right now!")
             return
 
-        if ctx.author.id in [active_training["challenger"], active_training["challenged"]]:
+        if ctx.author.id in [gs.training["challenger"], gs.training["challenged"]]:
             await ctx.send("💰 You can't bet on a training you're in!")
             return
 
@@ -11917,7 +11877,7 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
 
         bet_on_user = ctx.message.mentions[0]
 
-        if bet_on_user.id not in [active_training["challenger"], active_training["challenged"]]:
+        if bet_on_user.id not in [gs.training["challenger"], gs.training["challenged"]]:
             await ctx.send("🥊 You can only bet on one of the trainers!")
             return
 
@@ -11935,12 +11895,12 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
             await ctx.send(f"❌ You don't have enough chi! You have {chi_data[bettor_id]['chi']} chi.")
             return
 
-        for bet in active_training["bets"]:
+        for bet in gs.training["bets"]:
             if bet["bettor_id"] == ctx.author.id:
                 await ctx.send("💰 You've already placed a bet on this training!")
                 return
 
-        active_training["bets"].append(
+        gs.training["bets"].append(
             {"bettor_id": ctx.author.id, "bet_amount": bet_amount, "bet_on_user_id": bet_on_user.id}
         )
 
@@ -11951,7 +11911,7 @@ async def train(ctx, action_or_user: str = "", mode_or_item: str = "", *, item_n
             description=f"{ctx.author.mention} bet **{bet_amount} chi** on {bet_on_user.mention}!\n\n✅ **Win:** Gain {bet_amount * 2} chi (net +{bet_amount} chi)\n❌ **Lose:** Lose {bet_amount} chi",
             color=discord.Color.gold(),
         )
-        embed.set_footer(text=f"Total bets on this training: {len(active_training['bets'])}")
+        embed.set_footer(text=f"Total bets on this training: {len(gs.training['bets'])}")
         await ctx.send(embed=embed)
         return
 
@@ -12781,118 +12741,126 @@ async def upgrade(ctx, *, item_name: str = ""):
 
 @tasks.loop(seconds=30)
 async def duel_timeout_check():
-    """Check if active duel has exceeded 10 minute time limit"""
-    global active_duel
-
-    if active_duel is not None and active_duel["status"] == "active":
-        time_elapsed = (datetime.utcnow() - active_duel["start_time"]).total_seconds()
-
-        if time_elapsed >= 600:
-            guild = bot.get_guild(active_duel["guild_id"])
-            if guild:
-                channel = guild.get_channel(active_duel["channel_id"])
-                if channel and isinstance(channel, discord.TextChannel):
-                    challenger = guild.get_member(active_duel["challenger"])
-                    challenged = guild.get_member(active_duel["challenged"])
+    """Check if any guild's active duel has exceeded the 10 minute time limit"""
+    for gs in guild_states:
+        if gs.duel is not None and gs.duel["status"] == "active":
+            time_elapsed = (datetime.utcnow() - gs.duel["start_time"]).total_seconds()
+
+            if time_elapsed >= 600:
+                guild = bot.get_guild(gs.duel["guild_id"])
+                if guild:
+                    channel = guild.get_channel(gs.duel["channel_id"])
+                    if channel and isinstance(channel, discord.TextChannel):
+                        challenger = guild.get_member(gs.duel["challenger"])
+                        challenged = guild.get_member(gs.duel["challenged"])
 
-                    if challenger and challenged:
-                        description = f"The duel between {challenger.mention} and {challenged.mention} has exceeded 10 minutes!\n\n**Final HP:**\n{challenger.mention}: {active_duel['challenger_hp']} HP\n{challenged.mention}: {active_duel['challenged_hp']} HP\n\nNo winner declared!"
+                        if challenger and challenged:
+                            description = f"The duel between {challenger.mention} and {challenged.mention} has exceeded 10 minutes!\n\n**Final HP:**\n{challenger.mention}: {gs.duel['challenger_hp']} HP\n{challenged.mention}: {gs.duel['challenged_hp']} HP\n\nNo winner declared!"
 
-                        if active_duel.get("bets"):
-                            description += "\n\n**💰 All bets refunded due to timeout!**"
-                            for bet in active_duel["bets"]:
-                                bettor_id = str(bet["bettor_id"])
-                                bet_amount = bet["bet_amount"]
-                                update_chi(bettor_id, bet_amount)
+                            if gs.duel.get("bets"):
+                                description += "\n\n**💰 All bets refunded due to timeout!**"
+                                for bet in gs.duel["bets"]:
+                                    bettor_id = str(bet["bettor_id"])
+                                    bet_amount = bet["bet_amount"]
+                                    update_chi(bettor_id, bet_amount)
 
-                        # Update team duel stats - both teams get a tie
-                        challenger_id = str(active_duel["challenger"])
-                        challenged_id = str(active_duel["challenged"])
+                            # Update team duel stats - both teams get a tie
+                            challenger_id = str(gs.duel["challenger"])
+                            challenged_id = str(gs.duel["challenged"])
 
-                        if challenger_id in teams_data["user_teams"]:
-                            challenger_team_id = teams_data["user_teams"][challenger_id]
-                            teams_data["teams"][challenger_team_id]["duel_stats"]["ties"] += 1
+                            if challenger_id in teams_data["user_teams"]:
+                                challenger_team_id = teams_data["user_teams"][challenger_id]
+                                teams_data["teams"][challenger_team_id]["duel_stats"]["ties"] += 1
 
-                        if challenged_id in teams_data["user_teams"]:
-                            challenged_team_id = teams_data["user_teams"][challenged_id]
-                            teams_data["teams"][challenged_team_id]["duel_stats"]["ties"] += 1
+                            if challenged_id in teams_data["user_teams"]:
+                                challenged_team_id = teams_data["user_teams"][challenged_id]
+                                teams_data["teams"][challenged_team_id]["duel_stats"]["ties"] += 1
 
-                        save_teams()
+                            save_teams()
 
-                        embed = discord.Embed(
-                            title="⏱️ DUEL TIMEOUT!", description=description, color=discord.Color.dark_grey()
-                        )
-                        await channel.send(embed=embed)
+                            embed = discord.Embed(
+                                title="⏱️ DUEL TIMEOUT!", description=description, color=discord.Color.dark_grey()
+                            )
+                            await channel.send(embed=embed)
 
-            active_duel = None
+                gs.duel = None
 
 
 @tasks.loop(seconds=30)
 async def training_timeout_check():
-    """Check if active training has exceeded 10 minute time limit"""
-    global active_training
+    """Check if any guild's active training has exceeded the 10 minute time limit"""
+    for gs in guild_states:
+        if gs.training is not None and gs.training["status"] == "active":
+            time_elapsed = (datetime.utcnow() - gs.training["start_time"]).total_seconds()
+
+            if time_elapsed >= 600:
+                guild = bot.get_guild(gs.training["guild_id"])
+                if guild:
+                    channel = guild.get_channel(gs.training["channel_id"])
+                    if channel and isinstance(channel, discord.TextChannel):
+                        challenger = guild.get_member(gs.training["challenger"])
+                        challenged = guild.get_member(gs.training["challenged"])
 
-    if active_training is not None and active_training["status"] == "active":
-        time_elapsed = (datetime.utcnow() - active_training["start_time"]).total_seconds()
+                        if challenger and challenged:
+                            description = f"The training between {challenger.mention} and {challenged.mention} has exceeded 10 minutes!\n\n**Final HP:**\n{challenger.mention}: {gs.training['challenger_hp']} HP\n{challenged.mention}: {gs.training['challenged_hp']} HP\n\nNo winner declared!"
 
-        if time_elapsed >= 600:
-            guild = bot.get_guild(active_training["guild_id"])
-            if guild:
-                channel = guild.get_channel(active_training["channel_id"])
-                if channel and isinstance(channel, discord.TextChannel):
-                    challenger = guild.get_member(active_training["challenger"])
-                    challenged = guild.get_member(active_training["challenged"])
+                            if gs.training.get("bets"):
+                                description += "\n\n**💰 All bets refunded due to timeout!**"
+                                for bet in gs.training["bets"]:
+                                    bettor_id = str(bet["bettor_id"])
+                                    bet_amount = bet["bet_amount"]
+                                    update_chi(bettor_id, bet_amount)
 
-                    if challenger and challenged:
-                        description = f"The training between {challenger.mention} and {challenged.mention} has exceeded 10 minutes!\n\n**Final HP:**\n{challenger.mention}: {active_training['challenger_hp']} HP\n{challenged.mention}: {active_training['challenged_hp']} HP\n\nNo winner declared!"
+                            # Update team duel stats - both teams get a tie
+                            challenger_id = str(gs.training["challenger"])
+                            challenged_id = str(gs.training["challenged"])
 
-                        if active_training.get("bets"):
-                            description += "\n\n**💰 All bets refunded due to timeout!**"
-                            for bet in active_training["bets"]:
-                                bettor_id = str(bet["bettor_id"])
-                                bet_amount = bet["bet_amount"]
-                                update_chi(bettor_id, bet_amount)
+                            if challenger_id in teams_data["user_teams"]:
+                                challenger_team_id = teams_data["user_teams"][challenger_id]
+                                teams_data["teams"][challenger_team_id]["duel_stats"]["ties"] += 1
 
-                        # Update team duel stats - both teams get a tie
-                        challenger_id = str(active_training["challenger"])
-                        challenged_id = str(active_training["challenged"])
+                            if challenged_id in teams_data["user_teams"]:
+                                challenged_team_id = teams_data["user_teams"][challenged_id]
+                                teams_data["teams"][challenged_team_id]["duel_stats"]["ties"] += 1
 
-                        if challenger_id in teams_data["user_teams"]:
-                            challenger_team_id = teams_data["user_teams"][challenger_id]
-                            teams_data["teams"][challenger_team_id]["duel_stats"]["ties"] += 1
+                            save_teams()
 
-                        if challenged_id in teams_data["user_teams"]:
-                            challenged_team_id = teams_data["user_teams"][challenged_id]
-                            teams_data["teams"][challenged_team_id]["duel_stats"]["ties"] += 1
+                            embed = discord.Embed(
+                                title="⏱️ TRAINING TIMEOUT!", description=description, color=discord.Color.dark_grey()
+                            )
+                            await channel.send(embed=embed)
 
-                        save_teams()
+                gs.training = None
 
-                        embed = discord.Embed(
-                            title="⏱️ TRAINING TIMEOUT!", description=description, color=discord.Color.dark_grey()
-                        )
-                        await channel.send(embed=embed)
 
-            active_training = None
+def schedule_next_chi_event(gs):
+    gs.next_event_time = datetime.now(timezone.utc) + timedelta(
+        seconds=random.randint(CHI_EVENT_MIN_INTERVAL, CHI_EVENT_MAX_INTERVAL)
+    )
 
 
 @tasks.loop(seconds=60)
 async def chi_event_scheduler():
-    global event_active, event_claimer, current_event_message, current_event_type, next_event_time
-    if event_active:
-        return
+    """Start due chi events, each guild on its own schedule"""
+    now = datetime.now(timezone.utc)
+    for guild in bot.guilds:
+        # Only guilds with a live state (active within GUILD_STATE_IDLE_SECONDS) get events
+        gs = guild_states.peek(guild)
+        if gs is None or gs.event_active or (gs.event_task is not None and not gs.event_task.done()):
+            continue
+        if gs.next_event_time is None:
+            schedule_next_chi_event(gs)
+            continue
+        if now < gs.next_event_time:
+            continue
+        # Each event waits for its claim window - run it as a task so one guild doesn't hold up the rest
+        gs.event_task = asyncio.create_task(run_chi_event(guild, gs))
 
-    # Use timezone-aware UTC now to compare against possibly-aware next_event_time
-    try:
-        now = datetime.now(timezone.utc)
-    except Exception:
-        now = datetime.utcnow()
-    if next_event_time is None or now < next_event_time:
-        return
+    # Forget guilds that have been quiet for a day (their data stays in the files / database)
+    guild_states.evict_idle(GUILD_STATE_IDLE_SECONDS)
 
-    guild = bot.guilds[0] if bot.guilds else None
-    if not guild:
-        return
 
+async def run_chi_event(guild, gs):
     # Use guild config to get event channel, fallback to first available text channel
     guild_id = str(guild.id)
     event_channel_id = get_config_value(guild_id, "channels.log_channel_id")
@@ -12903,11 +12871,12 @@ async def chi_event_scheduler():
         # Fallback: use first available text channel with send permissions
         channel = next((ch for ch in guild.text_channels if ch.permissions_for(guild.me).send_messages), None)
 
+    schedule_next_chi_event(gs)
     if not channel or not isinstance(channel, discord.TextChannel):
         return
 
     event_type = random.choice(["positive", "negative"])
-    current_event_type = event_type
+    gs.event_type = event_type
 
     if event_type == "positive":
         embed = discord.Embed(
@@ -12922,19 +12891,19 @@ async def chi_event_scheduler():
             color=discord.Color.dark_red(),
         )
 
-    current_event_message = await channel.send(embed=embed)
-    event_active = True
-    event_claimer = None
-
-    next_event_time = datetime.utcnow() + timedelta(
-        seconds=random.randint(CHI_EVENT_MIN_INTERVAL, CHI_EVENT_MAX_INTERVAL)
-    )
-
-    await discord.utils.sleep_until(datetime.utcnow() + timedelta(seconds=CHI_EVENT_CLAIM_TIME))
-    if event_active:
-        event_active = False
-        event_claimer = None
-        await current_event_message.edit(
+    try:
+        gs.event_message = await channel.send(embed=embed)
+    except discord.HTTPException as e:
+        print(f"⚠️ Could not start chi event in guild {guild.id}: {e}")
+        return
+    gs.event_active = True
+    gs.event_claimer = None
+
+    await asyncio.sleep(CHI_EVENT_CLAIM_TIME)
+    if gs.event_active:
+        gs.event_active = False
+        gs.event_claimer = None
+        await gs.event_message.edit(
             embed=discord.Embed(
                 title=f"{'✨' if event_type == 'positive' else '💀'}🐼 Chi Event Expired!",
                 description="No one claimed it in time… maybe next round!",
@@ -13068,120 +13037,146 @@ async def monthly_reset_check():
         quest_data["quests"] = quests
         quest_data["user_progress"] = {}
         save_quests()
-        guild = bot.guilds[0] if bot.guilds else None
-        if guild:
+        embed = discord.Embed(title=f"🎯 {theme_name} Quests for this Month", color=discord.Color.orange())
+        for q in quests:
+            embed.add_field(name="\u200b", value=q, inline=False)
+        for guild in bot.guilds:
             channel = get_guild_channel_obj(guild, "log_channel_id")
             if not channel:
                 channel = next((ch for ch in guild.text_channels if ch.permissions_for(guild.me).send_messages), None)
             if channel and isinstance(channel, discord.TextChannel):
-                embed = discord.Embed(title=f"🎯 {theme_name} Quests for this Month", color=discord.Color.orange())
-                for q in quests:
-                    embed.add_field(name="\u200b", value=q, inline=False)
-                await channel.send(embed=embed)
-
+                try:
+                    await channel.send(embed=embed)
+                except discord.HTTPException as e:
+                    print(f"⚠️ Could not announce monthly quests in guild {guild.id}: {e}")
 
-@tasks.loop(minutes=1)
-async def database_sync_task():
-    """Periodically sync all critical data to database for persistence (every 1 minute for fast persistence)"""
-    if not db.pool:
-        return
 
+@tasks.loop(seconds=30)
+async def config_watch_task():
+    """Pick up hand edits to server_config.json (disable with PAX_CONFIG_WATCH=0)"""
     try:
-        # Sync ALL users to database (fast bulk operation)
-        for user_id_str in list(chi_data.keys()):
-            try:
-                await sync_user_to_db(int(user_id_str))
-            except Exception:
-                pass
+        if guild_configs.check_for_changes():
+            print("🔄 server_config.json changed on disk - reloaded guild configs")
+    except Exception as e:
+        print(f"⚠️ Config watch failed: {e}")
 
-        # Sync all teams data (FULL data including members, decorations, upgrades)
-        # DISABLED: Deprecated bulk method - use guild-aware team sync instead
-        # try:
-        #     await db.save_all_teams_data(teams_data)
-        # except Exception as e:
-        #     print(f"⚠️ Failed to sync teams to database: {e}")
 
-        # Sync ALL gardens to database (critical for persistence)
-        gardens = gardens_data.get("gardens", {})
-        for user_id_str in list(gardens.keys()):
-            try:
-                await sync_garden_to_db(int(user_id_str))
-            except Exception:
-                pass
+@tasks.loop(minutes=1)
+async def database_sync_task():
+    """Periodically sync changed users and gardens to the database (every 1 minute for fast persistence)"""
+    if not db.pool or not bot.guilds:
+        return
 
-    except Exception as e:
-        print(f"⚠️ Database sync failed: {e}")
+    # Sync teams data (FULL data including members, decorations, upgrades)
+    # DISABLED: Deprecated bulk method - use guild-aware team sync instead
+
+    # Group users and gardens by the guild whose rows hold them.  Only guilds loaded
+    # from the database are synced: until then the in-memory copy may be the stale
+    # JSON from the repo and would overwrite the good rows.
+    users_by_guild = {}
+    for user_id_str, user_data in list(chi_data.items()):
+        guild_id = guild_states.home_guild(user_id_str)
+        if guild_id is not None and guild_states.is_loaded(guild_id):
+            users_by_guild.setdefault(guild_id, ({}, {}))[0][user_id_str] = user_data
+    for user_id_str, garden in list(gardens_data.get("gardens", {}).items()):
+        guild_id = guild_states.home_guild(user_id_str)
+        if guild_id is not None and guild_states.is_loaded(guild_id):
+            users_by_guild.setdefault(guild_id, ({}, {}))[1][user_id_str] = garden
+
+    # Only rows modified since the last successful sync are sent, one transaction per guild
+    synced_users = synced_gardens = synced_plants = 0
+    start = time.perf_counter()
+    for guild_id, (users, gardens) in users_by_guild.items():
+        try:
+            stats = await db.sync_changed(users, gardens, guild_id=guild_id)
+            synced_users += stats["last_users"]
+            synced_gardens += stats["last_gardens"]
+            synced_plants += stats["last_plants"]
+        except Exception as e:
+            print(f"⚠️ Database sync failed for guild {guild_id}: {e}")
+    if synced_users or synced_gardens:
+        print(
+            f"🗄️ Database sync: {synced_users} users, {synced_gardens} gardens ({synced_plants} plants) "
+            f"across {len(users_by_guild)} guild(s) in {(time.perf_counter() - start) * 1000:.0f} ms"
+        )
 
 
 @tasks.loop(minutes=1)
 async def daily_chi_evaluation():
     now = datetime.utcnow()
     if now.hour == 23 and now.minute == 59:
-        if not bot.guilds:
-            return
-        guild = bot.guilds[0]
-        channel = get_guild_channel_obj(guild, "updates_channel_id")
-        if not channel:
-            return
+        for guild in bot.guilds:
+            try:
+                await ensure_guild_loaded(guild)
+                await post_daily_chi_summary(guild)
+            except Exception as e:
+                print(f"⚠️ Daily chi evaluation failed for guild {guild.id}: {e}")
 
-        positive_role = get_guild_role_obj(guild, "positive_role_id")
 
-        if not positive_role:
-            print("Error: Could not find positive role")
-            return
+async def post_daily_chi_summary(guild):
+    """Hand out the positive role and post the daily chi summary in one guild"""
+    channel = get_guild_channel_obj(guild, "updates_channel_id")
+    if not channel:
+        return
 
-        for member in guild.members:
-            try:
-                if positive_role in member.roles:
-                    await member.remove_roles(positive_role)
-            except Exception:
-                pass
+    positive_role = get_guild_role_obj(guild, "positive_role_id")
 
-        positive_members = []
-        negative_members = []
+    if not positive_role:
+        print(f"Error: Could not find positive role in guild {guild.id}")
+        return
 
-        for user_id_str, data in chi_data.items():
-            member = guild.get_member(int(user_id_str))
-            if member:
-                if data["chi"] > 0:
-                    positive_members.append((member, data["chi"]))
-                elif data["chi"] < 0:
-                    negative_members.append((member, data["chi"]))
+    for member in guild.members:
+        try:
+            if positive_role in member.roles:
+                await member.remove_roles(positive_role)
+        except Exception:
+            pass
 
-        positive_members.sort(key=lambda x: x[1], reverse=True)
-        negative_members.sort(key=lambda x: x[1])
+    positive_members = []
+    negative_members = []
 
-        if positive_members:
-            try:
-                await positive_members[0][0].add_roles(positive_role)
-            except Exception:
-                pass
+    for user_id_str, data in chi_data.items():
+        member = guild.get_member(int(user_id_str))
+        if member:
+            if data["chi"] > 0:
+                positive_members.append((member, data["chi"]))
+            elif data["chi"] < 0:
+                negative_members.append((member, data["chi"]))
 
-        embed = discord.Embed(title="🐼 Daily Panda Chi Summary", color=discord.Color.blue())
-        embed.add_field(
-            name="Top 3 Positive Chi",
-            value="\n".join(
-                [f"{i+1}. {m.display_name} 🐼✨ (Chi: {chi})" for i, (m, chi) in enumerate(positive_members[:3])]
-            )
-            or "No positive chi today!",
-            inline=False,
-        )
+    positive_members.sort(key=lambda x: x[1], reverse=True)
+    negative_members.sort(key=lambda x: x[1])
 
-        embed.add_field(
-            name="Top 3 Negative Chi",
-            value="\n".join(
-                [f"{i+1}. {m.display_name} 🐾💀 (Chi: {chi})" for i, (m, chi) in enumerate(negative_members[:3])]
-            )
-            or "No negative chi today!",
-            inline=False,
+    if positive_members:
+        try:
+            await positive_members[0][0].add_roles(positive_role)
+        except Exception:
+            pass
+
+    embed = discord.Embed(title="🐼 Daily Panda Chi Summary", color=discord.Color.blue())
+    embed.add_field(
+        name="Top 3 Positive Chi",
+        value="\n".join(
+            [f"{i+1}. {m.display_name} 🐼✨ (Chi: {chi})" for i, (m, chi) in enumerate(positive_members[:3])]
         )
+        or "No positive chi today!",
+        inline=False,
+    )
 
-        embed.add_field(
-            name="Totals", value=f"Positive: {len(positive_members)}\nNegative: {len(negative_members)}", inline=False
+    embed.add_field(
+        name="Top 3 Negative Chi",
+        value="\n".join(
+            [f"{i+1}. {m.display_name} 🐾💀 (Chi: {chi})" for i, (m, chi) in enumerate(negative_members[:3])]
         )
+        or "No negative chi today!",
+        inline=False,
+    )
 
-        if isinstance(channel, discord.TextChannel):
-            await channel.send(embed=embed)
+    embed.add_field(
+        name="Totals", value=f"Positive: {len(positive_members)}\nNegative: {len(negative_members)}", inline=False
+    )
+
+    if isinstance(channel, discord.TextChannel):
+        await channel.send(embed=embed)
 
 
 @bot.event
@@ -13220,9 +13215,7 @@ async def on_reaction_add(reaction, user):
 
 # ==================== TEAM DUEL SYSTEM ====================
 
-# Global team duel state
-active_team_duel = None
-active_team_boss_battle = None
+# Team duels and team boss battles are per guild: guild_states.get(guild).team_duel / .team_boss_battle
 
 
 def calculate_team_members_hp(team_id):
@@ -13256,40 +13249,40 @@ async def teamduel(ctx, action_or_target=None):
     - P!teamduel accept - Accept challenge
     - P!teamduel deny - Deny challenge
     """
-    global active_team_duel
+    gs = guild_states.get(ctx.guild)
 
     # Handle accept/deny if there's an active challenge
-    if active_team_duel and isinstance(action_or_target, str):
+    if gs.team_duel and isinstance(action_or_target, str):
         action = action_or_target.lower()
         user_id = str(ctx.author.id)
 
         if action == "accept":
             # Must be challenged leader
-            if ctx.author.id != active_team_duel["challenged_leader"]:
+            if ctx.author.id != gs.team_duel["challenged_leader"]:
                 await ctx.send("❌ Only the challenged team leader can accept!")
                 return
 
-            if active_team_duel["status"] != "pending":
+            if gs.team_duel["status"] != "pending":
                 await ctx.send("❌ This challenge has already been responded to!")
                 return
 
-            active_team_duel["status"] = "active"
+            gs.team_duel["status"] = "active"
 
-            challenger_team = teams_data["teams"][active_team_duel["challenger_team_id"]]
-            challenged_team = teams_data["teams"][active_team_duel["challenged_team_id"]]
-            challenger_leader = await bot.fetch_user(active_team_duel["challenger_leader"])
+            challenger_team = teams_data["teams"][gs.team_duel["challenger_team_id"]]
+            challenged_team = teams_data["teams"][gs.team_duel["challenged_team_id"]]
+            challenger_leader = await bot.fetch_user(gs.team_duel["challenger_leader"])
 
             # Build team roster display
             challenger_roster = ""
             for i, member_id in enumerate(challenger_team["members"], 1):
                 member = await bot.fetch_user(int(member_id))
-                hp_data = active_team_duel["challenger_members"][member_id]
+                hp_data = gs.team_duel["challenger_members"][member_id]
                 challenger_roster += f"{i}. {member.mention} - {hp_data['current_hp']}/{hp_data['max_hp']} HP\n"
 
             challenged_roster = ""
             for i, member_id in enumerate(challenged_team["members"], 1):
                 member = await bot.fetch_user(int(member_id))
-                hp_data = active_team_duel["challenged_members"][member_id]
+                hp_data = gs.team_duel["challenged_members"][member_id]
                 challenged_roster += f"{i}. {member.mention} - {hp_data['current_hp']}/{hp_data['max_hp']} HP\n"
 
             embed = discord.Embed(
@@ -13311,21 +13304,21 @@ async def teamduel(ctx, action_or_target=None):
 
         elif action == "deny":
             # Must be challenged leader
-            if ctx.author.id != active_team_duel["challenged_leader"]:
+            if ctx.author.id != gs.team_duel["challenged_leader"]:
                 await ctx.send("❌ Only the challenged team leader can deny!")
                 return
 
-            if active_team_duel["status"] != "pending":
+            if gs.team_duel["status"] != "pending":
                 await ctx.send("❌ This challenge has already been responded to!")
                 return
 
-            challenger_team = teams_data["teams"][active_team_duel["challenger_team_id"]]
-            challenged_team = teams_data["teams"][active_team_duel["challenged_team_id"]]
+            challenger_team = teams_data["teams"][gs.team_duel["challenger_team_id"]]
+            challenged_team = teams_data["teams"][gs.team_duel["challenged_team_id"]]
 
             await ctx.send(
                 f"❌ **{challenged_team['name']}** declined the challenge from **{challenger_team['name']}**!"
             )
-            active_team_duel = None
+            gs.team_duel = None
             return
 
         # Invalid action for existing challenge
@@ -13357,7 +13350,7 @@ async def teamduel(ctx, action_or_target=None):
         return
 
     # Check if there's already an active team duel
-    if active_team_duel is not None:
+    if gs.team_duel is not None:
         await ctx.send("⚔️ A team duel is already in progress! Please wait for it to finish.")
         return
 
@@ -13387,7 +13380,7 @@ async def teamduel(ctx, action_or_target=None):
         return
 
     # Initialize team duel state
-    active_team_duel = {
+    gs.team_duel = {
         "challenger_team_id": challenger_team_id,
         "challenged_team_id": challenged_team_id,
         "challenger_leader": ctx.author.id,
@@ -13430,18 +13423,18 @@ async def tduel_action(ctx, action: str = "", member_num: str = "", *, target_or
     - P!tduel special <member#> <target#> - Use member's special ability
     - P!tduel forfeit - Surrender (leader only)
     """
-    global active_team_duel
+    gs = guild_states.get(ctx.guild)
 
-    if not active_team_duel or active_team_duel["status"] != "active":
+    if not gs.team_duel or gs.team_duel["status"] != "active":
         await ctx.send("❌ No active team duel! Use `P!teamduel @leader` to challenge a team.")
         return
 
     user_id = str(ctx.author.id)
 
     # Determine which team the user leads
-    is_challenger_turn = active_team_duel["turn"] == "challenger"
+    is_challenger_turn = gs.team_duel["turn"] == "challenger"
     current_leader = (
-        active_team_duel["challenger_leader"] if is_challenger_turn else active_team_duel["challenged_leader"]
+        gs.team_duel["challenger_leader"] if is_challenger_turn else gs.team_duel["challenged_leader"]
     )
 
     if ctx.author.id != current_leader:
@@ -13451,15 +13444,15 @@ async def tduel_action(ctx, action: str = "", member_num: str = "", *, target_or
     action = action.lower()
 
     # Get team data
-    challenger_team = teams_data["teams"][active_team_duel["challenger_team_id"]]
-    challenged_team = teams_data["teams"][active_team_duel["challenged_team_id"]]
+    challenger_team = teams_data["teams"][gs.team_duel["challenger_team_id"]]
+    challenged_team = teams_data["teams"][gs.team_duel["challenged_team_id"]]
     my_team = challenger_team if is_challenger_turn else challenged_team
     enemy_team = challenged_team if is_challenger_turn else challenger_team
     my_members = (
-        active_team_duel["challenger_members"] if is_challenger_turn else active_team_duel["challenged_members"]
+        gs.team_duel["challenger_members"] if is_challenger_turn else gs.team_duel["challenged_members"]
     )
     enemy_members = (
-        active_team_duel["challenged_members"] if is_challenger_turn else active_team_duel["challenger_members"]
+        gs.team_duel["challenged_members"] if is_challenger_turn else gs.team_duel["challenger_members"]
     )
 
     if action == "status":
@@ -13467,21 +13460,21 @@ async def tduel_action(ctx, action: str = "", member_num: str = "", *, target_or
         challenger_roster = ""
         for i, member_id in enumerate(challenger_team["members"], 1):
             member = await bot.fetch_user(int(member_id))
-            hp_data = active_team_duel["challenger_members"][member_id]
+            hp_data = gs.team_duel["challenger_members"][member_id]
             status_icon = "💀" if hp_data["status"] == "ko" else "🛡️" if hp_data["status"] == "defending" else "⚡"
             challenger_roster += f"{status_icon} {i}. {member.display_name} - **{hp_data['current_hp']}/{hp_data['max_hp']} HP** ({hp_data['status']})\n"
 
         challenged_roster = ""
         for i, member_id in enumerate(challenged_team["members"], 1):
             member = await bot.fetch_user(int(member_id))
-            hp_data = active_team_duel["challenged_members"][member_id]
+            hp_data = gs.team_duel["challenged_members"][member_id]
             status_icon = "💀" if hp_data["status"] == "ko" else "🛡️" if hp_data["status"] == "defending" else "⚡"
             challenged_roster += f"{status_icon} {i}. {member.display_name} - **{hp_data['current_hp']}/{hp_data['max_hp']} HP** ({hp_data['status']})\n"
 
         current_leader_user = await bot.fetch_user(current_leader)
 
         embed = discord.Embed(
-            title=f"⚔️ TEAM BATTLE - Turn {active_team_duel['turn_count'] + 1}",
+            title=f"⚔️ TEAM BATTLE - Turn {gs.team_duel['turn_count'] + 1}",
             description=f"**{challenger_team['name']}** vs **{challenged_team['name']}**",
             color=discord.Color.blue() if is_challenger_turn else discord.Color.red(),
         )
@@ -13489,8 +13482,8 @@ async def tduel_action(ctx, action: str = "", member_num: str = "", *, target_or
         embed.add_field(name=f"🔴 {challenged_team['name']}", value=challenged_roster or "No members", inline=True)
         embed.add_field(name="⚡ Current Turn", value=f"{current_leader_user.mention}'s turn to command!", inline=False)
 
-        if active_team_duel["action_log"]:
-            recent_actions = "\n".join(active_team_duel["action_log"][-3:])
+        if gs.team_duel["action_log"]:
+            recent_actions = "\n".join(gs.team_duel["action_log"][-3:])
             embed.add_field(name="📜 Recent Actions", value=recent_actions, inline=False)
 
         embed.set_footer(text="Use P!tduel attack/heal/defend/special to command your team!")
@@ -13581,7 +13574,7 @@ async def tduel_action(ctx, action: str = "", member_num: str = "", *, target_or
             target_data["status"] = "ko"
             action_text += f"\n💀 **{target.display_name} has been knocked out!**"
 
-        active_team_duel["action_log"].append(action_text)
+        gs.team_duel["action_log"].append(action_text)
 
         # Check for team victory
         enemy_alive = sum(1 for m in enemy_members.values() if m["status"] != "ko")
@@ -13614,15 +13607,15 @@ async def tduel_action(ctx, action: str = "", member_num: str = "", *, target_or
                 color=discord.Color.gold(),
             )
             await ctx.send(embed=embed)
-            active_team_duel = None
+            gs.team_duel = None
             return
 
         # Switch turns
-        active_team_duel["turn"] = "challenged" if is_challenger_turn else "challenger"
-        active_team_duel["turn_count"] += 1
+        gs.team_duel["turn"] = "challenged" if is_challenger_turn else "challenger"
+        gs.team_duel["turn_count"] += 1
 
         next_leader = await bot.fetch_user(
-            active_team_duel["challenged_leader"] if is_challenger_turn else active_team_duel["challenger_leader"]
+            gs.team_duel["challenged_leader"] if is_challenger_turn else gs.team_duel["challenger_leader"]
         )
 
         await ctx.send(
@@ -13683,14 +13676,14 @@ async def tduel_action(ctx, action: str = "", member_num: str = "", *, target_or
             f"💚 {target.display_name} was healed with **{healing_item['name']}** for **{actual_healing} HP**!"
         )
 
-        active_team_duel["action_log"].append(action_text)
+        gs.team_duel["action_log"].append(action_text)
 
         # Switch turns
-        active_team_duel["turn"] = "challenged" if is_challenger_turn else "challenger"
-        active_team_duel["turn_count"] += 1
+        gs.team_duel["turn"] = "challenged" if is_challenger_turn else "challenger"
+        gs.team_duel["turn_count"] += 1
 
         next_leader = await bot.fetch_user(
-            active_team_duel["challenged_leader"] if is_challenger_turn else active_team_duel["challenger_leader"]
+            gs.team_duel["challenged_leader"] if is_challenger_turn else gs.team_duel["challenger_leader"]
         )
 
         await ctx.send(f"{action_text}\n\n⚡ **{next_leader.mention}'s turn to command!**")
@@ -13721,14 +13714,14 @@ async def tduel_action(ctx, action: str = "", member_num: str = "", *, target_or
         defender = await bot.fetch_user(int(defender_id))
 
         action_text = f"🛡️ {defender.display_name} takes a defensive stance! (50% damage reduction next turn)"
-        active_team_duel["action_log"].append(action_text)
+        gs.team_duel["action_log"].append(action_text)
 
         # Switch turns
-        active_team_duel["turn"] = "challenged" if is_challenger_turn else "challenger"
-        active_team_duel["turn_count"] += 1
+        gs.team_duel["turn"] = "challenged" if is_challenger_turn else "challenger"
+        gs.team_duel["turn_count"] += 1
 
         next_leader = await bot.fetch_user(
-            active_team_duel["challenged_leader"] if is_challenger_turn else active_team_duel["challenger_leader"]
+            gs.team_duel["challenged_leader"] if is_challenger_turn else gs.team_duel["challenger_leader"]
         )
 
         await ctx.send(f"{action_text}\n\n⚡ **{next_leader.mention}'s turn to command!**")
@@ -13745,7 +13738,7 @@ async def tduel_action(ctx, action: str = "", member_num: str = "", *, target_or
         save_teams()
 
         await ctx.send(f"🏳️ **{my_team['name']}** has forfeited! **{enemy_team['name']}** wins by forfeit!")
-        active_team_duel = None
+        gs.team_duel = None
 
     else:
         await ctx.send("❌ Invalid action! Use `P!tduel status`, `attack`, `heal`, `defend`, `special`, or `forfeit`")
@@ -13813,7 +13806,7 @@ async def teamboss(ctx, boss_name: str = ""):
     - P!teamboss titan - Fight the Shadow Panda Titan
     - P!teamboss dragon - Fight the Eternal Dragon Emperor
     """
-    global active_team_boss_battle
+    gs = guild_states.get(ctx.guild)
 
     user_id = str(ctx.author.id)
 
@@ -13832,12 +13825,12 @@ async def teamboss(ctx, boss_name: str = ""):
         return
 
     # Check if there's already an active boss battle
-    if active_team_boss_battle is not None:
+    if gs.team_boss_battle is not None:
         await ctx.send("🐉 A team boss battle is already in progress! Finish it first.")
         return
 
     # Check if there's an active team duel
-    if active_team_duel is not None:
+    if gs.team_duel is not None:
         await ctx.send("⚔️ Your team is currently in a duel! Finish it before challenging a boss.")
         return
 
@@ -13881,7 +13874,7 @@ async def teamboss(ctx, boss_name: str = ""):
     team_members_hp = calculate_team_members_hp(team_id)
 
     # Initialize team boss battle
-    active_team_boss_battle = {
+    gs.team_boss_battle = {
         "team_id": team_id,
         "boss_key": boss_name,
         "boss_hp": scaled_hp,
@@ -13935,14 +13928,14 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
     - P!tboss defend <member#> - Member defends (50% damage reduction next turn)
     - P!tboss forfeit - Flee from battle (no rewards)
     """
-    global active_team_boss_battle
+    gs = guild_states.get(ctx.guild)
 
-    if not active_team_boss_battle:
+    if not gs.team_boss_battle:
         await ctx.send("❌ No active team boss battle! Use `P!teamboss <boss>` to start one.")
         return
 
     user_id = str(ctx.author.id)
-    team_id = active_team_boss_battle["team_id"]
+    team_id = gs.team_boss_battle["team_id"]
     team = teams_data["teams"][team_id]
 
     # Only team leader can command
@@ -13952,8 +13945,8 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
         return
 
     action = action.lower()
-    boss_template = TEAM_BOSS_DATA[active_team_boss_battle["boss_key"]]
-    team_members = active_team_boss_battle["team_members"]
+    boss_template = TEAM_BOSS_DATA[gs.team_boss_battle["boss_key"]]
+    team_members = gs.team_boss_battle["team_members"]
 
     if action == "status":
         # Display current battle status
@@ -13968,8 +13961,8 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
             )
 
             status_text = hp_data["status"]
-            if member_id in active_team_boss_battle["status_effects"]:
-                effects = active_team_boss_battle["status_effects"][member_id]
+            if member_id in gs.team_boss_battle["status_effects"]:
+                effects = gs.team_boss_battle["status_effects"][member_id]
                 if "burn" in effects:
                     status_text += f" (🔥{effects['burn']} turns)"
                 if "stun" in effects:
@@ -13978,20 +13971,20 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
             team_roster += f"{status_icon} {i}. {member.display_name} - **{hp_data['current_hp']}/{hp_data['max_hp']} HP** ({status_text})\n"
 
         embed = discord.Embed(
-            title=f"{boss_template['emoji']} BOSS RAID - Turn {active_team_boss_battle['turn_count'] + 1}",
+            title=f"{boss_template['emoji']} BOSS RAID - Turn {gs.team_boss_battle['turn_count'] + 1}",
             description=f"**{team['name']}** vs **{boss_template['name']}**",
             color=discord.Color.dark_red(),
         )
         embed.add_field(name=f"👥 {team['name']}", value=team_roster or "Team wiped!", inline=True)
         embed.add_field(
             name=f"{boss_template['emoji']} {boss_template['name']}",
-            value=f"**{active_team_boss_battle['boss_hp']:,} / {active_team_boss_battle['boss_max_hp']:,} HP**\n\n"
+            value=f"**{gs.team_boss_battle['boss_hp']:,} / {gs.team_boss_battle['boss_max_hp']:,} HP**\n\n"
             f"⚡ {boss_template['special']['name']}",
             inline=True,
         )
 
-        if active_team_boss_battle["action_log"]:
-            recent_actions = "\n".join(active_team_boss_battle["action_log"][-4:])
+        if gs.team_boss_battle["action_log"]:
+            recent_actions = "\n".join(gs.team_boss_battle["action_log"][-4:])
             embed.add_field(name="📜 Recent Actions", value=recent_actions, inline=False)
 
         embed.set_footer(text="Use P!tboss attack/heal/defend to command your team!")
@@ -14023,9 +14016,9 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
             return
 
         # Check if stunned
-        if attacker_id in active_team_boss_battle["status_effects"]:
-            if "stun" in active_team_boss_battle["status_effects"][attacker_id]:
-                del active_team_boss_battle["status_effects"][attacker_id]["stun"]
+        if attacker_id in gs.team_boss_battle["status_effects"]:
+            if "stun" in gs.team_boss_battle["status_effects"][attacker_id]:
+                del gs.team_boss_battle["status_effects"][attacker_id]["stun"]
                 await ctx.send("❌ That member is stunned and cannot act this turn!")
                 return
 
@@ -14050,14 +14043,14 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
         attacker_level = get_user_level(int(attacker_id))
         damage = calculate_damage_with_level(base_damage, attacker_level, 1)
 
-        active_team_boss_battle["boss_hp"] -= damage
+        gs.team_boss_battle["boss_hp"] -= damage
 
         attacker = await bot.fetch_user(int(attacker_id))
         action_text = f"⚔️ {attacker.display_name} attacks {boss_template['emoji']} **{boss_template['name']}** with **{weapon_found['name']}** for **{damage} damage**!"
 
         # Check if boss is defeated
-        if active_team_boss_battle["boss_hp"] <= 0:
-            active_team_boss_battle["boss_hp"] = 0
+        if gs.team_boss_battle["boss_hp"] <= 0:
+            gs.team_boss_battle["boss_hp"] = 0
 
             # VICTORY! Distribute rewards
             chi_per_member = boss_template["rewards_per_member"]["chi"]
@@ -14108,9 +14101,9 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
             team["team_score"] += 200
             if "boss_victories" not in team:
                 team["boss_victories"] = {}
-            if active_team_boss_battle["boss_key"] not in team["boss_victories"]:
-                team["boss_victories"][active_team_boss_battle["boss_key"]] = 0
-            team["boss_victories"][active_team_boss_battle["boss_key"]] += 1
+            if gs.team_boss_battle["boss_key"] not in team["boss_victories"]:
+                team["boss_victories"][gs.team_boss_battle["boss_key"]] = 0
+            team["boss_victories"][gs.team_boss_battle["boss_key"]] += 1
 
             save_teams()
             save_data()
@@ -14122,7 +14115,7 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
                 "**Team Rewards:**\n"
                 f"💰 {total_chi:,} Total Chi ({chi_per_member:,} per member)\n"
                 "🏆 +200 Team Score\n"
-                f"📊 Boss Victories: {team.get('boss_victories', {}).get(active_team_boss_battle['boss_key'], 1)}",
+                f"📊 Boss Victories: {team.get('boss_victories', {}).get(gs.team_boss_battle['boss_key'], 1)}",
                 color=discord.Color.gold(),
             )
 
@@ -14130,10 +14123,10 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
                 embed.add_field(name="🎁 Artifacts Earned!", value="\n".join(artifacts_earned), inline=False)
 
             await ctx.send(embed=embed)
-            active_team_boss_battle = None
+            gs.team_boss_battle = None
             return
 
-        active_team_boss_battle["action_log"].append(action_text)
+        gs.team_boss_battle["action_log"].append(action_text)
 
         # BOSS TURN - Boss attacks back!
         boss_action = await execute_boss_turn(ctx, team, team_members, boss_template)
@@ -14154,10 +14147,10 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
                 color=discord.Color.dark_red(),
             )
             await ctx.send(embed=embed)
-            active_team_boss_battle = None
+            gs.team_boss_battle = None
             return
 
-        active_team_boss_battle["turn_count"] += 1
+        gs.team_boss_battle["turn_count"] += 1
         await ctx.send(
             f"{action_text}\n\n{boss_action}\n\n⚡ **Your turn to command!** Use `P!tboss status` to see the battlefield."
         )
@@ -14214,7 +14207,7 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
         action_text = (
             f"💚 {target.display_name} was healed with **{healing_item['name']}** for **{actual_healing} HP**!"
         )
-        active_team_boss_battle["action_log"].append(action_text)
+        gs.team_boss_battle["action_log"].append(action_text)
 
         # BOSS TURN
         boss_action = await execute_boss_turn(ctx, team, team_members, boss_template)
@@ -14231,10 +14224,10 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
                 color=discord.Color.dark_red(),
             )
             await ctx.send(embed=embed)
-            active_team_boss_battle = None
+            gs.team_boss_battle = None
             return
 
-        active_team_boss_battle["turn_count"] += 1
+        gs.team_boss_battle["turn_count"] += 1
         await ctx.send(f"{action_text}\n\n{boss_action}\n\n⚡ **Your turn!**")
 
     elif action == "defend":
@@ -14263,7 +14256,7 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
         defender = await bot.fetch_user(int(defender_id))
 
         action_text = f"🛡️ {defender.display_name} takes a defensive stance!"
-        active_team_boss_battle["action_log"].append(action_text)
+        gs.team_boss_battle["action_log"].append(action_text)
 
         # BOSS TURN
         boss_action = await execute_boss_turn(ctx, team, team_members, boss_template)
@@ -14280,10 +14273,10 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
                 color=discord.Color.dark_red(),
             )
             await ctx.send(embed=embed)
-            active_team_boss_battle = None
+            gs.team_boss_battle = None
             return
 
-        active_team_boss_battle["turn_count"] += 1
+        gs.team_boss_battle["turn_count"] += 1
         await ctx.send(f"{action_text}\n\n{boss_action}\n\n⚡ **Your turn!**")
 
     elif action == "forfeit":
@@ -14293,7 +14286,7 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
         await ctx.send(
             f"🏳️ **{team['name']}** has fled from the {boss_template['emoji']} **{boss_template['name']}**!\n**Penalty:** -25 Team Score"
         )
-        active_team_boss_battle = None
+        gs.team_boss_battle = None
 
     else:
         await ctx.send("❌ Invalid action! Use `P!tboss status`, `attack`, `heal`, `defend`, or `forfeit`")
@@ -14301,6 +14294,7 @@ async def tboss_action(ctx, action: str = "", member_num: str = "", *, target_or
 
 async def execute_boss_turn(ctx, team, team_members, boss_template):
     """Execute the boss's turn and return action text"""
+    gs = guild_states.get(ctx.guild)
 
     # Get alive members
     alive_members = [mid for mid, data in team_members.items() if data["status"] != "ko"]
@@ -14347,9 +14341,9 @@ async def execute_boss_turn(ctx, team, team_members, boss_template):
         elif "burn_damage_per_turn" in boss_template["special"]:
             # Burn all members
             for member_id in alive_members:
-                if member_id not in active_team_boss_battle["status_effects"]:
-                    active_team_boss_battle["status_effects"][member_id] = {}
-                active_team_boss_battle["status_effects"][member_id]["burn"] = boss_template["special"]["burn_turns"]
+                if member_id not in gs.team_boss_battle["status_effects"]:
+                    gs.team_boss_battle["status_effects"][member_id] = {}
+                gs.team_boss_battle["status_effects"][member_id]["burn"] = boss_template["special"]["burn_turns"]
                 team_members[member_id]["status"] = "burning"
 
             action_text = f"🔥 {boss_template['emoji']} **{special_name}!** All team members are burning for {boss_template['special']['burn_turns']} turns!"
@@ -14357,9 +14351,9 @@ async def execute_boss_turn(ctx, team, team_members, boss_template):
         elif "description" in boss_template["special"] and "stun" in boss_template["special"]["description"].lower():
             # Stun random member
             target_id = random.choice(alive_members)
-            if target_id not in active_team_boss_battle["status_effects"]:
-                active_team_boss_battle["status_effects"][target_id] = {}
-            active_team_boss_battle["status_effects"][target_id]["stun"] = 1
+            if target_id not in gs.team_boss_battle["status_effects"]:
+                gs.team_boss_battle["status_effects"][target_id] = {}
+            gs.team_boss_battle["status_effects"][target_id]["stun"] = 1
 
             target = await bot.fetch_user(int(target_id))
             action_text = (
@@ -14408,8 +14402,8 @@ async def execute_boss_turn(ctx, team, team_members, boss_template):
 
     # Process burn damage
     burn_texts = []
-    for member_id in list(active_team_boss_battle["status_effects"].keys()):
-        if "burn" in active_team_boss_battle["status_effects"][member_id]:
+    for member_id in list(gs.team_boss_battle["status_effects"].keys()):
+        if "burn" in gs.team_boss_battle["status_effects"][member_id]:
             if team_members[member_id]["status"] != "ko":
                 burn_damage = boss_template["special"].get("burn_damage_per_turn", 0)
                 team_members[member_id]["current_hp"] -= burn_damage
@@ -14422,16 +14416,16 @@ async def execute_boss_turn(ctx, team, team_members, boss_template):
                 else:
                     burn_texts.append(f"🔥 {member.display_name} takes {burn_damage} burn damage!")
 
-                active_team_boss_battle["status_effects"][member_id]["burn"] -= 1
-                if active_team_boss_battle["status_effects"][member_id]["burn"] <= 0:
-                    del active_team_boss_battle["status_effects"][member_id]["burn"]
+                gs.team_boss_battle["status_effects"][member_id]["burn"] -= 1
+                if gs.team_boss_battle["status_effects"][member_id]["burn"] <= 0:
+                    del gs.team_boss_battle["status_effects"][member_id]["burn"]
                     if team_members[member_id]["status"] == "burning":
                         team_members[member_id]["status"] = "active"
 
     if burn_texts:
         action_text += "\n" + "\n".join(burn_texts)
 
-    active_team_boss_battle["action_log"].append(action_text)
+    gs.team_boss_battle["action_log"].append(action_text)
     return action_text
 
 
@@ -16285,13 +16279,13 @@ async def pet_switch(ctx, *, pet_name: str = ""):
 @pet.command(name="attack", aliases=["duel"])
 async def pet_attack(ctx, attack_id: str = ""):
     """Use pet attack in duels (e.g., P!pet duel P1 or P!pet attack P1)"""
-    global active_duel
+    gs = guild_states.get(ctx.guild)
 
-    if active_duel is None or active_duel["status"] != "active":
+    if gs.duel is None or gs.duel["status"] != "active":
         await ctx.send("⚔️ There's no active duel right now! Pet attacks can only be used during duels.")
         return
 
-    if ctx.author.id != active_duel["turn"]:
+    if ctx.author.id != gs.duel["turn"]:
         await ctx.send("⚔️ It's not your turn!")
         return
 
@@ -16373,16 +16367,16 @@ async def pet_attack(ctx, attack_id: str = ""):
     damage = random.randint(selected_attack["damage_range"][0], selected_attack["damage_range"][1])
 
     # Deal damage to opponent
-    if ctx.author.id == active_duel["challenger"]:
-        active_duel["challenged_hp"] -= damage
-        opponent_id = active_duel["challenged"]
-        opponent_hp = active_duel["challenged_hp"]
-        active_duel["turn"] = active_duel["challenged"]
+    if ctx.author.id == gs.duel["challenger"]:
+        gs.duel["challenged_hp"] -= damage
+        opponent_id = gs.duel["challenged"]
+        opponent_hp = gs.duel["challenged_hp"]
+        gs.duel["turn"] = gs.duel["challenged"]
     else:
-        active_duel["challenger_hp"] -= damage
-        opponent_id = active_duel["challenger"]
-        opponent_hp = active_duel["challenger_hp"]
-        active_duel["turn"] = active_duel["challenger"]
+        gs.duel["challenger_hp"] -= damage
+        opponent_id = gs.duel["challenger"]
+        opponent_hp = gs.duel["challenger_hp"]
+        gs.duel["turn"] = gs.duel["challenger"]
 
     opponent = ctx.guild.get_member(opponent_id)
     pet_name = pet.get("nickname") or pet["name"]
@@ -16396,10 +16390,10 @@ async def pet_attack(ctx, attack_id: str = ""):
     if opponent_hp <= 0:
         winner = ctx.author
         loser = opponent
-        is_tournament = active_duel.get("is_tournament", False)
+        is_tournament = gs.duel.get("is_tournament", False)
 
         bet_results = process_duel_bets(winner.id, ctx.guild)
-        active_duel = None
+        gs.duel = None
 
         winner_id = str(winner.id)
         loser_id = str(loser.id)
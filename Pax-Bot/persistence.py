@@ -0,0 +1,194 @@
+"""
+Write-behind JSON persistence for the bot's in-memory collections
+Tracks which collections changed and writes them from a background thread
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class _Collection:
+    """One JSON file backed by an in-memory object"""
+
+    __slots__ = ("name", "path", "getter", "indent", "dirty", "first_dirty", "last_dirty", "writes")
+
+    def __init__(self, name: str, path: str, getter: Callable[[], Any], indent: Optional[int]):
+        self.name = name
+        self.path = path
+        self.getter = getter
+        self.indent = indent
+        self.dirty = False
+        self.first_dirty = 0.0
+        self.last_dirty = 0.0
+        self.writes = 0
+
+
+class PersistenceManager:
+    """Dirty flags per collection + debounced background flush.
+
+    Call sites mark a collection as changed (``mark_dirty("chi")``), which is
+    O(1).  A writer thread saves a collection once it has been quiet for
+    ``delay`` seconds, or at the latest ``max_delay`` seconds after it first
+    became dirty, so a busy chat can't postpone a save forever.  Each file
+    is written to a temp file, fsynced and swapped in with os.replace(), so
+    a crash mid-write never leaves a truncated JSON file behind.
+
+    Collections registered with ``indent=None`` are encoded by json's C
+    encoder, which runs in one go without letting other threads in - the
+    snapshot can't observe a half-applied update from the event loop.
+    Indented (pure Python) encoding retries if a dict changes size while
+    it is being written.
+    """
+
+    def __init__(self, delay: float = 2.0, max_delay: float = 10.0):
+        self.delay = delay
+        self.max_delay = max_delay
+        self.collections: Dict[str, _Collection] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._write_lock = threading.Lock()
+        self._atexit_registered = False
+
+        # Stats
+        self.marks = 0
+        self.flushes = 0
+        self.failures = 0
+        self.bytes_written = 0
+        self.last_flush_ms = 0.0
+
+    def register(self, name: str, path: str, getter: Callable[[], Any], indent: Optional[int] = 2):
+        """Register a collection; getter returns the object to save"""
+        self.collections[name] = _Collection(name, path, getter, indent)
+
+    def mark_dirty(self, name: str):
+        """Record that a collection changed; it will be saved shortly"""
+        collection = self.collections[name]
+        now = time.monotonic()
+        with self._cond:
+            self.marks += 1
+            collection.last_dirty = now
+            if not collection.dirty:
+                collection.dirty = True
+                collection.first_dirty = now
+                self._cond.notify()
+
+    def is_dirty(self, name: str) -> bool:
+        return self.collections[name].dirty
+
+    # ============================================
+    # WRITER THREAD
+    # ============================================
+
+    def start(self):
+        """Start the writer thread (idempotent) and flush everything at exit"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="persistence-writer", daemon=True)
+        self._thread.start()
+        if not self._atexit_registered:
+            atexit.register(self.shutdown)
+            self._atexit_registered = True
+
+    def _due(self, now: float):
+        """Names due for a write and seconds until the next one is due"""
+        due, wait = [], None
+        for collection in self.collections.values():
+            if not collection.dirty:
+                continue
+            at = min(collection.last_dirty + self.delay, collection.first_dirty + self.max_delay)
+            if at <= now:
+                due.append(collection.name)
+            elif wait is None or at - now < wait:
+                wait = at - now
+        return due, wait
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping:
+                        return
+                    due, wait = self._due(time.monotonic())
+                    if due:
+                        break
+                    self._cond.wait(wait)
+            for name in due:
+                self._write(name)
+
+    def _write(self, name: str):
+        collection = self.collections[name]
+        with self._write_lock:
+            with self._cond:
+                if not collection.dirty:
+                    return
+                collection.dirty = False
+            start = time.perf_counter()
+            try:
+                payload = self._encode(collection)
+                tmp_path = f"{collection.path}.tmp"
+                with open(tmp_path, "w") as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, collection.path)
+            except Exception as e:
+                self.failures += 1
+                print(f"⚠️ Failed to save {collection.path}: {e}")
+                # Try again on the next round
+                self.mark_dirty(name)
+                return
+            collection.writes += 1
+            self.flushes += 1
+            self.bytes_written += len(payload)
+            self.last_flush_ms = (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    def _encode(collection: _Collection) -> str:
+        for attempt in range(5):
+            try:
+                return json.dumps(collection.getter(), indent=collection.indent)
+            except RuntimeError:
+                # "dictionary changed size during iteration" - take another snapshot
+                if attempt == 4:
+                    raise
+                time.sleep(0.01)
+
+    # ============================================
+    # FORCED FLUSH
+    # ============================================
+
+    def flush(self, name: Optional[str] = None):
+        """Write dirty collections now, in the calling thread"""
+        names = [name] if name else list(self.collections)
+        for n in names:
+            self._write(n)
+
+    def shutdown(self):
+        """Stop the writer thread and save everything still dirty"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=10)
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "marks": self.marks,
+            "flushes": self.flushes,
+            "coalesced": max(0, self.marks - self.flushes),
+            "failures": self.failures,
+            "bytes_written": self.bytes_written,
+            "last_flush_ms": round(self.last_flush_ms, 1),
+            "dirty": [c.name for c in self.collections.values() if c.dirty],
+        }
+
+
+# Global persistence manager instance
+persistence = PersistenceManager()
@@ -46,6 +46,10 @@ async def lifespan(app):
     
     if not bot.is_closed():
         await bot.close()
+    
+    from persistence import persistence
+    await asyncio.to_thread(persistence.shutdown)
+    print("💾 Saved pending data")
 
 app.router.lifespan_context = lifespan
 
@@ -0,0 +1,189 @@
+"""
+Precompiled chi word matcher for on_message
+Finds secret, positive and negative words and the context-word check in one pass per message
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+# A word from the lists matches like the old rf"\b{word}\b" search: for words
+# made of \w characters that is exactly "one of the message's \w+ tokens".
+_TOKEN = re.compile(r"\w+")
+
+POSITIVE = 1
+NEGATIVE = 2
+
+
+class WordHits:
+    """Result of scanning one message"""
+
+    __slots__ = ("secret", "positive", "negative", "has_context")
+
+    def __init__(self):
+        self.secret: Optional[str] = None
+        self.positive = False
+        self.negative = False
+        self.has_context = False
+
+
+class WordMatcher:
+    """Token-dictionary matcher built once from the chi word lists.
+
+    scan() tokenises the lowercased message with one compiled regex and
+    looks every token up in a single dict (word -> positive/negative flags
+    and secret-word order), so the cost per message depends on the message
+    length only, not on the number of words in the lists.  Entries that
+    aren't plain words (phrases, punctuation) go into one compiled
+    alternation instead.
+
+    The lists are copied when the matcher is built; call rebuild() after
+    changing them.
+    """
+
+    def __init__(self, positive_words: Iterable[str], negative_words: Iterable[str],
+                 secret_words: Iterable[str] = ()):
+        self.rebuild(positive_words, negative_words, secret_words)
+
+    def rebuild(self, positive_words: Iterable[str], negative_words: Iterable[str],
+                secret: Iterable[str] = ()):
+        """(Re)build the lookup tables from the word lists"""
+        flags: Dict[str, int] = {}
+        secret_words: List[str] = []
+        phrases: Dict[str, int] = {}
+
+        for kind, words in ((POSITIVE, positive_words), (NEGATIVE, negative_words)):
+            for word in words:
+                word = word.lower()
+                target = flags if _TOKEN.fullmatch(word) else phrases
+                target[word] = target.get(word, 0) | kind
+        for word in secret:
+            word = word.lower()
+            if word not in secret_words:
+                secret_words.append(word)
+        # Rank = position in the secret list; the first listed word wins, as before
+        secret_order = {w: i for i, w in enumerate(secret_words) if _TOKEN.fullmatch(w)}
+        secret_phrases = [w for w in secret_words if w not in secret_order]
+
+        self.flags = flags
+        self.secret_order = secret_order
+        self.secret_words = secret_words
+        self.chi_words = frozenset(flags)
+        self._phrase_flags = phrases
+        self._phrase_re = self._alternation(phrases)
+        self._secret_phrase_re = self._alternation(secret_phrases)
+
+    @staticmethod
+    def _alternation(words) -> Optional[re.Pattern]:
+        if not words:
+            return None
+        # Longest first so a phrase isn't shadowed by its own prefix
+        ordered = sorted(words, key=len, reverse=True)
+        return re.compile(r"\b(?:" + "|".join(re.escape(w) for w in ordered) + r")\b")
+
+    def scan(self, content: str) -> WordHits:
+        """Secret word (first in list order), positive / negative hits and context check"""
+        hits = WordHits()
+        text = content.lower()
+        flags = self.flags
+        secret_order = self.secret_order
+        found = 0
+        secret_rank = None
+        for token in _TOKEN.findall(text):
+            kind = flags.get(token)
+            if kind is None:
+                hits.has_context = True
+            else:
+                found |= kind
+            rank = secret_order.get(token)
+            if rank is not None and (secret_rank is None or rank < secret_rank):
+                secret_rank = rank
+        if self._phrase_re is not None:
+            for match in self._phrase_re.finditer(text):
+                found |= self._phrase_flags[match.group(0)]
+        if self._secret_phrase_re is not None:
+            for match in self._secret_phrase_re.finditer(text):
+                rank = self.secret_words.index(match.group(0))
+                if secret_rank is None or rank < secret_rank:
+                    secret_rank = rank
+        if secret_rank is not None:
+            hits.secret = self.secret_words[secret_rank]
+        hits.positive = bool(found & POSITIVE)
+        hits.negative = bool(found & NEGATIVE)
+        return hits
+
+
+# ============================================
+# BENCHMARK
+# ============================================
+
+def _load_word_lists(path: str = "main.py"):
+    """Read the word list literals out of main.py without importing the bot"""
+    import ast
+
+    with open(path, "r") as f:
+        tree = ast.parse(f.read())
+    lists = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) in (
+            "POSITIVE_WORDS", "NEGATIVE_WORDS", "SECRET_WORDS"
+        ):
+            lists[node.targets[0].id] = ast.literal_eval(node.value)
+    return lists["POSITIVE_WORDS"], lists["NEGATIVE_WORDS"], lists["SECRET_WORDS"]
+
+
+def _benchmark(count: int = 20000):
+    """Cross-check against the old per-message regex code and compare throughput"""
+    import random
+    import time
+
+    positive, negative, secret = _load_word_lists()
+
+    def legacy(content):
+        lower = content.lower()
+        found_secret = None
+        for word in secret:
+            if re.search(r"\b" + re.escape(word) + r"\b", lower):
+                found_secret = word
+                break
+        pos = any(re.search(rf"\b{w}\b", lower) for w in positive)
+        neg = any(re.search(rf"\b{w}\b", lower) for w in negative)
+        all_chi_words = set(positive + negative)
+        context = any(w not in all_chi_words for w in re.findall(r"\b\w+\b", lower))
+        return found_secret, pos, neg, context
+
+    rng = random.Random(16)
+    filler = ("the a really so this that you i we was is what lol ok thanks game pax panda "
+              "today tomorrow bamboozled cakes stupidity radiantly ç ü 123 :) !!").split()
+    vocab = filler * 6 + positive + negative + list(secret)
+    corpus = []
+    for _ in range(count):
+        words = [rng.choice(vocab) for _ in range(rng.randint(1, 25))]
+        text = " ".join(words)
+        if rng.random() < 0.3:
+            text = text.upper() if rng.random() < 0.5 else text.capitalize() + "!"
+        corpus.append(text)
+
+    matcher = WordMatcher(positive, negative, secret)
+    mismatches = 0
+    for text in corpus:
+        hits = matcher.scan(text)
+        if legacy(text) != (hits.secret, hits.positive, hits.negative, hits.has_context):
+            mismatches += 1
+    print(f"Cross-check: {count - mismatches}/{count} messages identical to the old matcher")
+
+    start = time.perf_counter()
+    for text in corpus:
+        legacy(text)
+    legacy_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for text in corpus:
+        matcher.scan(text)
+    new_time = time.perf_counter() - start
+    print(f"Old regex loops: {legacy_time * 1e6 / count:7.1f} us/message  ({count / legacy_time:9,.0f} msg/s)")
+    print(f"WordMatcher:     {new_time * 1e6 / count:7.1f} us/message  ({count / new_time:9,.0f} msg/s)")
+    return mismatches
+
+
+if __name__ == "__main__":
+    # python word_matcher.py  (from the Pax-Bot directory)
+    raise SystemExit(1 if _benchmark() else 0)